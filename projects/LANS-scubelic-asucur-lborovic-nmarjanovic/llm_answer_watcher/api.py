@@ -1,15 +1,19 @@
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, ValidationError
 import yaml
 import os
 import sqlite3
 import logging
 import traceback
+from contextlib import ExitStack
 
-from llm_answer_watcher.auth.dependencies import get_current_user
-from llm_answer_watcher.storage.db import init_db_if_needed, get_run_summary, get_all_runs
+from llm_answer_watcher.auth.dependencies import get_admin_user, get_current_user
+from llm_answer_watcher.storage.connection import read_connection
+from llm_answer_watcher.storage.db import init_db_if_needed, get_run_summary, get_all_runs, get_answers_raw
+from llm_answer_watcher.storage.diff import diff_runs, unpaired_queries
+from llm_answer_watcher.report.diff import generate_diff_report
 from llm_answer_watcher.config.schema import (
     WatcherConfig,
     RuntimeConfig,
@@ -19,8 +23,13 @@ from llm_answer_watcher.config.schema import (
     RunSettings,
     ModelConfig,
 )
+from llm_answer_watcher.llm_runner.compiled_config import get_compiled_config_cache
 from llm_answer_watcher.llm_runner.runner import run_all
+from llm_answer_watcher.llm_runner.scheduler import get_scheduler
+from llm_answer_watcher.llm_runner.singleflight import get_single_flight
+from llm_answer_watcher.llm_runner.streaming import get_live_answers
 from llm_answer_watcher.system_prompts import get_provider_default
+from llm_answer_watcher.utils import metrics, serialization
 from llm_answer_watcher.auth.router import router as auth_router
 from llm_answer_watcher.user_config_router import router as user_config_router
 
@@ -29,7 +38,17 @@ from llm_answer_watcher.llm_runner.groq_client import GroqClient
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="LLM Answer Watcher API", version="0.2.0")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with utils.serialization (orjson when installed)."""
+
+    def render(self, content) -> bytes:
+        return serialization.dumps_bytes(content)
+
+
+app = FastAPI(
+    title="LLM Answer Watcher API", version="0.2.0", default_response_class=FastJSONResponse
+)
 
 # CORS configuration - must be added BEFORE routers
 origins = [
@@ -210,6 +229,51 @@ def read_root():
     return {"message": "LLM Answer Watcher API", "version": "0.2.0"}
 
 
+@app.get("/metrics")
+def prometheus_metrics():
+    """Expose process-wide stage timings, counters and gauges for Prometheus."""
+    return PlainTextResponse(
+        metrics.render_prometheus(), media_type=metrics.PROMETHEUS_CONTENT_TYPE
+    )
+
+
+@app.get("/admin/scheduler")
+def scheduler_status(admin_user: dict = Depends(get_admin_user)):
+    """
+    Fair-share scheduler state shared by all users' runs.
+
+    Per tenant (user id, "local" for CLI runs): queue depth, in-flight
+    queries, granted/rejected counts, average/max/oldest wait time and spend
+    in the current window. Per provider: in-flight queries and ceiling.
+    """
+    return get_scheduler().snapshot()
+
+
+@app.get("/admin/single-flight")
+def single_flight_status(admin_user: dict = Depends(get_admin_user)):
+    """
+    Coalescing of identical in-flight LLM requests across all users' runs.
+
+    Upstream calls made (leaders), requests that shared one (coalesced),
+    coalesced requests that shared a failure, cost saved and the number of
+    calls currently in flight.
+    """
+    single_flight = get_single_flight()
+    return {**single_flight.stats.to_dict(), "in_flight": single_flight.in_flight()}
+
+
+@app.get("/admin/compiled-configs")
+def compiled_config_status(admin_user: dict = Depends(get_admin_user)):
+    """
+    Cache of compiled run configurations (parsed, validated and precomputed).
+
+    Hits, misses, hit rate, evictions, expirations and the number of cached
+    configs.
+    """
+    cache = get_compiled_config_cache()
+    return {**cache.stats.to_dict(), "entries": len(cache)}
+
+
 @app.post("/run_watcher")
 async def run_watcher_endpoint(
     config_data: ConfigData,
@@ -223,27 +287,40 @@ async def run_watcher_endpoint(
     2. Builds a RuntimeConfig with the provided API key
     3. Calls the core run_all() function
     4. Returns the run results
+
+    Steps 1-2 and the run's config-derived structures (brand patterns,
+    operation order, pricing) are cached per YAML and API keys, so
+    resubmitting the same config skips them.
     """
-    # Parse YAML configuration
-    try:
-        raw_config = yaml.safe_load(config_data.yaml_config)
-    except yaml.YAMLError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid YAML configuration: {e}")
 
-    if not raw_config:
-        raise HTTPException(status_code=400, detail="Configuration cannot be empty")
+    def build_config() -> RuntimeConfig:
+        # Parse YAML configuration
+        try:
+            raw_config = yaml.safe_load(config_data.yaml_config)
+        except yaml.YAMLError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid YAML configuration: {e}")
 
-    if not config_data.api_keys:
-        raise HTTPException(status_code=400, detail="API keys are required.")
+        if not raw_config:
+            raise HTTPException(status_code=400, detail="Configuration cannot be empty")
+
+        if not config_data.api_keys:
+            raise HTTPException(status_code=400, detail="API keys are required.")
+
+        # Build RuntimeConfig from the parsed YAML
+        return build_runtime_config_from_dict(raw_config, config_data.api_keys)
 
-    # Build RuntimeConfig from the parsed YAML
     try:
-        runtime_config = build_runtime_config_from_dict(raw_config, config_data.api_keys)
+        compiled = get_compiled_config_cache().get_or_compile(
+            config_data.yaml_config, build_config, secrets=config_data.api_keys
+        )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to build runtime config: {e}", exc_info=True)
         raise HTTPException(status_code=400, detail=f"Configuration error: {e}")
+    runtime_config = compiled.config
 
     # Ensure output directory exists and DB is initialized
     sqlite_db_path = runtime_config.run_settings.sqlite_db_path
@@ -257,7 +334,7 @@ async def run_watcher_endpoint(
     # Run the watcher - call the actual run_all() function
     try:
         logger.info(f"Starting run_all() execution for user {current_user['username']} (id={current_user['id']})...")
-        result = await run_all(runtime_config, user_id=current_user['id'])
+        result = await run_all(runtime_config, user_id=current_user['id'], compiled=compiled)
         logger.info(f"run_all() completed: run_id={result['run_id']}, success={result['success_count']}/{result['total_queries']}")
     except Exception as e:
         logger.error(f"run_all() failed: {e}", exc_info=True)
@@ -272,6 +349,7 @@ async def run_watcher_endpoint(
         "total_queries": result["total_queries"],
         "success_count": result["success_count"],
         "error_count": result["error_count"],
+        "skipped_count": result.get("skipped_count", 0),
         "total_cost_usd": result["total_cost_usd"],
         "errors": result.get("errors", []),
     }
@@ -282,39 +360,94 @@ async def list_runs(current_user: dict = Depends(get_current_user)):
     sqlite_db_path = "./output/watcher.db"
     try:
         init_db_if_needed(sqlite_db_path)
-        with sqlite3.connect(sqlite_db_path) as conn:
+        with read_connection(sqlite_db_path) as conn:
             runs = get_all_runs(conn, user_id=current_user["id"])
             return runs
     except Exception as e:
         logger.error(f"Failed to list runs: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/runs/live")
+async def live_answers(current_user: dict = Depends(get_current_user)):
+    """
+    Partial answers of the current user's streamed queries still in flight.
+
+    Requires run_settings.streaming. Each entry has the answer text so far,
+    the brands detected in it and the time to first token; poll while a run
+    is in progress to watch answers grow.
+    """
+    return get_live_answers().snapshot(tenant=str(current_user["id"]))
+
+@app.get("/runs/{run_a}/diff/{run_b}")
+def diff_runs_endpoint(
+    run_a: str,
+    run_b: str,
+    include_unchanged: bool = False,
+    format: str = "jsonl",
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Compare brand visibility between two of the current user's runs.
+
+    format=jsonl streams one JSON object per brand delta (NDJSON);
+    format=html returns the rendered diff report.
+    """
+    if format not in ("jsonl", "html"):
+        raise HTTPException(status_code=400, detail="format must be 'jsonl' or 'html'")
+
+    sqlite_db_path = "./output/watcher.db"
+    init_db_if_needed(sqlite_db_path)
+    # Held until the stream ends; pooled readers may move between threads
+    reader = ExitStack()
+    conn = reader.enter_context(read_connection(sqlite_db_path))
+    try:
+        owned = conn.execute(
+            "SELECT COUNT(DISTINCT run_id) FROM runs WHERE run_id IN (?, ?) AND user_id = ?",
+            (run_a, run_b, current_user["id"]),
+        ).fetchone()[0]
+        if owned != len({run_a, run_b}):
+            raise HTTPException(status_code=404, detail="Run not found.")
+
+        if format == "html":
+            html = generate_diff_report(
+                run_a,
+                run_b,
+                diff_runs(conn, run_a, run_b, include_unchanged),
+                unpaired_queries(conn, run_a, run_b),
+            )
+            reader.close()
+            return HTMLResponse(html)
+    except BaseException:
+        reader.close()
+        raise
+
+    def stream_deltas():
+        try:
+            for delta in diff_runs(conn, run_a, run_b, include_unchanged):
+                yield serialization.dumps_bytes(delta.to_dict()) + b"\n"
+        finally:
+            reader.close()
+
+    return StreamingResponse(stream_deltas(), media_type="application/x-ndjson")
+
+
 @app.get("/results/{run_id}")
 async def get_run_results(run_id: str):
-    import json
     # Determine SQLite DB path based on typical output location
     # In a real app, this might come from a config or be passed from the run_watcher call
     sqlite_db_path = "./output/watcher.db" 
 
     try:
         init_db_if_needed(sqlite_db_path) # Ensure DB is initialized
-        with sqlite3.connect(sqlite_db_path) as conn:
+        with read_connection(sqlite_db_path) as conn:
             conn.row_factory = sqlite3.Row # To access columns by name
 
             run_summary = get_run_summary(conn, run_id)
             if not run_summary:
                 raise HTTPException(status_code=404, detail=f"Run with ID '{run_id}' not found.")
             
-            # Fetch raw answers
-            answers_cursor = conn.execute(
-                """
-                SELECT intent_id, prompt, answer_text, model_name, estimated_cost_usd, usage_meta_json
-                FROM answers_raw
-                WHERE run_id = ?
-                """,
-                (run_id,)
-            )
-            raw_answers = answers_cursor.fetchall()
+            # Fetch raw answers (texts resolved from answer_blobs)
+            raw_answers = get_answers_raw(conn, run_id)
 
             # Fetch mentions
             mentions_cursor = conn.execute(
@@ -344,8 +477,8 @@ async def get_run_results(run_id: str):
                 usage_meta = {}
                 if answer['usage_meta_json']:
                     try:
-                        usage_meta = json.loads(answer['usage_meta_json'])
-                    except (json.JSONDecodeError, TypeError):
+                        usage_meta = serialization.loads(answer['usage_meta_json'])
+                    except (ValueError, TypeError):
                         pass # Keep usage_meta empty if parsing fails
 
                 answer_obj = {
@@ -372,10 +505,11 @@ async def get_run_results(run_id: str):
                         "context": mention['mention_context']
                     })
             
-            return {
+            # Plain JSON types: skip FastAPI's jsonable_encoder pass
+            return FastJSONResponse({
                 "run_summary": dict(run_summary),
                 "intents_data": list(intents_data.values())
-            }
+            })
 
     except sqlite3.Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
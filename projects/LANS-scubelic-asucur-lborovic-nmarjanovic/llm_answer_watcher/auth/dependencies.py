@@ -1,11 +1,12 @@
 """FastAPI dependencies for authentication."""
 
-import sqlite3
+import os
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from llm_answer_watcher.auth.security import decode_token
+from llm_answer_watcher.storage.connection import read_connection
 from llm_answer_watcher.storage.db import get_user_by_id, init_db_if_needed
 
 # HTTP Bearer token security scheme
@@ -73,7 +74,7 @@ async def get_current_user(
     # Fetch user from database
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with read_connection(db_path) as conn:
         user = get_user_by_id(conn, user_id)
 
     if user is None:
@@ -121,3 +122,39 @@ async def get_current_active_user(
         but it provides a more explicit dependency name for routes.
     """
     return current_user
+
+
+def get_admin_usernames() -> set[str]:
+    """
+    Usernames allowed to use admin routes.
+
+    Read from the comma-separated ADMIN_USERNAMES environment variable.
+    Can be overridden for testing.
+    """
+    names = os.environ.get("ADMIN_USERNAMES", "").split(",")
+    return {name.strip() for name in names if name.strip()}
+
+
+async def get_admin_user(
+    current_user: dict = Depends(get_current_user),
+    admin_usernames: set[str] = Depends(get_admin_usernames),
+) -> dict:
+    """
+    FastAPI dependency that only lets admin users through.
+
+    Args:
+        current_user: User from get_current_user dependency
+        admin_usernames: Usernames with admin rights
+
+    Returns:
+        The current user dict
+
+    Raises:
+        HTTPException 403: If the user is not an admin
+    """
+    if current_user["username"] not in admin_usernames:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
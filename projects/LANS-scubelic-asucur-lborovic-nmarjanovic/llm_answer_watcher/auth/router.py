@@ -2,7 +2,6 @@
 
 import hashlib
 import logging
-import sqlite3
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -26,6 +25,7 @@ from llm_answer_watcher.auth.security import (
     hash_password,
     verify_password,
 )
+from llm_answer_watcher.storage.connection import read_connection, write_connection
 from llm_answer_watcher.storage.db import (
     create_user,
     create_user_api_key,
@@ -79,7 +79,7 @@ async def register(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         # Check if username already exists
         existing_user = get_user_by_username(conn, user_data.username)
         if existing_user:
@@ -136,7 +136,7 @@ async def login(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         # Try to find user by username or email
         user = get_user_by_username(conn, credentials.username)
         if user is None:
@@ -229,7 +229,7 @@ async def refresh_tokens(
 
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         # Verify refresh token exists and is not revoked
         stored_token = get_refresh_token(conn, token_hash)
         if stored_token is None:
@@ -298,7 +298,7 @@ async def logout(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         revoked_count = revoke_all_user_refresh_tokens(conn, current_user["id"])
 
     logger.info(f"User logged out: {current_user['username']} (revoked {revoked_count} tokens)")
@@ -344,7 +344,7 @@ async def update_me(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         # Check if username exists if being updated
         if user_update.username and user_update.username != current_user["username"]:
             existing = get_user_by_username(conn, user_update.username)
@@ -415,7 +415,7 @@ async def add_api_key(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         # Check if key already exists for this provider/name
         existing = get_user_api_key_by_provider(
             conn, current_user["id"], key_data.provider, key_data.key_name
@@ -466,7 +466,7 @@ async def list_api_keys(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with read_connection(db_path) as conn:
         keys = get_user_api_keys(conn, current_user["id"])
 
     return [
@@ -492,7 +492,7 @@ async def get_api_key_details(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with read_connection(db_path) as conn:
         key_record = get_user_api_key_by_id(conn, key_id, current_user["id"])
 
     if key_record is None:
@@ -542,7 +542,7 @@ async def update_api_key(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         # Encrypt new key
         encrypted_key = encrypt_api_key(key_data.api_key)
 
@@ -597,7 +597,7 @@ async def remove_api_key(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         deleted = delete_user_api_key(conn, key_id, current_user["id"])
 
     if not deleted:
@@ -637,7 +637,7 @@ async def get_decrypted_api_key(
     """
     init_db_if_needed(db_path)
 
-    with sqlite3.connect(db_path) as conn:
+    with read_connection(db_path) as conn:
         key_record = get_user_api_key_by_provider(
             conn, current_user["id"], provider, key_name
         )
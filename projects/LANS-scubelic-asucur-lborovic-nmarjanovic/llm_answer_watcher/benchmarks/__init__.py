@@ -0,0 +1,26 @@
+"""
+Performance benchmark suite for LLM Answer Watcher.
+
+Measures throughput and resource usage of the pipeline's hot paths
+(run_all, extraction, database writes, report rendering) against mock
+providers, and compares results with a stored baseline to catch
+performance regressions.
+"""
+
+from .runner import (
+    compare_benchmark_results,
+    load_benchmark_results,
+    run_benchmark_suite,
+    write_benchmark_results,
+)
+from .schema import BenchmarkResult, Metric, MetricComparison
+
+__all__ = [
+    "BenchmarkResult",
+    "Metric",
+    "MetricComparison",
+    "compare_benchmark_results",
+    "load_benchmark_results",
+    "run_benchmark_suite",
+    "write_benchmark_results",
+]
@@ -0,0 +1,320 @@
+"""
+Benchmark runner for LLM Answer Watcher.
+
+Executes the parameterized benchmark suite, writes results to JSON, and
+compares a results file against a stored baseline to flag regressions.
+
+Results file layout:
+    {
+        "schema_version": 1,
+        "created_at": "2025-11-02T08:00:00Z",
+        "environment": {"python": "3.12.1", "platform": "...", ...},
+        "peak_rss_mb": 142.5,
+        "results": [
+            {
+                "scenario": "run_all",
+                "params": {"intents": 20, "models": 2, ...},
+                "metrics": {
+                    "queries_per_sec": {"value": 410.2, "unit": "queries/s",
+                                        "higher_is_better": true},
+                    ...
+                }
+            }
+        ]
+    }
+
+Example:
+    >>> report = run_benchmark_suite(quick=True)
+    >>> write_benchmark_results("bench/current.json", report)
+    >>> baseline = load_benchmark_results("bench/baseline.json")
+    >>> comparisons = compare_benchmark_results(baseline, report, threshold=0.10)
+    >>> [c.key for c in comparisons if c.regressed]
+    []
+"""
+
+import json
+import logging
+import os
+import platform
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from ..storage.writer import write_json
+from ..utils.time import utc_timestamp
+from .scenarios import SCENARIOS
+from .schema import (
+    BENCHMARK_SCHEMA_VERSION,
+    BenchmarkResult,
+    MetricComparison,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default relative change tolerated before a metric is flagged as regressed.
+# Wall-clock benchmarks on shared machines routinely vary by 5-10%.
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+# Full benchmark suite: (scenario, params) pairs
+DEFAULT_SUITE: list[tuple[str, dict]] = [
+    ("run_all", {"intents": 20, "models": 2, "latency_ms": 0, "concurrency": 10, "failure_rate": 0.0}),
+    ("run_all", {"intents": 20, "models": 2, "latency_ms": 20, "concurrency": 10, "failure_rate": 0.0}),
+    ("run_all", {"intents": 20, "models": 2, "latency_ms": 20, "concurrency": 10, "failure_rate": 0.2}),
+    ("run_all", {"intents": 50, "models": 2, "latency_ms": 20, "concurrency": 50, "failure_rate": 0.0}),
+    ("run_all", {"intents": 50, "models": 2, "latency_ms": 0, "concurrency": 10, "failure_rate": 0.0, "artifact_backend": "files"}),
+    ("run_all", {"intents": 50, "models": 2, "latency_ms": 0, "concurrency": 10, "failure_rate": 0.0, "artifact_backend": "packed"}),
+    ("extraction", {"brand_count": 5, "answer_chars": 1000}),
+    ("extraction", {"brand_count": 20, "answer_chars": 4000}),
+    ("extraction", {"brand_count": 100, "answer_chars": 4000}),
+    ("extraction", {"brand_count": 20, "answer_chars": 16000}),
+    ("db_inserts", {"answers": 200, "batched": False}),
+    ("db_inserts", {"answers": 200, "batched": True}),
+    ("report_render", {"intents": 20, "models": 2}),
+    ("http_client", {"provider": "google", "requests": 200, "concurrency": 20, "latency_ms": 0}),
+    ("http_client", {"provider": "groq", "requests": 200, "concurrency": 20, "latency_ms": 0}),
+    ("http_client", {"provider": "google", "requests": 200, "concurrency": 50, "latency_ms": 50}),
+    ("logging", {"records": 20000, "queued": False, "sampled": False}),
+    ("logging", {"records": 20000, "queued": True, "sampled": False}),
+    ("logging", {"records": 20000, "queued": True, "sampled": True}),
+    ("operations", {"answer_chars": 4000, "operations": 10}),
+    ("operations", {"answer_chars": 32000, "operations": 10}),
+    ("operations", {"answer_chars": 4000, "operations": 50}),
+    ("serialization", {"answers": 500, "answer_chars": 4000, "backend": "json"}),
+    ("serialization", {"answers": 500, "answer_chars": 4000, "backend": "orjson"}),
+]
+
+# Reduced suite for CI smoke checks and tests
+QUICK_SUITE: list[tuple[str, dict]] = [
+    ("run_all", {"intents": 4, "models": 2, "latency_ms": 0, "concurrency": 4, "failure_rate": 0.0}),
+    ("run_all", {"intents": 4, "models": 2, "latency_ms": 5, "concurrency": 4, "failure_rate": 0.25}),
+    ("extraction", {"brand_count": 5, "answer_chars": 1000}),
+    ("extraction", {"brand_count": 50, "answer_chars": 4000}),
+    ("db_inserts", {"answers": 20, "batched": False}),
+    ("db_inserts", {"answers": 20, "batched": True}),
+    ("report_render", {"intents": 4, "models": 2}),
+    ("http_client", {"provider": "google", "requests": 20, "concurrency": 5, "latency_ms": 0}),
+    ("http_client", {"provider": "groq", "requests": 20, "concurrency": 5, "latency_ms": 0}),
+    ("logging", {"records": 2000, "queued": True, "sampled": False}),
+    ("operations", {"answer_chars": 4000, "operations": 5}),
+    ("serialization", {"answers": 50, "answer_chars": 2000, "backend": "orjson"}),
+]
+
+
+def get_peak_rss_mb() -> float | None:
+    """
+    Return the peak resident set size of the current process in MB.
+
+    Returns:
+        Peak RSS in MB, or None on platforms without the resource module
+        (e.g., Windows)
+
+    Note:
+        ru_maxrss is reported in kilobytes on Linux and bytes on macOS.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def run_benchmark_suite(
+    scenarios: list[str] | None = None,
+    quick: bool = False,
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """
+    Run the benchmark suite and return a JSON-serializable results dict.
+
+    Args:
+        scenarios: Optional list of scenario names to run (default: all)
+        quick: Use the reduced QUICK_SUITE instead of DEFAULT_SUITE
+        repeat: Timing repetitions per scenario (median is reported)
+
+    Returns:
+        Results dict (see module docstring for layout)
+
+    Raises:
+        ValueError: If an unknown scenario name is requested or repeat < 1
+    """
+    if repeat < 1:
+        raise ValueError(f"repeat must be >= 1, got {repeat}")
+
+    if scenarios:
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise ValueError(
+                f"Unknown benchmark scenario(s): {sorted(unknown)}. "
+                f"Available: {sorted(SCENARIOS)}"
+            )
+
+    suite = QUICK_SUITE if quick else DEFAULT_SUITE
+    selected = [(name, params) for name, params in suite if not scenarios or name in scenarios]
+
+    # Benchmarks exercise code paths that log at INFO/ERROR per query
+    # (including injected chaos failures). Silence them so the output stays
+    # readable; log formatting cost is measured separately.
+    package_logger = logging.getLogger("llm_answer_watcher")
+    previous_level = package_logger.level
+    package_logger.setLevel(logging.CRITICAL)
+
+    results: list[BenchmarkResult] = []
+    try:
+        for name, params in selected:
+            result = BenchmarkResult(scenario=name, params=dict(params))
+            result.metrics = SCENARIOS[name](**params, repeat=repeat)
+            results.append(result)
+    finally:
+        package_logger.setLevel(previous_level)
+
+    return {
+        "schema_version": BENCHMARK_SCHEMA_VERSION,
+        "created_at": utc_timestamp(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick,
+            "repeat": repeat,
+        },
+        "peak_rss_mb": get_peak_rss_mb(),
+        "results": [{**asdict(r), "key": r.key} for r in results],
+    }
+
+
+def write_benchmark_results(filepath: str | Path, report: dict[str, Any]) -> None:
+    """
+    Write benchmark results to a JSON file (creating parent directories).
+
+    Args:
+        filepath: Destination path
+        report: Results dict from run_benchmark_suite()
+    """
+    Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+    write_json(str(filepath), report)
+
+
+def load_benchmark_results(filepath: str | Path) -> dict[str, Any]:
+    """
+    Load a benchmark results JSON file.
+
+    Args:
+        filepath: Path to a file written by write_benchmark_results()
+
+    Returns:
+        Results dict
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not a supported benchmark results file
+    """
+    path = Path(filepath)
+    if not path.exists():
+        raise FileNotFoundError(f"Benchmark results file not found: {path}")
+
+    with path.open(encoding="utf-8") as f:
+        data = json.load(f)
+
+    version = data.get("schema_version") if isinstance(data, dict) else None
+    if version != BENCHMARK_SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark results schema_version={version} in {path} "
+            f"(expected {BENCHMARK_SCHEMA_VERSION})"
+        )
+
+    return data
+
+
+def compare_benchmark_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> list[MetricComparison]:
+    """
+    Compare current benchmark results against a baseline.
+
+    Only scenarios and metrics present in both files are compared. Metrics
+    with higher_is_better=None are informational and never flagged. The
+    process-wide peak RSS is compared under the key "process".
+
+    Args:
+        baseline: Baseline results dict
+        current: Current results dict
+        threshold: Allowed relative change before flagging (0.10 = 10%)
+
+    Returns:
+        List of MetricComparison, one per comparable metric
+
+    Example:
+        >>> comparisons = compare_benchmark_results(baseline, current, 0.15)
+        >>> regressions = [c for c in comparisons if c.regressed]
+    """
+    if threshold < 0:
+        raise ValueError(f"threshold must be >= 0, got {threshold}")
+
+    baseline_results = {
+        r.key: r for r in map(BenchmarkResult.from_dict, baseline.get("results", []))
+    }
+    comparisons = []
+
+    for data in current.get("results", []):
+        result = BenchmarkResult.from_dict(data)
+        base = baseline_results.get(result.key)
+        if base is None:
+            logger.info(f"No baseline for benchmark {result.key}, skipping")
+            continue
+
+        for name, metric in result.metrics.items():
+            base_metric = base.metrics.get(name)
+            if base_metric is None or metric.higher_is_better is None:
+                continue
+            comparisons.append(
+                _compare_values(
+                    result.key,
+                    name,
+                    base_metric.value,
+                    metric.value,
+                    metric.higher_is_better,
+                    threshold,
+                )
+            )
+
+    base_rss = baseline.get("peak_rss_mb")
+    current_rss = current.get("peak_rss_mb")
+    if base_rss and current_rss:
+        comparisons.append(
+            _compare_values("process", "peak_rss_mb", base_rss, current_rss, False, threshold)
+        )
+
+    return comparisons
+
+
+def _compare_values(
+    key: str,
+    metric: str,
+    baseline: float,
+    current: float,
+    higher_is_better: bool,
+    threshold: float,
+) -> MetricComparison:
+    """Build a MetricComparison and decide whether it regressed."""
+    if baseline == 0:
+        change_pct = 0.0 if current == 0 else float("inf")
+    else:
+        change_pct = (current - baseline) / abs(baseline) * 100
+
+    regressed = change_pct < -threshold * 100 if higher_is_better else change_pct > threshold * 100
+
+    return MetricComparison(
+        key=key,
+        metric=metric,
+        baseline=baseline,
+        current=current,
+        change_pct=change_pct,
+        regressed=regressed,
+    )
@@ -0,0 +1,873 @@
+"""
+Benchmark scenarios for LLM Answer Watcher.
+
+Each scenario exercises one hot path of the pipeline with synthetic data and
+returns a dict of Metric objects. Scenarios never touch the network: LLM calls
+are served by MockLLMClient (optionally wrapped in ChaosLLMClient) or by the
+local fake provider server on 127.0.0.1, and remote pricing lookups are
+disabled so timings only reflect local work.
+
+Scenarios:
+    run_all: End-to-end queries/sec through run_all() with configurable
+        mock latency, concurrency and injected 429/timeout failures
+    extraction: parse_answer() throughput vs. brand count and answer length
+    db_inserts: answers_raw + mentions insert rate (per-row commit vs. batched)
+    report_render: generate_report() time for a completed run
+    http_client: Real GeminiClient/GroqClient requests/sec and latency
+        percentiles against the local fake provider server
+    logging: JSON log records/sec, queued (background listener) vs. inline,
+        with optional per-query sampling
+    operations: Operation prompt rendering and condition evaluation rate vs.
+        answer length and number of operations
+    serialization: JSON work of finalizing a run (database columns and
+        artifacts) and of the results endpoint, per JSON backend
+
+Example:
+    >>> from llm_answer_watcher.benchmarks.scenarios import SCENARIOS
+    >>> metrics = SCENARIOS["extraction"](brand_count=10, answer_chars=2000, repeat=3)
+    >>> metrics["answers_per_sec"].value > 0
+    True
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from ..config.schema import Brands, Intent, RunSettings, RuntimeConfig, RuntimeModel
+from ..extractor.parser import parse_answer
+from ..llm_runner.chaos_client import ChaosLLMClient
+from ..llm_runner.factory_cache import use_client_builder
+from ..llm_runner.fake_provider import FakeProviderConfig, FakeProviderServer
+from ..llm_runner.mock_client import MockLLMClient
+from ..llm_runner.models import build_client
+from ..llm_runner.operation_executor import (
+    OperationContext,
+    evaluate_condition,
+    render_template,
+)
+from ..llm_runner.runner import run_all
+from ..report.generator import generate_report
+from ..storage.connection import close_connection_pools, write_connection
+from ..storage.db import init_db_if_needed, insert_answer_raw, insert_mention, insert_run
+from ..storage.writer import write_json
+from ..utils import serialization
+from ..utils.logging import create_log_handler
+from ..utils.pricing import no_remote_pricing
+from ..utils.time import utc_timestamp
+from .schema import Metric
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+# Minimum wall time per timing round for micro-benchmarks (seconds).
+# Short operations are repeated until a round lasts at least this long so
+# timer resolution and scheduler noise don't dominate the measurement.
+MIN_ROUND_SECONDS = 0.2
+
+# Seed for synthetic data and chaos injection (reproducible runs)
+BENCHMARK_SEED = 1234
+
+# Filler sentence used to pad synthetic answers to the requested length
+_FILLER = (
+    "It offers solid deliverability features, a clean interface and "
+    "reasonable pricing for small teams evaluating their options. "
+)
+
+# Mentions inserted per answer in the db_inserts scenario
+_MENTIONS_PER_ANSWER = 5
+
+_BYTES_PER_MB = 1024 * 1024
+
+# Every Nth record in the logging scenario carries a bearer token to redact
+_LOG_SECRET_EVERY = 10
+
+# Prompt rendered per operation in the operations scenario; each operation
+# also receives the previous one's result via {operation:id}
+_OPERATION_PROMPT = (
+    "You analyze how {brand:mine} ({brand:mine_all}) ranks for {intent:id}.\n"
+    "Question: {intent:prompt}\n"
+    "Rank: {rank:mine}. Mentions: {mentions:mine}. Competitors mentioned: "
+    "{competitors:mentioned} (tracked: {brand:competitors}; all mentions: "
+    "{mentions:competitors}).\n"
+    "Answer from {model:provider}/{model:name} in run {run:id} ({run:timestamp}):\n"
+    "{intent:response}\n"
+)
+_OPERATION_CONDITIONS = [
+    "{rank:mine} > 1",
+    "{rank:mine} == null",
+    '{competitors:mentioned} contains "Toolmark002"',
+]
+
+# Model used per provider in the http_client scenario (must have pricing)
+_HTTP_BENCH_MODELS = {
+    "google": "gemini-2.5-flash",
+    "groq": "llama-3.1-8b-instant",
+}
+
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+
+def make_brand_names(count: int) -> list[str]:
+    """
+    Generate deterministic, word-boundary-safe brand names.
+
+    Args:
+        count: Number of brand names to generate
+
+    Returns:
+        List of names like ["Toolmark000", "Toolmark001", ...]
+    """
+    return [f"Toolmark{i:03d}" for i in range(count)]
+
+
+def make_answer(brands: list[str], answer_chars: int) -> str:
+    """
+    Build a synthetic LLM answer with a numbered list of brands.
+
+    The answer starts with an introduction, lists every brand as a numbered
+    item followed by filler text, and is padded/truncated to answer_chars.
+
+    Args:
+        brands: Brand names to mention in ranked order
+        answer_chars: Target answer length in characters
+
+    Returns:
+        Answer text of exactly answer_chars characters (when answer_chars is
+        larger than the ranked list itself)
+    """
+    lines = ["Here are the best tools for your use case:", ""]
+    for position, brand in enumerate(brands, start=1):
+        lines.append(f"{position}. **{brand}** - {_FILLER.strip()}")
+
+    text = "\n".join(lines) + "\n\n"
+    while len(text) < answer_chars:
+        text += _FILLER
+
+    return text[: max(answer_chars, len("\n".join(lines)))]
+
+
+def build_benchmark_config(
+    output_dir: str,
+    db_path: str,
+    intents: int,
+    models: int,
+    concurrency: int,
+    brand_count: int = 10,
+    artifact_backend: str = "files",
+) -> RuntimeConfig:
+    """
+    Build a RuntimeConfig for benchmark runs against mock providers.
+
+    Args:
+        output_dir: Output directory for run artifacts
+        db_path: SQLite database path
+        intents: Number of intents
+        models: Number of models queried per intent
+        concurrency: max_concurrent_requests for the run
+        brand_count: Total number of brands (1 mine + competitors)
+        artifact_backend: "files" or "packed" artifact storage
+
+    Returns:
+        RuntimeConfig with intents x models queries and provider "mock"
+    """
+    brands = make_brand_names(max(brand_count, 1))
+
+    return RuntimeConfig(
+        run_settings=RunSettings(
+            output_dir=output_dir,
+            sqlite_db_path=db_path,
+            max_concurrent_requests=concurrency,
+            artifact_backend=artifact_backend,
+        ),
+        brands=Brands(mine=brands[:1], competitors=brands[1:]),
+        intents=[
+            Intent(id=f"bench-intent-{i:03d}", prompt=f"What are the best tools? ({i})")
+            for i in range(intents)
+        ],
+        models=[
+            RuntimeModel(
+                provider="mock",
+                model_name=f"mock-model-{i}",
+                api_key="benchmark-key",
+            )
+            for i in range(models)
+        ],
+    )
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+
+@contextmanager
+def mock_llm_stack(
+    answer_text: str,
+    latency_ms: float = 0.0,
+    failure_rate: float = 0.0,
+    streaming_chunk_size: int | None = None,
+) -> Iterator[None]:
+    """
+    Route run_all() through MockLLMClient and disable remote pricing lookups.
+
+    Failures are split evenly between injected 429 rate limits and timeouts.
+
+    Args:
+        answer_text: Answer returned by every mock client
+        latency_ms: Simulated provider latency per request
+        failure_rate: Fraction of requests that fail (0.0-1.0)
+        streaming_chunk_size: Chunk size of streamed answers (None: the
+            mock answers at once even when asked to stream)
+    """
+
+    def _client_factory(provider: str, model_name: str, **_kwargs):
+        client = MockLLMClient(
+            default_response=answer_text,
+            provider=provider,
+            model_name=model_name,
+            latency_ms=latency_ms,
+            latency_jitter_ms=latency_ms * 0.2,
+            tokens_per_response=650,
+            cost_per_response=0.0001,
+            streaming_chunk_size=streaming_chunk_size,
+            streaming_delay_ms=0,
+        )
+        if failure_rate <= 0:
+            return client
+        # Seed is applied once per scenario; a per-client seed would reset
+        # the global RNG and make every query fail (or succeed) identically.
+        return ChaosLLMClient(
+            base_client=client,
+            success_rate=1.0 - failure_rate,
+            rate_limit_prob=0.5,
+            server_error_prob=0.0,
+            timeout_prob=0.5,
+            auth_error_prob=0.0,
+        )
+
+    with use_client_builder(_client_factory), no_remote_pricing():
+        yield
+
+
+def _median_round(fn: Callable[[], object], repeat: int) -> float:
+    """
+    Return median seconds per call of fn across repeat timing rounds.
+
+    Each round calls fn until at least MIN_ROUND_SECONDS have elapsed.
+    """
+    samples = []
+    for _ in range(max(repeat, 1)):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_ROUND_SECONDS:
+                break
+        samples.append(elapsed / calls)
+    return statistics.median(samples)
+
+
+def _peak_allocated_mb(fn: Callable[[], object]) -> float:
+    """Run fn once under tracemalloc and return peak Python heap usage in MB."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / _BYTES_PER_MB
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of values (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(max(math.ceil(pct / 100 * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[index]
+
+
+def _run_all_once(config: RuntimeConfig) -> dict:
+    """Initialize the database and execute run_all() synchronously."""
+    init_db_if_needed(config.run_settings.sqlite_db_path)
+    return asyncio.run(run_all(config))
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+
+def bench_run_all(
+    intents: int = 20,
+    models: int = 2,
+    latency_ms: float = 0.0,
+    concurrency: int = 10,
+    failure_rate: float = 0.0,
+    brand_count: int = 10,
+    answer_chars: int = 2000,
+    artifact_backend: str = "files",
+    repeat: int = 3,
+) -> dict[str, Metric]:
+    """
+    Measure end-to-end run_all() throughput against mock providers.
+
+    Every repetition uses a fresh output directory and database so runs
+    don't collide on run_id or UNIQUE constraints.
+
+    Returns:
+        Metrics: queries_per_sec, wall_ms, error_rate, peak_alloc_mb,
+                 clients_built (clients constructed per run by the factory cache)
+    """
+    random.seed(BENCHMARK_SEED)
+    answer = make_answer(make_brand_names(brand_count), answer_chars)
+    wall_times = []
+    error_rates = []
+
+    def _one_run() -> dict:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = build_benchmark_config(
+                output_dir=str(Path(tmp) / "output"),
+                db_path=str(Path(tmp) / "bench.db"),
+                intents=intents,
+                models=models,
+                concurrency=concurrency,
+                brand_count=brand_count,
+                artifact_backend=artifact_backend,
+            )
+            init_db_if_needed(config.run_settings.sqlite_db_path)
+            start = time.perf_counter()
+            result = asyncio.run(run_all(config))
+            wall_times.append(time.perf_counter() - start)
+            return result
+
+    with mock_llm_stack(answer, latency_ms=latency_ms, failure_rate=failure_rate):
+        for _ in range(max(repeat, 1)):
+            result = _one_run()
+            error_rates.append(result["error_count"] / max(result["total_queries"], 1))
+        timed = list(wall_times)
+        peak_mb = _peak_allocated_mb(_one_run)
+
+    wall = statistics.median(timed)
+    total_queries = intents * models
+
+    return {
+        "queries_per_sec": Metric(total_queries / wall, "queries/s", True),
+        "wall_ms": Metric(wall * 1000, "ms", False),
+        "error_rate": Metric(statistics.mean(error_rates), "ratio", None),
+        "peak_alloc_mb": Metric(peak_mb, "MB", False),
+        "clients_built": Metric(result["factory_cache"]["client_misses"], "clients", False),
+    }
+
+
+def bench_extraction(
+    brand_count: int = 10,
+    answer_chars: int = 2000,
+    repeat: int = 3,
+) -> dict[str, Metric]:
+    """
+    Measure regex extraction (parse_answer) throughput.
+
+    Returns:
+        Metrics: answers_per_sec, chars_per_sec, ms_per_answer
+    """
+    brand_names = make_brand_names(brand_count)
+    brands = Brands(mine=brand_names[:1], competitors=brand_names[1:])
+    answer = make_answer(brand_names, answer_chars)
+    timestamp = utc_timestamp()
+
+    loop = asyncio.new_event_loop()
+    try:
+
+        def _parse():
+            return loop.run_until_complete(
+                parse_answer(
+                    answer_text=answer,
+                    brands=brands,
+                    intent_id="bench-intent",
+                    provider="mock",
+                    model_name="mock-model",
+                    timestamp_utc=timestamp,
+                )
+            )
+
+        seconds = _median_round(_parse, repeat)
+    finally:
+        loop.close()
+
+    return {
+        "answers_per_sec": Metric(1 / seconds, "answers/s", True),
+        "chars_per_sec": Metric(len(answer) / seconds, "chars/s", True),
+        "ms_per_answer": Metric(seconds * 1000, "ms", False),
+    }
+
+
+def bench_db_inserts(
+    answers: int = 200,
+    batched: bool = False,
+    repeat: int = 3,
+) -> dict[str, Metric]:
+    """
+    Measure answers_raw + mentions insert rate.
+
+    Rows go through the connection pool's writer (storage.connection). With
+    batched=False every row is its own write transaction and commit; with
+    batched=True all rows share a single transaction.
+
+    Returns:
+        Metrics: rows_per_sec, wall_ms
+    """
+    brands = make_brand_names(_MENTIONS_PER_ANSWER)
+    timestamp = utc_timestamp()
+    run_id = "2025-01-01T00-00-00Z"
+    total_rows = answers * (1 + _MENTIONS_PER_ANSWER)
+    wall_times = []
+
+    def _insert_answer(conn: sqlite3.Connection, i: int) -> None:
+        insert_answer_raw(
+            conn=conn,
+            run_id=run_id,
+            intent_id=f"bench-intent-{i:04d}",
+            model_provider="mock",
+            model_name="mock-model",
+            timestamp_utc=timestamp,
+            prompt="What are the best tools?",
+            answer_text=_FILLER * 10,
+            usage_meta_json='{"prompt_tokens": 150, "completion_tokens": 500}',
+            estimated_cost_usd=0.0001,
+        )
+
+    def _insert_mention(conn: sqlite3.Connection, i: int, position: int) -> None:
+        insert_mention(
+            conn=conn,
+            run_id=run_id,
+            timestamp_utc=timestamp,
+            intent_id=f"bench-intent-{i:04d}",
+            model_provider="mock",
+            model_name="mock-model",
+            brand_name=brands[position],
+            normalized_name=brands[position].lower(),
+            is_mine=position == 0,
+            rank_position=position + 1,
+        )
+
+    for _ in range(max(repeat, 1)):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp) / "bench.db")
+            init_db_if_needed(db_path)
+            with write_connection(db_path) as conn:
+                insert_run(conn, run_id, timestamp, answers, 1)
+
+            start = time.perf_counter()
+            if batched:
+                with write_connection(db_path) as conn:
+                    for i in range(answers):
+                        _insert_answer(conn, i)
+                        for position in range(_MENTIONS_PER_ANSWER):
+                            _insert_mention(conn, i, position)
+            else:
+                for i in range(answers):
+                    with write_connection(db_path) as conn:
+                        _insert_answer(conn, i)
+                    for position in range(_MENTIONS_PER_ANSWER):
+                        with write_connection(db_path) as conn:
+                            _insert_mention(conn, i, position)
+            wall_times.append(time.perf_counter() - start)
+            # Release the temporary database before it is deleted
+            close_connection_pools()
+
+    wall = statistics.median(wall_times)
+    return {
+        "rows_per_sec": Metric(total_rows / wall, "rows/s", True),
+        "wall_ms": Metric(wall * 1000, "ms", False),
+    }
+
+
+def bench_report_render(
+    intents: int = 20,
+    models: int = 2,
+    repeat: int = 3,
+) -> dict[str, Metric]:
+    """
+    Measure HTML report rendering time for a completed mock run.
+
+    The run itself is executed once as setup and is not part of the timing.
+
+    Returns:
+        Metrics: ms_per_render, html_kb, peak_alloc_mb
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        config = build_benchmark_config(
+            output_dir=str(Path(tmp) / "output"),
+            db_path=str(Path(tmp) / "bench.db"),
+            intents=intents,
+            models=models,
+            concurrency=10,
+        )
+        answer = make_answer(make_brand_names(10), 2000)
+        with mock_llm_stack(answer):
+            summary = _run_all_once(config)
+
+        results = [
+            {
+                "intent_id": intent.id,
+                "provider": model.provider,
+                "model_name": model.model_name,
+                "status": "success",
+                "cost_usd": 0.0001,
+                "timestamp_utc": summary["timestamp_utc"],
+            }
+            for intent in config.intents
+            for model in config.models
+        ]
+
+        def _render() -> str:
+            return generate_report(
+                summary["output_dir"], summary["run_id"], config, results
+            )
+
+        html = _render()
+        seconds = _median_round(_render, repeat)
+        peak_mb = _peak_allocated_mb(_render)
+
+    return {
+        "ms_per_render": Metric(seconds * 1000, "ms", False),
+        "html_kb": Metric(len(html.encode("utf-8")) / 1024, "KB", None),
+        "peak_alloc_mb": Metric(peak_mb, "MB", False),
+    }
+
+
+def bench_http_client(
+    provider: str = "google",
+    requests: int = 100,
+    concurrency: int = 10,
+    latency_ms: float = 0.0,
+    repeat: int = 3,
+) -> dict[str, Metric]:
+    """
+    Measure the real provider client stack against the local fake server.
+
+    Exercises client construction, httpx connection setup, retry wrapper,
+    JSON encoding/decoding and cost estimation. Each request uses a freshly
+    built client, the worst case for code outside a run's factory cache.
+
+    Returns:
+        Metrics: requests_per_sec, p50_ms, p95_ms, error_rate
+    """
+    if provider not in _HTTP_BENCH_MODELS:
+        raise ValueError(
+            f"http_client provider must be one of {sorted(_HTTP_BENCH_MODELS)}, "
+            f"got: {provider}"
+        )
+
+    server_config = FakeProviderConfig(
+        answer_text=make_answer(make_brand_names(10), 2000),
+        latency_ms=latency_ms,
+        latency_jitter_ms=latency_ms * 0.2,
+        seed=BENCHMARK_SEED,
+    )
+    wall_times = []
+    latencies_ms: list[float] = []
+    errors = 0
+
+    with FakeProviderServer(server_config) as server, no_remote_pricing():
+        base_url = server.gemini_base_url if provider == "google" else server.groq_base_url
+
+        async def _one_request(semaphore: asyncio.Semaphore) -> bool:
+            async with semaphore:
+                client = build_client(
+                    provider=provider,
+                    model_name=_HTTP_BENCH_MODELS[provider],
+                    api_key="benchmark-key",
+                    system_prompt="You are a helpful assistant.",
+                    base_url=base_url,
+                )
+                start = time.perf_counter()
+                try:
+                    await client.generate_answer("What are the best tools?")
+                    return True
+                except Exception:
+                    return False
+                finally:
+                    latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        async def _one_round() -> list[bool]:
+            semaphore = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(*(_one_request(semaphore) for _ in range(requests)))
+
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            outcomes = asyncio.run(_one_round())
+            wall_times.append(time.perf_counter() - start)
+            errors += outcomes.count(False)
+
+    wall = statistics.median(wall_times)
+
+    return {
+        "requests_per_sec": Metric(requests / wall, "requests/s", True),
+        "p50_ms": Metric(_percentile(latencies_ms, 50), "ms", False),
+        "p95_ms": Metric(_percentile(latencies_ms, 95), "ms", False),
+        "error_rate": Metric(errors / (requests * max(repeat, 1)), "ratio", None),
+    }
+
+
+def bench_logging(
+    records: int = 5000,
+    queued: bool = True,
+    sampled: bool = False,
+    repeat: int = 3,
+) -> dict[str, Metric]:
+    """
+    Measure log records/sec through the JSON logging pipeline.
+
+    Records look like run_all()'s per-query logs (f-string message plus
+    context), and every _LOG_SECRET_EVERY-th one contains a bearer token
+    for the redaction filter. Output is written to os.devnull.
+
+    Args:
+        records: Records logged per repetition
+        queued: Use the QueueHandler/QueueListener pipeline (setup_logging's
+            default) instead of formatting on the calling thread
+        sampled: Tag records with a sample_key so QueryLogSampler applies
+
+    Returns:
+        Metrics: emit_records_per_sec (time spent on the calling thread, i.e.
+                 what the event loop pays), records_per_sec (until every
+                 record is written), emit_us_per_record
+    """
+    logger = logging.getLogger("llm_answer_watcher.benchmarks.logging")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    emit_times = []
+    total_times = []
+
+    with open(os.devnull, "w") as sink:
+        for _ in range(max(repeat, 1)):
+            handler, listener = create_log_handler(sink, queued=queued, sample=sampled)
+            logger.addHandler(handler)
+            try:
+                start = time.perf_counter()
+                for i in range(records):
+                    extra = {"context": {"intent_id": f"bench-intent-{i:04d}", "tokens": 650}}
+                    if sampled:
+                        extra["sample_key"] = "query.success"
+                    secret = ""
+                    if i % _LOG_SECRET_EVERY == 0:
+                        secret = f", auth=Bearer {'x' * 24}{i:04d}"
+                    logger.info(
+                        f"Success: intent=bench-intent-{i:04d}, provider=mock, "
+                        f"model=mock-model, cost=${0.0001:.6f}, appeared_mine=True{secret}",
+                        extra=extra,
+                    )
+                emit_times.append(time.perf_counter() - start)
+                if listener is not None:
+                    listener.stop()
+                total_times.append(time.perf_counter() - start)
+            finally:
+                logger.removeHandler(handler)
+
+    emit = statistics.median(emit_times)
+    total = statistics.median(total_times)
+    return {
+        "emit_records_per_sec": Metric(records / emit, "records/s", True),
+        "records_per_sec": Metric(records / total, "records/s", True),
+        "emit_us_per_record": Metric(emit / records * 1_000_000, "us", False),
+    }
+
+
+def bench_operations(
+    answer_chars: int = 4000,
+    operations: int = 10,
+    repeat: int = 3,
+) -> dict[str, Metric]:
+    """
+    Measure operation prompt rendering and condition evaluation.
+
+    Renders one intent's chain of operations: each prompt uses every
+    template variable, including the full answer, and the result of the
+    previous operation.
+
+    Args:
+        answer_chars: Length of the answer substituted for {intent:response}
+        operations: Operations rendered per intent
+        repeat: Timing repetitions (median is reported)
+
+    Returns:
+        Metrics: prompts_per_sec, chars_per_sec (rendered prompt text),
+                 conditions_per_sec, us_per_condition
+    """
+    brand_names = make_brand_names(10)
+    answer = make_answer(brand_names, answer_chars)
+    context = OperationContext(
+        intent_data={
+            "id": "bench-intent",
+            "prompt": "What are the best tools?",
+            "response": answer,
+        },
+        extraction_data={
+            "my_brand": brand_names[0],
+            "my_brand_aliases": brand_names[:1],
+            "competitors": brand_names[1:],
+            "competitors_mentioned": brand_names[1:],
+            "my_rank": 1,
+            "my_mentions": brand_names[:1],
+            "competitor_mentions": brand_names[1:],
+        },
+        run_metadata={"run_id": "2025-11-02T08-00-00Z", "timestamp": "2025-11-02T08:00:00Z"},
+        model_info={"provider": "mock", "name": "mock-model"},
+        operation_results={f"bench-op-{i:03d}": _FILLER for i in range(operations)},
+    )
+    prompts = [
+        _OPERATION_PROMPT + (f"Previous analysis: {{operation:bench-op-{i - 1:03d}}}" if i else "")
+        for i in range(operations)
+    ]
+
+    def _render():
+        return [render_template(prompt, context) for prompt in prompts]
+
+    def _evaluate():
+        return [evaluate_condition(condition, context) for condition in _OPERATION_CONDITIONS]
+
+    rendered_chars = sum(len(prompt) for prompt in _render())
+    seconds = _median_round(_render, repeat)
+    condition_seconds = _median_round(_evaluate, repeat) / len(_OPERATION_CONDITIONS)
+
+    return {
+        "prompts_per_sec": Metric(operations / seconds, "prompts/s", True),
+        "chars_per_sec": Metric(rendered_chars / seconds, "chars/s", True),
+        "conditions_per_sec": Metric(1 / condition_seconds, "conditions/s", True),
+        "us_per_condition": Metric(condition_seconds * 1_000_000, "us", False),
+    }
+
+
+def bench_serialization(
+    answers: int = 500,
+    answer_chars: int = 4000,
+    backend: str = serialization.BACKEND_ORJSON,
+    repeat: int = 3,
+) -> dict[str, Metric]:
+    """
+    Measure the JSON work of finalizing a run and serving its results.
+
+    Finalize: per answer, the usage metadata and web search results columns
+    and the raw answer artifact (pretty-printed, like run_all() writes it),
+    then run_meta.json with every answer's result. Results: decoding every
+    answer's usage metadata and encoding the /results/{run_id} payload.
+    Comparing the "json" and "orjson" backends gives the before/after of the
+    serialization layer.
+
+    Args:
+        answers: Answers in the run
+        answer_chars: Length of each answer
+        backend: JSON backend ("json" or "orjson"; the stdlib is measured
+            when orjson is not installed)
+        repeat: Timing repetitions (median is reported)
+
+    Returns:
+        Metrics: finalize_ms, results_ms, results_kb
+    """
+    brand_names = make_brand_names(10)
+    answer = make_answer(brand_names, answer_chars)
+    usage_meta = {"prompt_tokens": 150, "completion_tokens": 500, "total_tokens": 650}
+    web_search_results = [
+        {"title": f"{brand} review", "url": f"https://example.com/{brand.lower()}"}
+        for brand in brand_names
+    ]
+    records = [
+        {
+            "intent_id": f"bench-intent-{i:04d}",
+            "provider": "mock",
+            "model_name": "mock-model",
+            "answer_text": answer,
+            "usage_meta": usage_meta,
+            "estimated_cost_usd": 0.0001,
+            "web_search_results": web_search_results,
+        }
+        for i in range(answers)
+    ]
+    rows = [
+        {
+            "intent_id": record["intent_id"],
+            "prompt": "What are the best tools?",
+            "model_name": record["model_name"],
+            "answer_text": answer,
+            "estimated_cost_usd": 0.0001,
+            "usage_meta_json": json.dumps(usage_meta),
+        }
+        for record in records
+    ]
+
+    if backend == serialization.BACKEND_ORJSON and serialization.orjson is None:
+        backend = serialization.BACKEND_STDLIB
+    previous = serialization.set_backend(backend)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+
+            def _finalize() -> None:
+                for i, record in enumerate(records):
+                    serialization.dumps(record["usage_meta"])
+                    serialization.dumps(record["web_search_results"])
+                    write_json(os.path.join(tmp, f"answer_{i:04d}.json"), record)
+                write_json(
+                    os.path.join(tmp, "run_meta.json"),
+                    {"run_id": "2025-11-02T08-00-00Z", "results": records},
+                )
+
+            def _results() -> bytes:
+                answers_data = [
+                    {
+                        "answer": row["answer_text"],
+                        "model": row["model_name"],
+                        "cost_usd": row["estimated_cost_usd"],
+                        "mentions": [],
+                        "usage": serialization.loads(row["usage_meta_json"]),
+                    }
+                    for row in rows
+                ]
+                run_summary = {"run_id": "2025-11-02T08-00-00Z"}
+                return serialization.dumps_bytes(
+                    {"run_summary": run_summary, "intents_data": answers_data}
+                )
+
+            finalize_seconds = _median_round(_finalize, repeat)
+            payload = _results()
+            results_seconds = _median_round(_results, repeat)
+    finally:
+        serialization.set_backend(previous)
+
+    return {
+        "finalize_ms": Metric(finalize_seconds * 1000, "ms", False),
+        "results_ms": Metric(results_seconds * 1000, "ms", False),
+        "results_kb": Metric(len(payload) / 1024, "KB", None),
+    }
+
+
+# Registry of scenario name -> scenario function.
+# Every function accepts its parameters plus `repeat` as keyword arguments.
+SCENARIOS: dict[str, Callable[..., dict[str, Metric]]] = {
+    "run_all": bench_run_all,
+    "extraction": bench_extraction,
+    "db_inserts": bench_db_inserts,
+    "report_render": bench_report_render,
+    "http_client": bench_http_client,
+    "logging": bench_logging,
+    "operations": bench_operations,
+    "serialization": bench_serialization,
+}
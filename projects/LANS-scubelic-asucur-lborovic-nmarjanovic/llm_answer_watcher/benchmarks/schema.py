@@ -0,0 +1,95 @@
+"""
+Data models for the LLM Answer Watcher benchmark suite.
+
+Benchmark results are plain dataclasses so they serialize directly to the
+JSON results file via dataclasses.asdict() and can be rebuilt from it when
+comparing against a stored baseline.
+
+Example:
+    >>> result = BenchmarkResult(
+    ...     scenario="extraction",
+    ...     params={"brand_count": 10, "answer_chars": 2000},
+    ...     metrics={"ops_per_sec": Metric(value=850.0, unit="ops/s", higher_is_better=True)},
+    ... )
+    >>> result.key
+    'extraction[answer_chars=2000,brand_count=10]'
+"""
+
+from dataclasses import dataclass, field
+
+# Version of the benchmark results JSON layout.
+# Bump when the structure changes in a way compare_benchmark_results() must handle.
+BENCHMARK_SCHEMA_VERSION = 1
+
+
+@dataclass
+class Metric:
+    """
+    Single measured value from a benchmark scenario.
+
+    Attributes:
+        value: Measured value (median across repetitions for timings)
+        unit: Human-readable unit (e.g., "ops/s", "ms", "MB")
+        higher_is_better: Direction used for regression detection.
+            True for throughput, False for latency/memory, None for
+            informational metrics that are never flagged (e.g., error rate).
+    """
+
+    value: float
+    unit: str
+    higher_is_better: bool | None = False
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Result of one parameterized benchmark scenario.
+
+    Attributes:
+        scenario: Scenario name from the SCENARIOS registry (e.g., "run_all")
+        params: Parameters the scenario was executed with
+        metrics: Measured metrics keyed by metric name
+    """
+
+    scenario: str
+    params: dict
+    metrics: dict[str, Metric] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used to match results across benchmark files."""
+        param_str = ",".join(f"{k}={self.params[k]}" for k in sorted(self.params))
+        return f"{self.scenario}[{param_str}]"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BenchmarkResult":
+        """Rebuild a BenchmarkResult from its asdict() representation."""
+        return cls(
+            scenario=data["scenario"],
+            params=data.get("params", {}),
+            metrics={
+                name: Metric(**metric) for name, metric in data.get("metrics", {}).items()
+            },
+        )
+
+
+@dataclass
+class MetricComparison:
+    """
+    Comparison of one metric between a baseline and a current benchmark run.
+
+    Attributes:
+        key: BenchmarkResult.key of the scenario
+        metric: Metric name
+        baseline: Baseline value
+        current: Current value
+        change_pct: Relative change in percent ((current - baseline) / baseline * 100)
+        regressed: True if the change is worse than the allowed threshold
+    """
+
+    key: str
+    metric: str
+    baseline: float
+    current: float
+    change_pct: float
+    regressed: bool
@@ -11,6 +11,9 @@ Commands:
     validate: Validate configuration without running queries
     eval: Run evaluation suite to test extraction accuracy
     prices: Manage LLM pricing data (show, refresh, list)
+    diff: Compare brand visibility between two runs
+    db: Database maintenance (compact)
+    bench: Run performance benchmarks and compare against a baseline
 
 Exit codes:
     0: Success - all queries successful
@@ -38,28 +41,18 @@ Security:
     - All exceptions are caught and formatted appropriately
 """
 
-import asyncio
 import json
+import sys
 from contextlib import nullcontext
 from pathlib import Path
 
 import typer
-from rich.traceback import install as install_rich_traceback
 
-from llm_answer_watcher.config.loader import load_config
-from llm_answer_watcher.evals.runner import run_eval_suite
 from llm_answer_watcher.exceptions import (
     APIKeyMissingError,
     ConfigFileNotFoundError,
     ConfigValidationError,
 )
-from llm_answer_watcher.llm_runner.runner import estimate_run_cost, run_all
-from llm_answer_watcher.report.generator import write_report
-from llm_answer_watcher.storage.db import init_db_if_needed
-from llm_answer_watcher.storage.eval_db import (
-    init_eval_db_if_needed,
-    store_eval_results,
-)
 from llm_answer_watcher.storage.layout import get_parsed_answer_filename
 from llm_answer_watcher.utils.console import (
     create_progress_bar,
@@ -76,12 +69,102 @@ from llm_answer_watcher.utils.console import (
 )
 from llm_answer_watcher.utils.logging import setup_logging
 
-# Install Rich tracebacks for better error messages
-install_rich_traceback(show_locals=False)
+# ============================================================================
+# LAZY IMPORTS
+# ============================================================================
+# Heavy dependencies (pydantic schemas, httpx, tenacity, rapidfuzz, jinja2)
+# are imported on first use so that `--help`, `validate` and `prices show`
+# don't pay for the whole stack. The module-level wrappers keep the names
+# patchable in tests (e.g. @patch("llm_answer_watcher.cli.run_all")).
+
+
+def load_config(*args, **kwargs):
+    """Load and validate configuration (lazy wrapper for config.loader)."""
+    from llm_answer_watcher.config.loader import load_config as _load_config
+
+    return _load_config(*args, **kwargs)
+
+
+def estimate_run_cost(*args, **kwargs):
+    """Estimate run cost (lazy wrapper for llm_runner.runner)."""
+    from llm_answer_watcher.llm_runner.runner import (
+        estimate_run_cost as _estimate_run_cost,
+    )
+
+    return _estimate_run_cost(*args, **kwargs)
+
+
+def run_all(*args, **kwargs):
+    """Create the run_all() coroutine (lazy wrapper for llm_runner.runner)."""
+    from llm_answer_watcher.llm_runner.runner import run_all as _run_all
+
+    return _run_all(*args, **kwargs)
+
+
+def write_report(*args, **kwargs):
+    """Render the HTML report (lazy wrapper for report.generator)."""
+    from llm_answer_watcher.report.generator import write_report as _write_report
+
+    return _write_report(*args, **kwargs)
+
+
+def init_db_if_needed(*args, **kwargs):
+    """Initialize the SQLite database (lazy wrapper for storage.db)."""
+    from llm_answer_watcher.storage.db import (
+        init_db_if_needed as _init_db_if_needed,
+    )
+
+    return _init_db_if_needed(*args, **kwargs)
+
+
+def run_eval_suite(*args, **kwargs):
+    """Run the evaluation suite (lazy wrapper for evals.runner)."""
+    from llm_answer_watcher.evals.runner import run_eval_suite as _run_eval_suite
+
+    return _run_eval_suite(*args, **kwargs)
+
+
+def init_eval_db_if_needed(*args, **kwargs):
+    """Initialize the evals database (lazy wrapper for storage.eval_db)."""
+    from llm_answer_watcher.storage.eval_db import (
+        init_eval_db_if_needed as _init_eval_db_if_needed,
+    )
+
+    return _init_eval_db_if_needed(*args, **kwargs)
+
+
+def store_eval_results(*args, **kwargs):
+    """Persist evaluation results (lazy wrapper for storage.eval_db)."""
+    from llm_answer_watcher.storage.eval_db import (
+        store_eval_results as _store_eval_results,
+    )
+
+    return _store_eval_results(*args, **kwargs)
+
+
+def _rich_excepthook(exc_type, exc_value, exc_traceback) -> None:
+    """
+    Install Rich tracebacks on the first uncaught exception.
+
+    rich.traceback pulls in pygments and rich.pretty, so the hook is only
+    installed when there is actually a traceback to render.
+    """
+    from rich.traceback import install as install_rich_traceback
+
+    install_rich_traceback(show_locals=False)
+    sys.excepthook(exc_type, exc_value, exc_traceback)
+
+
+# Install Rich tracebacks for better error messages (deferred until needed)
+sys.excepthook = _rich_excepthook
 
 
 def _check_brands_appeared(
-    output_dir: str, intent_id: str, provider: str, model_name: str
+    output_dir: str,
+    intent_id: str,
+    provider: str,
+    model_name: str,
+    artifacts=None,
 ) -> bool:
     """
     Check if our brands appeared in the LLM response by reading parsed file.
@@ -95,6 +178,8 @@ def _check_brands_appeared(
         intent_id: Intent identifier (e.g., "email-warmup")
         provider: LLM provider name (e.g., "openai")
         model_name: Model name (e.g., "gpt-4o-mini")
+        artifacts: Open RunArtifacts for output_dir (opened if not provided).
+                   Reads from the packed archive when the run used one.
 
     Returns:
         True if our brands were mentioned, False otherwise or on error
@@ -112,16 +197,22 @@ def _check_brands_appeared(
         Missing files, malformed JSON, or unexpected data structures are
         logged but don't crash the CLI.
     """
+    from llm_answer_watcher.storage.artifact_store import RunArtifacts
+
+    if artifacts is None:
+        with RunArtifacts(output_dir) as opened:
+            return _check_brands_appeared(
+                output_dir, intent_id, provider, model_name, artifacts=opened
+            )
+
     try:
         parsed_filename = get_parsed_answer_filename(intent_id, provider, model_name)
-        parsed_path = Path(output_dir) / parsed_filename
 
-        if not parsed_path.exists():
+        if not artifacts.exists(parsed_filename):
             # Parsed file doesn't exist, assume no mentions
             return False
 
-        with open(parsed_path, encoding="utf-8") as f:
-            parsed_data = json.load(f)
+        parsed_data = artifacts.read_json(parsed_filename)
 
         # Check if my_mentions list is non-empty (correct key from ExtractionResult)
         my_mentions = parsed_data.get("my_mentions", [])
@@ -244,6 +335,8 @@ def run(
       # Quiet mode for scripts
       llm-answer-watcher run --config watcher.config.yaml --quiet
     """
+    import asyncio
+
     # Set global output mode based on flags
     output_mode.format = format
     output_mode.quiet = quiet
@@ -409,6 +502,27 @@ def run(
 
                         # Note: We leave completed tasks visible to show full history
 
+                    def stream_query(self, live):
+                        """
+                        Called after every chunk of a streamed answer (sync).
+
+                        Shows the answer length and the brands detected so far.
+                        """
+                        from rich.markup import escape
+
+                        query_key = f"{live.intent_id}_{live.model_provider}_{live.model_name}"
+                        if query_key not in self.active_tasks:
+                            return
+                        brands = escape(", ".join(live.mentions)) or "no brands yet"
+                        progress.update(
+                            self.active_tasks[query_key],
+                            description=(
+                                f"  └─ [yellow]{live.intent_id}[/yellow] x "
+                                f"[cyan]{live.model_provider}/{live.model_name}[/cyan] "
+                                f"[dim]{len(live.text):,} chars · {brands}[/dim]"
+                            ),
+                        )
+
                 progress_tracker = ProgressTracker()
                 progress_callback = progress_tracker
 
@@ -430,6 +544,19 @@ def run(
                     )
                 )
 
+        # Answers carried forward by incremental runs cost nothing this run
+        carried = {
+            (c["intent_id"], c["model_provider"], c["model_name"]): c["source_run_id"]
+            for c in results.get("carried_forward", [])
+        }
+        # Queries the live budget refused to start
+        skipped = {
+            (s["intent_id"], s["model_provider"], s["model_name"])
+            for s in results.get("skipped", [])
+        }
+        live_successes = results["success_count"] - len(carried)
+        live_cost = results["total_cost_usd"] / live_successes if live_successes > 0 else 0.0
+
         # Generate HTML report
         with spinner("Generating report..."):
             # Build list of result dicts for report generator
@@ -457,18 +584,27 @@ def run(
                             found_error = True
                             break
 
-                    if not found_error:
+                    if not found_error and (intent.id, model.provider, model.model_name) in skipped:
+                        result_list.append(
+                            {
+                                "intent_id": intent.id,
+                                "provider": model.provider,
+                                "model_name": model.model_name,
+                                "status": "skipped",
+                                "cost_usd": 0.0,
+                                "timestamp_utc": results["timestamp_utc"],
+                            }
+                        )
+                    elif not found_error:
                         # Must be success
+                        is_carried = (intent.id, model.provider, model.model_name) in carried
                         result_list.append(
                             {
                                 "intent_id": intent.id,
                                 "provider": model.provider,
                                 "model_name": model.model_name,
                                 "status": "success",
-                                "cost_usd": results["total_cost_usd"]
-                                / results["success_count"]
-                                if results["success_count"] > 0
-                                else 0.0,
+                                "cost_usd": 0.0 if is_carried else live_cost,
                                 "timestamp_utc": results["timestamp_utc"],
                             }
                         )
@@ -486,6 +622,9 @@ def run(
         raise typer.Exit(EXIT_DB_ERROR)
 
     # Build summary table data
+    from llm_answer_watcher.storage.artifact_store import RunArtifacts
+
+    artifacts = RunArtifacts(results["output_dir"])
     summary_results = []
     for intent in runtime_config.intents:
         for model in runtime_config.models:
@@ -509,25 +648,49 @@ def run(
                     found_error = True
                     break
 
-            if not found_error:
+            if not found_error and (intent.id, model.provider, model.model_name) in skipped:
+                summary_results.append(
+                    {
+                        "intent_id": intent.id,
+                        "model": f"{model.provider}/{model.model_name}",
+                        "appeared": False,
+                        "cost": 0.0,
+                        "status": "skipped",
+                    }
+                )
+            elif not found_error:
                 # Must be success - check if our brands actually appeared by reading parsed file
                 appeared = _check_brands_appeared(
-                    results["output_dir"], intent.id, model.provider, model.model_name
+                    results["output_dir"],
+                    intent.id,
+                    model.provider,
+                    model.model_name,
+                    artifacts=artifacts,
                 )
+                is_carried = (intent.id, model.provider, model.model_name) in carried
                 summary_results.append(
                     {
                         "intent_id": intent.id,
                         "model": f"{model.provider}/{model.model_name}",
                         "appeared": appeared,
-                        "cost": results["total_cost_usd"] / results["success_count"]
-                        if results["success_count"] > 0
-                        else 0.0,
+                        "cost": 0.0 if is_carried else live_cost,
                         "status": "success",
                     }
                 )
+    artifacts.close()
 
     # Print summary table
     print_summary_table(summary_results)
+    if carried:
+        info(
+            f"Carried forward {len(carried)} fresh answer(s) from earlier runs "
+            "instead of re-querying"
+        )
+    if skipped:
+        warning(
+            f"Budget reached: {len(skipped)} query(ies) skipped, see spend_guard in "
+            "run_meta.json"
+        )
 
     # Print final summary
     print_final_summary(
@@ -684,6 +847,17 @@ def eval(
         "--save-results",
         help="Save evaluation results to database for historical tracking",
     ),
+    workers: int | None = typer.Option(
+        None,
+        "--workers",
+        min=1,
+        help="Worker processes for evaluation (default: CPU count)",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Evaluate every test case, even if unchanged since the last saved run",
+    ),
 ):
     """
     Run evaluation suite to test extraction accuracy.
@@ -700,9 +874,17 @@ def eval(
     - Loads test cases from YAML fixtures file
     - Runs brand mention detection and rank extraction
     - Computes precision, recall, F1 scores
+    - Measures extraction latency per test case
     - Shows detailed results for each test case
     - Optionally saves results to database for historical tracking
 
+    Large suites are evaluated in parallel worker processes. With
+    --save-results, test cases unchanged since the last saved run (same
+    fixture content, brands and extractor code) reuse their stored result,
+    and extraction latency is compared against the last saved run.
+
+    Slow extraction fails the suite like a quality regression.
+
     Exit codes:
       0: All test cases passed
       1: Configuration or file error
@@ -717,6 +899,9 @@ def eval(
 
       # Run evaluation and save results to database
       llm-answer-watcher eval --fixtures evals/testcases/fixtures.yaml --save-results
+
+      # Re-evaluate every case with 8 worker processes
+      llm-answer-watcher eval -f evals/testcases/fixtures.yaml --save-results --no-cache --workers 8
     """
     # Set global output mode
     output_mode.format = format
@@ -742,10 +927,16 @@ def eval(
             traceback.print_exc()
         raise typer.Exit(EXIT_CONFIG_ERROR)
 
+    eval_db_path = "./output/evals/eval_results.db"
+
     # Run evaluation suite
     try:
         with spinner("Running evaluation suite..."):
-            eval_results = run_eval_suite(fixtures)
+            eval_results = run_eval_suite(
+                fixtures,
+                workers=workers,
+                cache_db_path=eval_db_path if save_results and not no_cache else None,
+            )
 
         total_cases = eval_results["total_test_cases"]
         passed_cases = eval_results["total_passed"]
@@ -764,13 +955,12 @@ def eval(
             try:
                 with spinner("Saving results to database..."):
                     # Initialize eval database
-                    eval_db_path = "./output/evals/eval_results.db"
                     init_eval_db_if_needed(eval_db_path)
 
                     # Store results
-                    import sqlite3
+                    from llm_answer_watcher.storage.connection import write_connection
 
-                    with sqlite3.connect(eval_db_path) as conn:
+                    with write_connection(eval_db_path) as conn:
                         run_id = store_eval_results(conn, eval_results)
                         conn.commit()
 
@@ -828,6 +1018,16 @@ def eval(
         info(f"  Total cases: {summary['total_test_cases']}")
         info(f"  Passed: {summary['total_passed']}")
         info(f"  Failed: {summary['total_failed']}")
+        if summary.get("cached_cases"):
+            info(f"  Reused from last saved run: {summary['cached_cases']}")
+
+        latency = summary.get("latency", {})
+        if latency.get("measured_cases"):
+            info("\nExtraction Latency:")
+            info(
+                f"  p50: {latency['p50_ms']:.2f} ms, p95: {latency['p95_ms']:.2f} ms, "
+                f"max: {latency['max_ms']:.2f} ms"
+            )
 
         # Show average scores
         if summary["average_scores"]:
@@ -864,7 +1064,8 @@ def eval(
                     info(
                         f"  {severity_icon} {violation['metric']}: {violation['average']:.3f} "
                         f"(threshold: {violation['threshold']:.1f}, "
-                        f"{violation['gap_percent']:.0f}% below)"
+                        f"{violation['gap_percent']:.0f}% "
+                        f"{violation.get('direction', 'below')})"
                     )
             else:
                 info("  ✅ All quality thresholds met")
@@ -879,6 +1080,8 @@ def eval(
             - eval_results["total_passed"],
             "pass_rate": eval_results["summary"]["pass_rate"],
             "average_scores": eval_results["summary"]["average_scores"],
+            "latency": eval_results["summary"].get("latency"),
+            "cached_cases": eval_results.get("cached_cases", 0),
             "results": [],
         }
 
@@ -887,6 +1090,8 @@ def eval(
             result_dict = {
                 "test_description": result.test_description,
                 "overall_passed": result.overall_passed,
+                "extraction_latency_ms": result.extraction_latency_ms,
+                "cached": result.cached,
                 "metrics": [
                     {
                         "name": metric.name,
@@ -950,6 +1155,7 @@ def demo(
       # Run demo with minimal output
       llm-answer-watcher demo --mode quiet
     """
+    import asyncio
     import tempfile
     from pathlib import Path
 
@@ -1310,6 +1516,70 @@ def export_runs(
         raise typer.Exit(EXIT_DB_ERROR)
 
 
+@export_app.command("artifacts")
+def export_artifacts(
+    run_dir: Path = typer.Option(
+        ...,
+        "--run-dir",
+        help="Run output directory (e.g., ./output/2025-11-02T08-00-00Z)",
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+    ),
+    output: Path = typer.Option(
+        ...,
+        "--output",
+        "-o",
+        help="Output file path (extension determines format: .jsonl or .json)",
+    ),
+    pattern: str = typer.Option(
+        "intent_*.json",
+        "--pattern",
+        help="Glob pattern for artifact filenames (e.g., '*_parsed_*.json')",
+    ),
+    format: str = typer.Option(
+        "text",
+        "--format",
+        "-f",
+        help="CLI output format: 'text' or 'json'",
+    ),
+):
+    """
+    Export a run's JSON artifacts to a single JSON or JSONL file.
+
+    Reads loose artifact files or the packed archive
+    (run_settings.artifact_backend: packed), whichever the run used.
+
+    Examples:
+      # All per-query artifacts as JSONL
+      llm-answer-watcher export artifacts --run-dir ./output/2025-11-02T08-00-00Z --output run.jsonl
+
+      # Only parsed answers as a JSON object keyed by filename
+      llm-answer-watcher export artifacts --run-dir ./output/2025-11-02T08-00-00Z \\
+        --output parsed.json --pattern '*_parsed_*.json'
+    """
+    from llm_answer_watcher.storage.exporter import export_run_artifacts
+
+    output_mode.format = format
+
+    if output.suffix.lower() not in [".jsonl", ".json"]:
+        error("Output file must have .jsonl or .json extension")
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+
+    try:
+        with spinner(f"Exporting artifacts to {output}..."):
+            count = export_run_artifacts(str(output), str(run_dir), pattern=pattern)
+
+        success(f"Exported {count} artifacts to {output}")
+        raise typer.Exit(EXIT_SUCCESS)
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        error(f"Export failed: {e}")
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+
+
 # Create costs command subapp for cost analytics
 costs_app = typer.Typer(help="Analyze historical costs")
 app.add_typer(costs_app, name="costs")
@@ -1360,6 +1630,8 @@ def costs_show(
     from rich.console import Console
     from rich.table import Table
 
+    from llm_answer_watcher.storage.connection import read_connection
+
     output_mode.format = format
 
     # Calculate date filter based on period
@@ -1378,7 +1650,7 @@ def costs_show(
 
     try:
         with spinner("Analyzing costs..."):
-            with sqlite3.connect(str(db)) as conn:
+            with read_connection(str(db)) as conn:
                 conn.row_factory = sqlite3.Row
 
                 # Build query with date filter
@@ -1505,6 +1777,349 @@ def costs_show(
         raise typer.Exit(EXIT_DB_ERROR)
 
 
+@app.command()
+def diff(
+    run_a: str = typer.Argument(..., help="Baseline run ID"),
+    run_b: str = typer.Argument(..., help="Run ID to compare against the baseline"),
+    db: Path = typer.Option(
+        "./output/watcher.db",
+        "--db",
+        help="Path to SQLite database",
+        exists=True,
+    ),
+    output: Path | None = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Stream every delta to a file (extension determines format: .jsonl or .csv)",
+    ),
+    html: Path | None = typer.Option(
+        None,
+        "--html",
+        help="Write an HTML diff report",
+    ),
+    include_unchanged: bool = typer.Option(
+        False,
+        "--all",
+        help="Include brands whose visibility did not change",
+    ),
+    limit: int = typer.Option(
+        50,
+        "--limit",
+        help="Maximum deltas printed (use --output for all of them)",
+        min=0,
+    ),
+    format: str = typer.Option(
+        "text",
+        "--format",
+        "-f",
+        help="Output format: 'text' or 'json'",
+    ),
+):
+    """
+    Compare brand visibility between two runs.
+
+    Shows which brands appeared, disappeared, or moved in rank per intent and
+    model. Only queries answered in both runs are compared.
+
+    Examples:
+      # Changes between two runs
+      llm-answer-watcher diff 2025-11-01T08-00-00Z 2025-11-02T08-00-00Z
+
+      # All deltas to a file plus an HTML report
+      llm-answer-watcher diff RUN_A RUN_B --output diff.jsonl --html diff.html
+    """
+    import csv
+    import sqlite3
+    from contextlib import ExitStack
+    from dataclasses import fields
+
+    from rich.console import Console
+    from rich.markup import escape
+    from rich.table import Table
+
+    from llm_answer_watcher.storage.connection import read_connection
+    from llm_answer_watcher.storage.db import get_run_summary
+    from llm_answer_watcher.storage.diff import (
+        BrandDelta,
+        DiffCounter,
+        diff_runs,
+        unpaired_queries,
+    )
+
+    output_mode.format = format
+
+    if output is not None and output.suffix.lower() not in (".jsonl", ".csv"):
+        error("Output file must have .jsonl or .csv extension")
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+
+    counter = DiffCounter()
+    shown = []
+    collected = []
+    try:
+        with read_connection(str(db)) as conn, ExitStack() as stack:
+            for run_id in (run_a, run_b):
+                if get_run_summary(conn, run_id) is None:
+                    error(f"Run not found: {run_id}")
+                    raise typer.Exit(EXIT_CONFIG_ERROR)
+
+            unpaired = unpaired_queries(conn, run_a, run_b)
+
+            stream = csv_writer = None
+            if output is not None:
+                stream = stack.enter_context(open(output, "w", encoding="utf-8", newline=""))
+                if output.suffix.lower() == ".csv":
+                    fieldnames = [f.name for f in fields(BrandDelta)] + ["rank_delta"]
+                    csv_writer = csv.DictWriter(stream, fieldnames=fieldnames)
+                    csv_writer.writeheader()
+
+            for delta in counter.count(diff_runs(conn, run_a, run_b, include_unchanged)):
+                if csv_writer is not None:
+                    csv_writer.writerow(delta.to_dict())
+                elif stream is not None:
+                    stream.write(json.dumps(delta.to_dict(), ensure_ascii=False) + "\n")
+                if len(shown) < limit:
+                    shown.append(delta)
+                if html is not None:
+                    collected.append(delta)
+    except typer.Exit:
+        raise
+    except sqlite3.Error as e:
+        error(f"Database error: {e}")
+        raise typer.Exit(EXIT_DB_ERROR)
+    except OSError as e:
+        error(f"Cannot write {output}: {e}")
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+
+    summary = counter.summary()
+
+    if html is not None:
+        from llm_answer_watcher.report.diff import generate_diff_report
+
+        try:
+            html.write_text(
+                generate_diff_report(run_a, run_b, collected, unpaired), encoding="utf-8"
+            )
+        except (OSError, ValueError) as e:
+            error(f"Cannot write HTML diff report: {e}")
+            raise typer.Exit(EXIT_CONFIG_ERROR)
+
+    if output_mode.is_agent():
+        output_mode.add_json(
+            "diff",
+            {
+                "run_a": run_a,
+                "run_b": run_b,
+                "summary": summary,
+                "unpaired": unpaired,
+                "deltas": [d.to_dict() for d in shown],
+                "truncated": summary["total"] > len(shown),
+            },
+        )
+        output_mode.flush_json()
+        raise typer.Exit(EXIT_SUCCESS)
+
+    if shown:
+        table = Table(
+            title=f"Visibility changes {run_a} → {run_b}",
+            show_header=True,
+            header_style="bold cyan",
+        )
+        table.add_column("Intent", style="yellow")
+        table.add_column("Model", style="cyan")
+        table.add_column("Brand")
+        table.add_column("Change")
+        table.add_column("Rank", justify="right")
+
+        styles = {"appeared": "green", "rank_up": "green", "disappeared": "red", "rank_down": "red"}
+        for d in shown:
+            style = styles.get(d.change, "dim")
+            rank_a = "-" if d.rank_a is None else str(d.rank_a)
+            rank_b = "-" if d.rank_b is None else str(d.rank_b)
+            brand = escape(d.brand_name)
+            table.add_row(
+                escape(d.intent_id),
+                escape(f"{d.model_provider}/{d.model_name}"),
+                f"[bold]{brand}[/bold]" if d.is_mine else brand,
+                f"[{style}]{d.change.replace('_', ' ')}[/{style}]",
+                f"{rank_a} → {rank_b}",
+            )
+        Console().print(table)
+
+    if summary["total"] > len(shown):
+        info(f"Showing {len(shown)} of {summary['total']} deltas (use --output for all)")
+    if unpaired:
+        warning(f"{len(unpaired)} queries were answered in only one run and not compared")
+    mine = summary["mine"]
+    success(
+        f"{summary['total']} changes: {summary['appeared']} appeared, "
+        f"{summary['disappeared']} disappeared, {summary['rank_up']} up, "
+        f"{summary['rank_down']} down (my brands: {mine['appeared']} appeared, "
+        f"{mine['disappeared']} disappeared, {mine['rank_up']} up, {mine['rank_down']} down)"
+    )
+    if output is not None:
+        info(f"Wrote all deltas to {output}")
+    if html is not None:
+        info(f"Wrote HTML diff report to {html}")
+    raise typer.Exit(EXIT_SUCCESS)
+
+
+db_app = typer.Typer(help="Maintain the SQLite database")
+app.add_typer(db_app, name="db")
+
+
+def _load_retention_from_config(config_path: Path) -> tuple[dict, str | None]:
+    """
+    Read run_settings.retention and sqlite_db_path from a config file.
+
+    Only the YAML is parsed (no API key resolution), so maintenance can run
+    on hosts that don't hold provider credentials.
+
+    Returns:
+        Tuple of (retention settings dict, sqlite_db_path or None)
+    """
+    import yaml
+
+    with config_path.open(encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+    run_settings = raw.get("run_settings") or {}
+    return run_settings.get("retention") or {}, run_settings.get("sqlite_db_path")
+
+
+@db_app.command("compact")
+def db_compact(
+    db: Path | None = typer.Option(
+        None,
+        "--db",
+        help="Path to SQLite database (default: run_settings.sqlite_db_path from --config)",
+    ),
+    config: Path | None = typer.Option(
+        None,
+        "--config",
+        "-c",
+        help="Config file to read run_settings.retention from",
+        exists=True,
+        dir_okay=False,
+    ),
+    raw_answers_days: int | None = typer.Option(
+        None, "--raw-days", help="Keep raw answers and operation results for N days"
+    ),
+    mentions_days: int | None = typer.Option(
+        None, "--mentions-days", help="Keep individual mentions for N days, then roll up"
+    ),
+    rollups_days: int | None = typer.Option(
+        None, "--rollups-days", help="Keep daily mention rollups for N days"
+    ),
+    batch_size: int = typer.Option(
+        1000, "--batch-size", help="Rows deleted per write transaction", min=1
+    ),
+    pause_ms: int = typer.Option(
+        0, "--pause-ms", help="Pause between batches so running jobs can write", min=0
+    ),
+    full_vacuum: bool = typer.Option(
+        False,
+        "--full-vacuum",
+        help="Run a blocking full VACUUM (needed once for databases created before v12)",
+    ),
+    format: str = typer.Option(
+        "text",
+        "--format",
+        "-f",
+        help="Output format: 'text' or 'json'",
+    ),
+):
+    """
+    Apply retention and compact the database while jobs keep running.
+
+    Switches the database to WAL mode, deletes and rolls up expired data in
+    small batches, collects orphaned answer blobs, releases free pages with
+    incremental vacuum and refreshes planner statistics with ANALYZE.
+    Retention flags override run_settings.retention from --config.
+
+    Examples:
+      # Retention from the config file
+      llm-answer-watcher db compact --config watcher.config.yaml
+
+      # Keep raw answers 30 days, mentions 180 days, rollups forever
+      llm-answer-watcher db compact --db ./output/watcher.db --raw-days 30 --mentions-days 180
+
+      # Vacuum only
+      llm-answer-watcher db compact --db ./output/watcher.db
+    """
+    import sqlite3
+
+    from pydantic import ValidationError
+
+    from llm_answer_watcher.config.schema import RetentionConfig
+    from llm_answer_watcher.storage.maintenance import compact_database
+
+    output_mode.format = format
+
+    retention_settings: dict = {}
+    if config is not None:
+        try:
+            retention_settings, config_db = _load_retention_from_config(config)
+        except Exception as e:
+            error(f"Failed to read config: {e}")
+            raise typer.Exit(EXIT_CONFIG_ERROR)
+        if db is None and config_db:
+            db = Path(config_db)
+
+    if db is None:
+        error("No database given. Use --db or --config.")
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+    if not db.exists():
+        error(f"Database not found: {db}")
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+
+    overrides = {
+        "raw_answers_days": raw_answers_days,
+        "mentions_days": mentions_days,
+        "rollups_days": rollups_days,
+    }
+    retention_settings.update({k: v for k, v in overrides.items() if v is not None})
+    try:
+        retention = RetentionConfig(**retention_settings) if retention_settings else None
+    except ValidationError as e:
+        error(f"Invalid retention settings: {e}")
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+
+    def report_progress(stage: str, batch: int, total: int) -> None:
+        if output_mode.is_human():
+            info(f"{stage}: {total} processed (+{batch})")
+
+    try:
+        result = compact_database(
+            str(db),
+            retention,
+            batch_size=batch_size,
+            pause_seconds=pause_ms / 1000,
+            full=full_vacuum,
+            progress=report_progress,
+        )
+    except sqlite3.Error as e:
+        error(f"Database error: {e}")
+        raise typer.Exit(EXIT_DB_ERROR)
+
+    if output_mode.is_agent():
+        output_mode.add_json("compact", result.to_dict())
+        output_mode.flush_json()
+        raise typer.Exit(EXIT_SUCCESS)
+
+    for table, count in result.deleted.items():
+        info(f"Deleted {count} rows from {table}")
+    if result.rolled_up_days:
+        info(f"Rolled up {result.rolled_up_days} days of mentions")
+    if retention is None:
+        info("No retention configured; only vacuum and ANALYZE were run")
+    saved = (result.size_before_bytes or 0) - (result.size_after_bytes or 0)
+    success(
+        f"Compacted {db}: {result.size_before_bytes:,} -> {result.size_after_bytes:,} bytes "
+        f"({saved:,} bytes freed, {result.vacuum_mode} vacuum)"
+    )
+    raise typer.Exit(EXIT_SUCCESS)
+
+
 # Create prices command subapp
 prices_app = typer.Typer(help="Manage LLM pricing data")
 app.add_typer(prices_app, name="prices")
@@ -1718,6 +2333,280 @@ def prices_list(
     prices_show(provider=provider, format=format)
 
 
+# Create bench command subapp for performance benchmarks
+bench_app = typer.Typer(help="Run performance benchmarks and detect regressions")
+app.add_typer(bench_app, name="bench")
+
+
+@bench_app.command("run")
+def bench_run(
+    output: Path = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Write benchmark results to this JSON file",
+    ),
+    scenario: list[str] = typer.Option(
+        None,
+        "--scenario",
+        "-s",
+        help="Only run these scenarios (run_all, extraction, db_inserts, report_render, http_client)",
+    ),
+    quick: bool = typer.Option(
+        False,
+        "--quick",
+        help="Run the reduced suite (smaller inputs, for CI smoke checks)",
+    ),
+    repeat: int = typer.Option(
+        3,
+        "--repeat",
+        "-r",
+        help="Timing repetitions per scenario (median is reported)",
+    ),
+    format: str = typer.Option(
+        "text",
+        "--format",
+        "-f",
+        help="Output format: 'text' or 'json'",
+    ),
+):
+    """
+    Run the performance benchmark suite against mock LLM providers.
+
+    Measures run_all throughput (with simulated latency and injected
+    429/timeout failures), extraction throughput vs. brand count and answer
+    length, database insert rates, report rendering time, the real HTTP
+    client stack against a local fake provider server, and peak memory.
+    No API keys or network access are required.
+
+    Examples:
+      # Run full suite and save results
+      llm-answer-watcher bench run --output bench/current.json
+
+      # Quick smoke run of extraction only
+      llm-answer-watcher bench run --quick --scenario extraction
+    """
+    from rich.console import Console
+    from rich.markup import escape
+    from rich.table import Table
+
+    from llm_answer_watcher.benchmarks.runner import (
+        run_benchmark_suite,
+        write_benchmark_results,
+    )
+
+    output_mode.format = format
+
+    try:
+        with spinner("Running benchmarks..."):
+            report = run_benchmark_suite(
+                scenarios=scenario or None, quick=quick, repeat=repeat
+            )
+        if output:
+            write_benchmark_results(output, report)
+    except ValueError as e:
+        error(str(e))
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+    except Exception as e:
+        error(f"Benchmark run failed: {e}")
+        raise typer.Exit(EXIT_COMPLETE_FAILURE)
+
+    if output_mode.is_agent():
+        output_mode.add_json("benchmarks", report)
+        output_mode.flush_json()
+        raise typer.Exit(EXIT_SUCCESS)
+
+    console = Console()
+    table = Table(title="Benchmark Results", show_header=True, header_style="bold cyan")
+    table.add_column("Benchmark", style="yellow")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right", style="green")
+    table.add_column("Unit", style="blue")
+
+    for result in report["results"]:
+        for name, metric in result["metrics"].items():
+            table.add_row(
+                escape(result["key"]), name, f"{metric['value']:.2f}", metric["unit"]
+            )
+
+    console.print(table)
+    if report["peak_rss_mb"] is not None:
+        console.print(f"[bold]Peak RSS:[/bold] {report['peak_rss_mb']:.1f} MB")
+    if output:
+        success(f"Benchmark results written to {output}")
+
+    raise typer.Exit(EXIT_SUCCESS)
+
+
+@bench_app.command("compare")
+def bench_compare(
+    baseline: Path = typer.Argument(
+        ...,
+        help="Baseline benchmark results JSON",
+        exists=True,
+    ),
+    current: Path = typer.Argument(
+        ...,
+        help="Current benchmark results JSON",
+        exists=True,
+    ),
+    threshold: float = typer.Option(
+        0.10,
+        "--threshold",
+        "-t",
+        help="Allowed relative slowdown before flagging a regression (0.10 = 10%)",
+    ),
+    format: str = typer.Option(
+        "text",
+        "--format",
+        "-f",
+        help="Output format: 'text' or 'json'",
+    ),
+):
+    """
+    Compare benchmark results against a baseline and flag regressions.
+
+    Exit codes:
+      0: No regressions
+      1: Invalid input files
+      2: One or more metrics regressed beyond the threshold
+
+    Examples:
+      # Fail CI if anything got more than 15% slower
+      llm-answer-watcher bench compare bench/baseline.json bench/current.json -t 0.15
+    """
+    from dataclasses import asdict
+
+    from rich.console import Console
+    from rich.markup import escape
+    from rich.table import Table
+
+    from llm_answer_watcher.benchmarks.runner import (
+        compare_benchmark_results,
+        load_benchmark_results,
+    )
+
+    output_mode.format = format
+
+    try:
+        comparisons = compare_benchmark_results(
+            load_benchmark_results(baseline),
+            load_benchmark_results(current),
+            threshold=threshold,
+        )
+    except (ValueError, OSError, json.JSONDecodeError) as e:
+        error(f"Cannot compare benchmark results: {e}")
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+
+    regressions = [c for c in comparisons if c.regressed]
+
+    if output_mode.is_agent():
+        output_mode.add_json(
+            "benchmark_comparison",
+            {
+                "threshold": threshold,
+                "regression_count": len(regressions),
+                "comparisons": [asdict(c) for c in comparisons],
+            },
+        )
+        output_mode.flush_json()
+    else:
+        console = Console()
+        table = Table(
+            title=f"Benchmark Comparison (threshold {threshold:.0%})",
+            show_header=True,
+            header_style="bold cyan",
+        )
+        table.add_column("Benchmark", style="yellow")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Baseline", justify="right")
+        table.add_column("Current", justify="right")
+        table.add_column("Change", justify="right")
+
+        for c in comparisons:
+            style = "red" if c.regressed else "green"
+            table.add_row(
+                escape(c.key),
+                c.metric,
+                f"{c.baseline:.2f}",
+                f"{c.current:.2f}",
+                f"[{style}]{c.change_pct:+.1f}%[/{style}]",
+            )
+        console.print(table)
+
+        if regressions:
+            error(f"{len(regressions)} metric(s) regressed beyond {threshold:.0%}")
+        else:
+            success(f"No regressions across {len(comparisons)} metric(s)")
+
+    if regressions:
+        raise typer.Exit(2)
+    raise typer.Exit(EXIT_SUCCESS)
+
+
+@bench_app.command("fake-server")
+def bench_fake_server(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to bind"),
+    port: int = typer.Option(8089, "--port", "-p", help="Port to listen on"),
+    latency_ms: float = typer.Option(
+        0.0, "--latency-ms", help="Central response latency in milliseconds"
+    ),
+    latency_jitter_ms: float = typer.Option(
+        0.0, "--latency-jitter-ms", help="Spread of the latency distribution"
+    ),
+    latency_distribution: str = typer.Option(
+        "uniform",
+        "--latency-distribution",
+        help="Latency distribution: fixed, uniform, normal, lognormal",
+    ),
+    error_rate: float = typer.Option(
+        0.0, "--error-rate", help="Fraction of requests answered with 500/503"
+    ),
+    rate_limit: int = typer.Option(
+        None, "--rate-limit", help="Requests allowed per minute before 429s"
+    ),
+    seed: int = typer.Option(None, "--seed", help="Random seed for reproducibility"),
+):
+    """
+    Serve a local fake Gemini/Groq API for load and soak testing.
+
+    Speaks the Gemini generateContent and Groq chat-completions wire formats.
+    Point models at it with base_url in watcher.config.yaml, e.g.
+    "http://127.0.0.1:8089/v1beta" (google) or "http://127.0.0.1:8089/openai/v1"
+    (groq). Any non-empty API key is accepted.
+
+    Examples:
+      # Long-tailed latency with 5% server errors
+      llm-answer-watcher bench fake-server --latency-ms 200 --latency-jitter-ms 100 \\
+          --latency-distribution lognormal --error-rate 0.05
+    """
+    import uvicorn
+
+    from llm_answer_watcher.llm_runner.fake_provider import (
+        GEMINI_PATH_PREFIX,
+        GROQ_PATH_PREFIX,
+        FakeProviderConfig,
+        create_fake_provider_app,
+    )
+
+    try:
+        config = FakeProviderConfig(
+            latency_ms=latency_ms,
+            latency_jitter_ms=latency_jitter_ms,
+            latency_distribution=latency_distribution,
+            error_rate=error_rate,
+            rate_limit_requests=rate_limit,
+            seed=seed,
+        )
+    except ValueError as e:
+        error(str(e))
+        raise typer.Exit(EXIT_CONFIG_ERROR)
+
+    info(f"Gemini base_url: http://{host}:{port}{GEMINI_PATH_PREFIX}")
+    info(f"Groq base_url:   http://{host}:{port}{GROQ_PATH_PREFIX}")
+    uvicorn.run(create_fake_provider_app(config), host=host, port=port, log_level="warning")
+
+
 @app.callback(invoke_without_command=True)
 def main(
     ctx: typer.Context,
@@ -1779,6 +2668,7 @@ def main(
         console.print("  eval      Run evaluation suite to test extraction accuracy")
         console.print("  demo      Run interactive demo with sample data (no API keys needed)")
         console.print("  prices    Manage LLM pricing data (show, refresh, list)")
+        console.print("  bench     Run performance benchmarks (run, compare)")
 
 
 def _read_version() -> str:
@@ -314,6 +314,7 @@ def resolve_api_keys(config: WatcherConfig) -> list[RuntimeModel]:
             system_prompt=system_prompt_text,
             tools=model_config.tools,
             tool_choice=model_config.tool_choice,
+            base_url=model_config.base_url,
         )
 
         resolved_models.append(runtime_model)
@@ -423,6 +424,7 @@ def resolve_operation_api_keys(config: WatcherConfig) -> list[RuntimeModel]:
             system_prompt=system_prompt_text,
             tools=model_config.tools,
             tool_choice=model_config.tool_choice,
+            base_url=model_config.base_url,
         )
 
         resolved_operation_models.append(runtime_model)
@@ -636,6 +638,7 @@ def resolve_extraction_settings(
         model_name=model_config.model_name,
         api_key=api_key,
         system_prompt=system_prompt_text,
+        base_url=model_config.base_url,
     )
 
     # Build RuntimeExtractionSettings
@@ -8,6 +8,11 @@ Pydantic v2 field validators for comprehensive validation.
 Models:
     ModelConfig: LLM model configuration (provider, model_name, env_api_key) [LEGACY]
     RunnerConfig: Unified runner configuration for API and browser runners [NEW]
+    RetentionConfig: Database retention and maintenance settings
+    IncrementalConfig: Incremental run settings (reuse fresh answers)
+    SamplingConfig: Sequential sampling settings (repeat queries until stable)
+    StreamingConfig: Streaming settings (live partial answers, length cap)
+    HedgingConfig: Request hedging settings (duplicate slow requests, fallback models)
     RunSettings: Runtime settings (output paths, models, feature flags)
     ExtractionModelConfig: Extraction model configuration (project-level)
     ExtractionSettings: Extraction method configuration (function calling vs regex)
@@ -21,10 +26,14 @@ Models:
     RuntimeConfig: Runtime configuration with resolved API keys
 """
 
+import logging
+from itertools import pairwise
 from typing import Literal
 
 from pydantic import BaseModel, field_validator, model_validator
 
+logger = logging.getLogger(__name__)
+
 
 class ModelConfig(BaseModel):
     """
@@ -42,6 +51,8 @@ class ModelConfig(BaseModel):
                Google format: [{"google_search": {}}] (dictionary with tool name as key)
                Config is passed directly to provider API without translation.
         tool_choice: Tool selection mode ("auto", "required", "none"). Default: "auto"
+        base_url: Optional API base URL override (e.g., "http://127.0.0.1:8089/v1beta"
+                  to target the local fake provider server). Default: provider's public API
     """
 
     provider: Literal["google", "groq"]
@@ -50,6 +61,7 @@ class ModelConfig(BaseModel):
     system_prompt: str | None = None
     tools: list[dict] | None = None
     tool_choice: str = "auto"
+    base_url: str | None = None
 
     @field_validator("model_name")
     @classmethod
@@ -88,12 +100,20 @@ class BudgetConfig(BaseModel):
         max_per_run_usd: Maximum cost per run (abort if exceeded)
         max_per_intent_usd: Maximum cost per intent (abort if exceeded)
         warn_threshold_usd: Warn if estimated cost exceeds this (but continue)
+        enforce_live: Also enforce max_per_run_usd and max_per_intent_usd on
+                      the actual spend while the run executes: work that would
+                      exceed them is not started (default: True). See
+                      llm_runner.spend_guard.
+        cancel_low_priority: Cancel in-flight follow-up samples and operations
+                             once a budget is reached (default: False)
     """
 
     enabled: bool = True
     max_per_run_usd: float | None = None
     max_per_intent_usd: float | None = None
     warn_threshold_usd: float | None = None
+    enforce_live: bool = True
+    cancel_low_priority: bool = False
 
     @field_validator("max_per_run_usd", "max_per_intent_usd", "warn_threshold_usd")
     @classmethod
@@ -104,6 +124,261 @@ class BudgetConfig(BaseModel):
         return v
 
 
+class RetentionConfig(BaseModel):
+    """
+    Database retention tiers and automatic maintenance settings.
+
+    Data ages through three tiers. Raw answers (answer text, operation
+    results) are kept for raw_answers_days. Brand mentions are kept for
+    mentions_days, then rolled up into daily per-brand aggregates in
+    mention_rollups. Rollups are kept for rollups_days. None keeps a tier
+    forever. See storage.maintenance.
+
+    Attributes:
+        raw_answers_days: Days to keep answers_raw and operations rows
+        mentions_days: Days to keep individual mentions before rolling up
+        rollups_days: Days to keep daily mention rollups
+        maintenance_interval_hours: Minimum hours between automatic retention
+                                   passes run at the end of `run` (default: 24)
+    """
+
+    raw_answers_days: int | None = None
+    mentions_days: int | None = None
+    rollups_days: int | None = None
+    maintenance_interval_hours: float = 24.0
+
+    @field_validator("raw_answers_days", "mentions_days", "rollups_days")
+    @classmethod
+    def validate_positive_days(cls, v: int | None) -> int | None:
+        """Validate retention periods are at least one day if specified."""
+        if v is not None and v < 1:
+            raise ValueError(f"Retention period must be at least 1 day, got: {v}")
+        return v
+
+    @field_validator("maintenance_interval_hours")
+    @classmethod
+    def validate_interval(cls, v: float) -> float:
+        """Validate maintenance interval is non-negative."""
+        if v < 0:
+            raise ValueError(f"maintenance_interval_hours cannot be negative, got: {v}")
+        return v
+
+    @model_validator(mode="after")
+    def validate_tier_order(self) -> "RetentionConfig":
+        """Validate each tier is kept at least as long as the one before it."""
+        tiers = [
+            ("raw_answers_days", self.raw_answers_days),
+            ("mentions_days", self.mentions_days),
+            ("rollups_days", self.rollups_days),
+        ]
+        for (shorter_name, shorter), (longer_name, longer) in pairwise(tiers):
+            if shorter is not None and longer is not None and longer < shorter:
+                raise ValueError(
+                    f"{longer_name} ({longer}) must be >= {shorter_name} ({shorter})"
+                )
+        if self.mentions_days is not None and self.raw_answers_days is None:
+            raise ValueError("raw_answers_days must be set when mentions_days is set")
+        if self.rollups_days is not None and self.mentions_days is None:
+            raise ValueError("mentions_days must be set when rollups_days is set")
+        return self
+
+
+class IncrementalConfig(BaseModel):
+    """
+    Incremental run settings.
+
+    When enabled, each (intent, model) query is fingerprinted from its
+    prompt, model, system prompt, tools and brands. If the same fingerprint
+    was answered successfully within the staleness window, the previous
+    answer is carried forward into the new run instead of being queried
+    again. See llm_runner.incremental.
+
+    Attributes:
+        enabled: Reuse fresh answers (default: True when the section is present)
+        max_age_minutes: Staleness window; answers older than this are
+                         re-queried (default: 360). Intents can override it
+                         with their own max_age_minutes.
+    """
+
+    enabled: bool = True
+    max_age_minutes: int = 360
+
+    @field_validator("max_age_minutes")
+    @classmethod
+    def validate_max_age(cls, v: int) -> int:
+        """Validate staleness window is at least one minute."""
+        if v < 1:
+            raise ValueError(f"max_age_minutes must be at least 1, got: {v}")
+        return v
+
+
+class SamplingConfig(BaseModel):
+    """
+    Sequential sampling settings.
+
+    LLM answers are stochastic, so one answer per (intent, model) is a noisy
+    visibility signal. With sampling enabled, each API model query is
+    repeated until the confidence intervals on "my brand appeared" and on my
+    mean rank are narrower than the targets, or max_samples is reached.
+    See llm_runner.sampling.
+
+    Attributes:
+        enabled: Sample adaptively (default: True when the section is present)
+        min_samples: Samples always taken before checking intervals (default: 3)
+        max_samples: Hard cap on samples per (intent, model) (default: 10)
+        target_width: Target width of the appearance rate interval, as a
+                      fraction between 0 and 1 (default: 0.4)
+        rank_target_width: Target width of the mean rank interval, in rank
+                           positions (default: 2.0)
+        confidence: Confidence level of the intervals (default: 0.95)
+    """
+
+    enabled: bool = True
+    min_samples: int = 3
+    max_samples: int = 10
+    target_width: float = 0.4
+    rank_target_width: float = 2.0
+    confidence: float = 0.95
+
+    @field_validator("min_samples", "max_samples")
+    @classmethod
+    def validate_samples(cls, v: int) -> int:
+        """Validate sample counts are within safe limits."""
+        if not 1 <= v <= 100:
+            raise ValueError(f"Sample counts must be between 1 and 100, got: {v}")
+        return v
+
+    @field_validator("target_width", "rank_target_width")
+    @classmethod
+    def validate_width(cls, v: float) -> float:
+        """Validate target widths are positive."""
+        if v <= 0:
+            raise ValueError(f"Target width must be positive, got: {v}")
+        return v
+
+    @field_validator("confidence")
+    @classmethod
+    def validate_confidence(cls, v: float) -> float:
+        """Validate confidence is strictly between 0 and 1."""
+        if not 0 < v < 1:
+            raise ValueError(f"confidence must be between 0 and 1, got: {v}")
+        return v
+
+    @model_validator(mode="after")
+    def validate_sample_range(self) -> "SamplingConfig":
+        """Validate min_samples does not exceed max_samples."""
+        if self.min_samples > self.max_samples:
+            raise ValueError(
+                f"min_samples ({self.min_samples}) must be <= max_samples ({self.max_samples})"
+            )
+        return self
+
+
+class StreamingConfig(BaseModel):
+    """
+    Streaming settings.
+
+    With streaming enabled, API model answers are received as they are
+    generated: brand mentions are detected on the growing text, partial
+    answers are visible while the run is in progress (GET /runs/live and
+    the CLI progress display), and time-to-first-token is recorded next to
+    the total latency. Clients without streaming support answer as before.
+    See llm_runner.streaming.
+
+    Attributes:
+        enabled: Stream answers (default: True when the section is present)
+        max_answer_chars: Optional length cap; a streamed answer is cut off
+                          once it reaches this many characters (default: none)
+    """
+
+    enabled: bool = True
+    max_answer_chars: int | None = None
+
+    @field_validator("max_answer_chars")
+    @classmethod
+    def validate_max_answer_chars(cls, v: int | None) -> int | None:
+        """Validate the length cap leaves room for an answer."""
+        if v is not None and v < 100:
+            raise ValueError(f"max_answer_chars must be at least 100, got: {v}")
+        return v
+
+
+class HedgingConfig(BaseModel):
+    """
+    Request hedging settings.
+
+    With hedging enabled, an API model request that is still running after
+    the model's usual latency (a percentile of its recent latencies) gets a
+    duplicate request to the same model, or to its fallback model. The first
+    successful answer is used and the other request is cancelled. See
+    llm_runner.hedging.
+
+    Attributes:
+        enabled: Hedge slow requests (default: True when the section is present)
+        percentile: Latency percentile after which a request is hedged (default: 0.95)
+        min_samples: Latencies a model needs before its requests are hedged (default: 20)
+        min_delay_seconds: Never hedge earlier than this (default: 2.0)
+        max_hedge_fraction: At most this share of a run's requests is hedged
+                            (default: 0.1, at least one hedge per run)
+        max_extra_cost_usd: Optional cap on the estimated cost of duplicate
+                            requests per run (default: none)
+        fallback_models: Hedge target per model, "provider/model" to
+                         "provider/model" (default: hedge to the same model)
+    """
+
+    enabled: bool = True
+    percentile: float = 0.95
+    min_samples: int = 20
+    min_delay_seconds: float = 2.0
+    max_hedge_fraction: float = 0.1
+    max_extra_cost_usd: float | None = None
+    fallback_models: dict[str, str] = {}
+
+    @field_validator("percentile")
+    @classmethod
+    def validate_percentile(cls, v: float) -> float:
+        """Validate percentile is a fraction."""
+        if not 0.5 <= v < 1:
+            raise ValueError(f"percentile must be between 0.5 and 1 (exclusive), got: {v}")
+        return v
+
+    @field_validator("min_samples")
+    @classmethod
+    def validate_min_samples(cls, v: int) -> int:
+        """Validate min_samples is positive."""
+        if v < 1:
+            raise ValueError(f"min_samples must be at least 1, got: {v}")
+        return v
+
+    @field_validator("min_delay_seconds", "max_extra_cost_usd")
+    @classmethod
+    def validate_non_negative(cls, v: float | None) -> float | None:
+        """Validate delays and costs are not negative."""
+        if v is not None and v < 0:
+            raise ValueError(f"must be non-negative, got: {v}")
+        return v
+
+    @field_validator("max_hedge_fraction")
+    @classmethod
+    def validate_max_hedge_fraction(cls, v: float) -> float:
+        """Validate max_hedge_fraction is a fraction."""
+        if not 0 < v <= 1:
+            raise ValueError(f"max_hedge_fraction must be between 0 and 1, got: {v}")
+        return v
+
+    @field_validator("fallback_models")
+    @classmethod
+    def validate_fallback_models(cls, v: dict[str, str]) -> dict[str, str]:
+        """Validate fallback models are written as provider/model."""
+        for model_key in [*v.keys(), *v.values()]:
+            provider, _, model_name = model_key.partition("/")
+            if not provider or not model_name:
+                raise ValueError(
+                    f"fallback_models entries must be 'provider/model', got: {model_key!r}"
+                )
+        return v
+
+
 class RunnerConfig(BaseModel):
     """
     Unified runner configuration for API-based and browser-based runners.
@@ -258,6 +533,24 @@ class RunSettings(BaseModel):
                          Optional - if empty, operations fall back to models list
         use_llm_rank_extraction: Enable LLM-assisted ranking (slower, more accurate)
         budget: Optional budget controls to prevent runaway costs
+        artifact_backend: How per-query JSON artifacts are stored (default: "files")
+                         "files": one pretty-printed JSON file per artifact
+                         "packed": one compressed JSONL archive per run with an
+                         offset index (see storage.artifact_store)
+        retention: Optional retention tiers; when set, expired data is pruned
+                   and rolled up automatically after runs (see storage.maintenance)
+        incremental: Optional incremental mode; when enabled, queries answered
+                     within the staleness window are carried forward instead
+                     of re-queried (see llm_runner.incremental)
+        sampling: Optional sequential sampling; when enabled, API model queries
+                  are repeated until visibility intervals are narrow enough
+                  (see llm_runner.sampling)
+        streaming: Optional streaming; when enabled, API model answers are
+                   streamed with live mention detection, time-to-first-token
+                   and an optional length cap (see llm_runner.streaming)
+        hedging: Optional request hedging; when enabled, slow API model
+                 requests are duplicated to the same or a fallback model
+                 and the first answer wins (see llm_runner.hedging)
     """
 
     output_dir: str
@@ -268,6 +561,12 @@ class RunSettings(BaseModel):
     operation_models: list[ModelConfig] = []  # Models used only for operations
     use_llm_rank_extraction: bool = False
     budget: BudgetConfig | None = None
+    artifact_backend: Literal["files", "packed"] = "files"
+    retention: RetentionConfig | None = None
+    incremental: IncrementalConfig | None = None
+    sampling: SamplingConfig | None = None
+    streaming: StreamingConfig | None = None
+    hedging: HedgingConfig | None = None
 
     @field_validator("output_dir")
     @classmethod
@@ -620,6 +919,56 @@ class Operation(BaseModel):
 
         return self
 
+    @model_validator(mode="after")
+    def validate_templates(self) -> "Operation":
+        """
+        Compile the prompt and condition templates.
+
+        Compiling here validates them once at config-load time and warms the
+        cache the operation executor renders from. A condition with none of
+        the compiled shapes is kept (evaluated after rendering, as before
+        compilation) with a warning.
+        """
+        from llm_answer_watcher.config.template_compiler import (
+            CONDITION_UNSUPPORTED,
+            compile_condition,
+            compile_template,
+        )
+
+        unknown = list(compile_template(self.prompt).unknown_variables)
+        if self.condition:
+            condition = compile_condition(self.condition)
+            if condition.kind == CONDITION_UNSUPPORTED:
+                logger.warning(
+                    f"Operation '{self.id}' has a condition that is not compiled: "
+                    f"{self.condition!r}. It is evaluated after rendering; prefer "
+                    '"{rank:mine} == null", "{rank:mine} > 3" (==, !=, >, <, >=, <=) '
+                    'or "{competitors:mentioned} contains \"Name\""'
+                )
+            unknown.extend(condition.unknown_variables)
+
+        if unknown:
+            # Unknown placeholders are left as literal text when rendering
+            logger.warning(
+                f"Operation '{self.id}' uses unknown template variables: "
+                f"{', '.join('{' + v + '}' for v in dict.fromkeys(unknown))}"
+            )
+
+        return self
+
+    @property
+    def operation_refs(self) -> list[str]:
+        """Operation IDs referenced with {operation:id} in prompt or condition."""
+        from llm_answer_watcher.config.template_compiler import (
+            compile_condition,
+            compile_template,
+        )
+
+        refs = list(compile_template(self.prompt).operation_refs)
+        if self.condition:
+            refs.extend(compile_condition(self.condition).operation_refs)
+        return list(dict.fromkeys(refs))
+
 
 class Intent(BaseModel):
     """
@@ -632,11 +981,14 @@ class Intent(BaseModel):
         id: Unique identifier slug (alphanumeric, hyphens, underscores)
         prompt: The actual question to ask the LLM
         operations: Optional list of custom operations to run after this intent completes
+        max_age_minutes: Optional staleness window for incremental runs,
+                         overriding run_settings.incremental.max_age_minutes
     """
 
     id: str
     prompt: str
     operations: list[Operation] = []
+    max_age_minutes: int | None = None
 
     @field_validator("id")
     @classmethod
@@ -676,6 +1028,14 @@ class Intent(BaseModel):
             )
         return v
 
+    @field_validator("max_age_minutes")
+    @classmethod
+    def validate_max_age(cls, v: int | None) -> int | None:
+        """Validate staleness window is at least one minute if specified."""
+        if v is not None and v < 1:
+            raise ValueError(f"max_age_minutes must be at least 1, got: {v}")
+        return v
+
     @field_validator("operations")
     @classmethod
     def validate_operations(cls, v: list[Operation]) -> list[Operation]:
@@ -823,7 +1183,8 @@ class WatcherConfig(BaseModel):
 
         Checks:
         1. All operation IDs are unique across global_operations and all intents
-        2. All depends_on references point to valid operation IDs
+        2. All depends_on and {operation:id} references point to valid
+           operation IDs
         3. No circular dependencies exist
 
         Raises:
@@ -859,6 +1220,12 @@ class WatcherConfig(BaseModel):
                         f"Operation '{op_id}' depends on '{dep_id}' "
                         "which does not exist"
                     )
+            for ref_id in op.operation_refs:
+                if ref_id not in all_operations:
+                    raise ValueError(
+                        f"Operation '{op_id}' references {{operation:{ref_id}}} "
+                        "which does not exist"
+                    )
 
         # Detect circular dependencies using DFS
         def has_cycle(op_id: str, visited: set[str], rec_stack: set[str]) -> bool:
@@ -915,6 +1282,7 @@ class RuntimeModel(BaseModel):
         system_prompt: Resolved system prompt text (loaded from JSON file or default)
         tools: Optional list of tool configurations (e.g., [{"type": "web_search"}])
         tool_choice: Tool selection mode ("auto", "required", "none")
+        base_url: Optional API base URL override (None = provider default)
     """
 
     provider: str
@@ -923,6 +1291,7 @@ class RuntimeModel(BaseModel):
     system_prompt: str = "You are a helpful AI assistant."
     tools: list[dict] | None = None
     tool_choice: str = "auto"
+    base_url: str | None = None
 
     @field_validator("provider")
     @classmethod
@@ -969,12 +1338,14 @@ class RuntimeExtractionModel(BaseModel):
         model_name: Specific model identifier (e.g., "gpt-5-nano")
         api_key: Resolved API key from environment (NEVER log this)
         system_prompt: Resolved system prompt text
+        base_url: Optional API base URL override (None = provider default)
     """
 
     provider: str
     model_name: str
     api_key: str
     system_prompt: str = "You are a brand mention extraction assistant."
+    base_url: str | None = None
 
     @field_validator("provider")
     @classmethod
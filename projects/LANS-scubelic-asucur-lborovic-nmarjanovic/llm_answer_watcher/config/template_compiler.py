@@ -0,0 +1,372 @@
+"""
+Compiled operation prompt templates and conditions.
+
+Operation prompts and conditions are fixed by the config, but they are
+rendered once per (intent, model, operation). Rendering used to run one
+str.replace() pass over the whole prompt per variable, after the answer
+text had already been substituted, so every pass re-scanned the (possibly
+long) answer. Conditions were re-rendered and re-parsed with regexes on
+every evaluation.
+
+This module compiles each template once into segments of literal text and
+variable resolvers, rendered in a single pass with one join, and each
+condition into a predicate closure. Compilation is cached per source
+string, so the config validators and the operation executor share it.
+
+Substituted values are never re-scanned: a "{brand:mine}" that appears
+inside an answer stays literal text in the rendered prompt.
+
+Compiling also validates templates at config-load time:
+- Unknown variables are reported (they are left literal when rendering)
+- {operation:id} references are collected for the config to check
+- Conditions that don't match a supported shape are rejected
+
+Supported conditions:
+    {rank:mine} == null
+    {rank:mine} > 3            (==, !=, >, <, >=, <= against an integer)
+    {competitors:mentioned} contains "HubSpot"
+
+Example:
+    >>> template = compile_template("Improve {brand:mine} (rank {rank:mine})")
+    >>> template.render(context)
+    'Improve Instantly.ai (rank 3)'
+    >>> compile_condition("{rank:mine} > 1")(context)
+    True
+"""
+
+import logging
+import operator
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# {namespace:name}; operation IDs are slugs, variable names are identifiers
+_PLACEHOLDER = re.compile(r"\{([a-z]+):([A-Za-z0-9_-]+)\}")
+
+# Condition shapes, matched against the condition source before rendering
+_NULL_CHECK = re.compile(r"\s*(?P<left>.+?)\s*==\s*null\s*")
+_COMPARISON = re.compile(r"\s*(?P<left>.+?)\s*(?P<op>==|!=|>=|<=|>|<)\s*(?P<right>\d+)\s*")
+_CONTAINS = " contains "
+
+_COMPARATORS: dict[str, Callable[[int, int], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+CONDITION_NULL = "null"
+CONDITION_COMPARISON = "comparison"
+CONDITION_CONTAINS = "contains"
+CONDITION_UNSUPPORTED = "unsupported"
+
+OPERATION_NAMESPACE = "operation"
+
+# Rendered value of {rank:mine} when my brand was not ranked
+RANK_NOT_FOUND = "not found"
+
+
+# ============================================================================
+# VARIABLE RESOLVERS
+# ============================================================================
+
+
+def _joined(source: str, key: str) -> Callable[[Any], str]:
+    """Resolver joining a list from the context with ", "."""
+
+    def resolve(context: Any) -> str:
+        return ", ".join(getattr(context, source).get(key, []))
+
+    return resolve
+
+
+def _value(source: str, key: str, default: str = "") -> Callable[[Any], str]:
+    """Resolver reading a string from the context."""
+
+    def resolve(context: Any) -> str:
+        return getattr(context, source).get(key, default)
+
+    return resolve
+
+
+def _my_rank(context: Any) -> str:
+    rank = context.extraction_data.get("my_rank")
+    return str(rank) if rank is not None else RANK_NOT_FOUND
+
+
+# Context is an OperationContext (duck-typed: config must not import llm_runner)
+_RESOLVERS: dict[str, Callable[[Any], str]] = {
+    "brand:mine": _value("extraction_data", "my_brand", "unknown"),
+    "brand:mine_all": _joined("extraction_data", "my_brand_aliases"),
+    "brand:competitors": _joined("extraction_data", "competitors"),
+    "competitors:mentioned": _joined("extraction_data", "competitors_mentioned"),
+    "intent:id": _value("intent_data", "id"),
+    "intent:prompt": _value("intent_data", "prompt"),
+    "intent:response": _value("intent_data", "response"),
+    "rank:mine": _my_rank,
+    "mentions:mine": _joined("extraction_data", "my_mentions"),
+    "mentions:competitors": _joined("extraction_data", "competitor_mentions"),
+    "model:provider": _value("model_info", "provider"),
+    "model:name": _value("model_info", "name"),
+    "run:id": _value("run_metadata", "run_id"),
+    "run:timestamp": _value("run_metadata", "timestamp"),
+}
+
+
+def known_variables() -> list[str]:
+    """Names of all template variables, for error messages."""
+    return [*_RESOLVERS, f"{OPERATION_NAMESPACE}:<id>"]
+
+
+def _operation_result(operation_id: str, placeholder: str) -> Callable[[Any], str]:
+    """Resolver for {operation:id}; left literal until that operation has run."""
+
+    def resolve(context: Any) -> str:
+        return context.operation_results.get(operation_id, placeholder)
+
+    return resolve
+
+
+# ============================================================================
+# TEMPLATES
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    Template split into literal text and variable resolvers.
+
+    Attributes:
+        source: Template as written in the config
+        segments: (literal, resolver) pairs; resolver is None for the trailing
+            literal
+        operation_refs: Operation IDs referenced with {operation:id}
+        unknown_variables: Placeholders that are not template variables (left
+            literal when rendering)
+    """
+
+    source: str
+    segments: tuple[tuple[str, Callable[[Any], str] | None], ...]
+    operation_refs: tuple[str, ...] = ()
+    unknown_variables: tuple[str, ...] = ()
+
+    def render(self, context: Any) -> str:
+        """
+        Render the template in a single pass.
+
+        Args:
+            context: OperationContext with the values to substitute
+
+        Returns:
+            Rendered text
+        """
+        if len(self.segments) == 1 and self.segments[0][1] is None:
+            return self.source
+        parts = []
+        for literal, resolve in self.segments:
+            parts.append(literal)
+            if resolve is not None:
+                parts.append(resolve(context))
+        return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template: str) -> CompiledTemplate:
+    """
+    Compile a prompt template (cached per template string).
+
+    Args:
+        template: Template with {namespace:name} placeholders
+
+    Returns:
+        CompiledTemplate
+    """
+    segments: list[tuple[str, Callable[[Any], str] | None]] = []
+    operation_refs: list[str] = []
+    unknown: list[str] = []
+    # Unknown placeholders stay in the pending literal
+    pending: list[str] = []
+    position = 0
+
+    for match in _PLACEHOLDER.finditer(template):
+        pending.append(template[position : match.start()])
+        position = match.end()
+        namespace, name = match.groups()
+        variable = f"{namespace}:{name}"
+        if namespace == OPERATION_NAMESPACE:
+            resolve = _operation_result(name, match.group(0))
+            if name not in operation_refs:
+                operation_refs.append(name)
+        elif variable in _RESOLVERS:
+            resolve = _RESOLVERS[variable]
+        else:
+            pending.append(match.group(0))
+            if variable not in unknown:
+                unknown.append(variable)
+            continue
+        segments.append(("".join(pending), resolve))
+        pending = []
+
+    pending.append(template[position:])
+    segments.append(("".join(pending), None))
+    return CompiledTemplate(
+        source=template,
+        segments=tuple(segments),
+        operation_refs=tuple(operation_refs),
+        unknown_variables=tuple(unknown),
+    )
+
+
+# ============================================================================
+# CONDITIONS
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """
+    Condition compiled into a predicate.
+
+    Attributes:
+        source: Condition as written in the config
+        kind: CONDITION_NULL, CONDITION_COMPARISON, CONDITION_CONTAINS or
+            CONDITION_UNSUPPORTED
+        predicate: Function of an OperationContext returning the result
+        templates: Templates rendered by the predicate (for validation)
+    """
+
+    source: str
+    kind: str
+    predicate: Callable[[Any], bool]
+    templates: tuple[CompiledTemplate, ...] = ()
+
+    def __call__(self, context: Any) -> bool:
+        return self.predicate(context)
+
+    @property
+    def operation_refs(self) -> tuple[str, ...]:
+        return tuple(ref for t in self.templates for ref in t.operation_refs)
+
+    @property
+    def unknown_variables(self) -> tuple[str, ...]:
+        return tuple(var for t in self.templates for var in t.unknown_variables)
+
+
+def evaluate_rendered_condition(condition: str, rendered: str) -> bool:
+    """
+    Evaluate an already rendered condition of any shape.
+
+    Fallback for conditions that don't compile to a supported shape; kept
+    for conditions that bypass config validation.
+
+    Args:
+        condition: Condition source (for the warning)
+        rendered: Condition with variables substituted
+
+    Returns:
+        Result of the condition, True if it is not understood
+    """
+    if "== null" in rendered:
+        return f"{RANK_NOT_FOUND} == null" in rendered
+
+    match = re.match(r"(\d+|not found)\s*(==|!=|>|<|>=|<=)\s*(\d+)", rendered)
+    if match:
+        left, op, right = match.groups()
+        if left == RANK_NOT_FOUND:
+            return False  # Can't compare non-numeric
+        return _COMPARATORS[op](int(left), int(right))
+
+    if _CONTAINS in rendered:
+        parts = rendered.split(_CONTAINS)
+        if len(parts) == 2:
+            haystack = parts[0].strip()
+            needle = parts[1].strip().strip('"').strip("'")
+            return needle in haystack
+
+    # Default: condition not understood, don't skip
+    logger.warning(f"Could not evaluate condition: {condition} (rendered: {rendered})")
+    return True
+
+
+def _null_check(left: CompiledTemplate) -> Callable[[Any], bool]:
+    def predicate(context: Any) -> bool:
+        return left.render(context).strip() == RANK_NOT_FOUND
+
+    return predicate
+
+
+def _comparison(
+    condition: str, left: CompiledTemplate, op: str, right: int
+) -> Callable[[Any], bool]:
+    compare = _COMPARATORS[op]
+
+    def predicate(context: Any) -> bool:
+        value = left.render(context).strip()
+        if value.isdigit():
+            return compare(int(value), right)
+        if value == RANK_NOT_FOUND:
+            return False  # Can't compare non-numeric
+        logger.warning(f"Could not evaluate condition: {condition} (left side: {value})")
+        return True
+
+    return predicate
+
+
+def _contains(haystack: CompiledTemplate, needle: CompiledTemplate) -> Callable[[Any], bool]:
+    def predicate(context: Any) -> bool:
+        value = needle.render(context).strip().strip('"').strip("'")
+        return value in haystack.render(context).strip()
+
+    return predicate
+
+
+def _unsupported(condition: str, template: CompiledTemplate) -> Callable[[Any], bool]:
+    def predicate(context: Any) -> bool:
+        return evaluate_rendered_condition(condition, template.render(context))
+
+    return predicate
+
+
+@lru_cache(maxsize=1024)
+def compile_condition(condition: str) -> CompiledCondition:
+    """
+    Compile a condition into a predicate (cached per condition string).
+
+    Args:
+        condition: Condition with {namespace:name} placeholders
+
+    Returns:
+        CompiledCondition; kind is CONDITION_UNSUPPORTED if the condition
+        has none of the supported shapes (it is then evaluated like before
+        compilation, after rendering)
+    """
+    match = _NULL_CHECK.fullmatch(condition)
+    if match:
+        left = compile_template(match.group("left"))
+        return CompiledCondition(condition, CONDITION_NULL, _null_check(left), (left,))
+
+    match = _COMPARISON.fullmatch(condition)
+    if match:
+        left = compile_template(match.group("left"))
+        predicate = _comparison(condition, left, match.group("op"), int(match.group("right")))
+        return CompiledCondition(condition, CONDITION_COMPARISON, predicate, (left,))
+
+    parts = condition.split(_CONTAINS)
+    if len(parts) == 2 and parts[0].strip() and parts[1].strip():
+        haystack = compile_template(parts[0])
+        needle = compile_template(parts[1])
+        return CompiledCondition(
+            condition, CONDITION_CONTAINS, _contains(haystack, needle), (haystack, needle)
+        )
+
+    template = compile_template(condition)
+    return CompiledCondition(
+        condition, CONDITION_UNSUPPORTED, _unsupported(condition, template), (template,)
+    )
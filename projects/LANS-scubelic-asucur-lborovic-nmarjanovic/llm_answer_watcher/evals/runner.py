@@ -3,17 +3,41 @@ Evaluation runner for the LLM Answer Watcher evaluation framework.
 
 This module provides the main orchestrator function `run_eval_suite()` that
 loads test cases, executes the evaluation pipeline, and returns results.
+
+Test cases are independent, so large suites are evaluated in a process pool
+(extraction is CPU-bound regex work). With an eval database, cases whose
+fingerprint (case content, brands and extractor code) matches their last
+stored result are not evaluated again; the stored result is reused.
+
+Each result carries the time spent in extraction. The suite fails on slow
+extraction (p95 over EXTRACTION_LATENCY_P95_THRESHOLD_MS, or a regression
+against the last stored run) just like on quality regressions.
 """
 
-import sqlite3
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
+from pydantic import ValidationError
 
 from ..extractor.mention_detector import detect_mentions
 from ..extractor.rank_extractor import extract_ranked_list_pattern
-from ..storage.eval_db import init_eval_db_if_needed, store_eval_results
+from ..storage.connection import read_connection, write_connection
+from ..storage.eval_db import (
+    get_cached_eval_results,
+    get_recent_eval_runs,
+    init_eval_db_if_needed,
+    store_eval_results,
+)
 from .metrics import (
     compute_completeness_metrics,
     compute_mention_metrics,
@@ -54,6 +78,24 @@ FALSE_IS_MINE_VIOLATIONS_THRESHOLD = (
 # Overall evaluation thresholds
 MINIMUM_PASS_RATE = 0.75  # 75% - At least 75% of test cases must pass overall
 
+# Extraction performance thresholds (violations are critical)
+EXTRACTION_LATENCY_P95_THRESHOLD_MS = 250.0  # p95 time in extraction per case
+# A run regresses if its p95 exceeds the last stored run's p95 by this factor...
+EXTRACTION_LATENCY_REGRESSION_FACTOR = 2.0
+# ...plus this slack, so jitter on sub-millisecond cases doesn't fail the suite
+EXTRACTION_LATENCY_REGRESSION_SLACK_MS = 5.0
+
+LATENCY_P95_METRIC = "extraction_latency_p95_ms"
+LATENCY_REGRESSION_METRIC = "extraction_latency_regression"
+
+# Below this many cases to evaluate, process startup costs more than it saves
+PARALLEL_MIN_CASES = 64
+
+# Sources whose changes invalidate stored results (relative to the package)
+_FINGERPRINT_SOURCES = ("extractor/*.py", "evals/metrics.py", "evals/runner.py")
+
+logger = logging.getLogger(__name__)
+
 
 def load_test_cases(fixtures_path: str | Path) -> list[EvalTestCase]:
     """
@@ -92,6 +134,50 @@ def load_test_cases(fixtures_path: str | Path) -> list[EvalTestCase]:
     return test_cases
 
 
+@lru_cache(maxsize=1)
+def extractor_code_version() -> str:
+    """
+    SHA256 of the extractor and metric sources.
+
+    Part of every case fingerprint: any change to extraction or scoring code
+    invalidates all stored results, without a version to bump by hand.
+
+    Returns:
+        Hex digest
+    """
+    package_root = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256()
+    for pattern in _FINGERPRINT_SOURCES:
+        for path in sorted(package_root.glob(pattern)):
+            digest.update(path.relative_to(package_root).as_posix().encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def case_fingerprint(test_case: EvalTestCase) -> str:
+    """
+    Fingerprint of everything that shapes a test case's result.
+
+    Covers the fixture content (answer text, expected outputs), the brand
+    configuration and extractor_code_version().
+
+    Args:
+        test_case: The test case
+
+    Returns:
+        Hex digest
+    """
+    data = {
+        "case": test_case.model_dump(exclude={"brands_mine", "brands_competitors"}),
+        "brands": {
+            "mine": test_case.brands_mine,
+            "competitors": test_case.brands_competitors,
+        },
+        "extractor": extractor_code_version(),
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
 def evaluate_single_test_case(
     test_case: EvalTestCase,
 ) -> EvalResult:
@@ -102,8 +188,11 @@ def evaluate_single_test_case(
         test_case: The test case to evaluate
 
     Returns:
-        EvalResult containing all computed metrics for this test case
+        EvalResult containing all computed metrics for this test case and the
+        time spent in extraction
     """
+    start = time.perf_counter()
+
     # Detect brand mentions
     mention_result = detect_mentions(
         answer_text=test_case.llm_answer_text,
@@ -117,6 +206,7 @@ def evaluate_single_test_case(
         text=test_case.llm_answer_text,
         known_brands=all_brands,
     )
+    extraction_latency_ms = (time.perf_counter() - start) * 1000
 
     # Gather all detected mentions for metrics computation (use original text as it appeared)
     actual_mentions = [mention.original_text for mention in mention_result]
@@ -145,10 +235,127 @@ def evaluate_single_test_case(
         test_description=test_case.description,
         metrics=all_metrics,
         overall_passed=overall_passed,
+        extraction_latency_ms=extraction_latency_ms,
     )
 
 
-def check_evaluation_thresholds(results: list[EvalResult]) -> dict[str, Any]:
+def _evaluate_case(test_case: EvalTestCase, fingerprint: str | None = None) -> EvalResult:
+    """Evaluate one case, turning exceptions into a failed result (pool worker)."""
+    try:
+        result = evaluate_single_test_case(test_case)
+    except Exception as e:
+        logger.warning(f"Test case '{test_case.description}' raised: {e}")
+        # Create a failure result for test cases that throw exceptions
+        # (no fingerprint: it is evaluated again next run)
+        return EvalResult(
+            test_description=test_case.description,
+            metrics=[],
+            overall_passed=False,
+        )
+    result.case_fingerprint = fingerprint
+    return result
+
+
+def _evaluate_cases(
+    test_cases: list[EvalTestCase], fingerprints: list[str], workers: int
+) -> list[EvalResult]:
+    """Evaluate cases in order, in a process pool when there are enough of them."""
+    if workers > 1 and len(test_cases) >= PARALLEL_MIN_CASES:
+        # A few chunks per worker: low IPC overhead, still balanced
+        chunksize = max(1, math.ceil(len(test_cases) / (workers * 4)))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(
+                    executor.map(_evaluate_case, test_cases, fingerprints, chunksize=chunksize)
+                )
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Process pool unavailable ({e}), evaluating sequentially")
+    return [_evaluate_case(case, fp) for case, fp in zip(test_cases, fingerprints, strict=True)]
+
+
+def _load_cached_results(
+    db_path: str, test_cases: list[EvalTestCase], fingerprints: list[str]
+) -> tuple[dict[int, EvalResult], float | None]:
+    """
+    Stored results of unchanged cases, and the last run's p95 latency.
+
+    Returns:
+        ({index in test_cases: cached EvalResult}, baseline p95 or None)
+    """
+    init_eval_db_if_needed(db_path)
+    with read_connection(db_path) as conn:
+        stored = get_cached_eval_results(conn, [case.description for case in test_cases])
+        recent = get_recent_eval_runs(conn, limit=1)
+
+    cached = {}
+    for index, (case, fingerprint) in enumerate(zip(test_cases, fingerprints, strict=True)):
+        entry = stored.get(case.description)
+        if entry is None or entry[0] != fingerprint:
+            continue
+        try:
+            result = EvalResult.model_validate_json(entry[1])
+        except ValidationError:
+            continue  # Stored by an incompatible version: evaluate again
+        result.cached = True
+        cached[index] = result
+
+    baseline = None
+    if recent:
+        baseline = recent[0]["summary"].get("latency", {}).get("p95_ms") or None
+    return cached, baseline
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of values (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(max(math.ceil(pct / 100 * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize_latency(results: list[EvalResult]) -> dict[str, Any]:
+    """
+    Summarize per-case extraction latency.
+
+    Cached results keep the latency measured when they were evaluated (with
+    the same extractor code).
+
+    Args:
+        results: Evaluation results
+
+    Returns:
+        Dictionary with measured_cases, mean_ms, p50_ms, p95_ms and max_ms
+    """
+    latencies = [
+        r.extraction_latency_ms for r in results if r.extraction_latency_ms is not None
+    ]
+    return {
+        "measured_cases": len(latencies),
+        "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "max_ms": max(latencies, default=0.0),
+    }
+
+
+def _latency_violation(metric: str, value: float, threshold: float) -> dict[str, Any]:
+    """Threshold violation for a latency above its limit (always critical)."""
+    return {
+        "metric": metric,
+        "average": value,
+        "threshold": threshold,
+        "gap": value - threshold,
+        "gap_percent": (value - threshold) / threshold * 100,
+        "severity": "critical",
+        "direction": "above",
+    }
+
+
+def check_evaluation_thresholds(
+    results: list[EvalResult],
+    baseline_latency_p95_ms: float | None = None,
+) -> dict[str, Any]:
     """
     Check evaluation results against defined quality thresholds.
 
@@ -156,14 +363,22 @@ def check_evaluation_thresholds(results: list[EvalResult]) -> dict[str, Any]:
     defined by the threshold constants. It provides detailed feedback about which
     metrics are failing and by how much.
 
+    Extraction latency is checked too: a p95 above
+    EXTRACTION_LATENCY_P95_THRESHOLD_MS, or above the baseline run's p95 by
+    more than EXTRACTION_LATENCY_REGRESSION_FACTOR (plus slack), is a
+    critical violation.
+
     Args:
         results: List of EvalResult objects from run_eval_suite()
+        baseline_latency_p95_ms: p95 extraction latency of the last stored
+            run, for regression detection (skipped if None)
 
     Returns:
         Dictionary containing:
         - 'passes_thresholds': bool - Whether evaluation meets all quality thresholds
         - 'pass_rate': float - Overall pass rate
         - 'threshold_violations': list[dict] - Details of metric failures
+        - 'latency': dict - Extraction latency summary (see summarize_latency())
         - 'summary': dict - Summary statistics about threshold compliance
     """
     total_cases = len(results)
@@ -236,6 +451,28 @@ def check_evaluation_thresholds(results: list[EvalResult]) -> dict[str, Any]:
                     }
                 )
 
+    # Check extraction performance
+    latency = summarize_latency(results)
+    if latency["measured_cases"]:
+        p95 = latency["p95_ms"]
+        latency_limits = {LATENCY_P95_METRIC: EXTRACTION_LATENCY_P95_THRESHOLD_MS}
+        if baseline_latency_p95_ms is not None:
+            latency_limits[LATENCY_REGRESSION_METRIC] = (
+                baseline_latency_p95_ms * EXTRACTION_LATENCY_REGRESSION_FACTOR
+                + EXTRACTION_LATENCY_REGRESSION_SLACK_MS
+            )
+        for metric_name, limit in latency_limits.items():
+            passes = p95 <= limit
+            metric_summary[metric_name] = {
+                "average": p95,
+                "threshold": limit,
+                "passes": passes,
+                "gap": p95 - limit if not passes else 0.0,
+                "gap_percent": (p95 - limit) / limit * 100 if not passes else 0.0,
+            }
+            if not passes:
+                threshold_violations.append(_latency_violation(metric_name, p95, limit))
+
     # Check for critical failures (any critical metric below threshold)
     critical_violations = [
         v for v in threshold_violations if v.get("severity") == "critical"
@@ -252,6 +489,7 @@ def check_evaluation_thresholds(results: list[EvalResult]) -> dict[str, Any]:
         "critical_violations": len(critical_violations),
         "metric_summary": metric_summary,
         "average_scores": average_scores,
+        "latency": latency,
         "summary": {
             "overall_status": "PASS" if passes_thresholds else "FAIL",
             "pass_rate_threshold": MINIMUM_PASS_RATE,
@@ -268,6 +506,8 @@ def check_evaluation_thresholds(results: list[EvalResult]) -> dict[str, Any]:
 
 def run_eval_suite(
     fixtures_path: str | Path,
+    workers: int | None = None,
+    cache_db_path: str | None = None,
 ) -> dict[str, Any]:
     """
     Run the complete evaluation suite on all test cases.
@@ -278,33 +518,43 @@ def run_eval_suite(
 
     Args:
         fixtures_path: Path to YAML file containing test cases
+        workers: Worker processes for evaluation (default: CPU count). Suites
+            smaller than PARALLEL_MIN_CASES are evaluated in-process.
+        cache_db_path: Eval database to reuse stored results from. Cases
+            whose fingerprint matches their last stored result are not
+            evaluated again, and the last run's latency is the baseline for
+            regression checks. Results are only stored by store_eval_results().
 
     Returns:
         Dictionary containing:
         - 'results': List of EvalResult objects for each test case
-        - 'summary': Overall statistics (pass rate, average scores, etc.)
+        - 'summary': Overall statistics (pass rate, average scores, latency, etc.)
+        - 'threshold_check': Quality and performance threshold results
         - 'total_test_cases': Number of test cases evaluated
         - 'total_passed': Number of test cases that passed overall
+        - 'cached_cases': Number of results reused from the eval database
     """
     # Load test cases
     test_cases = load_test_cases(fixtures_path)
-
-    # Evaluate each test case
-    results = []
-    for test_case in test_cases:
-        try:
-            result = evaluate_single_test_case(test_case)
-            results.append(result)
-        except Exception as e:
-            # Create a failure result for test cases that throw exceptions
-            failure_result = EvalResult(
-                test_description=test_case.description,
-                metrics=[],
-                overall_passed=False,
-            )
-            # Note: In a real implementation, you might want to include the error
-            # information in the result, but the current schema doesn't support it
-            results.append(failure_result)
+    fingerprints = [case_fingerprint(case) for case in test_cases]
+
+    cached: dict[int, EvalResult] = {}
+    baseline_latency = None
+    if cache_db_path is not None:
+        cached, baseline_latency = _load_cached_results(cache_db_path, test_cases, fingerprints)
+
+    # Evaluate the remaining test cases
+    pending = [i for i in range(len(test_cases)) if i not in cached]
+    evaluated = _evaluate_cases(
+        [test_cases[i] for i in pending],
+        [fingerprints[i] for i in pending],
+        workers if workers is not None else (os.cpu_count() or 1),
+    )
+    results_by_index = {**cached, **dict(zip(pending, evaluated, strict=True))}
+    results = [results_by_index[i] for i in range(len(test_cases))]
+    logger.info(
+        f"Evaluated {len(pending)} test case(s), reused {len(cached)} stored result(s)"
+    )
 
     # Compute summary statistics
     total_test_cases = len(results)
@@ -330,13 +580,15 @@ def run_eval_suite(
     summary = {
         "pass_rate": pass_rate,
         "average_scores": average_scores,
+        "latency": summarize_latency(results),
         "total_test_cases": total_test_cases,
         "total_passed": total_passed,
         "total_failed": total_test_cases - total_passed,
+        "cached_cases": len(cached),
     }
 
-    # Check results against quality thresholds
-    threshold_check = check_evaluation_thresholds(results)
+    # Check results against quality and performance thresholds
+    threshold_check = check_evaluation_thresholds(results, baseline_latency)
 
     return {
         "results": results,
@@ -344,6 +596,7 @@ def run_eval_suite(
         "threshold_check": threshold_check,
         "total_test_cases": total_test_cases,
         "total_passed": total_passed,
+        "cached_cases": len(cached),
     }
 
 
@@ -424,6 +677,7 @@ def write_eval_results(
     summary = {
         "pass_rate": pass_rate,
         "average_scores": average_scores,
+        "latency": summarize_latency(results),
         "total_test_cases": total_test_cases,
         "total_passed": total_passed,
         "total_failed": total_failed,
@@ -438,7 +692,7 @@ def write_eval_results(
     }
 
     # Store results in database
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         run_id = store_eval_results(conn, eval_results_dict, eval_run_id)
         conn.commit()
 
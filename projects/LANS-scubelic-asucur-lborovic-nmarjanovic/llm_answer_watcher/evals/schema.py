@@ -127,6 +127,15 @@ class EvalResult(BaseModel):
     overall_passed: bool = Field(
         ..., description="Whether the test case passed overall"
     )
+    extraction_latency_ms: float | None = Field(
+        None, ge=0.0, description="Time spent in mention and rank extraction"
+    )
+    case_fingerprint: str | None = Field(
+        None, description="Fingerprint of the case, brands and extractor code"
+    )
+    cached: bool = Field(
+        False, description="Whether the result was reused from a stored run"
+    )
 
     @field_validator("test_description")
     @classmethod
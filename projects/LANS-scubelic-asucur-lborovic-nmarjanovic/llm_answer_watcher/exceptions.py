@@ -242,7 +242,8 @@ class BudgetExceededError(LLMAnswerWatcherError):
     Attributes:
         estimated_cost: float - Estimated cost in USD
         budget_limit: float - Configured budget limit in USD
-        budget_type: str - Type of budget exceeded ("per_run" or "per_intent")
+        budget_type: str - Type of budget exceeded ("per_run", "per_intent",
+            or "per_user" for the API's per-tenant spend cap)
 
     Example:
         raise BudgetExceededError(
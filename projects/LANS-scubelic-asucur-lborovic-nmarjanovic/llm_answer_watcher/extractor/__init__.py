@@ -9,6 +9,7 @@ Public API:
     - detect_mentions: Detect brand mentions using word-boundary regex
     - create_brand_pattern: Create regex pattern for brand matching
     - normalize_brand_name: Get canonical brand name from aliases
+    - StreamingMentionDetector: Detect brand mentions on a streamed answer
 """
 
 from llm_answer_watcher.extractor.mention_detector import (
@@ -17,9 +18,11 @@ from llm_answer_watcher.extractor.mention_detector import (
     detect_mentions,
     normalize_brand_name,
 )
+from llm_answer_watcher.extractor.stream_detector import StreamingMentionDetector
 
 __all__ = [
     "BrandMention",
+    "StreamingMentionDetector",
     "create_brand_pattern",
     "detect_mentions",
     "normalize_brand_name",
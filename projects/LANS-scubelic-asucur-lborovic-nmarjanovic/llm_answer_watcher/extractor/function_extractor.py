@@ -38,7 +38,9 @@ import logging
 from dataclasses import dataclass
 
 from ..config.schema import Brands, RuntimeExtractionSettings
+from ..llm_runner.factory_cache import get_client
 from ..llm_runner.models import LLMResponse, build_client
+from ..utils.metrics import timed
 from .function_schemas import (
     EXTRACT_BRAND_MENTIONS_FUNCTION,
     validate_function_response,
@@ -190,6 +192,7 @@ def parse_function_call_response(llm_response: LLMResponse) -> dict:
     return function_call_data.get("arguments", {})
 
 
+@timed()
 async def extract_with_function_calling(
     answer_text: str,
     brands: Brands,
@@ -231,13 +234,15 @@ async def extract_with_function_calling(
     """
     # Build extraction client
     extraction_model = extraction_settings.extraction_model
-    client = build_client(
+    client = get_client(
+        build_client,
         provider=extraction_model.provider,
         model_name=extraction_model.model_name,
         api_key=extraction_model.api_key,
         system_prompt=extraction_model.system_prompt,
         tools=[EXTRACT_BRAND_MENTIONS_FUNCTION],
         tool_choice="required",  # FORCE function call
+        base_url=extraction_model.base_url,
     )
 
     # Build prompt with brand context
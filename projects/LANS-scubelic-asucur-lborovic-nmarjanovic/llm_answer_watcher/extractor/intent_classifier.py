@@ -40,15 +40,17 @@ Example:
 import hashlib
 import json
 import logging
-import sqlite3
 from dataclasses import dataclass
 
 from ..config.schema import RuntimeExtractionSettings
+from ..llm_runner.factory_cache import get_client
 from ..llm_runner.models import LLMResponse, build_client
+from ..storage.connection import read_connection, write_connection
 from ..storage.db import (
     lookup_intent_classification_cache,
     store_intent_classification_cache,
 )
+from ..utils import metrics
 from .function_schemas import (
     CLASSIFY_QUERY_INTENT_FUNCTION,
     validate_intent_classification_response,
@@ -276,10 +278,11 @@ async def classify_intent(
 
     # Check cache first
     try:
-        with sqlite3.connect(db_path) as conn:
+        with read_connection(db_path) as conn:
             cached_result = lookup_intent_classification_cache(conn, query_hash)
 
             if cached_result is not None:
+                metrics.inc("cache_hits_total", cache="intent_classification")
                 logger.info(
                     f"Intent classification cache HIT for {intent_id}: "
                     f"{cached_result['intent_type']}/{cached_result['buyer_stage']}/{cached_result['urgency_signal']} "
@@ -297,6 +300,7 @@ async def classify_intent(
                     extraction_cost_usd=0.0,  # Cache hit = 0 cost
                 )
 
+            metrics.inc("cache_misses_total", cache="intent_classification")
             logger.debug(
                 f"Intent classification cache MISS for {intent_id} (query_hash={query_hash[:16]}...)"
             )
@@ -309,13 +313,15 @@ async def classify_intent(
 
     # Build extraction client
     extraction_model = extraction_settings.extraction_model
-    client = build_client(
+    client = get_client(
+        build_client,
         provider=extraction_model.provider,
         model_name=extraction_model.model_name,
         api_key=extraction_model.api_key,
         system_prompt="You are an expert at classifying user search intent for SEO and marketing analysis.",
         tools=[CLASSIFY_QUERY_INTENT_FUNCTION],
         tool_choice="required",  # FORCE function call
+        base_url=extraction_model.base_url,
     )
 
     # Build prompt
@@ -343,7 +349,7 @@ async def classify_intent(
 
         # Store result in cache for future lookups
         try:
-            with sqlite3.connect(db_path) as conn:
+            with write_connection(db_path) as conn:
                 store_intent_classification_cache(
                     conn=conn,
                     query_hash=query_hash,
@@ -0,0 +1,319 @@
+"""
+Memoization of extraction results.
+
+parse_answer() gives the same ExtractionResult for the same answer text,
+brands and extraction settings, yet identical answers (repeated models,
+carried-forward and sampled answers, reparses) were parsed again every time,
+and with function-calling extraction every parse is a paid LLM call. The
+memo keeps extraction results keyed by:
+
+- answer_hash: SHA256 of the exact answer text (match positions depend on it)
+- config fingerprint: SHA256 of the brands, the extraction settings that
+  affect results (method, extraction model, fallback, confidence,
+  sentiment) and MEMO_VERSION
+
+Changing the brands or extraction settings changes the fingerprint, so old
+entries simply stop matching; bump MEMO_VERSION when parsing logic changes.
+
+Two tiers:
+- In-memory LRU (process-wide, DEFAULT_MAX_ENTRIES entries)
+- SQLite table extraction_memo in the run's database, shared by later runs
+  and processes (unused entries are pruned with retention.raw_answers_days)
+
+parse_answer() uses aget() and aput(), which run the database tier in a
+worker thread so the event loop keeps serving other queries. Lookups use a
+reader connection; the last_accessed_at updates of hits are queued and
+written with the next store, by flush() at the end of a run, or once
+TOUCH_BATCH_SIZE are pending.
+
+Entries hold the serialized result without its per-call fields (intent,
+model, timestamp), which parse_answer() fills in on a hit. A hit costs
+nothing, so its extraction_cost_usd is 0.0.
+
+Example:
+    >>> memo = get_extraction_memo()
+    >>> key = (answer_hash(text), extraction_fingerprint(brands, settings))
+    >>> await memo.aget(key, db_path) is None
+    True
+    >>> await memo.aput(key, payload, extraction_cost_usd=0.0004, db_path=db_path)
+    >>> await memo.aget(key, db_path) == payload
+    True
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from ..config.schema import Brands, RuntimeExtractionSettings
+from ..storage.connection import read_connection, write_connection
+from ..storage.db import lookup_extraction_memo, store_extraction_memo, touch_extraction_memo
+from ..utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Part of every fingerprint: bump to invalidate all entries after parser changes
+MEMO_VERSION = 1
+
+# Entries kept in the in-memory tier
+DEFAULT_MAX_ENTRIES = 4096
+
+# Pending last_accessed_at updates per database that trigger a write
+TOUCH_BATCH_SIZE = 256
+
+
+def answer_hash(answer_text: str) -> str:
+    """SHA256 of the exact answer text."""
+    return hashlib.sha256(answer_text.encode("utf-8")).hexdigest()
+
+
+def extraction_fingerprint(
+    brands: Brands,
+    extraction_settings: RuntimeExtractionSettings | None = None,
+    use_llm_extraction: bool = False,
+) -> str:
+    """
+    Fingerprint of everything besides the answer text that shapes a result.
+
+    Brand order is kept: the first of two case-insensitively equal brands
+    wins, and the category depends on the list a brand is in. API keys are
+    not part of the fingerprint.
+
+    Args:
+        brands: Brand configuration
+        extraction_settings: Optional extraction settings
+        use_llm_extraction: Whether LLM-assisted rank extraction is used
+
+    Returns:
+        Hex digest
+    """
+    settings = None
+    if extraction_settings is not None:
+        model = extraction_settings.extraction_model
+        settings = {
+            "method": extraction_settings.method,
+            "fallback_to_regex": extraction_settings.fallback_to_regex,
+            "min_confidence": extraction_settings.min_confidence,
+            "enable_sentiment_analysis": extraction_settings.enable_sentiment_analysis,
+            "model": [model.provider, model.model_name, model.system_prompt, model.base_url],
+        }
+    data = {
+        "version": MEMO_VERSION,
+        "mine": list(brands.mine),
+        "competitors": list(brands.competitors),
+        "settings": settings,
+        "use_llm_extraction": use_llm_extraction,
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ExtractionMemoStats:
+    """Process-wide memo counters."""
+
+    memory_hits: int = 0
+    db_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    saved_cost_usd: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Return stats as a JSON-serializable dict with the hit rate."""
+        data = asdict(self)
+        hits = self.memory_hits + self.db_hits
+        total = hits + self.misses
+        data["hit_rate"] = round(hits / total, 4) if total else 0.0
+        data["saved_cost_usd"] = round(self.saved_cost_usd, 6)
+        return data
+
+
+class ExtractionMemo:
+    """
+    Two-tier memo of serialized extraction results.
+
+    Database errors are logged and treated as misses: the memo never fails
+    a parse.
+
+    Args:
+        max_entries: Entries kept in the in-memory LRU tier
+
+    Attributes:
+        stats: Hit/miss counters
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.stats = ExtractionMemoStats()
+        self._lock = threading.Lock()
+        # (answer_hash, fingerprint) -> (result JSON, extraction cost)
+        self._entries: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        # db_path -> keys hit since the last write, for last_accessed_at
+        self._touched: dict[str, set[tuple[str, str]]] = {}
+
+    def get(self, key: tuple[str, str], db_path: str | None = None) -> str | None:
+        """
+        Look up a serialized result, in memory first, then in the database.
+
+        Blocks on the database; use aget() from async code.
+
+        Args:
+            key: (answer_hash, fingerprint)
+            db_path: Database of the persistent tier (None: memory only)
+
+        Returns:
+            Serialized result, or None on a miss
+        """
+        payload = self._get_memory(key, db_path)
+        if payload is None and db_path is not None:
+            payload = self._get_db(key, db_path)
+        if payload is None:
+            self._record_miss()
+        return payload
+
+    async def aget(self, key: tuple[str, str], db_path: str | None = None) -> str | None:
+        """Like get(), with the database lookup in a worker thread."""
+        payload = self._get_memory(key, db_path)
+        if payload is None and db_path is not None:
+            payload = await asyncio.to_thread(self._get_db, key, db_path)
+        if payload is None:
+            self._record_miss()
+        return payload
+
+    def put(
+        self,
+        key: tuple[str, str],
+        payload: str,
+        extraction_cost_usd: float = 0.0,
+        db_path: str | None = None,
+    ) -> None:
+        """
+        Store a serialized result in both tiers.
+
+        Blocks on the database; use aput() from async code.
+
+        Args:
+            key: (answer_hash, fingerprint)
+            payload: Serialized result
+            extraction_cost_usd: Cost a later hit saves
+            db_path: Database of the persistent tier (None: memory only)
+        """
+        self._put_memory(key, payload, extraction_cost_usd)
+        if db_path is not None:
+            self._put_db(key, payload, extraction_cost_usd, db_path)
+
+    async def aput(
+        self,
+        key: tuple[str, str],
+        payload: str,
+        extraction_cost_usd: float = 0.0,
+        db_path: str | None = None,
+    ) -> None:
+        """Like put(), with the database write in a worker thread."""
+        self._put_memory(key, payload, extraction_cost_usd)
+        if db_path is not None:
+            await asyncio.to_thread(self._put_db, key, payload, extraction_cost_usd, db_path)
+
+    def flush(self, db_path: str | None = None) -> None:
+        """
+        Write pending last_accessed_at updates.
+
+        Args:
+            db_path: Database to flush (None: every database with updates)
+        """
+        with self._lock:
+            paths = [db_path] if db_path is not None else list(self._touched)
+        for path in paths:
+            keys = self._take_touched(path)
+            if not keys:
+                continue
+            try:
+                with write_connection(path) as conn:
+                    touch_extraction_memo(conn, keys)
+            except sqlite3.Error as e:
+                logger.warning(f"Extraction memo access update failed: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-memory tier and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._touched.clear()
+            self.stats = ExtractionMemoStats()
+
+    def _get_memory(self, key: tuple[str, str], db_path: str | None) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.stats.memory_hits += 1
+            self.stats.saved_cost_usd += entry[1]
+            if db_path is not None:
+                self._touched.setdefault(db_path, set()).add(key)
+        metrics.inc("cache_hits_total", cache="extraction_memo")
+        return entry[0]
+
+    def _get_db(self, key: tuple[str, str], db_path: str) -> str | None:
+        try:
+            with read_connection(db_path) as conn:
+                payload = lookup_extraction_memo(conn, *key)
+        except sqlite3.Error as e:
+            logger.warning(f"Extraction memo lookup failed: {e}")
+            return None
+        if payload is None:
+            return None
+
+        cost = json.loads(payload).get("extraction_cost_usd", 0.0)
+        with self._lock:
+            self._remember(key, payload, cost)
+            self.stats.db_hits += 1
+            self.stats.saved_cost_usd += cost
+            touched = self._touched.setdefault(db_path, set())
+            touched.add(key)
+            flush = len(touched) >= TOUCH_BATCH_SIZE
+        metrics.inc("cache_hits_total", cache="extraction_memo")
+        if flush:
+            self.flush(db_path)
+        return payload
+
+    def _record_miss(self) -> None:
+        with self._lock:
+            self.stats.misses += 1
+        metrics.inc("cache_misses_total", cache="extraction_memo")
+
+    def _put_memory(self, key: tuple[str, str], payload: str, cost: float) -> None:
+        with self._lock:
+            self._remember(key, payload, cost)
+            self.stats.stores += 1
+
+    def _put_db(self, key: tuple[str, str], payload: str, cost: float, db_path: str) -> None:
+        # Pending access updates go out in the same transaction
+        touched = self._take_touched(db_path)
+        try:
+            with write_connection(db_path) as conn:
+                store_extraction_memo(conn, *key, payload, cost)
+                if touched:
+                    touch_extraction_memo(conn, touched)
+        except sqlite3.Error as e:
+            logger.warning(f"Extraction memo store failed: {e}")
+
+    def _take_touched(self, db_path: str) -> list[tuple[str, str]]:
+        with self._lock:
+            return list(self._touched.pop(db_path, ()))
+
+    def _remember(self, key: tuple[str, str], payload: str, cost: float) -> None:
+        self._entries[key] = (payload, cost)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_extraction_memo = ExtractionMemo()
+
+
+def get_extraction_memo() -> ExtractionMemo:
+    """Return the process-wide extraction memo."""
+    return _extraction_memo
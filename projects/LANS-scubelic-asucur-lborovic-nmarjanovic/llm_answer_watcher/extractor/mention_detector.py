@@ -18,15 +18,24 @@ Security:
 - Validates all inputs
 
 Performance:
-- Compiles regex patterns once for reuse
+- Compiles regex patterns once per brand configuration (compile_brand_patterns)
 - Sorts results by position for deterministic output
 """
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 
 from rapidfuzz import fuzz
 
+from ..utils.metrics import timed
+
+# Brand configurations whose compiled patterns are kept
+BRAND_PATTERN_CACHE_SIZE = 256
+
+# (alias, normalized name, category, pattern)
+BrandPattern = tuple[str, str, str, re.Pattern]
+
 
 @dataclass
 class BrandMention:
@@ -102,6 +111,41 @@ def create_brand_pattern(alias: str) -> re.Pattern:
     return re.compile(pattern, re.IGNORECASE)
 
 
+@lru_cache(maxsize=BRAND_PATTERN_CACHE_SIZE)
+def compile_brand_patterns(
+    our_brands: tuple[str, ...], competitor_brands: tuple[str, ...]
+) -> tuple[BrandPattern, ...]:
+    """
+    Compile the word-boundary patterns for a brand configuration (cached).
+
+    Every answer of a run is matched against the same brands, so patterns
+    are built once per configuration instead of once per answer. Empty and
+    invalid brand names are skipped.
+
+    Args:
+        our_brands: Brands representing "us", in config order
+        competitor_brands: Competitor brands, in config order
+
+    Returns:
+        (alias, normalized name, category, pattern) per brand, "mine" brands
+        first
+    """
+    brand_patterns: list[BrandPattern] = []
+    categories = (("mine", our_brands), ("competitor", competitor_brands))
+    for category, brands in categories:
+        # Each brand is tracked separately (normalized name = itself)
+        for brand_name in brands:
+            if not brand_name or brand_name.isspace():
+                continue
+            try:
+                pattern = create_brand_pattern(brand_name)
+            except ValueError:
+                # Skip invalid brand names
+                continue
+            brand_patterns.append((brand_name, brand_name, category, pattern))
+    return tuple(brand_patterns)
+
+
 def normalize_brand_name(brand_aliases: list[str]) -> str:
     """
     Get canonical brand name from brand aliases list.
@@ -194,11 +238,13 @@ def remove_overlapping_mentions(mentions: list[BrandMention]) -> list[BrandMenti
     return result
 
 
+@timed()
 def detect_mentions(
     answer_text: str,
     our_brands: list[str],
     competitor_brands: list[str],
     fuzzy_threshold: float = 0.0,
+    brand_patterns: tuple[BrandPattern, ...] | None = None,
 ) -> list[BrandMention]:
     """
     Detect all brand mentions in LLM answer text using word-boundary matching.
@@ -212,7 +258,7 @@ def detect_mentions(
     they will be treated as independent brands with separate tracking.
 
     Process:
-    1. Create word-boundary patterns for all brands
+    1. Look up word-boundary patterns for all brands (compile_brand_patterns)
     2. Search answer text for exact matches
     3. If fuzzy_threshold > 0, search for fuzzy matches in remaining text
     4. For each match:
@@ -229,6 +275,8 @@ def detect_mentions(
         competitor_brands: List of competitor brands (each tracked separately)
         fuzzy_threshold: Minimum similarity score (0-100) for fuzzy matching.
             0 = disabled (default), 80-90 = recommended for typos.
+        brand_patterns: Patterns of these brands from compile_brand_patterns()
+            (e.g. CompiledConfig.brand_patterns); looked up when None
 
     Returns:
         List of BrandMention objects sorted by appearance order (match_position)
@@ -282,32 +330,9 @@ def detect_mentions(
     our_brands = our_brands or []
     competitor_brands = competitor_brands or []
 
-    # Build mapping of alias -> (primary_name, category, pattern)
-    brand_patterns: list[tuple[str, str, str, re.Pattern]] = []
-
-    # Add our brands (EACH is a SEPARATE brand tracked independently)
-    for brand_name in our_brands:
-        if not brand_name or brand_name.isspace():
-            continue
-        try:
-            pattern = create_brand_pattern(brand_name)
-            # Each "mine" brand is tracked separately (normalized name = itself)
-            brand_patterns.append((brand_name, brand_name, "mine", pattern))
-        except ValueError:
-            # Skip invalid brand names
-            continue
-
-    # Add competitor brands (each is a SEPARATE brand tracked independently)
-    for brand_name in competitor_brands:
-        if not brand_name or brand_name.isspace():
-            continue
-        try:
-            pattern = create_brand_pattern(brand_name)
-            # Each competitor is tracked separately (normalized name = itself)
-            brand_patterns.append((brand_name, brand_name, "competitor", pattern))
-        except ValueError:
-            # Skip invalid brand names
-            continue
+    # Mapping of alias -> (primary_name, category, pattern), built once per brand config
+    if brand_patterns is None:
+        brand_patterns = compile_brand_patterns(tuple(our_brands), tuple(competitor_brands))
 
     # Find all matches
     all_matches: list[BrandMention] = []
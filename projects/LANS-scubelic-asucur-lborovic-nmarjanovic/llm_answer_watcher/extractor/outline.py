@@ -0,0 +1,150 @@
+"""
+Single-pass markdown outline for LLM answers.
+
+Rank extraction looks at list structure: numbered items, bullets and
+markdown headers. parse_outline() walks the answer's lines once and sorts
+each line by its first non-space character, so all ranking strategies work
+from the same outline instead of each re-splitting and re-matching the
+whole answer. Prose lines are discarded without touching a regex.
+
+Line rules are the same as the original per-line patterns:
+- Numbered: "1. ToolName" / "1) ToolName"
+- Bullet: "- ToolName" / "• ToolName" / "* ToolName"
+- Header: "## ToolName" / "### ToolName"
+
+Example:
+    >>> outline = parse_outline("## Picks\\n1. Warmly\\n2. HubSpot\\n- Note")
+    >>> [(item.number, item.text) for item in outline.numbered]
+    [(1, 'Warmly'), (2, 'HubSpot')]
+    >>> [item.text for item in outline.headers]
+    ['Picks']
+"""
+
+import re
+from dataclasses import dataclass
+
+# Applied to a line with leading whitespace removed. Equivalent to the
+# former "^\s*<marker>\s+(.+)$" patterns: \s* consumed all leading
+# whitespace, and str.lstrip() strips exactly the characters \s matches.
+_NUMBERED_PATTERN = re.compile(r"(\d+)[.)]\s+(.+)")
+_BULLET_PATTERN = re.compile(r"[-•*]\s+(.+)")
+_HEADER_PATTERN = re.compile(r"#{2,3}\s+(.+)")
+
+_BULLET_CHARS = frozenset("-•*")
+
+
+@dataclass(slots=True)
+class OutlineItem:
+    """
+    One structural line of an answer.
+
+    Attributes:
+        kind: "numbered", "bullet" or "header"
+        text: Item text after the marker, stripped
+        position: Character offset of the line in the answer
+        number: List number for numbered items (None otherwise)
+    """
+
+    kind: str
+    text: str
+    position: int
+    number: int | None = None
+
+
+class MarkdownOutline:
+    """
+    Structural items of an answer, each list in document order.
+
+    The scan only sorts lines by their first character; each kind's items
+    are parsed on first access, so a strategy that succeeds early never
+    pays for the kinds it doesn't look at.
+
+    Attributes:
+        numbered: Numbered list items
+        bullets: Bullet list items
+        headers: Level 2-3 markdown headers
+    """
+
+    def __init__(self):
+        self._lines: dict[str, list[tuple[int, str]]] = {
+            "numbered": [],
+            "bullet": [],
+            "header": [],
+        }
+        self._items: dict[str, list[OutlineItem]] = {}
+
+    @property
+    def numbered(self) -> list[OutlineItem]:
+        return self._parsed("numbered")
+
+    @property
+    def bullets(self) -> list[OutlineItem]:
+        return self._parsed("bullet")
+
+    @property
+    def headers(self) -> list[OutlineItem]:
+        return self._parsed("header")
+
+    def _parsed(self, kind: str) -> list[OutlineItem]:
+        items = self._items.get(kind)
+        if items is not None:
+            return items
+
+        items = []
+        for position, line in self._lines[kind]:
+            if kind == "numbered":
+                match = _NUMBERED_PATTERN.fullmatch(line)
+                if match:
+                    items.append(
+                        OutlineItem(
+                            kind=kind,
+                            text=match.group(2).strip(),
+                            position=position,
+                            number=int(match.group(1)),
+                        )
+                    )
+                continue
+            pattern = _BULLET_PATTERN if kind == "bullet" else _HEADER_PATTERN
+            match = pattern.fullmatch(line)
+            if match:
+                items.append(
+                    OutlineItem(kind=kind, text=match.group(1).strip(), position=position)
+                )
+
+        self._items[kind] = items
+        return items
+
+
+def parse_outline(text: str) -> MarkdownOutline:
+    """
+    Build the outline of an answer in a single pass over its lines.
+
+    Args:
+        text: Answer text (markdown or plain)
+
+    Returns:
+        MarkdownOutline with numbered items, bullets and headers
+    """
+    outline = MarkdownOutline()
+    numbered = outline._lines["numbered"]
+    bullets = outline._lines["bullet"]
+    headers = outline._lines["header"]
+    position = 0
+
+    for line in text.split("\n"):
+        line_start = position
+        position += len(line) + 1
+
+        stripped = line.lstrip()
+        if not stripped:
+            continue
+        first = stripped[0]
+        # Prose lines are dropped here and never reach a regex
+        if first in _BULLET_CHARS:
+            bullets.append((line_start, stripped))
+        elif first == "#":
+            headers.append((line_start, stripped))
+        elif first.isdecimal():
+            numbered.append((line_start, stripped))
+
+    return outline
@@ -16,6 +16,8 @@ Key features:
 - Optional LLM-assisted extraction (disabled by default in v1)
 - Function calling support for higher accuracy and lower latency
 - Comprehensive signal capture (appeared_mine, mentions, rankings)
+- Memoized results: identical answers with the same brands and extraction
+  settings are not parsed again (see extractor.memo)
 
 Example:
     >>> from config.schema import Brands, RuntimeExtractionSettings
@@ -35,11 +37,14 @@ Example:
     2
 """
 
+import json
 import logging
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 from ..config.schema import Brands, RuntimeExtractionSettings
-from .mention_detector import BrandMention, detect_mentions
+from ..utils.metrics import timed
+from .memo import answer_hash, extraction_fingerprint, get_extraction_memo
+from .mention_detector import BrandMention, BrandPattern, detect_mentions
 from .rank_extractor import (
     RankedBrand,
     extract_ranked_list_llm,
@@ -48,6 +53,9 @@ from .rank_extractor import (
 
 logger = logging.getLogger(__name__)
 
+# Fields of an ExtractionResult that depend on the call, not on the answer
+_PER_CALL_FIELDS = ("intent_id", "model_provider", "model_name", "timestamp_utc")
+
 
 @dataclass
 class ExtractionResult:
@@ -98,7 +106,38 @@ class ExtractionResult:
                 f"got: {self.rank_extraction_method}"
             )
 
+    def to_memo(self) -> str:
+        """Serialize the answer-dependent fields for the extraction memo."""
+        data = asdict(self)
+        for name in _PER_CALL_FIELDS:
+            del data[name]
+        return json.dumps(data)
+
+    @classmethod
+    def from_memo(
+        cls,
+        payload: str,
+        intent_id: str,
+        provider: str,
+        model_name: str,
+        timestamp_utc: str,
+    ) -> "ExtractionResult":
+        """Rebuild a memoized result for a new call (at no extraction cost)."""
+        data = json.loads(payload)
+        data["my_mentions"] = [BrandMention(**m) for m in data["my_mentions"]]
+        data["competitor_mentions"] = [BrandMention(**m) for m in data["competitor_mentions"]]
+        data["ranked_list"] = [RankedBrand(**r) for r in data["ranked_list"]]
+        data["extraction_cost_usd"] = 0.0
+        return cls(
+            intent_id=intent_id,
+            model_provider=provider,
+            model_name=model_name,
+            timestamp_utc=timestamp_utc,
+            **data,
+        )
+
 
+@timed()
 async def parse_answer(
     answer_text: str,
     brands: Brands,
@@ -109,6 +148,8 @@ async def parse_answer(
     use_llm_extraction: bool = False,
     llm_client: object | None = None,
     extraction_settings: RuntimeExtractionSettings | None = None,
+    db_path: str | None = None,
+    brand_patterns: tuple[BrandPattern, ...] | None = None,
 ) -> ExtractionResult:
     """
     Parse LLM answer and extract all signals (async).
@@ -129,6 +170,10 @@ async def parse_answer(
        - Extract ranked list (pattern-based or LLM-assisted)
     3. Build ExtractionResult with all signals
 
+    Results are memoized by answer text and brand/extraction config (see
+    extractor.memo): a repeated answer is rebuilt from the memo without
+    parsing or calling the extraction model.
+
     Args:
         answer_text: Raw LLM response text to parse
         brands: Brand configuration (mine + competitors)
@@ -139,9 +184,14 @@ async def parse_answer(
         use_llm_extraction: If True, use LLM-assisted rank extraction (default: False)
         llm_client: LLM client for LLM-assisted extraction (required if use_llm_extraction=True)
         extraction_settings: Optional extraction settings (enables function calling)
+        db_path: Optional SQLite database for the persistent memo tier
+                 (default: in-memory memo only)
+        brand_patterns: Optional precompiled patterns of brands (e.g.
+                        CompiledConfig.brand_patterns)
 
     Returns:
         ExtractionResult with all extracted signals and metadata
+        (extraction_cost_usd is 0.0 for memoized results)
 
     Raises:
         ValueError: If use_llm_extraction=True but llm_client=None
@@ -172,6 +222,16 @@ async def parse_answer(
     if use_llm_extraction and llm_client is None:
         raise ValueError("llm_client required when use_llm_extraction=True")
 
+    memo = get_extraction_memo()
+    memo_key = (
+        answer_hash(answer_text),
+        extraction_fingerprint(brands, extraction_settings, use_llm_extraction),
+    )
+    payload = await memo.aget(memo_key, db_path)
+    if payload is not None:
+        logger.debug(f"Extraction memo hit for {intent_id} ({provider}/{model_name})")
+        return ExtractionResult.from_memo(payload, intent_id, provider, model_name, timestamp_utc)
+
     # Check if function calling is enabled
     use_function_calling = (
         extraction_settings is not None
@@ -179,6 +239,7 @@ async def parse_answer(
     )
 
     extraction_cost = 0.0
+    fell_back = False
 
     if use_function_calling:
         # Use function calling for extraction
@@ -269,6 +330,8 @@ async def parse_answer(
             ):
                 logger.info(f"Falling back to regex extraction for {intent_id}")
                 use_function_calling = False
+                # A fallback after a (possibly transient) failure is not memoized
+                fell_back = True
             else:
                 raise
 
@@ -279,6 +342,7 @@ async def parse_answer(
             answer_text=answer_text,
             our_brands=brands.mine,
             competitor_brands=brands.competitors,
+            brand_patterns=brand_patterns,
         )
 
         # Step 2: Separate mentions into mine vs competitors
@@ -311,7 +375,7 @@ async def parse_answer(
             rank_method = "pattern"
 
     # Step 5: Build ExtractionResult
-    return ExtractionResult(
+    result = ExtractionResult(
         intent_id=intent_id,
         model_provider=provider,
         model_name=model_name,
@@ -324,3 +388,6 @@ async def parse_answer(
         rank_confidence=rank_confidence,
         extraction_cost_usd=extraction_cost,
     )
+    if not fell_back:
+        await memo.aput(memo_key, result.to_memo(), extraction_cost, db_path)
+    return result
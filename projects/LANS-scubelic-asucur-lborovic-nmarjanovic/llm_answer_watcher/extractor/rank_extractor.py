@@ -36,8 +36,11 @@ Example:
 import re
 from dataclasses import dataclass
 from difflib import SequenceMatcher
+from functools import lru_cache
 
+from ..utils.metrics import timed
 from .mention_detector import create_brand_pattern
+from .outline import OutlineItem, parse_outline
 
 # ============================================================================
 # CONSTANTS
@@ -48,6 +51,9 @@ from .mention_detector import create_brand_pattern
 # Lower values increase false positives, higher values miss valid matches
 FUZZY_THRESHOLD = 0.8
 
+# Distinct known_brands lists whose lookup index is kept in memory
+BRAND_INDEX_CACHE_SIZE = 64
+
 
 @dataclass
 class RankedBrand:
@@ -74,6 +80,7 @@ class RankedBrand:
             )
 
 
+@timed()
 def extract_ranked_list_pattern(
     text: str, known_brands: list[str]
 ) -> tuple[list[RankedBrand], float]:
@@ -113,6 +120,8 @@ def extract_ranked_list_pattern(
         1.0
 
     Note:
+        - The answer is scanned once (see outline.parse_outline); every
+          strategy is resolved from that outline
         - Uses fuzzy matching (80% similarity threshold) if exact match fails
         - Deduplicates in first-seen order
         - Returns empty list if no brands detected
@@ -120,150 +129,143 @@ def extract_ranked_list_pattern(
     if not text or not known_brands:
         return ([], 0.3)
 
+    outline = parse_outline(text)
+    index = _brand_index(tuple(known_brands))
+
     # Try pattern-based extraction in priority order
-    ranked, confidence = _extract_numbered_list(text, known_brands)
+    ranked, confidence = _rank_numbered(outline.numbered, index)
     if ranked:
         return (ranked, confidence)
 
-    ranked, confidence = _extract_bullet_list(text, known_brands)
+    ranked, confidence = _rank_in_order(outline.bullets, index)
     if ranked:
         return (ranked, confidence)
 
-    ranked, confidence = _extract_headers(text, known_brands)
+    ranked, confidence = _rank_in_order(outline.headers, index)
     if ranked:
         return (ranked, confidence)
 
     # Fallback: Use mention order (lowest confidence)
-    ranked, confidence = _extract_from_mention_order(text, known_brands)
-    return (ranked, confidence)
+    return _rank_mention_order(text, index)
 
 
-def _extract_numbered_list(
-    text: str, known_brands: list[str]
-) -> tuple[list[RankedBrand], float]:
-    """
-    Extract brands from numbered list patterns.
+# ============================================================================
+# BRAND INDEX
+# ============================================================================
 
-    Patterns matched:
-    - "1. ToolName" / "1) ToolName" / "1 ToolName"
-    - "2. ToolName" / "2) ToolName" / "2 ToolName"
 
-    Returns:
-        (ranked_brands, 1.0) if numbered list found, else ([], 0.0)
+class _BrandIndex:
     """
-    # Pattern: number (with optional period/paren) followed by text
-    # Captures: (number, content after number)
-    pattern = r"^\s*(\d+)[\.\)]\s+(.+)$"
+    Precomputed lookup data for one known_brands list.
 
-    ranked_brands = []
-    seen_brands = set()
+    Holds lowercased names (for substring matching) and lazily compiled
+    word-boundary patterns (for mention order). Cached per brand tuple by
+    _brand_index(), since the same brand list is used for every answer.
+    """
 
-    for line in text.split("\n"):
-        match = re.match(pattern, line)
-        if not match:
-            continue
+    def __init__(self, brands: tuple[str, ...]):
+        self.brands = brands
+        self.lowered = tuple((brand, brand.lower()) for brand in brands)
+        self._patterns: tuple[tuple[str, re.Pattern], ...] | None = None
+
+    @property
+    def patterns(self) -> tuple[tuple[str, re.Pattern], ...]:
+        """(brand, word-boundary pattern) pairs, compiled on first use."""
+        if self._patterns is None:
+            # Compiled lazily: create_brand_pattern rejects empty brands,
+            # which must only fail when mention order is actually needed
+            self._patterns = tuple(
+                (brand, create_brand_pattern(brand)) for brand in self.brands
+            )
+        return self._patterns
 
-        rank_num = int(match.group(1))
-        candidate = match.group(2).strip()
+    def match(self, candidate: str) -> str | None:
+        """
+        Match candidate text against the known brands.
 
-        # Match candidate against known_brands
-        matched_brand = _match_brand(candidate, known_brands)
-        if matched_brand and matched_brand not in seen_brands:
-            ranked_brands.append(
-                RankedBrand(
-                    brand_name=matched_brand,
-                    rank_position=rank_num,
-                    confidence=1.0,
-                )
-            )
-            seen_brands.add(matched_brand)
+        Exact (substring) match first, in known_brands order, then the most
+        similar brand at or above FUZZY_THRESHOLD. Brands whose length alone
+        rules out reaching the threshold, or beating the best ratio so far,
+        are skipped before running SequenceMatcher.
+        """
+        candidate_lower = candidate.lower()
 
-    # Only return if we found numbered list items
-    if ranked_brands:
-        # Sort by rank_position to ensure proper order
-        ranked_brands.sort(key=lambda b: b.rank_position)
-        return (ranked_brands, 1.0)
+        # Try exact match first
+        for brand, lowered in self.lowered:
+            if lowered in candidate_lower:
+                return brand
 
-    return ([], 0.0)
+        best_match = None
+        best_ratio = 0.0
+        candidate_length = len(candidate_lower)
 
+        for brand, lowered in self.lowered:
+            # ratio() is 2*matches/total and matches <= the shorter length
+            total = candidate_length + len(lowered)
+            bound = 2.0 * min(candidate_length, len(lowered)) / total
+            if bound < FUZZY_THRESHOLD or bound <= best_ratio:
+                continue
 
-def _extract_bullet_list(
-    text: str, known_brands: list[str]
-) -> tuple[list[RankedBrand], float]:
-    """
-    Extract brands from bullet list patterns.
+            matcher = SequenceMatcher(None, candidate_lower, lowered)
+            if matcher.quick_ratio() < FUZZY_THRESHOLD:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best_ratio and ratio >= FUZZY_THRESHOLD:
+                best_ratio = ratio
+                best_match = brand
 
-    Patterns matched:
-    - "- ToolName"
-    - "" ToolName"
-    - "* ToolName"
+        return best_match
 
-    Returns:
-        (ranked_brands, 0.8) if bullet list found, else ([], 0.0)
-    """
-    # Pattern: bullet marker followed by text
-    pattern = r"^\s*[-•*]\s+(.+)$"
 
-    ranked_brands = []
-    seen_brands = set()
-    rank_position = 1
+@lru_cache(maxsize=BRAND_INDEX_CACHE_SIZE)
+def _brand_index(brands: tuple[str, ...]) -> _BrandIndex:
+    """Return the (cached) index for a known_brands list."""
+    return _BrandIndex(brands)
+
+
+# ============================================================================
+# RANKING STRATEGIES
+# ============================================================================
 
-    for line in text.split("\n"):
-        match = re.match(pattern, line)
-        if not match:
-            continue
 
-        candidate = match.group(1).strip()
+def _rank_numbered(
+    items: list[OutlineItem], index: _BrandIndex
+) -> tuple[list[RankedBrand], float]:
+    """Rank by list number; (ranked_brands, 1.0) or ([], 0.0)."""
+    ranked_brands = []
+    seen_brands = set()
 
-        # Match candidate against known_brands
-        matched_brand = _match_brand(candidate, known_brands)
+    for item in items:
+        matched_brand = index.match(item.text)
         if matched_brand and matched_brand not in seen_brands:
             ranked_brands.append(
                 RankedBrand(
                     brand_name=matched_brand,
-                    rank_position=rank_position,
-                    confidence=0.8,
+                    rank_position=item.number,
+                    confidence=1.0,
                 )
             )
             seen_brands.add(matched_brand)
-            rank_position += 1
 
-    # Only return if we found bullet list items
+    # Only return if we found numbered list items
     if ranked_brands:
-        return (ranked_brands, 0.8)
+        # Sort by rank_position to ensure proper order
+        ranked_brands.sort(key=lambda b: b.rank_position)
+        return (ranked_brands, 1.0)
 
     return ([], 0.0)
 
 
-def _extract_headers(
-    text: str, known_brands: list[str]
+def _rank_in_order(
+    items: list[OutlineItem], index: _BrandIndex
 ) -> tuple[list[RankedBrand], float]:
-    """
-    Extract brands from markdown header patterns.
-
-    Patterns matched:
-    - "## ToolName"
-    - "### ToolName"
-
-    Returns:
-        (ranked_brands, 0.8) if headers found, else ([], 0.0)
-    """
-    # Pattern: markdown headers (## or ###) followed by text
-    pattern = r"^\s*#{2,3}\s+(.+)$"
-
+    """Rank bullets or headers by order of appearance; (ranked, 0.8) or ([], 0.0)."""
     ranked_brands = []
     seen_brands = set()
     rank_position = 1
 
-    for line in text.split("\n"):
-        match = re.match(pattern, line)
-        if not match:
-            continue
-
-        candidate = match.group(1).strip()
-
-        # Match candidate against known_brands
-        matched_brand = _match_brand(candidate, known_brands)
+    for item in items:
+        matched_brand = index.match(item.text)
         if matched_brand and matched_brand not in seen_brands:
             ranked_brands.append(
                 RankedBrand(
@@ -275,30 +277,18 @@ def _extract_headers(
             seen_brands.add(matched_brand)
             rank_position += 1
 
-    # Only return if we found header items
     if ranked_brands:
         return (ranked_brands, 0.8)
 
     return ([], 0.0)
 
 
-def _extract_from_mention_order(
-    text: str, known_brands: list[str]
-) -> tuple[list[RankedBrand], float]:
-    """
-    Extract brands from mention order (fallback, lowest confidence).
-
-    Finds all known brands in text and ranks by first occurrence position.
-
-    Returns:
-        (ranked_brands, 0.5) if brands found, else ([], 0.3)
-    """
+def _rank_mention_order(text: str, index: _BrandIndex) -> tuple[list[RankedBrand], float]:
+    """Rank by first mention position; (ranked, 0.5) or ([], 0.3)."""
     # Find all brand mentions with positions
     mentions = []
 
-    for brand in known_brands:
-        # Use consistent word-boundary pattern from mention_detector
-        pattern = create_brand_pattern(brand)
+    for brand, pattern in index.patterns:
         match = pattern.search(text)
         if match:
             mentions.append((brand, match.start()))
@@ -328,6 +318,74 @@ def _extract_from_mention_order(
     return (ranked_brands, 0.5)
 
 
+# ============================================================================
+# SINGLE-STRATEGY HELPERS
+# ============================================================================
+
+
+def _extract_numbered_list(
+    text: str, known_brands: list[str]
+) -> tuple[list[RankedBrand], float]:
+    """
+    Extract brands from numbered list patterns.
+
+    Patterns matched:
+    - "1. ToolName" / "1) ToolName" / "1 ToolName"
+    - "2. ToolName" / "2) ToolName" / "2 ToolName"
+
+    Returns:
+        (ranked_brands, 1.0) if numbered list found, else ([], 0.0)
+    """
+    return _rank_numbered(parse_outline(text).numbered, _brand_index(tuple(known_brands)))
+
+
+def _extract_bullet_list(
+    text: str, known_brands: list[str]
+) -> tuple[list[RankedBrand], float]:
+    """
+    Extract brands from bullet list patterns.
+
+    Patterns matched:
+    - "- ToolName"
+    - "" ToolName"
+    - "* ToolName"
+
+    Returns:
+        (ranked_brands, 0.8) if bullet list found, else ([], 0.0)
+    """
+    return _rank_in_order(parse_outline(text).bullets, _brand_index(tuple(known_brands)))
+
+
+def _extract_headers(
+    text: str, known_brands: list[str]
+) -> tuple[list[RankedBrand], float]:
+    """
+    Extract brands from markdown header patterns.
+
+    Patterns matched:
+    - "## ToolName"
+    - "### ToolName"
+
+    Returns:
+        (ranked_brands, 0.8) if headers found, else ([], 0.0)
+    """
+    return _rank_in_order(parse_outline(text).headers, _brand_index(tuple(known_brands)))
+
+
+def _extract_from_mention_order(
+    text: str, known_brands: list[str]
+) -> tuple[list[RankedBrand], float]:
+    """
+    Extract brands from mention order (fallback, lowest confidence).
+
+    Finds all known brands in text and ranks by first occurrence position.
+
+    Returns:
+        (ranked_brands, 0.5) if brands found, else ([], 0.3)
+    """
+    return _rank_mention_order(text, _brand_index(tuple(known_brands)))
+
+
 def _match_brand(candidate: str, known_brands: list[str]) -> str | None:
     """
     Match candidate text against known brands list.
@@ -345,24 +403,7 @@ def _match_brand(candidate: str, known_brands: list[str]) -> str | None:
         Fuzzy matching threshold is defined by FUZZY_THRESHOLD constant (0.8).
         This can be adjusted if more lenient or strict matching is needed.
     """
-    candidate_lower = candidate.lower()
-
-    # Try exact match first
-    for brand in known_brands:
-        if brand.lower() in candidate_lower:
-            return brand
-
-    # Try fuzzy matching using FUZZY_THRESHOLD constant
-    best_match = None
-    best_ratio = 0.0
-
-    for brand in known_brands:
-        ratio = SequenceMatcher(None, candidate_lower, brand.lower()).ratio()
-        if ratio > best_ratio and ratio >= FUZZY_THRESHOLD:
-            best_ratio = ratio
-            best_match = brand
-
-    return best_match
+    return _brand_index(tuple(known_brands)).match(candidate)
 
 
 def extract_ranked_list_llm(
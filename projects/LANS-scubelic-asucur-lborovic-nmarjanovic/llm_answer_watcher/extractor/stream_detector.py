@@ -0,0 +1,130 @@
+"""
+Incremental brand mention detection for streamed answers.
+
+StreamingMentionDetector is fed the text deltas of a streamed LLM answer and
+reports each brand as soon as its first mention is complete. It uses the
+same word-boundary patterns as detect_mentions(), but only rescans the tail
+of the text that could still contain an unfinished match, so a long answer
+is scanned in roughly linear time instead of once per chunk.
+
+A match that ends exactly at the end of the text received so far is held
+back until the next character arrives: "Hub" at the end of a chunk may still
+turn into "HubSpot", and the word boundary after it is only known then.
+finish() accepts such trailing matches once the stream is complete.
+
+The detector is a live preview. The authoritative mentions of an answer are
+still extracted by parse_answer() from the complete text (fuzzy matching,
+overlap resolution between brands, ranks).
+
+Example:
+    >>> detector = StreamingMentionDetector(["HubSpot"], ["Salesforce"])
+    >>> detector.feed("Try Sales")
+    []
+    >>> [m.normalized_name for m in detector.feed("force or Hub")]
+    ['Salesforce']
+    >>> [m.normalized_name for m in detector.feed("Spot.")]
+    ['HubSpot']
+"""
+
+import re
+
+from .mention_detector import BrandMention, BrandPattern, compile_brand_patterns
+
+
+class StreamingMentionDetector:
+    """
+    Detect brand mentions on a growing answer text.
+
+    Each brand is reported once, at its first complete mention. Brands are
+    deduplicated case-insensitively like in detect_mentions().
+
+    Args:
+        our_brands: Brands representing "us"
+        competitor_brands: Competitor brands
+        brand_patterns: Their patterns from compile_brand_patterns(), if
+            already compiled
+
+    Attributes:
+        mentions: Mentions detected so far, in the order they were detected
+    """
+
+    def __init__(
+        self,
+        our_brands: list[str],
+        competitor_brands: list[str],
+        brand_patterns: tuple[BrandPattern, ...] | None = None,
+    ) -> None:
+        self._text = ""
+        self.mentions: list[BrandMention] = []
+
+        # brand key -> (normalized name, category, pattern); first brand wins
+        self._pending: dict[str, tuple[str, str, re.Pattern]] = {}
+        # brand key -> offset from which the text still needs scanning
+        self._scan_from: dict[str, int] = {}
+        if brand_patterns is None:
+            brand_patterns = compile_brand_patterns(
+                tuple(our_brands or ()), tuple(competitor_brands or ())
+            )
+        for _alias, brand_name, category, pattern in brand_patterns:
+            key = brand_name.lower()
+            if key not in self._pending:
+                self._pending[key] = (brand_name, category, pattern)
+                self._scan_from[key] = 0
+
+    @property
+    def text(self) -> str:
+        """Answer text received so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> list[BrandMention]:
+        """
+        Add the next chunk of answer text.
+
+        Args:
+            chunk: Text delta
+
+        Returns:
+            Mentions of brands first completed by this chunk, by position
+        """
+        if not chunk:
+            return []
+        self._text += chunk
+        return self._scan(final=False)
+
+    def finish(self) -> list[BrandMention]:
+        """
+        Mark the stream complete and accept mentions at the very end.
+
+        Returns:
+            Mentions of brands completed only by the end of the stream
+        """
+        return self._scan(final=True)
+
+    def _scan(self, final: bool) -> list[BrandMention]:
+        text = self._text
+        end = len(text)
+        found: list[BrandMention] = []
+
+        for key, (brand_name, category, pattern) in list(self._pending.items()):
+            match = pattern.search(text, self._scan_from[key])
+            if match is not None and (final or match.end() < end):
+                found.append(
+                    BrandMention(
+                        original_text=match.group(0),
+                        normalized_name=brand_name,
+                        brand_category=category,
+                        match_position=match.start(),
+                    )
+                )
+                del self._pending[key]
+                del self._scan_from[key]
+            elif match is not None:
+                # Unconfirmed match at the end: rescan from its start next time
+                self._scan_from[key] = match.start()
+            else:
+                # A match starting before this could not end after it
+                self._scan_from[key] = max(0, end - len(brand_name))
+
+        found.sort(key=lambda mention: mention.match_position)
+        self.mentions.extend(found)
+        return found
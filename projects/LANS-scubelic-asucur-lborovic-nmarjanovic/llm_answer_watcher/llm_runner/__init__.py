@@ -29,7 +29,7 @@ Example:
 
 # Core protocols and models
 from .intent_runner import IntentResult, IntentRunner
-from .models import LLMClient, LLMResponse, build_client
+from .models import LLMClient, LLMResponse, build_client, supports_streaming
 from .plugin_registry import RunnerPlugin, RunnerRegistry
 
 # Import plugins to trigger auto-registration
@@ -50,6 +50,7 @@ __all__ = [
     "LLMResponse",
     # Functions
     "build_client",
+    "supports_streaming",
     # Registry
     "RunnerRegistry",
     # Plugins (for direct access if needed)
@@ -0,0 +1,197 @@
+"""
+In-process stand-in for the Steel SDK client.
+
+FakeSteel implements the subset of the `steel.Steel` client used by
+SteelBaseRunner (sessions.create/retrieve/release/list, scrape, screenshot)
+without network access, so browser runners and the session pool can be
+tested and benchmarked locally. Latency, session expiry and creation
+failures are configurable to mimic the real service.
+
+Example:
+    >>> client = FakeSteel(FakeSteelConfig(create_latency_ms=50))
+    >>> runner = SteelChatGPTRunner(config, steel_client=client)
+    >>> runner.run_intent("What are the best CRM tools?")
+    >>> client.stats.sessions_created
+    1
+
+Note:
+    This module is a test utility. It is never imported by production code
+    paths and is not registered as a runner plugin.
+"""
+
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+# 1x1 transparent PNG
+_PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082"
+)
+
+
+@dataclass
+class FakeSteelConfig:
+    """
+    Behavior of the fake Steel service.
+
+    Attributes:
+        create_latency_ms: Delay of sessions.create() (real sessions take seconds)
+        request_latency_ms: Delay of every other API call
+        session_lifetime_seconds: Sessions expire after this long (None: never)
+        fail_create_rate: Probability that sessions.create() raises
+        page_markdown: Content returned by scrape(format=["markdown"])
+        seed: Random seed for failure injection
+    """
+
+    create_latency_ms: float = 0.0
+    request_latency_ms: float = 0.0
+    session_lifetime_seconds: float | None = None
+    fail_create_rate: float = 0.0
+    page_markdown: str = "Top CRM tools: HubSpot, Salesforce, Pipedrive"
+    seed: int = 0
+
+    def __post_init__(self):
+        if not 0.0 <= self.fail_create_rate <= 1.0:
+            raise ValueError(
+                f"fail_create_rate must be between 0 and 1, got: {self.fail_create_rate}"
+            )
+
+
+@dataclass
+class FakeSteelStats:
+    """Counters of API calls made against the fake service."""
+
+    sessions_created: int = 0
+    sessions_released: int = 0
+    retrieve_calls: int = 0
+    scrape_calls: int = 0
+    screenshot_calls: int = 0
+    peak_live_sessions: int = 0
+
+
+class _FakeSessions:
+    """Implements the `client.sessions` namespace."""
+
+    def __init__(self, client: "FakeSteel"):
+        self._client = client
+
+    def create(self, **params) -> SimpleNamespace:
+        client = self._client
+        client._sleep(client.config.create_latency_ms)
+        with client._lock:
+            if client._random.random() < client.config.fail_create_rate:
+                raise RuntimeError("Fake Steel: session creation failed")
+            session_id = str(uuid.uuid4())
+            session = SimpleNamespace(
+                id=session_id,
+                status="live",
+                websocket_url=f"ws://fake-steel.local/sessions/{session_id}",
+                url="about:blank",
+                created_at=time.monotonic(),
+                timeout=params.get("api_timeout"),
+            )
+            client._sessions[session_id] = session
+            client.stats.sessions_created += 1
+            client.stats.peak_live_sessions = max(
+                client.stats.peak_live_sessions, client.live_session_count()
+            )
+            return session
+
+    def retrieve(self, session_id: str) -> SimpleNamespace:
+        client = self._client
+        client._sleep(client.config.request_latency_ms)
+        with client._lock:
+            client.stats.retrieve_calls += 1
+            return client._get(session_id)
+
+    def release(self, session_id: str) -> SimpleNamespace:
+        client = self._client
+        client._sleep(client.config.request_latency_ms)
+        with client._lock:
+            session = client._get(session_id)
+            if session.status == "live":
+                client.stats.sessions_released += 1
+            session.status = "released"
+            return session
+
+    def list(self) -> list[SimpleNamespace]:
+        with self._client._lock:
+            return [self._client._get(sid) for sid in list(self._client._sessions)]
+
+
+class FakeSteel:
+    """
+    Drop-in replacement for `steel.Steel` backed by in-memory sessions.
+
+    Attributes:
+        config: Simulated service behavior
+        stats: API call counters
+        sessions: Session API namespace
+    """
+
+    def __init__(self, config: FakeSteelConfig | None = None, **_client_kwargs):
+        self.config = config or FakeSteelConfig()
+        self.stats = FakeSteelStats()
+        self.sessions = _FakeSessions(self)
+        self._sessions: dict[str, SimpleNamespace] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+
+    def scrape(self, url: str, format: list[str], session_id: str | None = None):
+        """Return fake page content in each requested format."""
+        self._sleep(self.config.request_latency_ms)
+        with self._lock:
+            self.stats.scrape_calls += 1
+            if session_id is not None:
+                self._require_live(session_id)
+        content = {
+            "markdown": self.config.page_markdown,
+            "html": f"<html><body><p>{self.config.page_markdown}</p></body></html>",
+            "cleaned_html": f"<p>{self.config.page_markdown}</p>",
+        }
+        return SimpleNamespace(**{fmt: content.get(fmt, self.config.page_markdown) for fmt in format})
+
+    def screenshot(self, url: str, session_id: str | None = None):
+        """Return a 1x1 PNG."""
+        self._sleep(self.config.request_latency_ms)
+        with self._lock:
+            self.stats.screenshot_calls += 1
+            if session_id is not None:
+                self._require_live(session_id)
+        return SimpleNamespace(data=_PNG_BYTES)
+
+    def kill(self, session_id: str) -> None:
+        """Simulate the service terminating a session (crash, timeout)."""
+        with self._lock:
+            self._get(session_id).status = "failed"
+
+    def live_session_count(self) -> int:
+        """Number of sessions that are still live."""
+        return sum(1 for sid in self._sessions if self._get(sid).status == "live")
+
+    def _get(self, session_id: str) -> SimpleNamespace:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"Fake Steel: unknown session {session_id}")
+        lifetime = self.config.session_lifetime_seconds
+        if (
+            session.status == "live"
+            and lifetime is not None
+            and time.monotonic() - session.created_at >= lifetime
+        ):
+            session.status = "released"
+        return session
+
+    def _require_live(self, session_id: str) -> None:
+        if self._get(session_id).status != "live":
+            raise RuntimeError(f"Fake Steel: session {session_id} is not live")
+
+    @staticmethod
+    def _sleep(milliseconds: float) -> None:
+        if milliseconds > 0:
+            time.sleep(milliseconds / 1000)
+
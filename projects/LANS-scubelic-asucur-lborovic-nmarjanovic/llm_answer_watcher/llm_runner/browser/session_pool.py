@@ -0,0 +1,394 @@
+"""
+Warm browser session pool for Steel runners.
+
+Creating a Steel session and loading ChatGPT/Perplexity takes several
+seconds, which used to be paid for every prompt. SteelSessionPool keeps
+sessions warm and leases them to concurrent intents:
+
+- At most `size` sessions exist per pool; extra leases wait for a free one
+- Idle sessions are health-checked before reuse (after health_check_interval)
+- Sessions are recycled after max_uses prompts or max_age_seconds, before
+  Steel's own session timeout kills them mid-prompt
+- Conversation state is reset between prompts (runner._reset_session)
+- A session whose prompt raised is discarded rather than reused
+
+Pools are shared by all runner instances with the same configuration (the
+runner registry creates a new runner per query), and are closed at the end
+of each run by close_session_pools().
+
+Example:
+    >>> pool = SteelSessionPool(
+    ...     create=runner._create_session,
+    ...     release=runner._release_session,
+    ...     health_check=runner._session_is_healthy,
+    ...     reset=runner._reset_session,
+    ...     size=2,
+    ... )
+    >>> with pool.lease() as session:
+    ...     runner._navigate_and_submit(session, "What are the best CRM tools?")
+    >>> pool.close()
+
+Thread safety:
+    Browser runners are synchronous and run in worker threads, so the pool
+    uses a threading.Condition. Session creation, health checks and resets
+    happen outside the lock.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_USES = 20
+DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS = 30.0
+DEFAULT_LEASE_TIMEOUT_SECONDS = 300.0
+
+
+@dataclass
+class PooledSession:
+    """
+    A Steel session owned by a pool.
+
+    Attributes:
+        data: Session dict returned by the runner's _create_session()
+        created_at: time.monotonic() when the session was created
+        last_used_at: time.monotonic() when the session was last returned
+        uses: Number of prompts executed in this session
+    """
+
+    data: dict
+    created_at: float
+    last_used_at: float
+    uses: int = 0
+
+    @property
+    def id(self) -> str:
+        """Steel session identifier."""
+        return self.data["id"]
+
+
+@dataclass
+class SessionPoolStats:
+    """Counters describing pool behavior."""
+
+    created: int = 0
+    reused: int = 0
+    released: int = 0
+    recycled_max_uses: int = 0
+    recycled_max_age: int = 0
+    health_check_failures: int = 0
+    reset_failures: int = 0
+    discarded_after_error: int = 0
+    lease_waits: int = 0
+    peak_in_use: int = 0
+
+    def to_dict(self) -> dict:
+        """Return stats as a JSON-serializable dict."""
+        return asdict(self)
+
+
+@dataclass
+class SteelSessionPool:
+    """
+    Bounded pool of warm Steel sessions.
+
+    Attributes:
+        create: Creates a ready session and returns its session dict
+        release: Releases a session by ID (must not raise)
+        health_check: Returns True if the session is still usable
+        reset: Clears conversation state before the session is reused
+        size: Maximum number of sessions (leased + idle)
+        max_uses: Prompts per session before it is recycled
+        max_age_seconds: Session lifetime before it is recycled (None: no limit)
+        health_check_interval: Idle seconds after which a session is checked
+                               before being leased again
+        stats: Pool counters
+    """
+
+    create: Callable[[], dict]
+    release: Callable[[str], None]
+    health_check: Callable[[dict], bool] = lambda _session: True
+    reset: Callable[[dict], None] = lambda _session: None
+    size: int = DEFAULT_POOL_SIZE
+    max_uses: int = DEFAULT_MAX_USES
+    max_age_seconds: float | None = None
+    health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS
+    stats: SessionPoolStats = field(default_factory=SessionPoolStats)
+
+    def __post_init__(self):
+        if self.size < 1:
+            raise ValueError(f"Session pool size must be at least 1, got: {self.size}")
+        if self.max_uses < 1:
+            raise ValueError(f"max_uses must be at least 1, got: {self.max_uses}")
+        self._condition = threading.Condition()
+        self._idle: list[PooledSession] = []
+        self._in_use = 0
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Leasing
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def lease(self, timeout: float | None = DEFAULT_LEASE_TIMEOUT_SECONDS) -> Iterator[dict]:
+        """
+        Lease a warm session for one prompt.
+
+        The session is returned to the pool (after reset) when the block
+        exits normally, and discarded if the block raises.
+
+        Args:
+            timeout: Max seconds to wait for a free session (None: forever)
+
+        Yields:
+            Session dict
+
+        Raises:
+            TimeoutError: If no session becomes free within timeout
+            RuntimeError: If the pool is closed
+        """
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled.data
+        except BaseException:
+            self.give_back(pooled, healthy=False)
+            raise
+        self.give_back(pooled, healthy=True)
+
+    def acquire(self, timeout: float | None = DEFAULT_LEASE_TIMEOUT_SECONDS) -> PooledSession:
+        """
+        Take a session out of the pool, creating one if below size.
+
+        Prefer lease(); callers of acquire() must call give_back().
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            candidate = None
+            with self._condition:
+                waited = False
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Session pool is closed")
+                    if self._idle:
+                        # Most recently used first: keeps the hottest sessions busy
+                        candidate = self._idle.pop()
+                        break
+                    if self._in_use < self.size:
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(
+                            f"No browser session available within {timeout}s "
+                            f"(pool size {self.size})"
+                        )
+                    if not waited:
+                        self.stats.lease_waits += 1
+                        waited = True
+                    self._condition.wait(remaining)
+                self._in_use += 1
+                self.stats.peak_in_use = max(self.stats.peak_in_use, self._in_use)
+
+            if candidate is None:
+                try:
+                    return self._new_session()
+                except BaseException:
+                    self._return_slot()
+                    raise
+
+            if self._usable(candidate):
+                self.stats.reused += 1
+                return candidate
+
+            # Stale: drop it and try again (the slot is kept for the retry)
+            self._discard(candidate)
+            self._return_slot()
+
+    def give_back(self, pooled: PooledSession, healthy: bool = True) -> None:
+        """
+        Return a leased session, recycling or resetting it as needed.
+
+        Args:
+            pooled: Session from acquire()
+            healthy: False if the prompt failed; the session is discarded
+        """
+        pooled.uses += 1
+        pooled.last_used_at = time.monotonic()
+
+        keep = healthy and not self._closed
+        if not healthy:
+            self.stats.discarded_after_error += 1
+        elif pooled.uses >= self.max_uses:
+            self.stats.recycled_max_uses += 1
+            keep = False
+        elif self._expired(pooled):
+            self.stats.recycled_max_age += 1
+            keep = False
+
+        if keep:
+            try:
+                self.reset(pooled.data)
+            except Exception as e:
+                logger.warning(f"Failed to reset browser session {pooled.id}: {e}")
+                self.stats.reset_failures += 1
+                keep = False
+
+        with self._condition:
+            self._in_use -= 1
+            # Pool may have been closed while the session was leased
+            keep = keep and not self._closed
+            if keep:
+                self._idle.append(pooled)
+            self._condition.notify()
+
+        if not keep:
+            self._discard(pooled)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def prewarm(self, count: int | None = None) -> int:
+        """
+        Create idle sessions ahead of the first lease.
+
+        Args:
+            count: Sessions to create (default: pool size); capped at free capacity
+
+        Returns:
+            Number of sessions created
+        """
+        target = self.size if count is None else min(count, self.size)
+        created = 0
+        while True:
+            with self._condition:
+                if self._closed or len(self._idle) + self._in_use >= target:
+                    return created
+                self._in_use += 1
+            try:
+                pooled = self._new_session()
+            except Exception:
+                self._return_slot()
+                raise
+            with self._condition:
+                self._in_use -= 1
+                self._idle.append(pooled)
+                self._condition.notify()
+            created += 1
+
+    def close(self) -> None:
+        """Release all idle sessions; leased sessions are released on return."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    @property
+    def idle_count(self) -> int:
+        """Number of warm sessions waiting for a lease."""
+        with self._condition:
+            return len(self._idle)
+
+    @property
+    def in_use_count(self) -> int:
+        """Number of sessions currently leased."""
+        with self._condition:
+            return self._in_use
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _new_session(self) -> PooledSession:
+        data = self.create()
+        now = time.monotonic()
+        self.stats.created += 1
+        return PooledSession(data=data, created_at=now, last_used_at=now)
+
+    def _expired(self, pooled: PooledSession) -> bool:
+        return (
+            self.max_age_seconds is not None
+            and time.monotonic() - pooled.created_at >= self.max_age_seconds
+        )
+
+    def _usable(self, pooled: PooledSession) -> bool:
+        if self._expired(pooled):
+            self.stats.recycled_max_age += 1
+            return False
+        if time.monotonic() - pooled.last_used_at < self.health_check_interval:
+            return True
+        try:
+            healthy = self.health_check(pooled.data)
+        except Exception as e:
+            logger.debug(f"Health check for session {pooled.id} raised: {e}")
+            healthy = False
+        if not healthy:
+            logger.info(f"Browser session {pooled.id} failed health check, recycling")
+            self.stats.health_check_failures += 1
+        return healthy
+
+    def _discard(self, pooled: PooledSession) -> None:
+        self.release(pooled.id)
+        self.stats.released += 1
+
+    def _return_slot(self) -> None:
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify()
+
+
+# ============================================================================
+# POOL REGISTRY
+# ============================================================================
+
+_pools: dict[Hashable, SteelSessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_session_pool(key: Hashable, factory: Callable[[], SteelSessionPool]) -> SteelSessionPool:
+    """
+    Return the shared pool for a runner configuration, creating it if needed.
+
+    Args:
+        key: Hashable identity of the runner configuration
+        factory: Builds the pool on first use
+
+    Returns:
+        Shared SteelSessionPool
+    """
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = factory()
+            _pools[key] = pool
+        return pool
+
+
+def close_session_pools() -> dict[str, dict]:
+    """
+    Close every pool and release their sessions.
+
+    Called at the end of each run so idle sessions don't keep billing.
+
+    Returns:
+        Dict mapping pool key (as string) to its final stats
+    """
+    with _pools_lock:
+        pools = list(_pools.items())
+        _pools.clear()
+    stats = {}
+    for key, pool in pools:
+        pool.close()
+        stats[str(key)] = pool.stats.to_dict()
+        logger.info(f"Closed browser session pool {key}: {pool.stats.to_dict()}")
+    return stats
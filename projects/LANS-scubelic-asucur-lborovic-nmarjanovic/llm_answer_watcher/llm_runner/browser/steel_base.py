@@ -8,6 +8,13 @@ Key components:
 - SteelConfig: Configuration dataclass for Steel API settings
 - SteelBaseRunner: Base class with common Steel operations
 
+Session reuse:
+    With session_reuse enabled (the default), sessions come from a shared
+    SteelSessionPool (see session_pool.py): up to pool_size warm sessions
+    per runner configuration are leased to concurrent intents, health-checked,
+    reset to a fresh conversation between prompts and recycled after
+    session_max_uses prompts or session_max_age seconds.
+
 Architecture:
     The base class handles Steel API interactions (session creation, cleanup,
     screenshot capture) while concrete implementations (ChatGPT, Perplexity)
@@ -29,8 +36,11 @@ Example:
 """
 
 import base64
+import hashlib
 import logging
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -40,6 +50,7 @@ except ImportError:
     Steel = None
 
 from ...utils.time import utc_timestamp
+from .session_pool import SteelSessionPool, get_session_pool
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +71,15 @@ class SteelConfig:
         solver: CAPTCHA solver service (default: "capsolver")
         proxy: Optional proxy configuration (default: None)
         output_dir: Directory for saving screenshots/HTML (default: "./output")
+        pool_size: Max concurrent sessions when reusing sessions (default: 2)
+        session_max_uses: Prompts per session before recycling (default: 20)
+        session_max_age: Session age in seconds before recycling
+                         (default: None, 80% of session_timeout)
+        health_check_interval: Idle seconds before a session is re-checked
+                               (default: 30)
+        lease_timeout: Max seconds an intent waits for a free session
+                       (default: 300)
+        base_url: Steel API base URL override (default: None, Steel cloud)
     """
 
     steel_api_key: str
@@ -72,6 +92,12 @@ class SteelConfig:
     solver: str = "capsolver"
     proxy: str | None = None
     output_dir: str = "./output"
+    pool_size: int = 2
+    session_max_uses: int = 20
+    session_max_age: float | None = None
+    health_check_interval: float = 30.0
+    lease_timeout: float = 300.0
+    base_url: str | None = None
 
 
 class SteelBaseRunner:
@@ -114,24 +140,31 @@ class SteelBaseRunner:
         >>> result = runner.run_intent("What are the best CRM tools?")
     """
 
-    def __init__(self, config: SteelConfig):
+    def __init__(self, config: SteelConfig, steel_client=None):
         """
         Initialize Steel base runner.
 
         Args:
             config: Steel configuration
+            steel_client: Pre-built Steel client (default: created from config).
+                          Tests pass a FakeSteel instance here.
 
         Raises:
-            ImportError: If steel-sdk is not installed
+            ImportError: If steel-sdk is not installed and no client is given
         """
-        if Steel is None:
-            raise ImportError(
-                "Steel SDK is not installed. Install it with: pip install steel-sdk"
-            )
+        if steel_client is None:
+            if Steel is None:
+                raise ImportError(
+                    "Steel SDK is not installed. Install it with: pip install steel-sdk"
+                )
+            client_kwargs = {"steel_api_key": config.steel_api_key}
+            if config.base_url:
+                client_kwargs["base_url"] = config.base_url
+            steel_client = Steel(**client_kwargs)
 
         self.config = config
         self.session_id: str | None = None
-        self._steel_client = Steel(steel_api_key=config.steel_api_key)
+        self._steel_client = steel_client
         self._current_session = None
 
     @property
@@ -199,6 +232,138 @@ class SteelBaseRunner:
             logger.error(f"Failed to create Steel session: {e}")
             raise
 
+    @contextmanager
+    def _lease_session(self) -> Iterator[dict]:
+        """
+        Provide a ready session for one prompt.
+
+        With session_reuse, the session is leased from the shared pool for
+        this runner configuration and returned (reset) afterwards; a session
+        whose prompt raised is discarded. Without session_reuse, a new
+        session is created and always released.
+
+        Yields:
+            dict: Session data (see _create_session)
+        """
+        if not self.config.session_reuse:
+            session = self._create_session()
+            try:
+                yield session
+            finally:
+                self._release_session(session["id"])
+            return
+
+        pool = get_session_pool(self._pool_key(), self._build_session_pool)
+        with pool.lease(timeout=self.config.lease_timeout) as session:
+            yield session
+
+    def _pool_key(self) -> tuple:
+        """Identify runners that may share sessions (API key is hashed)."""
+        key_digest = hashlib.sha256(self.config.steel_api_key.encode("utf-8")).hexdigest()[:12]
+        return (
+            self.runner_name,
+            self.config.target_url,
+            self.config.base_url,
+            self.config.proxy,
+            key_digest,
+        )
+
+    def _build_session_pool(self) -> SteelSessionPool:
+        """Create the session pool for this runner configuration."""
+        max_age = self.config.session_max_age
+        if max_age is None:
+            # Recycle before Steel's own timeout can end a session mid-prompt
+            max_age = self.config.session_timeout * 0.8
+
+        logger.info(
+            f"Creating browser session pool for {self.runner_name} "
+            f"(size={self.config.pool_size}, max_uses={self.config.session_max_uses}, "
+            f"max_age={max_age:.0f}s)"
+        )
+        return SteelSessionPool(
+            create=self._create_warm_session,
+            release=self._release_session,
+            health_check=self._session_is_healthy,
+            reset=self._reset_session,
+            size=self.config.pool_size,
+            max_uses=self.config.session_max_uses,
+            max_age_seconds=max_age,
+            health_check_interval=self.config.health_check_interval,
+        )
+
+    def _create_warm_session(self) -> dict:
+        """Create a session and load the target site so the first prompt is fast."""
+        session = self._create_session()
+        try:
+            self._warm_session(session)
+        except Exception:
+            self._release_session(session["id"])
+            raise
+        return session
+
+    def _session_is_healthy(self, session: dict) -> bool:
+        """
+        Check that a pooled session is still live on Steel.
+
+        Args:
+            session: Steel session data
+
+        Returns:
+            bool: True if Steel reports the session as live
+        """
+        session_obj = self._steel_client.sessions.retrieve(session["id"])
+        return getattr(session_obj, "status", "live") == "live"
+
+    def _warm_session(self, session: dict) -> None:
+        """
+        Prepare a new pooled session before its first prompt.
+
+        Default: open target_url. Override for sites that need more setup.
+
+        Args:
+            session: Steel session data
+        """
+        self._open_target_page(session)
+
+    def _reset_session(self, session: dict) -> None:
+        """
+        Clear conversation state before a pooled session is reused.
+
+        Default: reopen target_url, which starts a new conversation on
+        ChatGPT and Perplexity. Raising discards the session.
+
+        Args:
+            session: Steel session data
+        """
+        self._open_target_page(session)
+
+    def _open_target_page(self, session: dict) -> None:
+        """
+        Navigate the session's page to target_url via Playwright CDP.
+
+        Skipped (with a debug log) when Playwright is not installed or the
+        session has no CDP URL; _navigate_and_submit then loads the page.
+
+        Args:
+            session: Steel session data
+        """
+        ws_url = session.get("cdp_url")
+        if not ws_url:
+            return
+
+        try:
+            from playwright.sync_api import sync_playwright
+        except ImportError:
+            logger.debug("Playwright not installed, skipping page warm-up")
+            return
+
+        with sync_playwright() as p:
+            browser = p.chromium.connect_over_cdp(ws_url)
+            context = browser.contexts[0] if browser.contexts else browser.new_context()
+            page = context.pages[0] if context.pages else context.new_page()
+            page.goto(self.config.target_url)
+            page.wait_for_load_state("domcontentloaded")
+
     def _release_session(self, session_id: str) -> None:
         """
         Release Steel browser session using Steel SDK.
@@ -419,8 +584,11 @@ class SteelBaseRunner:
             return None
 
     def __del__(self):
-        """Cleanup: release any active sessions."""
+        """Cleanup: release any active unpooled session."""
         try:
+            # Pooled sessions outlive the runner; the pool releases them
+            if self.config.session_reuse:
+                return
             if self.session_id and self._current_session:
                 logger.debug(f"Cleanup: Releasing session {self.session_id}")
                 self._steel_client.sessions.release(self.session_id)
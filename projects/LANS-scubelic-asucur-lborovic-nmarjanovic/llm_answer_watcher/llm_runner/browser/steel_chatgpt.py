@@ -85,52 +85,55 @@ class SteelChatGPTRunner(SteelBaseRunner):
             ...     print(f"Error: {result.error_message}")
         """
         start_time = time.time()
+        # Pooled sessions serve many prompts, so artifact names need a per-prompt part
+        artifact_id = f"chatgpt_{int(start_time * 1000)}"
 
         try:
-            # Create Steel browser session
-            session = self._create_session()
-            self.session_id = session["id"]
-
-            logger.info(f"ChatGPT session created: {self.session_id}")
-
-            # Navigate to ChatGPT and submit prompt
-            self._navigate_and_submit(session, prompt)
-
-            # Wait for response completion
-            answer_text = self._extract_answer(session)
-
-            # Extract web search results if present (future enhancement)
-            web_search_results = self._extract_web_sources(session)
-            web_search_count = len(web_search_results) if web_search_results else 0
-
-            # Take screenshot if enabled
-            screenshot_path = self._take_screenshot(self.session_id, "chatgpt")
-
-            # Save HTML snapshot if enabled
-            html_snapshot_path = self._save_html(self.session_id, "chatgpt")
-
-            # Estimate cost (placeholder for now)
-            cost_usd = self._estimate_cost(session, start_time)
-
-            # Import timestamp utility
-            from ...utils.time import utc_timestamp
-
-            return IntentResult(
-                answer_text=answer_text,
-                runner_type="browser",
-                runner_name="steel-chatgpt",
-                provider="chatgpt-web",
-                model_name="chatgpt-unknown",  # Can't determine model from UI
-                timestamp_utc=utc_timestamp(),
-                cost_usd=cost_usd,
-                tokens_used=0,  # Browser-based, no token tracking
-                screenshot_path=screenshot_path,
-                html_snapshot_path=html_snapshot_path,
-                session_id=self.session_id,
-                web_search_results=web_search_results,
-                web_search_count=web_search_count,
-                success=True,
-            )
+            # Lease a warm browser session (new session if not reusing)
+            with self._lease_session() as session:
+                # Runners are shared by concurrent intents: keep the ID local
+                session_id = self.session_id = session["id"]
+
+                logger.info(f"ChatGPT session ready: {session_id}")
+
+                # Navigate to ChatGPT and submit prompt
+                self._navigate_and_submit(session, prompt)
+
+                # Wait for response completion
+                answer_text = self._extract_answer(session)
+
+                # Extract web search results if present (future enhancement)
+                web_search_results = self._extract_web_sources(session)
+                web_search_count = len(web_search_results) if web_search_results else 0
+
+                # Take screenshot if enabled
+                screenshot_path = self._take_screenshot(session_id, artifact_id)
+
+                # Save HTML snapshot if enabled
+                html_snapshot_path = self._save_html(session_id, artifact_id)
+
+                # Estimate cost (placeholder for now)
+                cost_usd = self._estimate_cost(session, start_time)
+
+                # Import timestamp utility
+                from ...utils.time import utc_timestamp
+
+                return IntentResult(
+                    answer_text=answer_text,
+                    runner_type="browser",
+                    runner_name="steel-chatgpt",
+                    provider="chatgpt-web",
+                    model_name="chatgpt-unknown",  # Can't determine model from UI
+                    timestamp_utc=utc_timestamp(),
+                    cost_usd=cost_usd,
+                    tokens_used=0,  # Browser-based, no token tracking
+                    screenshot_path=screenshot_path,
+                    html_snapshot_path=html_snapshot_path,
+                    session_id=session_id,
+                    web_search_results=web_search_results,
+                    web_search_count=web_search_count,
+                    success=True,
+                )
 
         except Exception as e:
             logger.error(f"ChatGPT runner failed: {e}", exc_info=True)
@@ -149,11 +152,6 @@ class SteelChatGPTRunner(SteelBaseRunner):
                 error_message=str(e),
             )
 
-        finally:
-            # Cleanup: release session if not reusing
-            if self.session_id and not self.config.session_reuse:
-                self._release_session(self.session_id)
-
     def _navigate_and_submit(self, session: dict, prompt: str) -> None:
         """
         Navigate to ChatGPT and submit prompt using Playwright.
@@ -192,9 +190,10 @@ class SteelChatGPTRunner(SteelBaseRunner):
                 context = browser.contexts[0] if browser.contexts else browser.new_context()
                 page = context.pages[0] if context.pages else context.new_page()
 
-                # Navigate to target URL
-                logger.info(f"Navigating to {self.config.target_url}")
-                page.goto(self.config.target_url)
+                # Navigate to target URL unless the session was already reset there
+                if page.url.rstrip("/") != self.config.target_url.rstrip("/"):
+                    logger.info(f"Navigating to {self.config.target_url}")
+                    page.goto(self.config.target_url)
 
                 # Wait for page to be ready
                 page.wait_for_load_state("domcontentloaded")
@@ -430,6 +429,12 @@ class SteelChatGPTPlugin:
         - session_reuse: Reuse sessions across intents (default: True)
         - solver: CAPTCHA solver (default: "capsolver")
         - proxy: Optional proxy config (default: None)
+        - pool_size: Warm sessions shared by concurrent intents (default: 2)
+        - session_max_uses: Prompts per session before recycling (default: 20)
+        - session_max_age: Seconds before recycling (default: 80% of session_timeout)
+        - health_check_interval: Idle seconds before re-checking a session (default: 30)
+        - lease_timeout: Max wait for a free session in seconds (default: 300)
+        - base_url: Steel API base URL override (default: Steel cloud)
 
     Example:
         >>> config = {
@@ -473,6 +478,12 @@ class SteelChatGPTPlugin:
             solver=config.get("solver", "capsolver"),
             proxy=config.get("proxy"),
             output_dir=config.get("output_dir", "./output"),
+            pool_size=config.get("pool_size", 2),
+            session_max_uses=config.get("session_max_uses", 20),
+            session_max_age=config.get("session_max_age"),
+            health_check_interval=config.get("health_check_interval", 30.0),
+            lease_timeout=config.get("lease_timeout", 300.0),
+            base_url=config.get("base_url"),
         )
         return SteelChatGPTRunner(steel_config)
 
@@ -18,7 +18,7 @@ import logging
 import random
 from dataclasses import dataclass
 
-from llm_answer_watcher.llm_runner.models import LLMClient, LLMResponse
+from llm_answer_watcher.llm_runner.models import ChunkCallback, LLMClient, LLMResponse
 
 logger = logging.getLogger(__name__)
 
@@ -104,7 +104,12 @@ class ChaosLLMClient:
             f"timeout={self.timeout_prob}, auth_error={self.auth_error_prob}"
         )
 
-    async def generate_answer(self, prompt: str) -> LLMResponse:
+    async def generate_answer(
+        self,
+        prompt: str,
+        on_chunk: ChunkCallback | None = None,
+        max_answer_chars: int | None = None,
+    ) -> LLMResponse:
         """
         Generate answer with chaos injection.
 
@@ -114,6 +119,8 @@ class ChaosLLMClient:
 
         Args:
             prompt: User intent prompt
+            on_chunk: Optional streaming callback, forwarded to base_client
+            max_answer_chars: Optional streamed length cap, forwarded to base_client
 
         Returns:
             LLMResponse: Response from base_client if successful
@@ -126,13 +133,19 @@ class ChaosLLMClient:
             >>> response = await chaos.generate_answer("test")
             # 80% chance of success, 20% chance of error
         """
+        # Streaming arguments are only forwarded when used, so base clients
+        # without streaming support keep working
+        stream_kwargs = {}
+        if on_chunk is not None:
+            stream_kwargs = {"on_chunk": on_chunk, "max_answer_chars": max_answer_chars}
+
         # Decide outcome
         roll = random.random()
 
         # Success case
         if roll < self.success_rate:
             logger.debug("ChaosLLMClient: SUCCESS (calling base client)")
-            return await self.base_client.generate_answer(prompt)
+            return await self.base_client.generate_answer(prompt, **stream_kwargs)
 
         # Failure case - determine which failure type
         failure_roll = random.random()
@@ -174,7 +187,7 @@ class ChaosLLMClient:
 
         # If we get here, success (edge case due to floating point arithmetic)
         logger.debug("ChaosLLMClient: SUCCESS (fallback)")
-        return await self.base_client.generate_answer(prompt)
+        return await self.base_client.generate_answer(prompt, **stream_kwargs)
 
 
 def create_chaos_client(
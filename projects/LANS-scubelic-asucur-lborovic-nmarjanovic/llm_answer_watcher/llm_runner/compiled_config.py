@@ -0,0 +1,301 @@
+"""
+Compiled run configurations, cached by content hash.
+
+Every /run_watcher call parsed the YAML, validated the pydantic models and
+resolved models and API keys, and the run then rebuilt structures that only
+depend on the config: brand patterns for every answer, the operation order
+for every query, and pricing lookups (each reading the pricing cache and
+overrides files) for every intent x model pair of the cost estimate.
+
+A CompiledConfig bundles the validated RuntimeConfig with those derived
+structures, computed once:
+
+- brand_patterns: word-boundary patterns for the brands, passed by run_all()
+  to parse_answer(), sampling and the streaming detector
+- operation plans: intent and global operations of each intent, in
+  dependency order
+- pricing: ModelPricing per query and operation model (None if no pricing
+  is available, so the estimate uses its fallback rates)
+- client_specs: build_client() arguments per model, for the factory cache
+
+CompiledConfigCache keeps compiled configs keyed by the SHA-256 of the
+config source and a digest of the secrets it was built with, so repeated
+submissions of the same config skip parsing, validation and compilation.
+The least recently used entry is evicted beyond max_entries, and entries
+expire after ttl_seconds so pricing is picked up again.
+
+run_all() compiles the config itself when it is not given a CompiledConfig,
+so CLI runs (one process per run, e.g. from cron) still compute the derived
+structures once per run instead of once per query.
+
+Example:
+    >>> compiled = get_compiled_config_cache().get_or_compile(
+    ...     yaml_text, lambda: build_runtime_config(yaml_text, api_keys), secrets=api_keys
+    ... )
+    >>> result = await run_all(compiled.config, compiled=compiled)
+
+Security:
+    Secrets are part of the cache key only as a SHA-256 digest. Cached
+    RuntimeConfigs hold resolved API keys in memory, like any running config.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from ..config.schema import RuntimeConfig, RuntimeModel
+from ..extractor.mention_detector import BrandPattern, compile_brand_patterns
+from ..utils import metrics
+from ..utils.pricing import ModelPricing, get_pricing
+from .operation_executor import topological_sort
+from .spend_guard import model_key
+
+logger = logging.getLogger(__name__)
+
+# Compiled configs kept by the process-wide cache
+DEFAULT_MAX_ENTRIES = 64
+
+# Entries are recompiled after this long, so pricing changes are picked up
+DEFAULT_TTL_SECONDS = 3600.0
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """
+    Validated runtime config with the structures derived from it.
+
+    Attributes:
+        config: Validated RuntimeConfig
+        content_hash: Cache key the config was compiled under ("" if uncached)
+        brand_patterns: (alias, normalized name, category, pattern) per brand
+        operation_plans: Intent ID -> operations in dependency order
+        pricing: model_key() -> ModelPricing, or None without pricing
+        client_specs: model_key() -> build_client() keyword arguments (missing
+            for a model configured twice with different settings)
+    """
+
+    config: RuntimeConfig
+    content_hash: str = ""
+    brand_patterns: tuple[BrandPattern, ...] = ()
+    operation_plans: dict[str, tuple[Any, ...]] = field(default_factory=dict)
+    pricing: dict[str, ModelPricing | None] = field(default_factory=dict)
+    client_specs: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def client_spec(self, model: RuntimeModel) -> dict[str, Any]:
+        """
+        build_client() keyword arguments for a configured model.
+
+        Args:
+            model: Model from config.models or config.operation_models
+
+        Returns:
+            Precomputed arguments, or the model's own if its key is ambiguous
+        """
+        spec = self.client_specs.get(model_key(model.provider, model.model_name))
+        return spec if spec is not None else client_kwargs(model)
+
+    def operations_for(self, intent_id: str) -> list[Any]:
+        """
+        Operations to run after an intent's query, in dependency order.
+
+        Args:
+            intent_id: Intent identifier
+
+        Returns:
+            Intent and global operations (empty for an unknown intent)
+        """
+        return list(self.operation_plans.get(intent_id, ()))
+
+
+def client_kwargs(model: RuntimeModel) -> dict[str, Any]:
+    """build_client() keyword arguments for a model."""
+    return {
+        "provider": model.provider,
+        "model_name": model.model_name,
+        "api_key": model.api_key,
+        "system_prompt": model.system_prompt,
+        "tools": model.tools,
+        "tool_choice": model.tool_choice,
+        "base_url": model.base_url,
+    }
+
+
+def _resolve_pricing(provider: str, model_name: str) -> ModelPricing | None:
+    try:
+        return get_pricing(provider, model_name)
+    except Exception as e:
+        logger.warning(f"No pricing for {provider}/{model_name}: {e}")
+        return None
+
+
+def compile_runtime_config(config: RuntimeConfig, content_hash: str = "") -> CompiledConfig:
+    """
+    Compute the structures a run derives from its config.
+
+    Args:
+        config: Validated runtime config
+        content_hash: Cache key, recorded on the result
+
+    Returns:
+        CompiledConfig
+    """
+    with metrics.span("config_compile"):
+        brand_patterns = compile_brand_patterns(
+            tuple(config.brands.mine), tuple(config.brands.competitors)
+        )
+
+        operation_plans = {}
+        for intent in config.intents:
+            operations = list(intent.operations) + list(config.global_operations)
+            operation_plans[intent.id] = tuple(topological_sort(operations))
+
+        pricing: dict[str, ModelPricing | None] = {}
+        client_specs: dict[str, dict[str, Any]] = {}
+        ambiguous: set[str] = set()
+        for model in [*config.models, *config.operation_models]:
+            key = model_key(model.provider, model.model_name)
+            if key not in pricing:
+                pricing[key] = _resolve_pricing(model.provider, model.model_name)
+            spec = client_kwargs(model)
+            if client_specs.setdefault(key, spec) != spec:
+                ambiguous.add(key)
+        # Same model configured with different settings: callers use the model itself
+        for key in ambiguous:
+            del client_specs[key]
+
+    return CompiledConfig(
+        config=config,
+        content_hash=content_hash,
+        brand_patterns=brand_patterns,
+        operation_plans=operation_plans,
+        pricing=pricing,
+        client_specs=client_specs,
+    )
+
+
+def config_content_hash(source: str | bytes, secrets: Mapping[str, str] | None = None) -> str:
+    """
+    Cache key of a config source and the secrets it is built with.
+
+    Args:
+        source: Config source (YAML text or file contents)
+        secrets: API keys or other values the build depends on
+
+    Returns:
+        Hex digest
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    digest = hashlib.sha256(source)
+    if secrets:
+        digest.update(b"\0")
+        digest.update(json.dumps(dict(secrets), sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class CompiledConfigStats:
+    """Counters of compiled config cache use."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def to_dict(self) -> dict:
+        """Return stats as a JSON-serializable dict with the hit rate."""
+        data = asdict(self)
+        total = self.hits + self.misses
+        data["hit_rate"] = round(self.hits / total, 4) if total else 0.0
+        return data
+
+
+class CompiledConfigCache:
+    """
+    Thread-safe LRU cache of compiled configs.
+
+    Args:
+        max_entries: Compiled configs kept (least recently used evicted)
+        ttl_seconds: Age after which an entry is compiled again
+
+    Attributes:
+        stats: Hit/miss, eviction and expiration counters
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CompiledConfigStats()
+        self._entries: OrderedDict[str, tuple[float, CompiledConfig]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compile(
+        self,
+        source: str | bytes,
+        build: Callable[[], RuntimeConfig],
+        secrets: Mapping[str, str] | None = None,
+    ) -> CompiledConfig:
+        """
+        Return the compiled config for a source, building it on a miss.
+
+        Args:
+            source: Config source the build reads (YAML text or file contents)
+            build: Parses and validates the source into a RuntimeConfig
+            secrets: API keys or other values the build depends on
+
+        Returns:
+            CompiledConfig (shared between callers: treat it as read-only)
+
+        Raises:
+            Whatever build() raises; failed builds are not cached
+        """
+        key = config_content_hash(source, secrets)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.stats.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                metrics.inc("cache_hits_total", cache="compiled_config")
+                return entry[1]
+            self.stats.misses += 1
+        metrics.inc("cache_misses_total", cache="compiled_config")
+
+        # Compiled outside the lock; concurrent misses for one key both compile
+        compiled = compile_runtime_config(build(), content_hash=key)
+        with self._lock:
+            self._entries[key] = (now, compiled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return compiled
+
+    def clear(self) -> None:
+        """Drop all entries (e.g. after pricing overrides change)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_compiled_config_cache = CompiledConfigCache()
+
+
+def get_compiled_config_cache() -> CompiledConfigCache:
+    """Return the process-wide compiled config cache."""
+    return _compiled_config_cache
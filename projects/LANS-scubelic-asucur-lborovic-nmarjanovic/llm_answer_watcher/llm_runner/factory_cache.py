@@ -0,0 +1,313 @@
+"""
+Per-run cache of LLM clients and intent runners.
+
+run_all() used to call build_client() or RunnerRegistry.create_runner() for
+every query, repeating config validation and object construction for each
+intent x model pair. A FactoryCache lives for one run and hands out one
+shared instance per distinct configuration:
+
+- Clients are keyed by provider, model, API key (hashed), system prompt,
+  tools, tool_choice and base_url. They are wrapped in a ScheduledLLMClient,
+  so every upstream call holds a slot of the run's tenant (see
+  llm_runner.scheduler), and in a CoalescingLLMClient so identical
+  concurrent requests share one upstream call (see llm_runner.singleflight)
+- Runners are keyed by plugin name and their full config dict
+- Instances are closed in reverse creation order when the run ends
+  (aclose() or close(), whichever the instance provides)
+
+Cached objects must be safe to share between concurrent queries: LLM clients
+hold only configuration, and browser runners keep per-prompt state in local
+variables (sessions come from the session pool).
+
+Code outside run_all() (operations, function-calling extraction, intent
+classification) uses get_client(), which goes through the cache of the
+current run when one is active and builds a fresh client otherwise.
+
+Inside use_client_builder(builder), every client is built by that builder
+instead of the one the call site passes (e.g. benchmarks running against
+MockLLMClient).
+
+Example:
+    >>> cache, token = start_factory_cache()
+    >>> client = cache.client(build_client, provider="google", model_name="gemini-2.5-flash",
+    ...                       api_key=api_key, system_prompt="You are a helpful assistant.")
+    >>> same = get_client(build_client, provider="google", model_name="gemini-2.5-flash",
+    ...                   api_key=api_key, system_prompt="You are a helpful assistant.")
+    >>> client is same
+    True
+    >>> await cache.aclose()
+    >>> stop_factory_cache(token)
+    >>> cache.stats.to_dict()["client_hits"]
+    1
+
+Security:
+    API keys are part of the cache key only as a truncated SHA-256 digest,
+    so keys never appear in cache keys, stats or logs.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .scheduler import LOCAL_TENANT, ScheduledLLMClient
+from .singleflight import CoalescingLLMClient, single_flight_enabled
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FactoryCacheStats:
+    """Counters of cache use during one run."""
+
+    client_hits: int = 0
+    client_misses: int = 0
+    runner_hits: int = 0
+    runner_misses: int = 0
+    closed: int = 0
+    close_errors: int = 0
+
+    def to_dict(self) -> dict:
+        """Return stats as a JSON-serializable dict with hit rates."""
+        data = asdict(self)
+        data["client_hit_rate"] = _hit_rate(self.client_hits, self.client_misses)
+        data["runner_hit_rate"] = _hit_rate(self.runner_hits, self.runner_misses)
+        return data
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total, 4) if total else 0.0
+
+
+def _secret_digest(secret: str | None) -> str | None:
+    if secret is None:
+        return None
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
+
+
+def _stable_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+class FactoryCache:
+    """
+    Shared client and runner instances for one run.
+
+    Args:
+        tenant: Scheduler tenant the run's provider calls are made for
+
+    Attributes:
+        stats: Hit/miss and close counters
+    """
+
+    def __init__(self, tenant: str = LOCAL_TENANT):
+        self.tenant = tenant
+        self.stats = FactoryCacheStats()
+        self._instances: dict[tuple, Any] = {}
+        self._creation_order: list[Any] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def client(
+        self,
+        builder: Callable[..., Any],
+        *,
+        provider: str,
+        model_name: str,
+        api_key: str,
+        system_prompt: str,
+        tools: list[dict] | None = None,
+        tool_choice: str = "auto",
+        base_url: str | None = None,
+    ) -> Any:
+        """
+        Return the shared client for this configuration, building it once.
+
+        Args:
+            builder: Client factory called on a miss (normally build_client)
+            provider, model_name, api_key, system_prompt, tools, tool_choice,
+            base_url: Passed to builder unchanged
+
+        Returns:
+            LLMClient instance: the built client in a ScheduledLLMClient,
+            itself in a CoalescingLLMClient unless WATCHER_SINGLE_FLIGHT is
+            off (coalesced requests don't take a slot)
+        """
+        key = (
+            "client",
+            provider,
+            model_name,
+            _secret_digest(api_key),
+            system_prompt,
+            _stable_json(tools),
+            tool_choice,
+            base_url,
+        )
+
+        builder = _client_builder.get() or builder
+
+        def _build() -> Any:
+            client = builder(
+                provider=provider,
+                model_name=model_name,
+                api_key=api_key,
+                system_prompt=system_prompt,
+                tools=tools,
+                tool_choice=tool_choice,
+                base_url=base_url,
+            )
+            client = ScheduledLLMClient(client, provider, self.tenant)
+            if not single_flight_enabled():
+                return client
+            # Includes the API key digest: tenants never share upstream calls
+            return CoalescingLLMClient(client, key[1:])
+
+        return self._get_or_create(key, _build, kind="client")
+
+    def runner(self, plugin_name: str, config: dict) -> Any:
+        """
+        Return the shared runner for this plugin config, creating it once.
+
+        Args:
+            plugin_name: Registered runner plugin name
+            config: Plugin configuration dict
+
+        Returns:
+            IntentRunner instance
+
+        Raises:
+            ValueError: If the plugin is unknown or the config is invalid
+        """
+        from .plugin_registry import RunnerRegistry
+
+        # Secrets in runner configs are hashed like client API keys
+        safe_config = {
+            k: _secret_digest(v) if "key" in k and isinstance(v, str) else v
+            for k, v in config.items()
+        }
+        key = ("runner", plugin_name, _stable_json(safe_config))
+        return self._get_or_create(
+            key,
+            lambda: RunnerRegistry.create_runner(plugin_name=plugin_name, config=config),
+            kind="runner",
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close every cached instance in reverse creation order.
+
+        Instances with aclose() are awaited, otherwise close() is called if
+        present. Errors are logged and counted, never raised. Safe to call
+        more than once.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            instances = list(reversed(self._creation_order))
+            self._creation_order.clear()
+            self._instances.clear()
+
+        for instance in instances:
+            closer = getattr(instance, "aclose", None) or getattr(instance, "close", None)
+            if closer is None:
+                continue
+            try:
+                result = closer()
+                if inspect.isawaitable(result):
+                    await result
+                self.stats.closed += 1
+            except Exception as e:
+                self.stats.close_errors += 1
+                logger.warning(f"Failed to close cached {type(instance).__name__}: {e}")
+
+    def _get_or_create(self, key: tuple, factory: Callable[[], Any], kind: str) -> Any:
+        # Construction happens under the lock so concurrent first uses build once
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Factory cache is closed")
+            instance = self._instances.get(key)
+            if instance is not None:
+                setattr(self.stats, f"{kind}_hits", getattr(self.stats, f"{kind}_hits") + 1)
+                return instance
+            instance = factory()
+            self._instances[key] = instance
+            self._creation_order.append(instance)
+            setattr(self.stats, f"{kind}_misses", getattr(self.stats, f"{kind}_misses") + 1)
+            return instance
+
+
+# ============================================================================
+# MODULE-LEVEL API
+# ============================================================================
+
+# Cache of the run currently executing in this context
+_active_cache: ContextVar[FactoryCache | None] = ContextVar(
+    "llm_answer_watcher_factory_cache", default=None
+)
+
+# Builder replacing the call sites' builders, set by use_client_builder()
+_client_builder: ContextVar[Callable[..., Any] | None] = ContextVar(
+    "llm_answer_watcher_client_builder", default=None
+)
+
+
+@contextmanager
+def use_client_builder(builder: Callable[..., Any]) -> Iterator[None]:
+    """
+    Build every client in this context (and tasks created from it) with builder.
+
+    Args:
+        builder: Called with build_client()'s keyword arguments
+    """
+    token = _client_builder.set(builder)
+    try:
+        yield
+    finally:
+        _client_builder.reset(token)
+
+
+def start_factory_cache(tenant: str = LOCAL_TENANT) -> tuple[FactoryCache, Token]:
+    """
+    Start a factory cache for a run in the current context.
+
+    Tasks created afterwards (e.g. by asyncio.gather) share the cache.
+
+    Args:
+        tenant: Scheduler tenant of the run (user_id as string, or LOCAL_TENANT)
+
+    Returns:
+        Tuple of (cache, token for stop_factory_cache())
+    """
+    cache = FactoryCache(tenant)
+    return cache, _active_cache.set(cache)
+
+
+def stop_factory_cache(token: Token) -> None:
+    """Detach the cache started with start_factory_cache() from the context."""
+    _active_cache.reset(token)
+
+
+def get_client(builder: Callable[..., Any], **client_kwargs) -> Any:
+    """
+    Build a client through the active run's cache, if any.
+
+    Args:
+        builder: Client factory (pass the caller's build_client so tests can
+                 patch it where it is used)
+        **client_kwargs: Keyword arguments for builder
+
+    Returns:
+        Shared client during a run, a new client otherwise
+    """
+    cache = _active_cache.get()
+    if cache is None or cache._closed:
+        return (_client_builder.get() or builder)(**client_kwargs)
+    return cache.client(builder, **client_kwargs)
@@ -0,0 +1,615 @@
+"""
+Local fake LLM provider server for load and soak testing.
+
+MockLLMClient bypasses httpx entirely, so it cannot expose connection
+setup, retry, timeout or JSON decoding costs in GeminiClient/GroqClient.
+This module provides a small ASGI app that speaks the Gemini
+generateContent and Groq chat-completions wire formats, so the real
+clients can be pointed at it via their base_url override and the whole
+I/O path can be exercised in CI without network access.
+
+Configurable behavior (FakeProviderConfig):
+- Latency distributions: fixed, uniform, normal, lognormal (long tail)
+- Token counts reported in usage metadata
+- Function-call responses (Gemini functionCall parts, Groq tool_calls)
+- Rate limiting with x-ratelimit-* and Retry-After headers
+- Error injection (5xx status codes) and hung requests (client timeouts)
+
+Endpoints:
+    POST /v1beta/models/{model}:generateContent   (Gemini)
+    POST /openai/v1/chat/completions              (Groq)
+    GET  /_fake/stats                             (request counters)
+
+Example:
+    >>> from llm_answer_watcher.llm_runner.fake_provider import (
+    ...     FakeProviderConfig, FakeProviderServer)
+    >>> from llm_answer_watcher.llm_runner.models import build_client
+    >>> config = FakeProviderConfig(latency_ms=50, latency_jitter_ms=20,
+    ...     latency_distribution="lognormal", error_rate=0.05)
+    >>> with FakeProviderServer(config) as server:
+    ...     client = build_client("google", "gemini-2.5-flash", "fake-key",
+    ...         "You are a helpful assistant.", base_url=server.gemini_base_url)
+    ...     response = await client.generate_answer("What are the best CRM tools?")
+    >>> server.stats.requests
+    1
+
+Security:
+    The server binds to 127.0.0.1 by default and accepts any non-empty API
+    key. It is a test utility and must never be exposed publicly.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import random
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+# Path prefixes matching the public API base URLs of each provider
+GEMINI_PATH_PREFIX = "/v1beta"
+GROQ_PATH_PREFIX = "/openai/v1"
+
+# Supported latency distributions
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+# Function-call modes:
+#   auto   - answer with a function call when the request declares function tools
+#   always - always answer with a function call
+#   never  - always answer with text
+FUNCTION_CALL_MODES = ("auto", "always", "never")
+
+# Default answer text (numbered list so extraction finds brands and ranks)
+DEFAULT_ANSWER_TEXT = (
+    "Here are the best email warmup tools:\n\n"
+    "1. **Warmly** - Automated warmup with detailed deliverability reports.\n"
+    "2. **HubSpot** - Full CRM suite with built-in email tools.\n"
+    "3. **Instantly** - Unlimited warmup for cold outreach teams.\n"
+)
+
+# Rough characters-per-token ratio used when token counts are not configured
+_CHARS_PER_TOKEN = 4
+
+# Seconds to wait for the background server to start accepting connections
+_STARTUP_TIMEOUT_SECONDS = 10.0
+
+# Google RPC status names for error bodies
+_GEMINI_STATUS_NAMES = {
+    400: "INVALID_ARGUMENT",
+    401: "UNAUTHENTICATED",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    502: "UNAVAILABLE",
+    503: "UNAVAILABLE",
+    504: "DEADLINE_EXCEEDED",
+}
+
+
+@dataclass
+class FakeProviderConfig:
+    """
+    Behavior of the fake provider server.
+
+    Attributes:
+        answer_text: Text returned in successful non-function-call responses
+        latency_ms: Central response latency (mean, or median for lognormal)
+        latency_jitter_ms: Spread of the latency distribution (half-width for
+            uniform, standard deviation for normal, scale of the tail for lognormal)
+        latency_distribution: One of "fixed", "uniform", "normal", "lognormal"
+        prompt_tokens: Prompt token count to report (None = estimated from request)
+        completion_tokens: Completion token count to report (None = estimated from answer)
+        function_call_mode: One of "auto", "always", "never" (see FUNCTION_CALL_MODES)
+        function_call_name: Function name to return when the request declares none
+        function_call_arguments: Arguments returned in function-call responses
+        rate_limit_requests: Requests allowed per window (None = unlimited)
+        rate_limit_window_seconds: Length of the fixed rate-limit window
+        error_rate: Probability (0.0-1.0) of answering with an injected error
+        error_status_codes: Status codes chosen uniformly for injected errors
+        hang_rate: Probability (0.0-1.0) of holding a request for hang_seconds
+            before answering (longer than REQUEST_TIMEOUT triggers client timeouts)
+        hang_seconds: Duration of a hung request
+        seed: Random seed for reproducible latency and error injection
+    """
+
+    answer_text: str = DEFAULT_ANSWER_TEXT
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    latency_distribution: str = "uniform"
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    function_call_mode: str = "auto"
+    function_call_name: str = "extract_brand_mentions"
+    function_call_arguments: dict = field(default_factory=dict)
+    rate_limit_requests: int | None = None
+    rate_limit_window_seconds: float = 60.0
+    error_rate: float = 0.0
+    error_status_codes: tuple[int, ...] = (500, 503)
+    hang_rate: float = 0.0
+    hang_seconds: float = 60.0
+    seed: int | None = None
+
+    def __post_init__(self):
+        """Validate configuration values."""
+        if self.latency_ms < 0 or self.latency_jitter_ms < 0:
+            raise ValueError("latency_ms and latency_jitter_ms must be >= 0")
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"latency_distribution must be one of {LATENCY_DISTRIBUTIONS}, "
+                f"got: {self.latency_distribution}"
+            )
+        if self.function_call_mode not in FUNCTION_CALL_MODES:
+            raise ValueError(
+                f"function_call_mode must be one of {FUNCTION_CALL_MODES}, "
+                f"got: {self.function_call_mode}"
+            )
+        for name in ("error_rate", "hang_rate"):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be between 0.0 and 1.0, got: {value}")
+        if self.rate_limit_requests is not None and self.rate_limit_requests < 1:
+            raise ValueError("rate_limit_requests must be >= 1 or None")
+        if self.rate_limit_window_seconds <= 0:
+            raise ValueError("rate_limit_window_seconds must be > 0")
+        if self.error_rate > 0 and not self.error_status_codes:
+            raise ValueError("error_status_codes cannot be empty when error_rate > 0")
+
+
+@dataclass
+class FakeProviderStats:
+    """
+    Counters collected by the fake provider server.
+
+    Attributes:
+        requests: Total requests received on provider endpoints
+        by_status: Response count per HTTP status code
+        function_calls: Successful responses that contained a function call
+        rate_limited: Requests rejected with 429 by the rate limiter
+        injected_errors: Requests answered with an injected error status
+        hung: Requests held for hang_seconds
+    """
+
+    requests: int = 0
+    by_status: dict[int, int] = field(default_factory=dict)
+    function_calls: int = 0
+    rate_limited: int = 0
+    injected_errors: int = 0
+    hung: int = 0
+
+
+class FakeProvider:
+    """
+    Request handling state shared by the fake provider endpoints.
+
+    Holds the configuration, RNG, fixed-window rate limiter and stats. All
+    methods run on the server's event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, config: FakeProviderConfig):
+        self.config = config
+        self.stats = FakeProviderStats()
+        self._rng = random.Random(config.seed)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def sample_latency_seconds(self) -> float:
+        """Draw one response latency from the configured distribution."""
+        mean = self.config.latency_ms
+        spread = self.config.latency_jitter_ms
+        distribution = self.config.latency_distribution
+
+        if distribution == "fixed" or spread == 0:
+            latency = mean
+        elif distribution == "uniform":
+            latency = self._rng.uniform(mean - spread, mean + spread)
+        elif distribution == "normal":
+            latency = self._rng.gauss(mean, spread)
+        # lognormal: median=mean, sigma from relative spread
+        elif mean <= 0:
+            latency = self._rng.expovariate(1 / spread)
+        else:
+            latency = self._rng.lognormvariate(math.log(mean), spread / mean)
+
+        return max(latency, 0.0) / 1000
+
+    def rate_limit_headers(self) -> tuple[dict[str, str], bool]:
+        """
+        Count the request against the rate-limit window.
+
+        Returns:
+            Tuple of (x-ratelimit-* headers, allowed)
+        """
+        limit = self.config.rate_limit_requests
+        if limit is None:
+            return {}, True
+
+        now = time.monotonic()
+        window = self.config.rate_limit_window_seconds
+        if now - self._window_start >= window:
+            self._window_start = now
+            self._window_count = 0
+
+        reset_seconds = max(window - (now - self._window_start), 0.0)
+        allowed = self._window_count < limit
+        if allowed:
+            self._window_count += 1
+
+        headers = {
+            "x-ratelimit-limit-requests": str(limit),
+            "x-ratelimit-remaining-requests": str(limit - self._window_count),
+            "x-ratelimit-reset-requests": f"{reset_seconds:.2f}s",
+        }
+        if not allowed:
+            headers["Retry-After"] = str(max(math.ceil(reset_seconds), 1))
+        return headers, allowed
+
+    def roll(self, probability: float) -> bool:
+        """Return True with the given probability."""
+        return probability > 0 and self._rng.random() < probability
+
+    def choose_error_status(self) -> int:
+        """Pick an injected error status code."""
+        return self._rng.choice(self.config.error_status_codes)
+
+    def token_counts(self, prompt_text: str, answer_text: str) -> tuple[int, int]:
+        """Return (prompt_tokens, completion_tokens) for a response."""
+        prompt_tokens = self.config.prompt_tokens
+        if prompt_tokens is None:
+            prompt_tokens = max(len(prompt_text) // _CHARS_PER_TOKEN, 1)
+        completion_tokens = self.config.completion_tokens
+        if completion_tokens is None:
+            completion_tokens = max(len(answer_text) // _CHARS_PER_TOKEN, 1)
+        return prompt_tokens, completion_tokens
+
+    def function_call_name(self, declared_names: list[str]) -> str | None:
+        """
+        Decide whether to answer with a function call.
+
+        Args:
+            declared_names: Function names declared in the request's tools
+
+        Returns:
+            Function name to call, or None to answer with text
+        """
+        mode = self.config.function_call_mode
+        if mode == "never" or (mode == "auto" and not declared_names):
+            return None
+        return declared_names[0] if declared_names else self.config.function_call_name
+
+    def record(self, status_code: int) -> None:
+        """Count a response status code."""
+        self.stats.by_status[status_code] = self.stats.by_status.get(status_code, 0) + 1
+
+
+def _declared_function_names(tools: Any) -> list[str]:
+    """
+    Collect function names declared in a request's tools list.
+
+    Accepts Gemini ({"functionDeclarations": [...]}), OpenAI chat
+    ({"type": "function", "function": {...}}) and Responses-style
+    ({"type": "function", "name": ...}) declarations. Built-in tools such
+    as {"google_search": {}} are ignored.
+    """
+    names = []
+    if not isinstance(tools, list):
+        return names
+    for tool in tools:
+        if not isinstance(tool, dict):
+            continue
+        for declaration in tool.get("functionDeclarations") or []:
+            if isinstance(declaration, dict) and declaration.get("name"):
+                names.append(declaration["name"])
+        function = tool.get("function")
+        if isinstance(function, dict) and function.get("name"):
+            names.append(function["name"])
+        elif tool.get("type") == "function" and tool.get("name"):
+            names.append(tool["name"])
+    return names
+
+
+def create_fake_provider_app(config: FakeProviderConfig | None = None) -> FastAPI:
+    """
+    Create the fake provider ASGI app.
+
+    Args:
+        config: Server behavior (default: FakeProviderConfig())
+
+    Returns:
+        FastAPI app; request handling state is available as app.state.fake_provider
+
+    Example:
+        >>> app = create_fake_provider_app(FakeProviderConfig(latency_ms=20))
+        >>> # uvicorn.run(app, port=8089)
+    """
+    provider = FakeProvider(config or FakeProviderConfig())
+    app = FastAPI(title="LLM Answer Watcher Fake Provider")
+    app.state.fake_provider = provider
+
+    async def _admit(
+        authorized: bool, wire: str
+    ) -> tuple[dict[str, str], JSONResponse | None]:
+        """Apply auth, rate limiting, error injection and latency."""
+        provider.stats.requests += 1
+
+        if not authorized:
+            return {}, _error_response(provider, wire, 401, "API key not valid.", {})
+
+        headers, allowed = provider.rate_limit_headers()
+        if not allowed:
+            provider.stats.rate_limited += 1
+            return headers, _error_response(
+                provider, wire, 429, "Rate limit reached for requests.", headers
+            )
+
+        if provider.roll(provider.config.hang_rate):
+            provider.stats.hung += 1
+            await asyncio.sleep(provider.config.hang_seconds)
+
+        if provider.roll(provider.config.error_rate):
+            provider.stats.injected_errors += 1
+            status = provider.choose_error_status()
+            return headers, _error_response(
+                provider, wire, status, "Injected error from fake provider.", headers
+            )
+
+        latency = provider.sample_latency_seconds()
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return headers, None
+
+    @app.post(GEMINI_PATH_PREFIX + "/models/{model}:generateContent")
+    async def gemini_generate_content(model: str, request: Request) -> JSONResponse:
+        headers, rejected = await _admit(
+            bool(request.query_params.get("key")), "gemini"
+        )
+        if rejected is not None:
+            return rejected
+
+        payload = await _read_json(request)
+        prompt_text = "".join(
+            part.get("text", "")
+            for content in payload.get("contents") or []
+            for part in content.get("parts") or []
+            if isinstance(part, dict)
+        )
+        function_name = provider.function_call_name(
+            _declared_function_names(payload.get("tools"))
+        )
+
+        if function_name:
+            provider.stats.function_calls += 1
+            arguments = provider.config.function_call_arguments
+            part = {"functionCall": {"name": function_name, "args": arguments}}
+            answer_chars = json.dumps(arguments)
+        else:
+            part = {"text": provider.config.answer_text}
+            answer_chars = provider.config.answer_text
+
+        prompt_tokens, completion_tokens = provider.token_counts(prompt_text, answer_chars)
+        body = {
+            "candidates": [
+                {
+                    "content": {"role": "model", "parts": [part]},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }
+            ],
+            "usageMetadata": {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": completion_tokens,
+                "totalTokenCount": prompt_tokens + completion_tokens,
+            },
+            "modelVersion": model,
+        }
+        provider.record(200)
+        return JSONResponse(body, headers=headers)
+
+    @app.post(GROQ_PATH_PREFIX + "/chat/completions")
+    async def groq_chat_completions(request: Request) -> JSONResponse:
+        authorization = request.headers.get("authorization", "")
+        headers, rejected = await _admit(
+            authorization.startswith("Bearer ") and len(authorization) > 7, "groq"
+        )
+        if rejected is not None:
+            return rejected
+
+        payload = await _read_json(request)
+        prompt_text = "".join(
+            str(message.get("content") or "")
+            for message in payload.get("messages") or []
+            if isinstance(message, dict)
+        )
+        function_name = provider.function_call_name(
+            _declared_function_names(payload.get("tools"))
+        )
+
+        request_number = provider.stats.requests
+        if function_name:
+            provider.stats.function_calls += 1
+            arguments = json.dumps(provider.config.function_call_arguments)
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": f"call_fake_{request_number}",
+                        "type": "function",
+                        "function": {"name": function_name, "arguments": arguments},
+                    }
+                ],
+            }
+            finish_reason = "tool_calls"
+            answer_chars = arguments
+        else:
+            message = {"role": "assistant", "content": provider.config.answer_text}
+            finish_reason = "stop"
+            answer_chars = provider.config.answer_text
+
+        prompt_tokens, completion_tokens = provider.token_counts(prompt_text, answer_chars)
+        body = {
+            "id": f"chatcmpl-fake-{request_number}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "unknown"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+        provider.record(200)
+        return JSONResponse(body, headers=headers)
+
+    @app.get("/_fake/stats")
+    async def fake_stats() -> dict:
+        return asdict(provider.stats)
+
+    return app
+
+
+async def _read_json(request: Request) -> dict:
+    """Parse the request body as a JSON object (empty dict if invalid)."""
+    try:
+        data = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _error_response(
+    provider: FakeProvider,
+    wire: str,
+    status_code: int,
+    message: str,
+    headers: dict[str, str],
+) -> JSONResponse:
+    """Build a provider-shaped error response and count it."""
+    if wire == "gemini":
+        error = {
+            "code": status_code,
+            "message": message,
+            "status": _GEMINI_STATUS_NAMES.get(status_code, "UNKNOWN"),
+        }
+    else:
+        error = {"message": message, "type": "fake_provider_error", "code": status_code}
+    provider.record(status_code)
+    return JSONResponse({"error": error}, status_code=status_code, headers=headers)
+
+
+class FakeProviderServer:
+    """
+    Run the fake provider app with uvicorn in a background thread.
+
+    Binds a socket before starting (port 0 picks a free port), so base URLs
+    are known as soon as start() returns.
+
+    Attributes:
+        config: Server behavior
+        host: Interface to bind (default: 127.0.0.1)
+        port: Bound port (resolved after start() when 0 was requested)
+        app: The ASGI app being served
+
+    Example:
+        >>> with FakeProviderServer(FakeProviderConfig(latency_ms=30)) as server:
+        ...     client = GroqClient("llama-3.1-8b-instant", "fake-key", "Be helpful.",
+        ...         base_url=server.groq_base_url)
+    """
+
+    def __init__(
+        self,
+        config: FakeProviderConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.config = config or FakeProviderConfig()
+        self.host = host
+        self.port = port
+        self.app = create_fake_provider_app(self.config)
+        self._server = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Root URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def gemini_base_url(self) -> str:
+        """Base URL to pass to GeminiClient(base_url=...)."""
+        return self.url + GEMINI_PATH_PREFIX
+
+    @property
+    def groq_base_url(self) -> str:
+        """Base URL to pass to GroqClient(base_url=...)."""
+        return self.url + GROQ_PATH_PREFIX
+
+    @property
+    def stats(self) -> FakeProviderStats:
+        """Live request counters."""
+        return self.app.state.fake_provider.stats
+
+    def start(self) -> "FakeProviderServer":
+        """
+        Start serving in a daemon thread and wait until ready.
+
+        Raises:
+            RuntimeError: If the server is already running or fails to start
+        """
+        import uvicorn
+
+        if self._thread is not None:
+            raise RuntimeError("Fake provider server is already running")
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+
+        uvicorn_config = uvicorn.Config(
+            self.app, log_level="warning", lifespan="off", access_log=False
+        )
+        self._server = uvicorn.Server(uvicorn_config)
+        self._thread = threading.Thread(
+            target=self._server.run,
+            kwargs={"sockets": [sock]},
+            name="fake-provider-server",
+            daemon=True,
+        )
+        self._thread.start()
+
+        deadline = time.monotonic() + _STARTUP_TIMEOUT_SECONDS
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError("Fake provider server failed to start")
+            time.sleep(0.01)
+
+        logger.info(f"Fake provider server listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Signal the server to exit and wait for the thread to finish."""
+        if self._server is not None:
+            self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=_STARTUP_TIMEOUT_SECONDS)
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "FakeProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
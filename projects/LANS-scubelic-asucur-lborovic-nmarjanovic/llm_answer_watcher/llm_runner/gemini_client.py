@@ -6,6 +6,8 @@ automatic retry logic, exponential backoff, and comprehensive error handling.
 
 Key features:
 - Async HTTP client for parallel execution (httpx.AsyncClient)
+- Optional streaming (streamGenerateContent as SSE) with a chunk callback
+  and a length cap (see llm_runner.streaming)
 - Retry on transient failures (429, 5xx) with exponential backoff
 - Fail fast on permanent errors (401, 400, 404)
 - Automatic cost estimation based on token usage
@@ -22,17 +24,20 @@ Example:
     >>> print(f"Cost: ${response.cost_usd:.6f}")
 """
 
+import json
 import logging
 from typing import Any
 
 import httpx
 
-from llm_answer_watcher.llm_runner.models import LLMResponse
+from llm_answer_watcher.llm_runner.models import ChunkCallback, LLMResponse
 from llm_answer_watcher.llm_runner.retry_config import (
     NO_RETRY_STATUS_CODES,
     REQUEST_TIMEOUT,
     create_retry_decorator,
 )
+from llm_answer_watcher.llm_runner.streaming import StreamBuffer, estimate_tokens, iter_sse_data
+from llm_answer_watcher.utils import metrics
 from llm_answer_watcher.utils.cost import estimate_cost
 from llm_answer_watcher.utils.time import utc_timestamp
 
@@ -64,6 +69,8 @@ class GeminiClient:
         model_name: Gemini model identifier (e.g., "gemini-2.0-flash-exp", "gemini-1.5-pro")
         api_key: Google API key for authentication (NEVER logged)
         system_prompt: System message sent with every request for context/instructions
+        base_url: API base URL (defaults to GEMINI_API_BASE_URL; override to
+            point at a proxy or the local fake provider server)
 
     Example:
         >>> client = GeminiClient("gemini-2.0-flash-exp", "AIza...", "You are a helpful assistant.")
@@ -85,9 +92,14 @@ class GeminiClient:
         - Backoff: Exponential starting at 1s, max 60s (from retry_config)
         - Timeout: 30s per request (from retry_config.REQUEST_TIMEOUT)
 
+    Streaming:
+        Pass on_chunk to generate_answer() to stream the answer
+        (streamGenerateContent with alt=sse). A stream that fails after the
+        first chunk was delivered is not retried, since the caller already
+        received part of the answer.
+
     Note:
         This implementation uses async/await for parallel execution.
-        Streaming is not supported in v1.
     """
 
     def __init__(
@@ -97,6 +109,7 @@ class GeminiClient:
         system_prompt: str,
         tools: list[dict] | None = None,
         tool_choice: str = "auto",
+        base_url: str | None = None,
     ):
         """
         Initialize Gemini client with model, API key, system prompt, and optional tools.
@@ -107,6 +120,7 @@ class GeminiClient:
             system_prompt: System message for context/instructions
             tools: Optional list of tool configurations (e.g., [{"google_search": {}}])
             tool_choice: Tool selection mode (note: Gemini auto-decides, this param is for API compat)
+            base_url: Optional API base URL override (default: GEMINI_API_BASE_URL)
 
         Raises:
             ValueError: If model_name, api_key, or system_prompt is empty
@@ -150,6 +164,7 @@ class GeminiClient:
         self.system_prompt = system_prompt
         self.tools = tools
         self.tool_choice = tool_choice
+        self.base_url = (base_url or GEMINI_API_BASE_URL).rstrip("/")
 
         # Log if Google Search grounding is enabled
         if tools:
@@ -171,7 +186,12 @@ class GeminiClient:
             logger.info(f"Initialized Gemini client for model: {model_name}")
 
     @create_retry_decorator()
-    async def generate_answer(self, prompt: str) -> LLMResponse:
+    async def generate_answer(
+        self,
+        prompt: str,
+        on_chunk: ChunkCallback | None = None,
+        max_answer_chars: int | None = None,
+    ) -> LLMResponse:
         """
         Execute LLM query asynchronously with automatic retry and cost tracking.
 
@@ -181,6 +201,10 @@ class GeminiClient:
 
         Args:
             prompt: User intent prompt to send to the LLM
+            on_chunk: Optional callback receiving each text delta; when given,
+                the answer is streamed
+            max_answer_chars: Optional length cap for streamed answers; the
+                stream is closed once it is reached (response.truncated)
 
         Returns:
             LLMResponse: Structured response with answer text, tokens, cost, metadata
@@ -260,7 +284,8 @@ class GeminiClient:
         # Format: /v1beta/models/{model}:generateContent?key={api_key}
         # Handle both "gemini-1.5-flash" and "models/gemini-1.5-flash" formats
         model_path = self.model_name if self.model_name.startswith("models/") else f"models/{self.model_name}"
-        api_url = f"{GEMINI_API_BASE_URL}/{model_path}:generateContent"
+        method = "streamGenerateContent" if on_chunk is not None else "generateContent"
+        api_url = f"{self.base_url}/{model_path}:{method}"
 
         # Build headers (NEVER log api_key)
         headers = {
@@ -278,31 +303,30 @@ class GeminiClient:
         # Make HTTP request with context manager for proper cleanup
         try:
             async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+                if on_chunk is not None:
+                    return await self._stream_answer(
+                        client,
+                        api_url,
+                        payload,
+                        headers,
+                        {**params, "alt": "sse"},
+                        prompt,
+                        on_chunk,
+                        max_answer_chars,
+                    )
+
                 response = await client.post(
                     api_url,
                     json=payload,
                     headers=headers,
                     params=params,
                 )
-
-                # Check for non-retryable errors first
-                # These should fail immediately without retry
-                if response.status_code in NO_RETRY_STATUS_CODES:
-                    error_detail = self._extract_error_detail(response)
-                    raise RuntimeError(
-                        f"Gemini API error (non-retryable): "
-                        f"status={response.status_code}, "
-                        f"model={self.model_name}, "
-                        f"detail={error_detail}"
-                    )
-
-                # Raise for retryable errors (429, 5xx)
-                # The @retry decorator will catch these and retry
-                response.raise_for_status()
+                self._raise_for_status(response)
 
         except httpx.HTTPStatusError as e:
             # Log specific warning for rate limit errors
             if e.response.status_code == 429:
+                metrics.inc("rate_limited_total", provider="google", model=self.model_name)
                 retry_after = e.response.headers.get("Retry-After")
                 logger.warning(
                     f"Gemini API rate limit exceeded (429 Too Many Requests). "
@@ -372,6 +396,151 @@ class GeminiClient:
             web_search_count=web_search_count,
         )
 
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        """
+        Fail fast on permanent errors and raise retryable ones for @retry.
+
+        Args:
+            response: HTTP response (body already read)
+
+        Raises:
+            RuntimeError: On non-retryable status codes (401, 400, 404)
+            httpx.HTTPStatusError: On retryable status codes (429, 5xx)
+        """
+        # Check for non-retryable errors first
+        # These should fail immediately without retry
+        if response.status_code in NO_RETRY_STATUS_CODES:
+            error_detail = self._extract_error_detail(response)
+            raise RuntimeError(
+                f"Gemini API error (non-retryable): "
+                f"status={response.status_code}, "
+                f"model={self.model_name}, "
+                f"detail={error_detail}"
+            )
+
+        # Raise for retryable errors (429, 5xx)
+        # The @retry decorator will catch these and retry
+        response.raise_for_status()
+
+    async def _stream_answer(
+        self,
+        client: httpx.AsyncClient,
+        api_url: str,
+        payload: dict[str, Any],
+        headers: dict[str, str],
+        params: dict[str, str],
+        prompt: str,
+        on_chunk: ChunkCallback,
+        max_answer_chars: int | None,
+    ) -> LLMResponse:
+        """
+        Stream a streamGenerateContent response as server-sent events.
+
+        Each event is a partial GenerateContentResponse whose text parts are
+        deltas; finishReason, usageMetadata and groundingMetadata are taken
+        from the latest event carrying them. The complete answer is then
+        validated like a non-streamed response (finish reason, function
+        calls), unless it was cut off at max_answer_chars, in which case
+        token usage is estimated if the provider did not report it yet.
+
+        Returns:
+            LLMResponse with the complete (or truncated) answer and
+            time_to_first_token_ms
+
+        Raises:
+            RuntimeError: On non-retryable errors, blocked or malformed
+                answers, or a stream that failed after the first chunk
+                was delivered
+        """
+        buffer = StreamBuffer(on_chunk, max_answer_chars)
+        finish_reason = None
+        function_part = None
+        usage = None
+        grounding = None
+
+        async with client.stream(
+            "POST", api_url, json=payload, headers=headers, params=params
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+            self._raise_for_status(response)
+
+            try:
+                async for data in iter_sse_data(response):
+                    try:
+                        event = json.loads(data)
+                    except json.JSONDecodeError as e:
+                        raise RuntimeError(f"Failed to parse Gemini stream event: {e}") from e
+
+                    usage = event.get("usageMetadata") or usage
+                    candidates = event.get("candidates") or [{}]
+                    candidate = candidates[0]
+                    finish_reason = candidate.get("finishReason") or finish_reason
+                    grounding = candidate.get("groundingMetadata") or grounding
+                    for part in (candidate.get("content") or {}).get("parts") or []:
+                        if "functionCall" in part:
+                            function_part = part
+                        elif not buffer.add(part.get("text") or ""):
+                            break
+                    if buffer.truncated:
+                        break
+            except httpx.TransportError as e:
+                if buffer.started:
+                    raise RuntimeError(
+                        f"Gemini stream interrupted after first chunk: "
+                        f"model={self.model_name}, error={e}"
+                    ) from e
+                raise
+
+        if buffer.truncated:
+            answer_text = buffer.text
+        else:
+            # Validate the assembled answer exactly like a complete response
+            answer_text = self._extract_answer_text(
+                {
+                    "candidates": [
+                        {
+                            "finishReason": finish_reason,
+                            "content": {"parts": [function_part or {"text": buffer.text}]},
+                        }
+                    ]
+                }
+            )
+
+        if usage is None and buffer.truncated:
+            # The stream was closed before usage was reported: estimate from lengths
+            prompt_tokens = estimate_tokens(self.system_prompt + prompt)
+            completion_tokens = estimate_tokens(answer_text)
+            tokens_used = prompt_tokens + completion_tokens
+        else:
+            tokens_used, prompt_tokens, completion_tokens = self._extract_token_usage(
+                {"usageMetadata": usage}
+            )
+
+        web_search_results, web_search_count = self._extract_grounding_metadata(
+            {"candidates": [{"groundingMetadata": grounding}]}
+        )
+
+        usage_meta = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        }
+
+        return LLMResponse(
+            answer_text=answer_text,
+            tokens_used=tokens_used,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=estimate_cost("google", self.model_name, usage_meta),
+            provider="google",
+            model_name=self.model_name,
+            timestamp_utc=utc_timestamp(),
+            web_search_results=web_search_results,
+            web_search_count=web_search_count,
+            time_to_first_token_ms=buffer.time_to_first_token_ms,
+            truncated=buffer.truncated,
+        )
+
     def _extract_answer_text(self, data: dict[str, Any]) -> str:
         """
         Extract answer text from Gemini API response.
@@ -380,7 +549,9 @@ class GeminiClient:
             data: Parsed JSON response from Gemini API
 
         Returns:
-            str: The assistant's message content
+            str: The assistant's message content, or a JSON-encoded
+                {"_function_call": {"name": ..., "arguments": {...}}} object
+                when the model answered with a functionCall part
 
         Raises:
             RuntimeError: If response structure is invalid or missing required fields
@@ -452,6 +623,19 @@ class GeminiClient:
             if not isinstance(first_part, dict):
                 raise RuntimeError("Invalid part structure")
 
+            # Function calling: normalize to the format expected by
+            # extractor.function_extractor.parse_function_call_response()
+            function_call = first_part.get("functionCall")
+            if isinstance(function_call, dict):
+                return json.dumps(
+                    {
+                        "_function_call": {
+                            "name": function_call.get("name"),
+                            "arguments": function_call.get("args") or {},
+                        }
+                    }
+                )
+
             text = first_part.get("text")
             if text is None:
                 raise RuntimeError("Part missing 'text' field")
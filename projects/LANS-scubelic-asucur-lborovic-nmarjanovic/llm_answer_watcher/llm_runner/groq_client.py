@@ -9,6 +9,8 @@ Supported models include Llama 3, Mixtral, and Gemma.
 
 Key features:
 - Async HTTP client for parallel execution (httpx.AsyncClient)
+- Optional streaming (SSE chat completions) with a chunk callback and
+  a length cap (see llm_runner.streaming)
 - Retry on transient failures (429, 5xx) with exponential backoff
 - Fail fast on permanent errors (401, 400, 404)
 - Automatic cost estimation based on token usage
@@ -25,17 +27,25 @@ Example:
     >>> print(f"Cost: ${response.cost_usd:.6f}")
 """
 
+import json
 import logging
 from typing import Any
 
 import httpx
 
-from llm_answer_watcher.llm_runner.models import LLMResponse
+from llm_answer_watcher.llm_runner.models import ChunkCallback, LLMResponse
 from llm_answer_watcher.llm_runner.retry_config import (
     NO_RETRY_STATUS_CODES,
     REQUEST_TIMEOUT,
     create_retry_decorator,
 )
+from llm_answer_watcher.llm_runner.streaming import (
+    SSE_DONE,
+    StreamBuffer,
+    estimate_tokens,
+    iter_sse_data,
+)
+from llm_answer_watcher.utils import metrics
 from llm_answer_watcher.utils.cost import estimate_cost
 from llm_answer_watcher.utils.time import utc_timestamp
 
@@ -75,6 +85,8 @@ class GroqClient:
         model_name: Groq model identifier (e.g., "llama-3.1-8b-instant")
         api_key: Groq API key for authentication (NEVER logged)
         system_prompt: System message sent with every request for context/instructions
+        base_url: API base URL (defaults to GROQ_API_BASE_URL; override to
+            point at a proxy or the local fake provider server)
 
     Example:
         >>> client = GroqClient("llama-3.1-8b-instant", "gsk-...", "You are a helpful assistant.")
@@ -96,9 +108,14 @@ class GroqClient:
         - Backoff: Exponential starting at 1s, max 60s (from retry_config)
         - Timeout: 30s per request (from retry_config.REQUEST_TIMEOUT)
 
+    Streaming:
+        Pass on_chunk to generate_answer() to stream the answer (SSE chat
+        completions). A stream that fails after the first chunk was
+        delivered is not retried, since the caller already received part
+        of the answer.
+
     Note:
         This implementation uses async/await for parallel execution.
-        Streaming is not supported in v1.
     """
 
     def __init__(
@@ -108,6 +125,7 @@ class GroqClient:
         system_prompt: str,
         tools: list[dict] | None = None,
         tool_choice: str = "auto",
+        base_url: str | None = None,
     ):
         """
         Initialize Groq client with model, API key, system prompt, and optional tools.
@@ -118,6 +136,7 @@ class GroqClient:
             system_prompt: System message for context/instructions
             tools: Optional list of tool configurations (not currently used by Groq)
             tool_choice: Tool selection mode (not currently used by Groq)
+            base_url: Optional API base URL override (default: GROQ_API_BASE_URL)
 
         Raises:
             ValueError: If model_name, api_key, or system_prompt is empty
@@ -147,6 +166,7 @@ class GroqClient:
         self.system_prompt = system_prompt
         self.tools = tools
         self.tool_choice = tool_choice
+        self.base_url = (base_url or GROQ_API_BASE_URL).rstrip("/")
 
         # Log if tools are provided (Groq has limited tool support)
         if tools:
@@ -159,7 +179,12 @@ class GroqClient:
             logger.info(f"Initialized Groq client for model: {model_name}")
 
     @create_retry_decorator()
-    async def generate_answer(self, prompt: str) -> LLMResponse:
+    async def generate_answer(
+        self,
+        prompt: str,
+        on_chunk: ChunkCallback | None = None,
+        max_answer_chars: int | None = None,
+    ) -> LLMResponse:
         """
         Execute LLM query asynchronously with automatic retry and cost tracking.
 
@@ -169,6 +194,10 @@ class GroqClient:
 
         Args:
             prompt: User intent prompt to send to the LLM
+            on_chunk: Optional callback receiving each text delta; when given,
+                the answer is streamed
+            max_answer_chars: Optional length cap for streamed answers; the
+                stream is closed once it is reached (response.truncated)
 
         Returns:
             LLMResponse: Structured response with answer text, tokens, cost, metadata
@@ -225,7 +254,7 @@ class GroqClient:
         }
 
         # Build API endpoint URL
-        api_url = f"{GROQ_API_BASE_URL}/chat/completions"
+        api_url = f"{self.base_url}/chat/completions"
 
         # Build headers (NEVER log api_key)
         headers = {
@@ -239,30 +268,22 @@ class GroqClient:
         # Make HTTP request with context manager for proper cleanup
         try:
             async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+                if on_chunk is not None:
+                    return await self._stream_answer(
+                        client, api_url, payload, headers, prompt, on_chunk, max_answer_chars
+                    )
+
                 response = await client.post(
                     api_url,
                     json=payload,
                     headers=headers,
                 )
-
-                # Check for non-retryable errors first
-                # These should fail immediately without retry
-                if response.status_code in NO_RETRY_STATUS_CODES:
-                    error_detail = self._extract_error_detail(response)
-                    raise RuntimeError(
-                        f"Groq API error (non-retryable): "
-                        f"status={response.status_code}, "
-                        f"model={self.model_name}, "
-                        f"detail={error_detail}"
-                    )
-
-                # Raise for retryable errors (429, 5xx)
-                # The @retry decorator will catch these and retry
-                response.raise_for_status()
+                self._raise_for_status(response)
 
         except httpx.HTTPStatusError as e:
             # Log specific warning for rate limit errors
             if e.response.status_code == 429:
+                metrics.inc("rate_limited_total", provider="groq", model=self.model_name)
                 retry_after = e.response.headers.get("Retry-After")
                 logger.warning(
                     f"Groq API rate limit exceeded (429 Too Many Requests). "
@@ -329,6 +350,126 @@ class GroqClient:
             web_search_count=0,
         )
 
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        """
+        Fail fast on permanent errors and raise retryable ones for @retry.
+
+        Args:
+            response: HTTP response (body already read)
+
+        Raises:
+            RuntimeError: On non-retryable status codes (401, 400, 404)
+            httpx.HTTPStatusError: On retryable status codes (429, 5xx)
+        """
+        # Check for non-retryable errors first
+        # These should fail immediately without retry
+        if response.status_code in NO_RETRY_STATUS_CODES:
+            error_detail = self._extract_error_detail(response)
+            raise RuntimeError(
+                f"Groq API error (non-retryable): "
+                f"status={response.status_code}, "
+                f"model={self.model_name}, "
+                f"detail={error_detail}"
+            )
+
+        # Raise for retryable errors (429, 5xx)
+        # The @retry decorator will catch these and retry
+        response.raise_for_status()
+
+    async def _stream_answer(
+        self,
+        client: httpx.AsyncClient,
+        api_url: str,
+        payload: dict[str, Any],
+        headers: dict[str, str],
+        prompt: str,
+        on_chunk: ChunkCallback,
+        max_answer_chars: int | None,
+    ) -> LLMResponse:
+        """
+        Stream a chat completion as server-sent events.
+
+        Each event carries a delta of the assistant message; with
+        stream_options.include_usage the last event carries token usage.
+        If the answer is cut off at max_answer_chars the stream is closed
+        early and token usage is estimated from the text lengths.
+
+        Returns:
+            LLMResponse with the complete (or truncated) answer and
+            time_to_first_token_ms
+
+        Raises:
+            RuntimeError: On non-retryable errors, malformed events, or a
+                stream that failed after the first chunk was delivered
+        """
+        buffer = StreamBuffer(on_chunk, max_answer_chars)
+        usage: dict[str, Any] | None = None
+        stream_payload = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+
+        async with client.stream("POST", api_url, json=stream_payload, headers=headers) as response:
+            if response.status_code >= 400:
+                await response.aread()
+            self._raise_for_status(response)
+
+            try:
+                async for data in iter_sse_data(response):
+                    if data == SSE_DONE:
+                        break
+                    try:
+                        event = json.loads(data)
+                    except json.JSONDecodeError as e:
+                        raise RuntimeError(f"Failed to parse Groq stream event: {e}") from e
+
+                    # Usage arrives on the final event (or under x_groq on older APIs)
+                    usage = event.get("usage") or event.get("x_groq", {}).get("usage") or usage
+                    for choice in event.get("choices") or []:
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta and not buffer.add(delta):
+                            break
+                    if buffer.truncated:
+                        break
+            except httpx.TransportError as e:
+                if buffer.started:
+                    raise RuntimeError(
+                        f"Groq stream interrupted after first chunk: model={self.model_name}, "
+                        f"error={e}"
+                    ) from e
+                raise
+
+        answer_text = buffer.text
+        if not answer_text:
+            raise RuntimeError("Groq stream ended without answer text")
+
+        if usage is None and buffer.truncated:
+            # The stream was closed before the usage event: estimate from lengths
+            prompt_tokens = estimate_tokens(self.system_prompt + prompt)
+            completion_tokens = estimate_tokens(answer_text)
+            tokens_used = prompt_tokens + completion_tokens
+        else:
+            tokens_used, prompt_tokens, completion_tokens = self._extract_token_usage(
+                {"usage": usage}
+            )
+
+        usage_meta = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        }
+
+        return LLMResponse(
+            answer_text=answer_text,
+            tokens_used=tokens_used,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=estimate_cost("groq", self.model_name, usage_meta),
+            provider="groq",
+            model_name=self.model_name,
+            timestamp_utc=utc_timestamp(),
+            web_search_results=None,
+            web_search_count=0,
+            time_to_first_token_ms=buffer.time_to_first_token_ms,
+            truncated=buffer.truncated,
+        )
+
     def _extract_answer_text(self, data: dict[str, Any]) -> str:
         """
         Extract answer text from Groq API response.
@@ -337,7 +478,9 @@ class GroqClient:
             data: Parsed JSON response from Groq API
 
         Returns:
-            str: The assistant's message content
+            str: The assistant's message content, or a JSON-encoded
+                {"_function_call": {"name": ..., "arguments": {...}}} object
+                when the model answered with tool_calls
 
         Raises:
             RuntimeError: If response structure is invalid or missing required fields
@@ -366,6 +509,28 @@ class GroqClient:
                 raise RuntimeError("Choice missing 'message' field")
 
             content = message.get("content")
+            tool_calls = message.get("tool_calls")
+            if content is None and tool_calls and isinstance(tool_calls, list):
+                # Function calling: normalize to the format expected by
+                # extractor.function_extractor.parse_function_call_response()
+                function = tool_calls[0].get("function", {})
+                arguments = function.get("arguments") or "{}"
+                if isinstance(arguments, str):
+                    try:
+                        arguments = json.loads(arguments)
+                    except json.JSONDecodeError as e:
+                        raise RuntimeError(
+                            f"Groq tool call has invalid JSON arguments: {e}"
+                        ) from e
+                return json.dumps(
+                    {
+                        "_function_call": {
+                            "name": function.get("name"),
+                            "arguments": arguments,
+                        }
+                    }
+                )
+
             if content is None:
                 raise RuntimeError("Message missing 'content' field")
 
@@ -0,0 +1,331 @@
+"""
+Hedged LLM requests for lower tail latency.
+
+A few slow or stuck requests (up to REQUEST_TIMEOUT per attempt, times the
+retry attempts) used to decide how long every run took. With hedging, a
+request that is still running after the model's usual latency gets a
+duplicate ("hedge") sent to the same model or a configured fallback model.
+The first successful answer wins and the other request is cancelled.
+
+- LatencyTracker: Process-wide window of recent latencies per (provider,
+  model), seeded from answers_raw.latency_ms so the hedge delay is known
+  from the first query of a run. The hedge delay is a percentile of that
+  window (p95 by default), never below min_delay_seconds.
+- HedgeBudget: Per-run limits on extra spend. At most max_hedge_fraction of
+  the run's requests may fire a hedge, and the estimated cost of losing
+  requests (the winner's cost, as a cancelled request may still be billed)
+  may not exceed max_extra_cost_usd.
+- HedgedLLMClient: LLMClient wrapper that races the primary and the hedge.
+
+Streamed requests are only hedged while they have produced no text yet: a
+request that is streaming is slow, not stuck.
+
+Example:
+    >>> budget = HedgeBudget(HedgingConfig())
+    >>> client = HedgedLLMClient(primary, fallback, budget, "groq", "llama-3.1-8b-instant")
+    >>> response = await client.generate_answer(prompt)
+    >>> budget.to_dict()["hedges"]
+    1
+"""
+
+import asyncio
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from ..config.schema import HedgingConfig
+from ..storage.connection import read_connection
+from ..utils import metrics
+from .models import ChunkCallback, LLMClient, LLMResponse
+from .singleflight import no_coalescing
+
+logger = logging.getLogger(__name__)
+
+# Recent latencies kept per (provider, model)
+LATENCY_WINDOW = 200
+
+# Hedge outcomes (label of hedged_requests_total)
+OUTCOME_PRIMARY_WON = "primary_won"
+OUTCOME_HEDGE_WON = "hedge_won"
+OUTCOME_BOTH_FAILED = "both_failed"
+OUTCOME_BUDGET_EXHAUSTED = "budget_exhausted"
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyTracker:
+    """
+    Thread-safe window of recent request latencies per (provider, model).
+
+    Example:
+        >>> tracker = LatencyTracker()
+        >>> for seconds in (1.0, 1.2, 1.1, 9.0):
+        ...     tracker.record("groq", "llama-3.1-8b-instant", seconds)
+        >>> tracker.quantile("groq", "llama-3.1-8b-instant", 0.5, min_samples=3)
+        1.1
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._window = window
+        self._lock = threading.Lock()
+        self._latencies: dict[tuple[str, str], deque] = {}
+        self._seeded: set[tuple[str, str, str]] = set()
+
+    def record(self, provider: str, model_name: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(
+                (provider, model_name), deque(maxlen=self._window)
+            ).append(seconds)
+
+    def quantile(
+        self, provider: str, model_name: str, fraction: float, min_samples: int
+    ) -> float | None:
+        """Latency quantile in seconds, or None with fewer than min_samples."""
+        with self._lock:
+            values = list(self._latencies.get((provider, model_name), ()))
+        if len(values) < max(1, min_samples):
+            return None
+        return percentile(values, fraction)
+
+    def seed_from_db(self, db_path: str, provider: str, model_name: str) -> None:
+        """
+        Load the most recent latencies of a model from answers_raw, once per database.
+
+        Failures (missing database, pre-v15 schema) are logged and ignored:
+        the window then fills from live requests.
+        """
+        seed_key = (db_path, provider, model_name)
+        with self._lock:
+            if seed_key in self._seeded:
+                return
+            self._seeded.add(seed_key)
+        try:
+            with read_connection(db_path) as conn:
+                rows = conn.execute(
+                    """
+                    SELECT latency_ms FROM answers_raw
+                    WHERE model_provider = ? AND model_name = ? AND latency_ms IS NOT NULL
+                    ORDER BY timestamp_utc DESC
+                    LIMIT ?
+                    """,
+                    (provider, model_name, self._window),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.debug(f"No latency history for {provider}/{model_name}: {e}")
+            return
+        history = [latency_ms / 1000 for (latency_ms,) in reversed(rows)]
+        with self._lock:
+            # History goes before samples already recorded live in this process
+            live = self._latencies.get((provider, model_name), ())
+            self._latencies[(provider, model_name)] = deque(
+                [*history, *live], maxlen=self._window
+            )
+
+
+_latency_tracker = LatencyTracker()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Return the process-wide latency tracker."""
+    return _latency_tracker
+
+
+class HedgeBudget:
+    """
+    Per-run limits on hedged requests and their extra spend.
+
+    Args:
+        hedging: Hedging settings of the run
+    """
+
+    def __init__(self, hedging: HedgingConfig) -> None:
+        self.hedging = hedging
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.rejected = 0
+        self.extra_cost_usd = 0.0
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_acquire(self) -> bool:
+        """Reserve one hedge if the run's hedge rate and extra spend allow it."""
+        with self._lock:
+            allowed_hedges = max(1, int(self.hedging.max_hedge_fraction * self.requests))
+            cost_cap = self.hedging.max_extra_cost_usd
+            if self.hedges >= allowed_hedges or (
+                cost_cap is not None and self.extra_cost_usd >= cost_cap
+            ):
+                self.rejected += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def record_outcome(self, hedge_won: bool, extra_cost_usd: float) -> None:
+        with self._lock:
+            self.hedge_wins += int(hedge_won)
+            self.extra_cost_usd += extra_cost_usd
+
+    def to_dict(self) -> dict:
+        """Counters for run_meta.json."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "rejected": self.rejected,
+                "extra_cost_usd": round(self.extra_cost_usd, 6),
+            }
+
+
+class HedgedLLMClient:
+    """
+    LLMClient wrapper that hedges slow requests.
+
+    Attributes:
+        base_client: Primary client
+        hedge_client: Client receiving the duplicate request (the primary
+            itself, or the fallback model's client)
+        budget: Per-run HedgeBudget
+        provider: Provider of the primary model (latency key)
+        model_name: Primary model (latency key)
+        tracker: Latency history (default: process-wide tracker)
+        outcome: Hedge outcome of the last request (None if it was not hedged)
+    """
+
+    def __init__(
+        self,
+        base_client: LLMClient,
+        hedge_client: LLMClient,
+        budget: HedgeBudget,
+        provider: str,
+        model_name: str,
+        tracker: LatencyTracker | None = None,
+    ) -> None:
+        self.base_client = base_client
+        self.hedge_client = hedge_client
+        self.budget = budget
+        self.provider = provider
+        self.model_name = model_name
+        self.tracker = tracker or get_latency_tracker()
+        self.outcome: str | None = None
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None while history is too short."""
+        hedging = self.budget.hedging
+        delay = self.tracker.quantile(
+            self.provider, self.model_name, hedging.percentile, hedging.min_samples
+        )
+        if delay is None:
+            return None
+        return max(delay, hedging.min_delay_seconds)
+
+    async def generate_answer(
+        self,
+        prompt: str,
+        on_chunk: ChunkCallback | None = None,
+        max_answer_chars: int | None = None,
+    ) -> LLMResponse:
+        """
+        Generate an answer, hedging if the primary request is slow.
+
+        Args:
+            prompt: User intent prompt
+            on_chunk: Optional streaming callback (primary request only)
+            max_answer_chars: Optional streamed length cap
+
+        Returns:
+            LLMResponse of whichever request succeeded first. After a
+            hedge, its cost includes the estimated cost of the cancelled
+            request.
+
+        Raises:
+            Exception: The primary request's error if both requests failed
+        """
+        self.budget.count_request()
+        self.outcome = None
+        streamed = False
+        kwargs = {}
+        if on_chunk is not None:
+
+            def _on_chunk(delta: str) -> None:
+                nonlocal streamed
+                streamed = True
+                on_chunk(delta)
+
+            kwargs = {"on_chunk": _on_chunk, "max_answer_chars": max_answer_chars}
+
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(self.base_client.generate_answer(prompt, **kwargs))
+
+        delay = self.hedge_delay()
+        if delay is not None:
+            try:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+            except asyncio.CancelledError:
+                primary.cancel()
+                raise
+            if not done and not streamed:
+                if self.budget.try_acquire():
+                    return await self._race(primary, prompt, started)
+                self.outcome = OUTCOME_BUDGET_EXHAUSTED
+                metrics.inc("hedged_requests_total", outcome=self.outcome)
+
+        response = await primary
+        self.tracker.record(self.provider, self.model_name, time.perf_counter() - started)
+        return response
+
+    async def _race(self, primary: asyncio.Future, prompt: str, started: float) -> LLMResponse:
+        """Run the hedge against the primary; first success wins, the loser is cancelled."""
+        logger.info(
+            f"Hedging slow request: model={self.provider}/{self.model_name}, "
+            f"after {time.perf_counter() - started:.1f}s"
+        )
+        # The hedge must not be coalesced with the request it hedges
+        with no_coalescing():
+            hedge = asyncio.ensure_future(self.hedge_client.generate_answer(prompt))
+        pending = {primary, hedge}
+        winner = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary if both finished in the same step
+                for task in sorted(done, key=lambda t: t is not primary):
+                    if task.exception() is None:
+                        winner = task
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if winner is None:
+            self.budget.record_outcome(hedge_won=False, extra_cost_usd=0.0)
+            self.outcome = OUTCOME_BOTH_FAILED
+            metrics.inc("hedged_requests_total", outcome=self.outcome)
+            raise primary.exception()
+
+        response = winner.result()
+        hedge_won = winner is hedge
+        # A cancelled request may still be billed: assume it cost as much as the
+        # winner. A loser that already failed is not counted.
+        extra_cost = response.cost_usd if pending else 0.0
+        self.budget.record_outcome(hedge_won=hedge_won, extra_cost_usd=extra_cost)
+        self.outcome = OUTCOME_HEDGE_WON if hedge_won else OUTCOME_PRIMARY_WON
+        metrics.inc("hedged_requests_total", outcome=self.outcome)
+        if hedge_won:
+            self.tracker.record(self.provider, self.model_name, time.perf_counter() - started)
+        response.cost_usd += extra_cost
+        return response
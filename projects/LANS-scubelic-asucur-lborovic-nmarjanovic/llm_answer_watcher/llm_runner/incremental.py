@@ -0,0 +1,281 @@
+"""
+Incremental runs: carry fresh answers forward instead of re-querying.
+
+Scheduled monitoring re-asks every intent on every run, even when nothing
+that determines the answer has changed and the last answer is minutes old.
+With run_settings.incremental enabled, run_all() fingerprints every
+(intent, model) query and looks up the newest successful answer with the
+same fingerprint. If that answer is younger than the intent's staleness
+window, it is carried forward into the new run instead of being queried:
+
+- answers_raw row copied with carried_from_run_id set (texts are shared
+  blobs, so nothing is duplicated), keeping the original answer timestamp
+- mentions copied with the new run's timestamp, so rollups count them
+- raw, parsed and samples artifacts copied into the new run directory,
+  marked with carried_from_run_id so the report can label them
+
+The fingerprint covers everything that determines the stored result: the
+intent prompt, provider/model, system prompt, tools, brands and extraction
+settings. Changing any of them forces a fresh query. API keys are never
+part of the fingerprint, so rotating a key does not invalidate answers.
+
+Operations are not re-run for carried answers; their results stay with
+the run that produced the answer.
+
+Example:
+    >>> plan = plan_incremental_run(config, user_id=None)
+    >>> len(plan.sources)  # queries that will be carried forward
+    4
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from ..config.schema import Intent, RunnerConfig, RuntimeConfig, RuntimeModel
+from ..storage.artifact_store import RunArtifacts
+from ..storage.connection import read_connection, write_connection
+from ..storage.db import carry_answer_forward, find_fresh_answer
+from ..storage.layout import (
+    get_parsed_answer_filename,
+    get_raw_answer_filename,
+    get_samples_filename,
+)
+from ..storage.writer import write_parsed_answer, write_raw_answer, write_sample_group
+from ..utils.time import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate all stored fingerprints when the hashed fields change
+FINGERPRINT_VERSION = 1
+
+# Config keys containing any of these are left out of fingerprints
+_SECRET_KEY_PARTS = ("key", "token", "secret", "password")
+
+
+def _without_secrets(value):
+    """Drop secret-looking keys from nested dicts so fingerprints stay stable."""
+    if isinstance(value, dict):
+        return {
+            k: _without_secrets(v)
+            for k, v in value.items()
+            if not any(part in str(k).lower() for part in _SECRET_KEY_PARTS)
+        }
+    if isinstance(value, list):
+        return [_without_secrets(v) for v in value]
+    return value
+
+
+def query_fingerprint(
+    config: RuntimeConfig,
+    intent: Intent,
+    model_config: RuntimeModel | None = None,
+    runner_config: RunnerConfig | None = None,
+) -> str:
+    """
+    Fingerprint one (intent, model) or (intent, runner) query.
+
+    Args:
+        config: Runtime configuration (brands and extraction settings)
+        intent: Intent being queried
+        model_config: API model for the query (mutually exclusive with runner_config)
+        runner_config: Runner for the query
+
+    Returns:
+        Hex SHA-256 of the query's inputs
+    """
+    if model_config is not None:
+        target = {
+            "provider": model_config.provider,
+            "model_name": model_config.model_name,
+            "system_prompt": model_config.system_prompt,
+            "tools": model_config.tools,
+            "tool_choice": model_config.tool_choice,
+            "base_url": model_config.base_url,
+        }
+    else:
+        target = {
+            "runner_plugin": runner_config.runner_plugin,
+            "config": _without_secrets(runner_config.config),
+        }
+
+    extraction = None
+    if config.extraction_settings is not None:
+        extraction = _without_secrets(config.extraction_settings.model_dump())
+
+    payload = {
+        "version": FINGERPRINT_VERSION,
+        "prompt": intent.prompt,
+        "target": target,
+        "brands": config.brands.model_dump(),
+        "extraction": extraction,
+        "llm_rank_extraction": config.run_settings.use_llm_rank_extraction,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def staleness_cutoff(intent: Intent, max_age_minutes: int, now: datetime) -> str:
+    """
+    Oldest answer timestamp still considered fresh for an intent.
+
+    Args:
+        intent: Intent (its max_age_minutes overrides the default)
+        max_age_minutes: Default staleness window from run settings
+        now: Current UTC time
+
+    Returns:
+        ISO 8601 timestamp in the same format as stored answers
+    """
+    minutes = intent.max_age_minutes or max_age_minutes
+    return (now - timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@dataclass
+class IncrementalPlan:
+    """
+    Fingerprints and reusable answers for every query of a run.
+
+    Attributes:
+        fingerprints: Fingerprint per query key, stored with live answers
+        sources: Fresh answer (from find_fresh_answer) per query key that
+                 can be carried forward instead of queried
+
+    Query keys are (intent_id, index) tuples where index is the position of
+    the model in config.models, or len(config.models) + position for runners.
+    """
+
+    fingerprints: dict[tuple[str, int], str] = field(default_factory=dict)
+    sources: dict[tuple[str, int], dict] = field(default_factory=dict)
+
+
+def plan_incremental_run(
+    config: RuntimeConfig,
+    user_id: int | None = None,
+    now: datetime | None = None,
+) -> IncrementalPlan:
+    """
+    Fingerprint all queries of a run and find answers fresh enough to reuse.
+
+    Fingerprints are always computed so that answers from any run can be
+    reused later. Fresh answers are only looked up when incremental mode is
+    enabled; lookup failures fall back to querying everything.
+
+    Args:
+        config: Runtime configuration
+        user_id: Owner of the run (answers are only reused within one user)
+        now: Current UTC time (default: now)
+
+    Returns:
+        IncrementalPlan for run_all()
+    """
+    plan = IncrementalPlan()
+    targets = [(m, None) for m in config.models]
+    targets += [(None, r) for r in config.runner_configs or []]
+    for intent in config.intents:
+        for index, (model_config, runner_config) in enumerate(targets):
+            plan.fingerprints[(intent.id, index)] = query_fingerprint(
+                config, intent, model_config=model_config, runner_config=runner_config
+            )
+
+    incremental = config.run_settings.incremental
+    if incremental is None or not incremental.enabled:
+        return plan
+
+    now = now or utc_now()
+    intents = {intent.id: intent for intent in config.intents}
+    try:
+        with read_connection(config.run_settings.sqlite_db_path) as conn:
+            for key, fingerprint in plan.fingerprints.items():
+                since = staleness_cutoff(intents[key[0]], incremental.max_age_minutes, now)
+                source = find_fresh_answer(conn, fingerprint, since, user_id=user_id)
+                if source is not None:
+                    plan.sources[key] = source
+    except sqlite3.Error as e:
+        logger.warning(f"Incremental lookup failed, querying everything: {e}")
+        plan.sources.clear()
+
+    logger.info(
+        f"Incremental run: {len(plan.sources)}/{len(plan.fingerprints)} queries "
+        f"have a fresh answer and will be carried forward"
+    )
+    return plan
+
+
+def carry_forward(
+    config: RuntimeConfig,
+    run_dir: str,
+    run_id: str,
+    timestamp_utc: str,
+    source: dict,
+) -> dict | None:
+    """
+    Carry one fresh answer into a new run.
+
+    Copies the raw, parsed and (if sampled) samples artifacts from the
+    source run directory and the answers_raw/mentions rows in the database. Artifacts are checked
+    first: if the source run's files are gone (deleted, different output
+    directory), nothing is copied and the caller queries live instead.
+
+    Args:
+        config: Runtime configuration
+        run_dir: New run's output directory
+        run_id: New run identifier
+        timestamp_utc: New run timestamp
+        source: Fresh answer row from find_fresh_answer()
+
+    Returns:
+        Dict describing the carried answer (intent_id, model_provider,
+        model_name, source_run_id, answered_at), or None if it can't be carried
+    """
+    intent_id = source["intent_id"]
+    provider = source["model_provider"]
+    model_name = source["model_name"]
+    origin_run_id = source["carried_from_run_id"] or source["run_id"]
+    raw_filename = get_raw_answer_filename(intent_id, provider, model_name)
+    parsed_filename = get_parsed_answer_filename(intent_id, provider, model_name)
+    samples_filename = get_samples_filename(intent_id, provider, model_name)
+
+    source_dir = os.path.join(config.run_settings.output_dir, source["run_id"])
+    try:
+        with RunArtifacts(source_dir) as artifacts:
+            if not (artifacts.exists(raw_filename) and artifacts.exists(parsed_filename)):
+                logger.info(
+                    f"Artifacts for {intent_id} {provider}/{model_name} missing in "
+                    f"{source_dir}; querying instead of carrying forward"
+                )
+                return None
+            raw_data = artifacts.read_json(raw_filename)
+            parsed_data = artifacts.read_json(parsed_filename)
+            samples_data = None
+            if artifacts.exists(samples_filename):
+                samples_data = artifacts.read_json(samples_filename)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cannot read artifacts from {source_dir}: {e}; querying instead")
+        return None
+
+    raw_data["carried_from_run_id"] = origin_run_id
+    parsed_data["carried_from_run_id"] = origin_run_id
+    write_raw_answer(run_dir, intent_id, provider, model_name, raw_data)
+    write_parsed_answer(run_dir, intent_id, provider, model_name, parsed_data)
+    if samples_data is not None:
+        write_sample_group(run_dir, intent_id, provider, model_name, samples_data)
+
+    try:
+        with write_connection(config.run_settings.sqlite_db_path) as conn:
+            carry_answer_forward(conn, source, run_id, timestamp_utc)
+            conn.commit()
+    except Exception as e:
+        logger.error(f"Failed to carry answer forward in database: {e}", exc_info=True)
+
+    return {
+        "intent_id": intent_id,
+        "model_provider": provider,
+        "model_name": model_name,
+        "source_run_id": origin_run_id,
+        "answered_at": source["timestamp_utc"],
+    }
@@ -33,6 +33,8 @@ Streaming example:
 
 import asyncio
 import logging
+import random
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 
@@ -66,6 +68,11 @@ class MockLLMClient:
             If None, streaming is disabled.
         streaming_delay_ms: Delay in milliseconds between chunks. Defaults to 50ms.
             Simulates network latency for realistic streaming tests.
+        latency_ms: Simulated request latency in milliseconds before the answer
+            is returned. Defaults to 0 (respond immediately). Used by the
+            benchmark suite to model provider round-trip time.
+        latency_jitter_ms: Uniform random jitter (+/-) added to latency_ms.
+            Defaults to 0 (constant latency).
 
     Example:
         >>> client = MockLLMClient(
@@ -104,12 +111,21 @@ class MockLLMClient:
     cost_per_response: float = 0.0
     streaming_chunk_size: int | None = None
     streaming_delay_ms: int = 50
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
 
     def __post_init__(self):
-        """Initialize responses dict if not provided."""
+        """Initialize responses dict if not provided and validate latency."""
         if self.responses is None:
             self.responses = {}
 
+        if self.latency_ms < 0:
+            raise ValueError(f"latency_ms must be >= 0, got {self.latency_ms}")
+        if self.latency_jitter_ms < 0:
+            raise ValueError(
+                f"latency_jitter_ms must be >= 0, got {self.latency_jitter_ms}"
+            )
+
         logger.info(
             f"Initialized MockLLMClient with {len(self.responses)} configured responses"
         )
@@ -118,6 +134,7 @@ class MockLLMClient:
         self,
         prompt: str,
         on_chunk: Callable[[str], None] | None = None,
+        max_answer_chars: int | None = None,
     ) -> LLMResponse:
         """
         Generate mock answer for the given prompt with optional streaming.
@@ -133,6 +150,8 @@ class MockLLMClient:
             on_chunk: Optional callback to receive text chunks during streaming.
                 Called with each chunk as it's "generated". If None or streaming
                 is disabled, the full answer is returned at once.
+            max_answer_chars: Optional length cap for streamed answers; the
+                answer is cut off once it is reached (response.truncated)
 
         Returns:
             LLMResponse: Mock response with configured answer and metadata
@@ -167,8 +186,23 @@ class MockLLMClient:
 
         logger.debug(f"MockLLMClient returning answer for prompt: {prompt[:50]}...")
 
+        # Simulate provider round-trip latency
+        delay_ms = self.latency_ms
+        if self.latency_jitter_ms > 0:
+            delay_ms += random.uniform(-self.latency_jitter_ms, self.latency_jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000.0)
+
+        time_to_first_token_ms = None
+        truncated = False
+
         # Stream if enabled and callback provided
         if self.streaming_chunk_size is not None and on_chunk is not None:
+            if max_answer_chars is not None and len(answer_text) > max_answer_chars:
+                answer_text = answer_text[:max_answer_chars]
+                truncated = True
+            started = time.perf_counter()
+
             logger.debug(
                 f"Streaming enabled with chunk_size={self.streaming_chunk_size}, "
                 f"delay={self.streaming_delay_ms}ms"
@@ -177,6 +211,8 @@ class MockLLMClient:
             # Split answer into chunks
             for i in range(0, len(answer_text), self.streaming_chunk_size):
                 chunk = answer_text[i : i + self.streaming_chunk_size]
+                if time_to_first_token_ms is None:
+                    time_to_first_token_ms = (time.perf_counter() - started) * 1000
                 on_chunk(chunk)
 
                 # Simulate network latency between chunks
@@ -197,4 +233,6 @@ class MockLLMClient:
             timestamp_utc=utc_timestamp(),
             web_search_results=None,
             web_search_count=0,
+            time_to_first_token_ms=time_to_first_token_ms,
+            truncated=truncated,
         )
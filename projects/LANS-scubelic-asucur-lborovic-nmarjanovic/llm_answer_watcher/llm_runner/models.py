@@ -7,6 +7,7 @@ Google Gemini through a unified Protocol-based design.
 Key components:
 - LLMResponse: Structured dataclass holding LLM response data
 - LLMClient: Protocol defining provider-agnostic interface
+- ChunkCallback / supports_streaming: Optional streaming extension of LLMClient
 - build_client: Factory function to create Gemini client instances
 
 The design follows the Protocol pattern for extensibility, while maintaining
@@ -21,9 +22,14 @@ Example:
     >>> print(f"Cost: ${response.cost_usd:.4f}")
 """
 
+import inspect
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Protocol
 
+# Receives each text delta of a streamed answer, in order (see supports_streaming)
+ChunkCallback = Callable[[str], None]
+
 
 @dataclass
 class LLMResponse:
@@ -45,6 +51,9 @@ class LLMResponse:
         timestamp_utc: ISO 8601 timestamp with 'Z' suffix when response was received
         web_search_results: Optional list of web search results if tools were used
         web_search_count: Number of web searches performed (0 if no web search)
+        time_to_first_token_ms: Milliseconds until the first streamed chunk
+                                arrived (None if the answer was not streamed)
+        truncated: True if a streamed answer was cut off at max_answer_chars
 
     Example:
         >>> response = LLMResponse(
@@ -75,6 +84,8 @@ class LLMResponse:
     completion_tokens: int = 0
     web_search_results: list[dict] | None = None
     web_search_count: int = 0
+    time_to_first_token_ms: float | None = None
+    truncated: bool = False
 
 
 class LLMClient(Protocol):
@@ -108,6 +119,15 @@ class LLMClient(Protocol):
         - Never log API keys or sensitive credentials
         - Return LLMResponse with accurate cost estimates
         - Use UTC timestamps from utils.time module
+
+    Streaming (optional):
+        Clients that can stream accept two extra keyword arguments,
+        ``generate_answer(prompt, on_chunk=None, max_answer_chars=None)``:
+        on_chunk (a ChunkCallback) is called synchronously with each text
+        delta as it arrives, and max_answer_chars stops the stream once the
+        answer reaches that length (LLMResponse.truncated is then True).
+        The returned LLMResponse always holds the complete answer. Use
+        supports_streaming() to check a client before passing them.
     """
 
     async def generate_answer(self, prompt: str) -> LLMResponse:
@@ -149,6 +169,33 @@ class LLMClient(Protocol):
         ...
 
 
+def supports_streaming(client: LLMClient) -> bool:
+    """
+    Check whether a client's generate_answer() accepts an on_chunk callback.
+
+    Wrappers exposing a ``base_client`` (e.g. ChaosLLMClient) stream only if
+    the wrapped client does.
+
+    Args:
+        client: Any LLMClient implementation
+
+    Returns:
+        True if the client supports the streaming extension of LLMClient
+
+    Example:
+        >>> supports_streaming(MockLLMClient())
+        True
+    """
+    base_client = getattr(client, "base_client", None)
+    if base_client is not None:
+        return supports_streaming(base_client)
+    try:
+        parameters = inspect.signature(client.generate_answer).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return "on_chunk" in parameters
+
+
 def build_client(
     provider: str,
     model_name: str,
@@ -156,6 +203,7 @@ def build_client(
     system_prompt: str,
     tools: list[dict] | None = None,
     tool_choice: str = "auto",
+    base_url: str | None = None,
 ) -> LLMClient:
     """
     Factory function to create LLM client for supported providers.
@@ -174,6 +222,8 @@ def build_client(
         system_prompt: System message for context/instructions sent with requests
         tools: Optional list of tool configurations (e.g., [{"google_search": {}}])
         tool_choice: Tool selection mode ("auto", "required", "none"). Default: "auto"
+        base_url: Optional API base URL override (e.g., the local fake provider
+            server from llm_runner.fake_provider). Default: provider's public API
 
     Returns:
         LLMClient: Provider client implementing LLMClient protocol
@@ -211,6 +261,7 @@ def build_client(
             system_prompt=system_prompt,
             tools=tools,
             tool_choice=tool_choice,
+            base_url=base_url,
         )
 
     if provider == "groq":
@@ -225,6 +276,7 @@ def build_client(
             system_prompt=system_prompt,
             tools=tools,
             tool_choice=tool_choice,
+            base_url=base_url,
         )
 
     # Unknown provider - clear error message
@@ -35,13 +35,15 @@ Example:
 """
 
 import logging
-import re
 from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any
 
 from ..config.schema import RuntimeConfig, RuntimeOperation
+from ..config.template_compiler import compile_condition, compile_template
+from ..llm_runner.factory_cache import get_client
 from ..llm_runner.models import LLMResponse, build_client
+from ..utils.metrics import timed
 from ..utils.time import utc_timestamp
 
 logger = logging.getLogger(__name__)
@@ -138,6 +140,10 @@ def render_template(template: str, context: OperationContext) -> str:
     """
     Render operation prompt template with variable substitution.
 
+    The template is compiled once (cached) and rendered in a single pass, see
+    config.template_compiler. Placeholders inside substituted values are not
+    substituted again.
+
     Supported variables:
         {brand:mine} - Primary brand name
         {brand:mine_all} - All brand aliases (comma-separated)
@@ -168,66 +174,16 @@ def render_template(template: str, context: OperationContext) -> str:
         >>> print(rendered)
         Analyze Instantly.ai (rank 3) in: Here are the top tools...
     """
-    rendered = template
-
-    # Brand variables
-    my_brand = context.extraction_data.get("my_brand", "unknown")
-    my_brand_aliases = context.extraction_data.get("my_brand_aliases", [])
-    competitors = context.extraction_data.get("competitors", [])
-    competitors_mentioned = context.extraction_data.get("competitors_mentioned", [])
-
-    rendered = rendered.replace("{brand:mine}", my_brand)
-    rendered = rendered.replace("{brand:mine_all}", ", ".join(my_brand_aliases))
-    rendered = rendered.replace("{brand:competitors}", ", ".join(competitors))
-    rendered = rendered.replace(
-        "{competitors:mentioned}", ", ".join(competitors_mentioned)
-    )
-
-    # Intent variables
-    rendered = rendered.replace("{intent:id}", context.intent_data.get("id", ""))
-    rendered = rendered.replace(
-        "{intent:prompt}", context.intent_data.get("prompt", "")
-    )
-    rendered = rendered.replace(
-        "{intent:response}", context.intent_data.get("response", "")
-    )
-
-    # Rank and mention variables
-    my_rank = context.extraction_data.get("my_rank")
-    rank_str = str(my_rank) if my_rank is not None else "not found"
-    rendered = rendered.replace("{rank:mine}", rank_str)
-
-    my_mentions = context.extraction_data.get("my_mentions", [])
-    competitor_mentions = context.extraction_data.get("competitor_mentions", [])
-    rendered = rendered.replace("{mentions:mine}", ", ".join(my_mentions))
-    rendered = rendered.replace(
-        "{mentions:competitors}", ", ".join(competitor_mentions)
-    )
-
-    # Model variables
-    rendered = rendered.replace(
-        "{model:provider}", context.model_info.get("provider", "")
-    )
-    rendered = rendered.replace("{model:name}", context.model_info.get("name", ""))
-
-    # Run metadata variables
-    rendered = rendered.replace("{run:id}", context.run_metadata.get("run_id", ""))
-    rendered = rendered.replace(
-        "{run:timestamp}", context.run_metadata.get("timestamp", "")
-    )
-
-    # Operation chaining variables
-    for op_id, op_result in context.operation_results.items():
-        placeholder = f"{{operation:{op_id}}}"
-        rendered = rendered.replace(placeholder, op_result)
-
-    return rendered
+    return compile_template(template).render(context)
 
 
 def evaluate_condition(condition: str, context: OperationContext) -> bool:
     """
     Evaluate conditional expression for operation execution.
 
+    The condition is compiled once (cached) into a predicate, see
+    config.template_compiler.
+
     Supports simple comparison expressions:
         {rank:mine} == null
         {rank:mine} > 3
@@ -247,48 +203,10 @@ def evaluate_condition(condition: str, context: OperationContext) -> bool:
         >>> print(result)
         True
     """
-    # First render the condition template
-    rendered = render_template(condition, context)
-
-    # Handle null checks
-    if "== null" in rendered:
-        return "not found == null" in rendered
-
-    # Handle numeric comparisons
-    match = re.match(r"(\d+|not found)\s*(==|!=|>|<|>=|<=)\s*(\d+)", rendered)
-    if match:
-        left, op, right = match.groups()
-        if left == "not found":
-            return False  # Can't compare non-numeric
-
-        left_val = int(left)
-        right_val = int(right)
-
-        # Use operator mapping to reduce return statements
-        comparisons = {
-            "==": lambda left, right: left == right,
-            "!=": lambda left, right: left != right,
-            ">": lambda left, right: left > right,
-            "<": lambda left, right: left < right,
-            ">=": lambda left, right: left >= right,
-            "<=": lambda left, right: left <= right,
-        }
-        if op in comparisons:
-            return comparisons[op](left_val, right_val)
-
-    # Handle string contains checks
-    if " contains " in rendered:
-        parts = rendered.split(" contains ")
-        if len(parts) == 2:
-            haystack = parts[0].strip()
-            needle = parts[1].strip().strip('"').strip("'")
-            return needle in haystack
-
-    # Default: condition not understood, don't skip
-    logger.warning(f"Could not evaluate condition: {condition} (rendered: {rendered})")
-    return True
+    return compile_condition(condition)(context)
 
 
+@timed()
 async def execute_operation(
     operation: RuntimeOperation,
     context: OperationContext,
@@ -431,13 +349,15 @@ async def execute_operation(
                 )
 
         # Build client with tools if needed
-        client = build_client(
+        client = get_client(
+            build_client,
             provider=model.provider,
             model_name=model.model_name,
             api_key=model.api_key,
             system_prompt=model.system_prompt,
             tools=tools,  # None for standard, schema for structured
             tool_choice=tool_choice,  # "auto" for standard, "required" for structured
+            base_url=model.base_url,
         )
 
         # Execute
@@ -557,6 +477,8 @@ async def execute_operations_with_dependencies(
     operations: list[RuntimeOperation],
     context: OperationContext,
     runtime_config: RuntimeConfig,
+    presorted: bool = False,
+    results: dict[str, OperationResult] | None = None,
 ) -> dict[str, OperationResult]:
     """
     Execute operations in dependency order (topological sort).
@@ -571,28 +493,33 @@ async def execute_operations_with_dependencies(
         operations: List of operations to execute
         context: Template rendering context
         runtime_config: Runtime configuration
+        presorted: Operations are already in dependency order (e.g. from
+            CompiledConfig.operations_for()), skip the sort
+        results: Dict to add each result to as soon as its operation
+            finishes. Owned by the caller, it keeps the finished (and paid)
+            operations when this call is cancelled. A new dict by default
 
     Returns:
-        Dictionary mapping operation ID to OperationResult
+        Dictionary mapping operation ID to OperationResult (results, if given)
 
     Example:
         >>> results = execute_operations_with_dependencies(ops, context, runtime_config)
         >>> print(results["content-gaps"].result_text)
         Create blog posts about...
     """
+    if results is None:
+        results = {}
     if not operations:
-        return {}
+        return results
 
     # Sort operations by dependencies
-    sorted_operations = topological_sort(operations)
+    sorted_operations = operations if presorted else topological_sort(operations)
 
     logger.info(
         f"Executing {len(sorted_operations)} operations in dependency order: "
         f"{[op.id for op in sorted_operations]}"
     )
 
-    results: dict[str, OperationResult] = {}
-
     for operation in sorted_operations:
         # Execute operation
         result = await execute_operation(operation, context, runtime_config)
@@ -28,12 +28,15 @@ Example:
 
 import httpx
 from tenacity import (
+    RetryCallState,
     retry,
     retry_if_exception_type,
     stop_after_attempt,
     wait_exponential,
 )
 
+from llm_answer_watcher.utils import metrics
+
 # ============================================================================
 # RETRY CONSTANTS
 # ============================================================================
@@ -74,6 +77,21 @@ REQUEST_TIMEOUT = 120.0
 # ============================================================================
 
 
+def record_retry(retry_state: RetryCallState) -> None:
+    """
+    Record a retry in the metrics registry (tenacity before_sleep hook).
+
+    Increments llm_retries_total and records the backoff wait as the
+    "retry_wait" stage. Provider/model labels are inherited from the
+    calling query's metrics context.
+    """
+    metrics.inc("llm_retries_total")
+    if retry_state.next_action is not None:
+        metrics.observe(
+            metrics.STAGE_DURATION, retry_state.next_action.sleep, stage="retry_wait"
+        )
+
+
 def create_retry_decorator():
     """
     Create a tenacity retry decorator for LLM API calls.
@@ -83,6 +101,7 @@ def create_retry_decorator():
     - Max 3 attempts total
     - Retry on: httpx.HTTPStatusError, httpx.ConnectError, httpx.TimeoutException
     - Caller must check status codes to fail fast on permanent errors
+    - Each retry is counted in llm_retries_total (see record_retry)
 
     Returns:
         Retry decorator configured for LLM API resilience
@@ -126,5 +145,6 @@ def create_retry_decorator():
                 httpx.TimeoutException,
             )
         ),
+        before_sleep=record_retry,
         reraise=True,
     )
@@ -33,16 +33,23 @@ Architecture:
 """
 
 import asyncio
-import json
 import logging
-import sqlite3
+import time
 from collections.abc import Callable
 from dataclasses import asdict, dataclass
 
 from ..config.schema import RuntimeConfig
 from ..exceptions import BudgetExceededError
 from ..extractor.intent_classifier import classify_intent
-from ..extractor.parser import parse_answer
+from ..extractor.memo import get_extraction_memo
+from ..extractor.parser import ExtractionResult, parse_answer
+from ..extractor.stream_detector import StreamingMentionDetector
+from ..storage.artifact_store import (
+    abort_packed_artifacts,
+    finalize_packed_artifacts,
+    open_packed_artifacts,
+)
+from ..storage.connection import write_connection
 from ..storage.db import (
     insert_answer_raw,
     insert_intent_classification,
@@ -50,6 +57,7 @@ from ..storage.db import (
     insert_operation,
     insert_run,
 )
+from ..storage.maintenance import run_scheduled_maintenance
 from ..storage.writer import (
     create_run_directory,
     write_error,
@@ -58,14 +66,25 @@ from ..storage.writer import (
     write_raw_answer,
     write_run_meta,
 )
+from ..utils import metrics, serialization
+from ..utils.pricing import ModelPricing
 from ..utils.time import run_id_from_timestamp, utc_timestamp
+from .browser.session_pool import close_session_pools
+from .compiled_config import CompiledConfig, compile_runtime_config
+from .factory_cache import start_factory_cache, stop_factory_cache
+from .hedging import OUTCOME_HEDGE_WON, HedgeBudget, HedgedLLMClient, get_latency_tracker
+from .incremental import carry_forward, plan_incremental_run
 from .intent_runner import IntentResult
-from .models import build_client
+from .models import build_client, supports_streaming
 from .operation_executor import (
     OperationContext,
+    OperationResult,
     execute_operations_with_dependencies,
 )
-from .plugin_registry import RunnerRegistry
+from .sampling import Sample, SampleGroup, my_rank, sample_until_stable, store_sample_group
+from .scheduler import LOCAL_TENANT, get_scheduler
+from .spend_guard import STAGE_OPERATIONS, STAGE_QUERY, STAGE_SAMPLING, SpendGuard, model_key
+from .streaming import AnswerStream, get_live_answers
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +114,12 @@ class RawAnswerRecord:
         screenshot_path: Optional path to screenshot file (browser runners only)
         html_snapshot_path: Optional path to HTML snapshot file (browser runners only)
         session_id: Optional browser session ID (browser runners only)
+        latency_ms: Wall-clock time of the LLM call in milliseconds (API runners)
+        time_to_first_token_ms: Time until the first streamed chunk (None if
+            the answer was not streamed)
+        truncated: True if a streamed answer was cut off at max_answer_chars
+        answered_by: "provider/model" of the fallback model if a hedged
+            request to it answered instead of the queried model (None otherwise)
 
     Example:
         >>> # API runner example
@@ -148,6 +173,10 @@ class RawAnswerRecord:
     screenshot_path: str | None = None
     html_snapshot_path: str | None = None
     session_id: str | None = None
+    latency_ms: float | None = None
+    time_to_first_token_ms: float | None = None
+    truncated: bool = False
+    answered_by: str | None = None
 
 
 def intent_result_to_raw_record(
@@ -229,7 +258,63 @@ def intent_result_to_raw_record(
     )
 
 
-def estimate_run_cost(config: RuntimeConfig) -> dict:
+def _insert_answer_mentions(
+    db_path: str,
+    *,
+    run_id: str,
+    timestamp_utc: str,
+    intent_id: str,
+    model_provider: str,
+    model_name: str,
+    extraction_result: ExtractionResult,
+) -> None:
+    """
+    Insert the mentions of one answer in a single write transaction.
+
+    A mention that fails to insert is logged and skipped; the others are
+    still committed.
+
+    Args:
+        db_path: Path to SQLite database
+        run_id: Run identifier
+        timestamp_utc: Timestamp of the answer
+        intent_id: Intent query identifier
+        model_provider: Provider that answered
+        model_name: Model that answered
+        extraction_result: Parsed answer with mentions and ranked list
+    """
+    ranks = {}
+    for ranked in extraction_result.ranked_list:
+        ranks.setdefault(ranked.brand_name, ranked.rank_position)
+
+    try:
+        with write_connection(db_path) as conn:
+            for mention in extraction_result.my_mentions + extraction_result.competitor_mentions:
+                try:
+                    insert_mention(
+                        conn=conn,
+                        run_id=run_id,
+                        timestamp_utc=timestamp_utc,
+                        intent_id=intent_id,
+                        model_provider=model_provider,
+                        model_name=model_name,
+                        brand_name=mention.original_text,
+                        normalized_name=mention.normalized_name,
+                        is_mine=mention.brand_category == "mine",
+                        rank_position=ranks.get(mention.normalized_name),
+                        match_type="exact",
+                        sentiment=mention.sentiment,
+                        mention_context=mention.mention_context,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to insert mention into database: {e}", exc_info=True)
+    except Exception as e:
+        logger.error(f"Failed to insert mentions into database: {e}", exc_info=True)
+
+
+def estimate_run_cost(
+    config: RuntimeConfig, pricing_table: dict[str, ModelPricing | None] | None = None
+) -> dict:
     """
     Estimate total cost for a run before execution.
 
@@ -238,10 +323,15 @@ def estimate_run_cost(config: RuntimeConfig) -> dict:
     - Output tokens: 500 per query (answer)
     - Web search: $0.01 per call if tools enabled
 
-    Adds 20% buffer for safety.
+    Adds 20% buffer for safety. With sequential sampling enabled, every API
+    model query is budgeted at max_samples answers (the worst case). With
+    hedging enabled, max_hedge_fraction of the queries are budgeted twice.
 
     Args:
         config: Runtime configuration with intents and models
+        pricing_table: Pricing per "provider/model" resolved once by the
+            compiled config (None entries use the fallback rates). Models
+            missing from the table are looked up with get_pricing().
 
     Returns:
         dict: Cost estimate with breakdown:
@@ -258,13 +348,31 @@ def estimate_run_cost(config: RuntimeConfig) -> dict:
         >>> print(f"Queries: {estimate['total_queries']}")
         Queries: 6
     """
-    from ..utils.pricing import PricingNotAvailableError, get_pricing
+    from ..utils.pricing import PricingNotAvailableError
+    from ..utils.pricing import get_pricing as lookup_pricing
+
+    def get_pricing(provider: str, model_name: str) -> ModelPricing:
+        key = model_key(provider, model_name)
+        if pricing_table is None or key not in pricing_table:
+            return lookup_pricing(provider, model_name)
+        pricing = pricing_table[key]
+        if pricing is None:
+            raise PricingNotAvailableError(f"No pricing for {provider}/{model_name}")
+        return pricing
 
     # Conservative token estimates
     AVG_INPUT_TOKENS = 150  # Prompt + system message
     AVG_OUTPUT_TOKENS = 500  # Response
     BUFFER_PERCENTAGE = 0.20  # 20% safety buffer
 
+    # Worst case: every query is sampled up to max_samples times
+    sampling = config.run_settings.sampling
+    samples_per_query = sampling.max_samples if sampling and sampling.enabled else 1
+    # With hedging, up to max_hedge_fraction of the queries are sent twice
+    hedging = config.run_settings.hedging
+    if hedging is not None and hedging.enabled:
+        samples_per_query *= 1 + hedging.max_hedge_fraction
+
     total_cost = 0.0
     per_intent_costs = {}
     per_model_costs = []
@@ -298,7 +406,7 @@ def estimate_run_cost(config: RuntimeConfig) -> dict:
                 web_search_cost = 0.01  # $10/1k = $0.01 per call
                 query_cost += web_search_cost
 
-            intent_cost += query_cost
+            intent_cost += query_cost * samples_per_query
 
         per_intent_costs[intent.id] = round(intent_cost, 6)
         total_cost += intent_cost
@@ -322,7 +430,7 @@ def estimate_run_cost(config: RuntimeConfig) -> dict:
             query_cost += 0.01
 
         # Total cost for this model across all intents
-        model_total = query_cost * len(config.intents)
+        model_total = query_cost * samples_per_query * len(config.intents)
 
         per_model_costs.append(
             {
@@ -470,6 +578,7 @@ async def run_all(
     progress_callback: Callable[[], None] | None = None,
     config_filename: str | None = None,
     user_id: int | None = None,
+    compiled: CompiledConfig | None = None,
 ) -> dict:
     """
     Execute complete LLM query workflow with parallel execution and return results.
@@ -487,6 +596,8 @@ async def run_all(
             completes (successful or failed). Used by CLI to update progress bar.
         config_filename: Optional filename of the config file loaded.
         user_id: Optional ID of the user executing this run (for isolation).
+        compiled: Compiled form of config (e.g. from the API's compiled config
+            cache). Compiled at the start of the run when not given.
 
     Returns:
         Summary dictionary with structure:
@@ -499,6 +610,10 @@ async def run_all(
             "total_queries": 6,
             "success_count": 5,
             "error_count": 1,
+            "carried_forward_count": 0,
+            "carried_forward": [],
+            "skipped_count": 0,
+            "skipped": [],
             "total_cost_usd": 0.0123,
             "errors": [
                 {
@@ -534,7 +649,49 @@ async def run_all(
         - Error files are written for failed queries
         - Database operations remain synchronous (SQLite is fast for local ops)
         - Cost is estimated, not exact (depends on provider pricing)
+        - With run_settings.incremental, queries with a fresh answer are carried
+          forward from an earlier run and count as successes with zero cost
+          (see llm_runner.incremental)
+        - With run_settings.sampling, API model queries are repeated until the
+          visibility intervals are stable (see llm_runner.sampling)
+        - With run_settings.streaming, API model answers are streamed: partial
+          answers and the brands detected so far are published to the live
+          answer registry, and progress callbacks with a stream_query(live)
+          method are called after every chunk (see llm_runner.streaming)
+        - With run_settings.hedging, slow API model requests are duplicated to
+          the same or a fallback model and the first answer wins; the hedge
+          counters are written to run_meta.json (see llm_runner.hedging)
+        - With a budget (max_per_run_usd or max_per_intent_usd), the actual spend
+          is enforced while the run executes: queries, follow-up samples and
+          operations that would exceed it are skipped, and the spend summary is
+          written to run_meta.json (see llm_runner.spend_guard)
+        - Brand patterns, operation order, pricing and client arguments are
+          derived from the config once per run, or once per config with the
+          API's compiled config cache (see llm_runner.compiled_config)
     """
+    # Collect per-run stage timings, counters and gauges (written to run_meta.json).
+    # Query tasks inherit the collection through their context.
+    run_metrics, metrics_token = metrics.start_run_collection()
+    try:
+        return await _run_all_collected(
+            config, progress_callback, config_filename, user_id, compiled, run_metrics
+        )
+    finally:
+        metrics.stop_run_collection(metrics_token)
+
+
+async def _run_all_collected(
+    config: RuntimeConfig,
+    progress_callback: Callable[[], None] | None,
+    config_filename: str | None,
+    user_id: int | None,
+    compiled: CompiledConfig | None,
+    run_metrics: metrics.MetricsRegistry,
+) -> dict:
+    """Body of run_all(), with the run's metrics collected into run_metrics."""
+    if compiled is None:
+        compiled = compile_runtime_config(config)
+
     # Generate run identifier from current UTC timestamp
     run_id = run_id_from_timestamp()
     timestamp_utc = utc_timestamp()
@@ -550,8 +707,11 @@ async def run_all(
         f"{num_runners} runners, output_dir={config.run_settings.output_dir}"
     )
 
+    # Fingerprint every query; in incremental mode, find fresh answers to reuse
+    incremental_plan = plan_incremental_run(config, user_id=user_id)
+
     # Estimate cost and validate budget (if configured)
-    cost_estimate = estimate_run_cost(config)
+    cost_estimate = estimate_run_cost(config, pricing_table=compiled.pricing)
     logger.info(
         f"Estimated cost: ${cost_estimate['total_estimated_cost']:.4f} "
         f"for {cost_estimate['total_queries']} queries "
@@ -564,10 +724,25 @@ async def run_all(
         logger.error(f"Budget exceeded: {e}")
         raise
 
+    # Enforce the budget on actual spend too, shared by all query tasks
+    spend_guard = SpendGuard.from_config(config, cost_estimate)
+
     # Create output directory for this run
     run_dir = create_run_directory(config.run_settings.output_dir, run_id)
     logger.info(f"Created run directory: {run_dir}")
 
+    # Packed backend: per-query artifacts go to one compressed archive per run
+    artifact_backend = config.run_settings.artifact_backend
+    if artifact_backend == "packed":
+        open_packed_artifacts(run_dir)
+
+    # Slots from the process-wide scheduler bound concurrency and spend across
+    # all runs (users) in this process, on top of this run's own semaphore.
+    # Clients from the factory cache take a slot for each provider call.
+    scheduler = get_scheduler()
+    tenant = str(user_id) if user_id is not None else LOCAL_TENANT
+    factory_cache, factory_cache_token = start_factory_cache(tenant)
+
     # Initialize tracking variables
     total_queries = len(config.intents) * total_execution_units
     success_count = 0
@@ -575,10 +750,12 @@ async def run_all(
     total_cost_usd = 0.0
     total_operations_cost_usd = 0.0  # Track operations cost separately
     errors = []
+    carried_forward = []  # Fresh answers reused instead of queried
+    skipped = []  # Queries not started because the budget was reached
 
     # Insert run record into database
     try:
-        with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+        with write_connection(config.run_settings.sqlite_db_path) as conn:
             insert_run(
                 conn=conn,
                 run_id=run_id,
@@ -601,36 +778,122 @@ async def run_all(
     if request_delay > 0:
         logger.info(f"Request throttling enabled: {request_delay}s delay between requests")
 
+    # Sequential sampling repeats API model queries until visibility is stable
+    sampling = config.run_settings.sampling
+    if sampling is not None and not sampling.enabled:
+        sampling = None
+
+    # Streaming publishes partial answers while API model queries are in flight
+    streaming = config.run_settings.streaming
+    if streaming is not None and not streaming.enabled:
+        streaming = None
+    live_answers = get_live_answers()
+    stream_listener = getattr(progress_callback, "stream_query", None)
+
+    # Hedging duplicates slow API model requests to the same or a fallback model
+    hedging = config.run_settings.hedging
+    hedge_budget = None
+    hedge_targets = {}
+    if hedging is not None and hedging.enabled:
+        hedge_budget = HedgeBudget(hedging)
+        models_by_key = {f"{m.provider}/{m.model_name}": m for m in config.models}
+        for hedged_key, fallback_key in hedging.fallback_models.items():
+            if fallback_key not in models_by_key:
+                logger.warning(
+                    f"Hedging fallback {fallback_key} for {hedged_key} is not a configured "
+                    "model, hedging to the same model instead"
+                )
+                continue
+            hedge_targets[hedged_key] = models_by_key[fallback_key]
+        latency_tracker = get_latency_tracker()
+        for model in config.models:
+            latency_tracker.seed_from_db(
+                config.run_settings.sqlite_db_path, model.provider, model.model_name
+            )
+
     # Define async wrapper for executing single query with semaphore
     async def _execute_query_with_semaphore(
         intent,
+        query_index,
         model_config=None,
         runner_config=None,
     ):
         """
         Execute single query with semaphore rate limiting.
 
+        In incremental mode, a fresh answer from an earlier run is carried
+        forward instead (no slot, no cost); if that fails, the query runs live.
+
+        With a spend guard, the query's estimated cost is reserved first; if
+        the budget would be exceeded, the query is skipped.
+
         Returns:
-            tuple: (success: bool, cost_usd: float, error_dict: dict | None)
+            tuple: (success: bool, cost_usd: float, error_dict: dict | None),
+            or None if the query was skipped
         """
-        async with semaphore:
+        fingerprint = incremental_plan.fingerprints.get((intent.id, query_index))
+        source = incremental_plan.sources.get((intent.id, query_index))
+        if source is not None:
+            carried = carry_forward(config, run_dir, run_id, timestamp_utc, source)
+            if carried is not None:
+                carried_forward.append(carried)
+                metrics.inc("queries_total", status="carried")
+                if progress_callback:
+                    if hasattr(progress_callback, "complete_query"):
+                        await progress_callback.complete_query(
+                            f"{intent.id}_{carried['model_provider']}_{carried['model_name']}",
+                            success=True,
+                        )
+                    else:
+                        progress_callback()
+                return (True, 0.0, None, 0.0)
+
+        async with metrics.tracked_semaphore(semaphore):
             # Determine if this is an API model or runner
             if model_config:
                 provider = model_config.provider
                 model_name = model_config.model_name
                 logger.info(
-                    f"Processing: intent={intent.id}, provider={provider}, model={model_name}"
+                    f"Processing: intent={intent.id}, provider={provider}, model={model_name}",
+                    extra={"sample_key": "query.start"},
                 )
             else:
                 provider = runner_config.runner_plugin
                 model_name = "runner"
                 logger.info(
-                    f"Processing runner: intent={intent.id}, plugin={provider}"
+                    f"Processing runner: intent={intent.id}, plugin={provider}",
+                    extra={"sample_key": "query.start"},
                 )
 
+            # Label all stage timings of this query task with provider/model
+            metrics.bind_labels(provider=provider, model=model_name)
+
             # Construct query key for progress tracking
             query_key = f"{intent.id}_{provider}_{model_name}"
 
+            # Reserve the estimated cost; skip the query if the budget is reached
+            query_model_key = model_key(provider, model_name)
+            reservation = None
+            if spend_guard is not None:
+                estimate = spend_guard.query_estimate(query_model_key) if model_config else 0.0
+                reservation = spend_guard.try_reserve(intent.id, query_model_key, estimate)
+                if reservation is None:
+                    spend_guard.record_skipped(intent.id, query_model_key, STAGE_QUERY)
+                    skipped.append(
+                        {
+                            "intent_id": intent.id,
+                            "model_provider": provider,
+                            "model_name": model_name,
+                        }
+                    )
+                    metrics.inc("queries_total", status="skipped")
+                    if progress_callback:
+                        if hasattr(progress_callback, "complete_query"):
+                            await progress_callback.complete_query(query_key, success=False)
+                        else:
+                            progress_callback()
+                    return None
+
             # Notify progress callback of query start (if supported)
             if progress_callback and hasattr(progress_callback, "start_query"):
                 await progress_callback.start_query(intent.id, provider, model_name)
@@ -638,22 +901,70 @@ async def run_all(
             try:
                 # Process API model
                 if model_config:
-                    # Build LLM client for this model
-                    client = build_client(
-                        provider=model_config.provider,
-                        model_name=model_config.model_name,
-                        api_key=model_config.api_key,
-                        system_prompt=model_config.system_prompt,
-                        tools=model_config.tools,
-                        tool_choice=model_config.tool_choice,
+                    # Shared client for this model (built once per run)
+                    client = factory_cache.client(
+                        build_client, **compiled.client_spec(model_config)
                     )
+                    fallback = None
+                    if hedge_budget is not None:
+                        fallback = hedge_targets.get(f"{provider}/{model_name}")
+                        hedge_client = client
+                        if fallback is not None:
+                            hedge_client = factory_cache.client(
+                                build_client, **compiled.client_spec(fallback)
+                            )
+                        client = HedgedLLMClient(
+                            client, hedge_client, hedge_budget, provider, model_name
+                        )
+
+                    # Stream the answer when configured and the client supports it
+                    live = None
+                    stream_kwargs = {}
+                    if streaming is not None and supports_streaming(client):
+                        live = live_answers.start(
+                            run_id, tenant, intent.id, provider, model_name
+                        )
+                        detector = StreamingMentionDetector(
+                            config.brands.mine,
+                            config.brands.competitors,
+                            brand_patterns=compiled.brand_patterns,
+                        )
+                        stream_kwargs = {
+                            "on_chunk": AnswerStream(live, detector, stream_listener),
+                            "max_answer_chars": streaming.max_answer_chars,
+                        }
 
                     # Generate answer with retry logic (await the async call)
-                    response = await client.generate_answer(intent.prompt)
+                    request_started = time.perf_counter()
+                    try:
+                        with metrics.span("llm_request"):
+                            response = await client.generate_answer(
+                                intent.prompt, **stream_kwargs
+                            )
+                    finally:
+                        if live is not None:
+                            live_answers.finish(live)
+                    latency_ms = (time.perf_counter() - request_started) * 1000
+                    if response.time_to_first_token_ms is not None:
+                        metrics.observe(
+                            "time_to_first_token_seconds",
+                            response.time_to_first_token_ms / 1000,
+                        )
+                    if response.truncated:
+                        logger.info(
+                            f"Answer cut off at {len(response.answer_text)} chars: "
+                            f"intent={intent.id}, model={provider}/{model_name}"
+                        )
 
                     # Extract response data
                     answer_text = response.answer_text
                     cost_usd = response.cost_usd
+                    if reservation is not None:
+                        spend_guard.settle(reservation, cost_usd)
+                        reservation = None
+                    answered_by = None
+                    if fallback is not None and client.outcome == OUTCOME_HEDGE_WON:
+                        answered_by = f"{fallback.provider}/{fallback.model_name}"
 
                     # Create usage metadata for storage with actual token breakdown
                     usage_meta = {
@@ -675,6 +986,10 @@ async def run_all(
                         estimated_cost_usd=cost_usd,
                         web_search_results=response.web_search_results,
                         web_search_count=response.web_search_count,
+                        latency_ms=latency_ms,
+                        time_to_first_token_ms=response.time_to_first_token_ms,
+                        truncated=response.truncated,
+                        answered_by=answered_by,
                     )
 
                     # Write raw answer JSON
@@ -691,9 +1006,9 @@ async def run_all(
                         # Serialize web search results to JSON if present
                         web_search_json = None
                         if response.web_search_results:
-                            web_search_json = json.dumps(response.web_search_results)
+                            web_search_json = serialization.dumps(response.web_search_results)
 
-                        with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+                        with write_connection(config.run_settings.sqlite_db_path) as conn:
                             insert_answer_raw(
                                 conn=conn,
                                 run_id=run_id,
@@ -703,7 +1018,7 @@ async def run_all(
                                 timestamp_utc=raw_record.timestamp_utc,
                                 prompt=intent.prompt,
                                 answer_text=answer_text,
-                                usage_meta_json=json.dumps(usage_meta),
+                                usage_meta_json=serialization.dumps(usage_meta),
                                 estimated_cost_usd=cost_usd,
                                 web_search_count=response.web_search_count,
                                 web_search_results_json=web_search_json,
@@ -712,6 +1027,10 @@ async def run_all(
                                 screenshot_path=raw_record.screenshot_path,
                                 html_snapshot_path=raw_record.html_snapshot_path,
                                 session_id=raw_record.session_id,
+                                fingerprint=fingerprint,
+                                latency_ms=latency_ms,
+                                time_to_first_token_ms=response.time_to_first_token_ms,
+                                truncated=response.truncated,
                             )
                             conn.commit()
                     except Exception as e:
@@ -728,7 +1047,15 @@ async def run_all(
                         model_name=model_config.model_name,
                         timestamp_utc=raw_record.timestamp_utc,
                         extraction_settings=config.extraction_settings,
+                        db_path=config.run_settings.sqlite_db_path,
+                        brand_patterns=compiled.brand_patterns,
                     )
+                    if spend_guard is not None:
+                        spend_guard.charge_extraction(
+                            intent.id,
+                            config.extraction_settings,
+                            extraction_result.extraction_cost_usd,
+                        )
 
                     # Write parsed answer JSON
                     parsed_data = {
@@ -773,56 +1100,81 @@ async def run_all(
                     )
 
                     # Insert mentions into database
-                    all_mentions = (
-                        extraction_result.my_mentions
-                        + extraction_result.competitor_mentions
+                    _insert_answer_mentions(
+                        config.run_settings.sqlite_db_path,
+                        run_id=run_id,
+                        timestamp_utc=raw_record.timestamp_utc,
+                        intent_id=intent.id,
+                        model_provider=model_config.provider,
+                        model_name=model_config.model_name,
+                        extraction_result=extraction_result,
                     )
-                    for mention in all_mentions:
-                        try:
-                            # Determine if this is my brand
-                            is_mine = mention.brand_category == "mine"
-
-                            # Find rank position if this brand is in ranked list
-                            rank_position = None
-                            for ranked in extraction_result.ranked_list:
-                                if ranked.brand_name == mention.normalized_name:
-                                    rank_position = ranked.rank_position
-                                    break
-
-                            with sqlite3.connect(
-                                config.run_settings.sqlite_db_path
-                            ) as conn:
-                                insert_mention(
-                                    conn=conn,
-                                    run_id=run_id,
-                                    timestamp_utc=raw_record.timestamp_utc,
-                                    intent_id=intent.id,
-                                    model_provider=model_config.provider,
-                                    model_name=model_config.model_name,
-                                    brand_name=mention.original_text,
-                                    normalized_name=mention.normalized_name,
-                                    is_mine=is_mine,
-                                    rank_position=rank_position,
-                                    match_type="exact",
-                                    sentiment=mention.sentiment,
-                                    mention_context=mention.mention_context,
-                                )
-                                conn.commit()
-                        except Exception as e:
-                            logger.error(
-                                f"Failed to insert mention into database: {e}",
-                                exc_info=True,
+
+                    # Repeat the query until the visibility intervals are stable
+                    sampling_cost_usd = 0.0
+                    if sampling is not None:
+                        sample_group = SampleGroup(
+                            intent.id, model_config.provider, model_config.model_name
+                        )
+                        sample_group.add(
+                            Sample(
+                                index=0,
+                                timestamp_utc=raw_record.timestamp_utc,
+                                answer_text=answer_text,
+                                appeared_mine=extraction_result.appeared_mine,
+                                my_rank=my_rank(extraction_result),
+                                cost_usd=cost_usd + extraction_result.extraction_cost_usd,
+                            )
+                        )
+                        with metrics.span("sampling"):
+                            sampling_work = sample_until_stable(
+                                client,
+                                intent,
+                                config,
+                                sample_group,
+                                sampling,
+                                spend_guard,
+                                brand_patterns=compiled.brand_patterns,
                             )
+                            if spend_guard is not None:
+                                # Low priority: cancelled once the budget is reached
+                                await spend_guard.run_low_priority(
+                                    intent.id, query_model_key, STAGE_SAMPLING, sampling_work
+                                )
+                            else:
+                                await sampling_work
+                        store_sample_group(
+                            sample_group,
+                            sampling,
+                            run_dir,
+                            run_id,
+                            config.run_settings.sqlite_db_path,
+                        )
+                        sampling_cost_usd = sample_group.extra_cost_usd
 
                     # Execute operations if configured
                     operations_cost_usd = 0.0
-                    if intent.operations or config.global_operations:
-                        logger.info(f"Executing operations for intent={intent.id}")
-
-                        # Combine intent-specific and global operations
-                        all_operations = list(intent.operations) + list(
-                            config.global_operations
+                    num_operations = len(intent.operations) + len(config.global_operations)
+                    operations_reservation = None
+                    if num_operations and spend_guard is not None:
+                        operations_reservation = spend_guard.try_reserve(
+                            intent.id,
+                            query_model_key,
+                            spend_guard.operations_estimate(query_model_key, num_operations),
                         )
+                        if operations_reservation is None:
+                            spend_guard.record_skipped(
+                                intent.id, query_model_key, STAGE_OPERATIONS
+                            )
+                            num_operations = 0
+                    if num_operations:
+                        logger.info(
+                            f"Executing operations for intent={intent.id}",
+                            extra={"sample_key": "query.operations"},
+                        )
+
+                        # Intent-specific and global operations, in dependency order
+                        all_operations = compiled.operations_for(intent.id)
 
                         # Build operation context
                         operation_context = OperationContext(
@@ -863,18 +1215,42 @@ async def run_all(
                             },
                         )
 
-                        # Execute operations
-                        operation_results = await execute_operations_with_dependencies(
-                            operations=all_operations,
-                            context=operation_context,
-                            runtime_config=config,
-                        )
+                        # Execute operations (filled in place, so operations finished
+                        # before a budget cancellation are still charged and stored)
+                        operation_results: dict[str, OperationResult] = {}
+                        with metrics.span("operations"):
+                            operations_work = execute_operations_with_dependencies(
+                                operations=all_operations,
+                                context=operation_context,
+                                runtime_config=config,
+                                presorted=True,
+                                results=operation_results,
+                            )
+                            if spend_guard is not None:
+                                # Low priority: cancelled once the budget is reached
+                                try:
+                                    await spend_guard.run_low_priority(
+                                        intent.id,
+                                        query_model_key,
+                                        STAGE_OPERATIONS,
+                                        operations_work,
+                                    )
+                                finally:
+                                    spend_guard.release(operations_reservation)
+                            else:
+                                await operations_work
 
                         # Store operation results
                         for execution_order, (op_id, op_result) in enumerate(
                             operation_results.items()
                         ):
                             operations_cost_usd += op_result.cost_usd
+                            if spend_guard is not None:
+                                spend_guard.charge(
+                                    intent.id,
+                                    model_key(op_result.model_provider, op_result.model_name),
+                                    op_result.cost_usd,
+                                )
 
                             # Write JSON artifact
                             operation_data = asdict(op_result)
@@ -892,7 +1268,7 @@ async def run_all(
                                 operation = next(
                                     (o for o in all_operations if o.id == op_id), None
                                 )
-                                with sqlite3.connect(
+                                with write_connection(
                                     config.run_settings.sqlite_db_path
                                 ) as conn:
                                     insert_operation(
@@ -926,11 +1302,17 @@ async def run_all(
                                 )
 
                         logger.info(
-                            f"Completed {len(operation_results)} operations, cost=${operations_cost_usd:.6f}"
+                            f"Completed {len(operation_results)} operations, cost=${operations_cost_usd:.6f}",
+                            extra={"sample_key": "query.operations"},
                         )
 
                     # Calculate total cost for this query
-                    total_query_cost = cost_usd + extraction_result.extraction_cost_usd + operations_cost_usd
+                    total_query_cost = (
+                        cost_usd
+                        + extraction_result.extraction_cost_usd
+                        + sampling_cost_usd
+                        + operations_cost_usd
+                    )
 
                     # Log with extraction cost breakdown if applicable
                     if extraction_result.extraction_cost_usd > 0:
@@ -941,13 +1323,15 @@ async def run_all(
                             f"extraction_cost=${extraction_result.extraction_cost_usd:.6f}, "
                             f"total=${cost_usd + extraction_result.extraction_cost_usd:.6f}, "
                             f"appeared_mine={extraction_result.appeared_mine}, "
-                            f"extraction_method={extraction_result.rank_extraction_method}"
+                            f"extraction_method={extraction_result.rank_extraction_method}",
+                            extra={"sample_key": "query.success"},
                         )
                     else:
                         logger.info(
                             f"Success: intent={intent.id}, provider={model_config.provider}, "
                             f"model={model_config.model_name}, cost=${cost_usd:.6f}, "
-                            f"appeared_mine={extraction_result.appeared_mine}"
+                            f"appeared_mine={extraction_result.appeared_mine}",
+                            extra={"sample_key": "query.success"},
                         )
 
                     # Call progress callback if provided
@@ -961,17 +1345,27 @@ async def run_all(
                     if request_delay > 0:
                         await asyncio.sleep(request_delay)
 
+                    metrics.inc("queries_total", status="success")
+                    scheduler.record_spend(tenant, total_query_cost)
                     return (True, total_query_cost, None, operations_cost_usd)
 
                 # Process browser/custom runner
-                # Create runner instance via plugin registry
-                runner = RunnerRegistry.create_runner(
-                    plugin_name=runner_config.runner_plugin,
-                    config=runner_config.config,
+                # Shared runner instance for this config (created once per run)
+                runner = factory_cache.runner(
+                    runner_config.runner_plugin, runner_config.config
                 )
 
-                # Execute intent via runner
-                result = runner.run_intent(intent.prompt)
+                # Wait for a fair-share slot (raises once the user's spend cap is hit)
+                with metrics.span("scheduler_wait"):
+                    scheduler_slot = await scheduler.acquire(tenant, provider)
+
+                # Execute intent via runner. Browser runners are synchronous,
+                # so run them in a worker thread to keep other queries moving.
+                try:
+                    with metrics.span("runner_intent"):
+                        result = await asyncio.to_thread(runner.run_intent, intent.prompt)
+                finally:
+                    scheduler_slot.release()
 
                 # Check if execution was successful
                 if not result.success:
@@ -979,6 +1373,10 @@ async def run_all(
                         result.error_message or "Runner execution failed (no error message)"
                     )
 
+                if reservation is not None:
+                    spend_guard.settle(reservation, result.cost_usd)
+                    reservation = None
+
                 # Convert IntentResult to RawAnswerRecord
                 raw_record = intent_result_to_raw_record(
                     result=result, intent_id=intent.id, prompt=intent.prompt
@@ -998,9 +1396,9 @@ async def run_all(
                     # Serialize web search results to JSON if present
                     web_search_json = None
                     if result.web_search_results:
-                        web_search_json = json.dumps(result.web_search_results)
+                        web_search_json = serialization.dumps(result.web_search_results)
 
-                    with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+                    with write_connection(config.run_settings.sqlite_db_path) as conn:
                         insert_answer_raw(
                             conn=conn,
                             run_id=run_id,
@@ -1010,7 +1408,7 @@ async def run_all(
                             timestamp_utc=raw_record.timestamp_utc,
                             prompt=intent.prompt,
                             answer_text=result.answer_text,
-                            usage_meta_json=json.dumps(raw_record.usage_meta),
+                            usage_meta_json=serialization.dumps(raw_record.usage_meta),
                             estimated_cost_usd=result.cost_usd,
                             web_search_count=raw_record.web_search_count,
                             web_search_results_json=web_search_json,
@@ -1019,6 +1417,7 @@ async def run_all(
                             screenshot_path=result.screenshot_path,
                             html_snapshot_path=result.html_snapshot_path,
                             session_id=result.session_id,
+                            fingerprint=fingerprint,
                         )
                         conn.commit()
                 except Exception as e:
@@ -1036,7 +1435,15 @@ async def run_all(
                     model_name=result.model_name,
                     timestamp_utc=raw_record.timestamp_utc,
                     extraction_settings=config.extraction_settings,
+                    db_path=config.run_settings.sqlite_db_path,
+                    brand_patterns=compiled.brand_patterns,
                 )
+                if spend_guard is not None:
+                    spend_guard.charge_extraction(
+                        intent.id,
+                        config.extraction_settings,
+                        extraction_result.extraction_cost_usd,
+                    )
 
                 # Write parsed answer JSON
                 write_parsed_answer(
@@ -1048,46 +1455,15 @@ async def run_all(
                 )
 
                 # Insert mentions into database
-                all_mentions = (
-                    extraction_result.my_mentions
-                    + extraction_result.competitor_mentions
+                _insert_answer_mentions(
+                    config.run_settings.sqlite_db_path,
+                    run_id=run_id,
+                    timestamp_utc=raw_record.timestamp_utc,
+                    intent_id=intent.id,
+                    model_provider=result.provider,
+                    model_name=result.model_name,
+                    extraction_result=extraction_result,
                 )
-                for mention in all_mentions:
-                    try:
-                        # Determine if this is my brand
-                        is_mine = mention.brand_category == "mine"
-
-                        # Find rank position if this brand is in ranked list
-                        rank_position = None
-                        for ranked in extraction_result.ranked_list:
-                            if ranked.brand_name == mention.normalized_name:
-                                rank_position = ranked.rank_position
-                                break
-
-                        with sqlite3.connect(
-                            config.run_settings.sqlite_db_path
-                        ) as conn:
-                            insert_mention(
-                                conn=conn,
-                                run_id=run_id,
-                                timestamp_utc=raw_record.timestamp_utc,
-                                intent_id=intent.id,
-                                model_provider=result.provider,
-                                model_name=result.model_name,
-                                brand_name=mention.original_text,
-                                normalized_name=mention.normalized_name,
-                                is_mine=is_mine,
-                                rank_position=rank_position,
-                                match_type="exact",
-                                sentiment=mention.sentiment,
-                                mention_context=mention.mention_context,
-                            )
-                            conn.commit()
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to insert runner mention into database: {e}",
-                            exc_info=True,
-                        )
 
                 # Calculate total cost for this query
                 total_query_cost = result.cost_usd + extraction_result.extraction_cost_usd
@@ -1099,13 +1475,15 @@ async def run_all(
                         f"runner_cost=${result.cost_usd:.6f}, "
                         f"extraction_cost=${extraction_result.extraction_cost_usd:.6f}, "
                         f"total=${result.cost_usd + extraction_result.extraction_cost_usd:.6f}, "
-                        f"appeared_mine={extraction_result.appeared_mine}"
+                        f"appeared_mine={extraction_result.appeared_mine}",
+                        extra={"sample_key": "query.success"},
                     )
                 else:
                     logger.info(
                         f"Success: intent={intent.id}, runner={runner_config.runner_plugin}, "
                         f"cost=${result.cost_usd:.6f}, "
-                        f"appeared_mine={extraction_result.appeared_mine}"
+                        f"appeared_mine={extraction_result.appeared_mine}",
+                        extra={"sample_key": "query.success"},
                     )
 
                 # Call progress callback if provided
@@ -1119,6 +1497,8 @@ async def run_all(
                 if request_delay > 0:
                     await asyncio.sleep(request_delay)
 
+                metrics.inc("queries_total", status="success")
+                scheduler.record_spend(tenant, total_query_cost)
                 return (True, total_query_cost, None, 0.0)  # Browser runners don't support operations yet
 
             except Exception as e:
@@ -1181,8 +1561,14 @@ async def run_all(
                 if request_delay > 0:
                     await asyncio.sleep(request_delay)
 
+                metrics.inc("queries_total", status="error")
                 return (False, 0.0, error_dict, 0.0)
 
+            finally:
+                # Failed before its cost was known: drop the estimate
+                if reservation is not None:
+                    spend_guard.release(reservation)
+
     # Build list of tasks for all (intent x model) and (intent x runner) combinations
     tasks = []
 
@@ -1194,17 +1580,21 @@ async def run_all(
             and config.extraction_settings.enable_intent_classification
         ):
             try:
-                logger.info(f"Classifying intent: {intent.id}")
-                classification_result = await classify_intent(
-                    query=intent.prompt,
-                    extraction_settings=config.extraction_settings,
-                    intent_id=intent.id,
-                    db_path=config.run_settings.sqlite_db_path,
+                logger.info(
+                    f"Classifying intent: {intent.id}",
+                    extra={"sample_key": "query.classification"},
                 )
+                with metrics.span("intent_classification"):
+                    classification_result = await classify_intent(
+                        query=intent.prompt,
+                        extraction_settings=config.extraction_settings,
+                        intent_id=intent.id,
+                        db_path=config.run_settings.sqlite_db_path,
+                    )
 
                 # Store classification in database
                 try:
-                    with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+                    with write_connection(config.run_settings.sqlite_db_path) as conn:
                         insert_intent_classification(
                             conn=conn,
                             run_id=run_id,
@@ -1222,7 +1612,8 @@ async def run_all(
                         f"Intent classification stored: {intent.id} -> "
                         f"{classification_result.intent_type}/{classification_result.buyer_stage}/"
                         f"{classification_result.urgency_signal} "
-                        f"(confidence={classification_result.classification_confidence:.2f})"
+                        f"(confidence={classification_result.classification_confidence:.2f})",
+                        extra={"sample_key": "query.classification"},
                     )
                 except Exception as e:
                     logger.error(
@@ -1233,6 +1624,10 @@ async def run_all(
                 # Track classification cost
                 intent_classification_cost = classification_result.extraction_cost_usd
                 total_cost_usd += intent_classification_cost
+                if spend_guard is not None:
+                    spend_guard.charge_extraction(
+                        intent.id, config.extraction_settings, intent_classification_cost
+                    )
 
             except Exception as e:
                 logger.warning(
@@ -1243,9 +1638,10 @@ async def run_all(
 
         # Create tasks for API models (if configured)
         if config.models:
-            for model_config in config.models:
+            for index, model_config in enumerate(config.models):
                 task = _execute_query_with_semaphore(
                     intent=intent,
+                    query_index=index,
                     model_config=model_config,
                     runner_config=None,
                 )
@@ -1253,9 +1649,10 @@ async def run_all(
 
         # Create tasks for browser/custom runners (if configured)
         if config.runner_configs:
-            for runner_config in config.runner_configs:
+            for index, runner_config in enumerate(config.runner_configs, len(config.models)):
                 task = _execute_query_with_semaphore(
                     intent=intent,
+                    query_index=index,
                     model_config=None,
                     runner_config=runner_config,
                 )
@@ -1263,13 +1660,32 @@ async def run_all(
 
     # Execute all tasks in parallel with semaphore limiting concurrency
     logger.info(f"Executing {len(tasks)} queries in parallel...")
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    except BaseException:
+        # Cancelled or interrupted: don't publish a half-written archive
+        abort_packed_artifacts(run_dir)
+        raise
+    finally:
+        # Close shared clients/runners, then release warm browser sessions
+        # so they don't bill while idle
+        await factory_cache.aclose()
+        stop_factory_cache(factory_cache_token)
+        close_session_pools()
+
+    # Flush queued artifacts and atomically publish the archive + index
+    finalize_packed_artifacts(run_dir)
+
+    # Write the access times of extraction memo hits queued during the run
+    await asyncio.to_thread(get_extraction_memo().flush, config.run_settings.sqlite_db_path)
 
     # Process results
     for i, result in enumerate(results):
         if isinstance(result, Exception):
             logger.error(f"Task {i} failed with exception: {result}")
             error_count += 1
+        elif result is None:  # Skipped by the spend guard
+            continue
         elif result[0]:  # Success
             success_count += 1
             total_cost_usd += result[1]
@@ -1292,19 +1708,41 @@ async def run_all(
         "total_queries": total_queries,
         "success_count": success_count,
         "error_count": error_count,
+        "carried_forward_count": len(carried_forward),
+        "carried_forward": carried_forward,
+        "skipped_count": len(skipped),
+        "skipped": skipped,
         "total_cost_usd": round(total_cost_usd, 6),
         "total_llm_cost_usd": round(total_cost_usd - total_operations_cost_usd, 6),
         "total_operations_cost_usd": round(total_operations_cost_usd, 6),
         "my_brands": config.brands.mine,
         "competitors": config.brands.competitors,
         "database_path": config.run_settings.sqlite_db_path,
+        "artifact_backend": artifact_backend,
+        "metrics": run_metrics.snapshot(),
+        "factory_cache": factory_cache.stats.to_dict(),
     }
+    if hedge_budget is not None:
+        run_meta["hedging"] = hedge_budget.to_dict()
+    if spend_guard is not None:
+        run_meta["spend_guard"] = spend_guard.to_dict()
 
     # Write run metadata JSON
     write_run_meta(run_dir=run_dir, meta=run_meta)
 
+    # Refresh planner statistics and apply retention when due. Maintenance
+    # problems are logged but never fail a completed run.
+    try:
+        run_scheduled_maintenance(
+            config.run_settings.sqlite_db_path,
+            config.run_settings.retention,
+        )
+    except Exception as e:
+        logger.warning(f"Database maintenance after run failed: {e}", exc_info=True)
+
     logger.info(
-        f"Run {run_id} complete: {success_count}/{total_queries} successful, "
+        f"Run {run_id} complete: {success_count}/{total_queries} successful "
+        f"({len(carried_forward)} carried forward, {len(skipped)} skipped), "
         f"total_cost=${total_cost_usd:.6f}"
     )
 
@@ -1318,8 +1756,13 @@ async def run_all(
         "total_queries": total_queries,
         "success_count": success_count,
         "error_count": error_count,
+        "carried_forward_count": len(carried_forward),
+        "carried_forward": carried_forward,
+        "skipped_count": len(skipped),
+        "skipped": skipped,
         "total_cost_usd": round(total_cost_usd, 6),
         "total_llm_cost_usd": round(total_cost_usd - total_operations_cost_usd, 6),
         "total_operations_cost_usd": round(total_operations_cost_usd, 6),
+        "factory_cache": factory_cache.stats.to_dict(),
         "errors": errors,
     }
@@ -0,0 +1,417 @@
+"""
+Sequential sampling: repeat a query until its visibility signal is stable.
+
+LLM answers are stochastic, so a single answer per (intent, model) says
+little about how often our brand really appears or where it ranks. Fixed
+repetition (always N samples) pays N times for every query, including the
+ones that are stable after three answers. With run_settings.sampling
+enabled, run_all() keeps sampling each API model query until both
+intervals are narrower than their targets, or max_samples is reached:
+
+- Appearance rate of my brand: Wilson score interval, which stays well
+  behaved at 0% and 100% and with few samples
+- My mean rank (over samples where my brand was ranked): Student's t
+  interval. If my brand is never ranked, there is no rank to estimate and
+  only the appearance interval decides
+
+The first sample is the run's primary answer and goes through the normal
+pipeline (artifacts, answers_raw, mentions, operations). All samples,
+including the first, are stored as a group in answer_samples, with the
+intervals in sample_groups and the intent_*_samples_*.json artifact.
+
+Example:
+    >>> low, high = wilson_interval(successes=6, n=6, confidence=0.95)
+    >>> round(high - low, 2)  # six out of six is narrow enough for 0.4
+    0.39
+"""
+
+import logging
+import math
+from dataclasses import asdict, dataclass, field
+from statistics import NormalDist, fmean, stdev
+
+from ..config.schema import Intent, RuntimeConfig, SamplingConfig
+from ..extractor.mention_detector import BrandPattern
+from ..extractor.parser import ExtractionResult, parse_answer
+from ..storage.connection import write_connection
+from ..storage.db import insert_sample_group
+from ..storage.writer import write_sample_group
+from ..utils import metrics
+from ..utils.time import utc_timestamp
+from .singleflight import no_coalescing
+from .spend_guard import STAGE_SAMPLING, SpendGuard, model_key
+
+logger = logging.getLogger(__name__)
+
+STOP_STABLE = "stable"
+STOP_MAX_SAMPLES = "max_samples"
+STOP_ERROR = "error"
+STOP_BUDGET = "budget"
+
+
+# ============================================================================
+# INTERVALS
+# ============================================================================
+
+
+def _z_score(confidence: float) -> float:
+    """Two-sided standard normal quantile for a confidence level."""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def t_quantile(confidence: float, df: int) -> float:
+    """
+    Two-sided Student's t quantile for a confidence level.
+
+    Exact for df 1 and 2 (closed form). For df >= 3 uses the Cornish-Fisher
+    expansion around the normal quantile (Abramowitz & Stegun 26.7.5),
+    without needing scipy: within 1% of the exact value and slightly too
+    small (e.g. 3.179 instead of 3.182 at 95% and df 3). Below df 3 the
+    expansion is far too small (11.30 instead of 12.71 at 95% and df 1),
+    which would stop sampling early on ranks from two or three samples.
+
+    Args:
+        confidence: Confidence level (e.g., 0.95)
+        df: Degrees of freedom (>= 1)
+
+    Returns:
+        t value such that P(|T| <= t) = confidence
+    """
+    if df == 1:
+        # Cauchy distribution
+        return math.tan(math.pi * confidence / 2)
+    if df == 2:
+        return confidence * math.sqrt(2 / (1 - confidence * confidence))
+    z = _z_score(confidence)
+    v = float(df)
+    return (
+        z
+        + (z**3 + z) / (4 * v)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * v**2)
+        + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * v**3)
+        + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * v**4)
+    )
+
+
+def wilson_interval(successes: int, n: int, confidence: float) -> tuple[float, float]:
+    """
+    Wilson score interval for a proportion.
+
+    Args:
+        successes: Number of successes
+        n: Number of trials (> 0)
+        confidence: Confidence level (e.g., 0.95)
+
+    Returns:
+        Tuple of (low, high), both within [0, 1]
+    """
+    z = _z_score(confidence)
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def mean_interval(values: list[float], confidence: float) -> tuple[float, float, float] | None:
+    """
+    Student's t interval for a mean.
+
+    Args:
+        values: Observations
+        confidence: Confidence level (e.g., 0.95)
+
+    Returns:
+        Tuple of (mean, low, high), or None with fewer than two values
+    """
+    if len(values) < 2:
+        return None
+    mean = fmean(values)
+    half = t_quantile(confidence, len(values) - 1) * stdev(values) / math.sqrt(len(values))
+    return mean, mean - half, mean + half
+
+
+# ============================================================================
+# SAMPLE GROUPS
+# ============================================================================
+
+
+def my_rank(extraction: ExtractionResult) -> int | None:
+    """Best rank position of any of my brands in an answer, or None."""
+    my_names = {m.normalized_name for m in extraction.my_mentions}
+    ranks = [r.rank_position for r in extraction.ranked_list if r.brand_name in my_names]
+    return min(ranks) if ranks else None
+
+
+@dataclass
+class Sample:
+    """
+    One answer in a sample group.
+
+    Attributes:
+        index: Position in the group (0 is the run's primary answer)
+        timestamp_utc: When the answer was generated
+        answer_text: Raw answer text
+        appeared_mine: True if any of my brands were mentioned
+        my_rank: Best rank of my brands (None if not ranked)
+        cost_usd: Answer plus extraction cost
+    """
+
+    index: int
+    timestamp_utc: str
+    answer_text: str
+    appeared_mine: bool
+    my_rank: int | None
+    cost_usd: float
+
+
+@dataclass
+class SampleGroup:
+    """
+    All samples of one (intent, model) query in a run.
+
+    Attributes:
+        intent_id: Intent identifier
+        provider: Model provider
+        model_name: Model identifier
+        samples: Samples in order
+        failed: True if a follow-up sample failed and sampling stopped early
+        budget_stopped: True if the run's budget refused a follow-up sample
+    """
+
+    intent_id: str
+    provider: str
+    model_name: str
+    samples: list[Sample] = field(default_factory=list)
+    failed: bool = False
+    budget_stopped: bool = False
+
+    def add(self, sample: Sample) -> None:
+        self.samples.append(sample)
+
+    @property
+    def appeared_count(self) -> int:
+        return sum(1 for s in self.samples if s.appeared_mine)
+
+    @property
+    def ranks(self) -> list[int]:
+        return [s.my_rank for s in self.samples if s.my_rank is not None]
+
+    @property
+    def extra_cost_usd(self) -> float:
+        """Cost of samples after the primary answer."""
+        return sum(s.cost_usd for s in self.samples[1:])
+
+    def stop_reason(self, sampling: SamplingConfig) -> str | None:
+        """
+        Decide whether to stop sampling.
+
+        Args:
+            sampling: Sampling settings
+
+        Returns:
+            STOP_STABLE, STOP_MAX_SAMPLES, STOP_ERROR, STOP_BUDGET, or None to
+            keep sampling
+        """
+        n = len(self.samples)
+        if self.failed:
+            return STOP_ERROR
+        if self.budget_stopped:
+            return STOP_BUDGET
+        if n < sampling.min_samples:
+            return None
+
+        low, high = wilson_interval(self.appeared_count, n, sampling.confidence)
+        appearance_stable = high - low <= sampling.target_width
+
+        ranks = self.ranks
+        if not ranks:
+            rank_stable = True
+        else:
+            rank_ci = mean_interval(ranks, sampling.confidence)
+            rank_stable = (
+                rank_ci is not None and rank_ci[2] - rank_ci[1] <= sampling.rank_target_width
+            )
+
+        if appearance_stable and rank_stable:
+            return STOP_STABLE
+        if n >= sampling.max_samples:
+            return STOP_MAX_SAMPLES
+        return None
+
+    def summary(self, sampling: SamplingConfig) -> dict:
+        """
+        Intervals and counts for storage and reports.
+
+        Args:
+            sampling: Sampling settings (confidence level)
+
+        Returns:
+            Dict with sample_count, appeared_count, appearance_rate,
+            appearance_ci_low/high, ranked_count, mean_rank, rank_ci_low/high,
+            confidence, stop_reason and total_cost_usd
+        """
+        n = len(self.samples)
+        low, high = wilson_interval(self.appeared_count, n, sampling.confidence)
+        ranks = self.ranks
+        rank_ci = mean_interval(ranks, sampling.confidence)
+        mean_rank = rank_ci[0] if rank_ci else (float(ranks[0]) if ranks else None)
+        return {
+            "sample_count": n,
+            "appeared_count": self.appeared_count,
+            "appearance_rate": round(self.appeared_count / n, 4),
+            "appearance_ci_low": round(low, 4),
+            "appearance_ci_high": round(high, 4),
+            "ranked_count": len(ranks),
+            "mean_rank": round(mean_rank, 3) if mean_rank is not None else None,
+            "rank_ci_low": round(rank_ci[1], 3) if rank_ci else None,
+            "rank_ci_high": round(rank_ci[2], 3) if rank_ci else None,
+            "confidence": sampling.confidence,
+            "stop_reason": self.stop_reason(sampling) or STOP_MAX_SAMPLES,
+            "total_cost_usd": round(sum(s.cost_usd for s in self.samples), 6),
+        }
+
+
+async def sample_until_stable(
+    client,
+    intent: Intent,
+    config: RuntimeConfig,
+    group: SampleGroup,
+    sampling: SamplingConfig,
+    spend_guard: SpendGuard | None = None,
+    brand_patterns: tuple[BrandPattern, ...] | None = None,
+) -> SampleGroup:
+    """
+    Query and parse follow-up samples until the group's intervals are stable.
+
+    A failed follow-up sample stops sampling (the group keeps the samples it
+    has); it never fails the query, whose primary answer already succeeded.
+    So does a sample the run's spend guard refuses.
+
+    Args:
+        client: LLM client used for the primary answer
+        intent: Intent being sampled
+        config: Runtime configuration (brands, extraction settings)
+        group: Group holding at least the primary sample
+        sampling: Sampling settings
+        spend_guard: Optional live budget; each follow-up sample reserves one
+            query estimate and is charged its actual cost
+        brand_patterns: Precompiled patterns of config.brands, if any
+
+    Returns:
+        The same group, with follow-up samples added
+    """
+    key = model_key(group.provider, group.model_name)
+    while group.stop_reason(sampling) is None:
+        reservation = None
+        if spend_guard is not None:
+            reservation = spend_guard.try_reserve(
+                intent.id, key, spend_guard.query_estimate(key)
+            )
+            if reservation is None:
+                spend_guard.record_skipped(intent.id, key, STAGE_SAMPLING)
+                group.budget_stopped = True
+                break
+        try:
+            # Samples must be independent answers, never shared with other requests
+            with no_coalescing():
+                response = await client.generate_answer(intent.prompt)
+            timestamp = utc_timestamp()
+            extraction = await parse_answer(
+                answer_text=response.answer_text,
+                brands=config.brands,
+                intent_id=intent.id,
+                provider=group.provider,
+                model_name=group.model_name,
+                timestamp_utc=timestamp,
+                extraction_settings=config.extraction_settings,
+                db_path=config.run_settings.sqlite_db_path,
+                brand_patterns=brand_patterns,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Sampling stopped for intent={intent.id}, "
+                f"model={group.provider}/{group.model_name} after "
+                f"{len(group.samples)} samples: {e}"
+            )
+            group.failed = True
+            break
+        finally:
+            if reservation is not None:
+                spend_guard.release(reservation)
+
+        if spend_guard is not None:
+            spend_guard.charge(intent.id, key, response.cost_usd)
+            spend_guard.charge_extraction(
+                intent.id, config.extraction_settings, extraction.extraction_cost_usd
+            )
+        metrics.inc("samples_total")
+        group.add(
+            Sample(
+                index=len(group.samples),
+                timestamp_utc=timestamp,
+                answer_text=response.answer_text,
+                appeared_mine=extraction.appeared_mine,
+                my_rank=my_rank(extraction),
+                cost_usd=response.cost_usd + extraction.extraction_cost_usd,
+            )
+        )
+
+    logger.info(
+        f"Sampled intent={intent.id}, model={group.provider}/{group.model_name}: "
+        f"{len(group.samples)} samples ({group.stop_reason(sampling)})",
+        extra={"sample_key": "query.sampling"},
+    )
+    return group
+
+
+def store_sample_group(
+    group: SampleGroup,
+    sampling: SamplingConfig,
+    run_dir: str,
+    run_id: str,
+    db_path: str,
+) -> dict:
+    """
+    Write a sample group to its artifact and to the database.
+
+    Database errors are logged and don't fail the query, like other inserts
+    in run_all().
+
+    Args:
+        group: Finished sample group
+        sampling: Sampling settings
+        run_dir: Run output directory
+        run_id: Run identifier
+        db_path: SQLite database path
+
+    Returns:
+        The group's interval summary
+    """
+    summary = group.summary(sampling)
+    samples = [asdict(sample) for sample in group.samples]
+    write_sample_group(
+        run_dir,
+        group.intent_id,
+        group.provider,
+        group.model_name,
+        {**summary, "samples": samples},
+    )
+
+    try:
+        with write_connection(db_path) as conn:
+            insert_sample_group(
+                conn,
+                run_id=run_id,
+                intent_id=group.intent_id,
+                model_provider=group.provider,
+                model_name=group.model_name,
+                timestamp_utc=group.samples[0].timestamp_utc,
+                summary=summary,
+                samples=samples,
+            )
+            conn.commit()
+    except Exception as e:
+        logger.error(f"Failed to insert sample group into database: {e}", exc_info=True)
+
+    return summary
@@ -0,0 +1,507 @@
+"""
+Process-wide fair-share scheduler for outbound LLM queries.
+
+Every run_all() limits its own concurrency with a semaphore, but several
+users can run at once through the API, so total outbound concurrency and
+spend were unbounded and one large run could starve small ones. All runs in
+the process take a slot from the shared FairShareScheduler for each
+provider call, and return it as soon as the call does:
+
+- Weighted fair queuing between tenants (user_id; CLI runs are "local"):
+  each tenant has a virtual time that advances by cost/weight per granted
+  slot, and a free slot goes to the waiting tenant with the lowest virtual
+  time. A tenant that was idle starts at the current minimum, so idleness
+  doesn't bank credit.
+- Per-tenant concurrency cap
+- Per-tenant spend cap over a rolling window (BudgetExceededError with
+  budget_type="per_user" once reached)
+- Per-provider ceiling shared by all tenants
+
+Clients built through a run's FactoryCache are wrapped in a
+ScheduledLLMClient, so queries, hedges, sampling follow-ups, operations,
+function-calling extraction and intent classification each hold a slot
+only while their request is in flight (not during extraction or database
+writes). Browser runners take a slot around each intent they run.
+
+Within a tenant, waiters are served in arrival order (skipping waiters
+whose provider is at its ceiling). The defaults (50 per tenant, the largest
+max_concurrent_requests a run accepts, and 64 per provider) never throttle a
+single run; fair sharing starts once concurrent runs contend for a limit.
+
+Configuration comes from SchedulerConfig.from_env():
+    WATCHER_TENANT_MAX_CONCURRENCY   per-tenant slots (default 50)
+    WATCHER_PROVIDER_MAX_CONCURRENCY "openai=8,google=16" per-provider ceilings
+    WATCHER_DEFAULT_PROVIDER_MAX_CONCURRENCY  ceiling for unlisted providers (default 64)
+    WATCHER_TENANT_WEIGHTS           "1=2,7=0.5" weight per tenant (default 1)
+    WATCHER_TENANT_SPEND_CAP_USD     spend cap per tenant and window (default: none)
+    WATCHER_SPEND_WINDOW_SECONDS     rolling spend window (default 86400)
+
+Example:
+    >>> scheduler = get_scheduler()
+    >>> slot = await scheduler.acquire(tenant="42", provider="openai")
+    >>> try:
+    ...     response = await client.generate_answer(prompt)
+    ... finally:
+    ...     slot.release()
+    >>> scheduler.record_spend("42", response.cost_usd)
+    >>> scheduler.snapshot()["tenants"]["42"]["granted"]
+    1
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..exceptions import BudgetExceededError
+from ..utils import metrics
+from .models import ChunkCallback, LLMClient, LLMResponse
+
+logger = logging.getLogger(__name__)
+
+# Tenant used for runs without a user (CLI, scripts)
+LOCAL_TENANT = "local"
+
+
+@dataclass
+class SchedulerConfig:
+    """
+    Limits applied by the FairShareScheduler.
+
+    Attributes:
+        tenant_max_concurrency: Slots one tenant may hold at once
+        provider_limits: Ceiling per provider, shared by all tenants
+        default_provider_limit: Ceiling for providers not in provider_limits
+        tenant_weights: Fair-share weight per tenant (default 1.0)
+        tenant_spend_cap_usd: Spend allowed per tenant per window (None: no cap)
+        spend_window_seconds: Length of the rolling spend window
+    """
+
+    tenant_max_concurrency: int = 50
+    provider_limits: dict[str, int] = field(default_factory=dict)
+    default_provider_limit: int = 64
+    tenant_weights: dict[str, float] = field(default_factory=dict)
+    tenant_spend_cap_usd: float | None = None
+    spend_window_seconds: float = 86400.0
+
+    def __post_init__(self):
+        limits = [self.tenant_max_concurrency, self.default_provider_limit]
+        if any(limit < 1 for limit in [*limits, *self.provider_limits.values()]):
+            raise ValueError("Concurrency limits must be at least 1")
+        if any(weight <= 0 for weight in self.tenant_weights.values()):
+            raise ValueError("Tenant weights must be positive")
+
+    @classmethod
+    def from_env(cls) -> "SchedulerConfig":
+        """
+        Build the config from WATCHER_* environment variables.
+
+        Raises:
+            ValueError: If a variable is malformed
+        """
+        env = os.environ
+        spend_cap = env.get("WATCHER_TENANT_SPEND_CAP_USD")
+        return cls(
+            tenant_max_concurrency=int(env.get("WATCHER_TENANT_MAX_CONCURRENCY", 50)),
+            provider_limits={
+                k: int(v)
+                for k, v in _parse_mapping(env.get("WATCHER_PROVIDER_MAX_CONCURRENCY")).items()
+            },
+            default_provider_limit=int(env.get("WATCHER_DEFAULT_PROVIDER_MAX_CONCURRENCY", 64)),
+            tenant_weights={
+                k: float(v) for k, v in _parse_mapping(env.get("WATCHER_TENANT_WEIGHTS")).items()
+            },
+            tenant_spend_cap_usd=float(spend_cap) if spend_cap else None,
+            spend_window_seconds=float(env.get("WATCHER_SPEND_WINDOW_SECONDS", 86400)),
+        )
+
+    def provider_limit(self, provider: str) -> int:
+        return self.provider_limits.get(provider, self.default_provider_limit)
+
+
+def _parse_mapping(value: str | None) -> dict[str, str]:
+    """Parse "a=1,b=2" into {"a": "1", "b": "2"}."""
+    if not value:
+        return {}
+    mapping = {}
+    for item in value.split(","):
+        key, sep, val = item.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"Expected key=value, got: {item!r}")
+        mapping[key.strip()] = val.strip()
+    return mapping
+
+
+@dataclass
+class _Waiter:
+    """A queued acquire() call."""
+
+    provider: str
+    cost: float
+    seq: int
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    enqueued_at: float
+    granted: bool = False
+    error: Exception | None = None
+
+
+@dataclass
+class _TenantState:
+    """Queue, usage and statistics of one tenant."""
+
+    weight: float
+    virtual_time: float = 0.0
+    in_flight: int = 0
+    waiters: deque = field(default_factory=deque)
+    spend: deque = field(default_factory=deque)  # (monotonic time, cost_usd)
+    granted: int = 0
+    rejected: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.in_flight > 0 or bool(self.waiters)
+
+
+class SchedulerSlot:
+    """
+    A granted slot. Call release() exactly once when the query is done.
+
+    Attributes:
+        tenant: Tenant holding the slot
+        provider: Provider the slot counts against
+        wait_seconds: Time spent queued before the grant
+    """
+
+    def __init__(self, scheduler: "FairShareScheduler", tenant: str, provider: str, wait: float):
+        self.tenant = tenant
+        self.provider = provider
+        self.wait_seconds = wait
+        self._scheduler = scheduler
+        self._released = False
+
+    def release(self) -> None:
+        """Return the slot; later calls are no-ops."""
+        if not self._released:
+            self._released = True
+            self._scheduler._release(self.tenant, self.provider)
+
+
+class FairShareScheduler:
+    """
+    Grants query slots across tenants with weighted fair queuing.
+
+    Safe to use from several event loops and threads: state is guarded by a
+    lock and waiters are woken on their own loop.
+
+    Attributes:
+        config: Limits in effect
+    """
+
+    def __init__(self, config: SchedulerConfig | None = None):
+        self.config = config or SchedulerConfig()
+        self._tenants: dict[str, _TenantState] = {}
+        self._provider_in_flight: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    async def acquire(self, tenant: str, provider: str, cost: float = 1.0) -> SchedulerSlot:
+        """
+        Wait for a slot for one query.
+
+        Args:
+            tenant: Tenant identifier (user_id as string, or LOCAL_TENANT)
+            provider: Provider the query goes to
+            cost: Fair-share cost of the query (1.0 per query)
+
+        Returns:
+            SchedulerSlot to release when the query is done
+
+        Raises:
+            BudgetExceededError: If the tenant reached its spend cap
+        """
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        waiter = _Waiter(
+            provider=provider,
+            cost=cost,
+            seq=next(self._seq),
+            loop=loop,
+            future=loop.create_future(),
+            enqueued_at=start,
+        )
+        with self._lock:
+            state = self._tenant(tenant)
+            self._check_spend_cap(tenant, state)
+            if not state.active:
+                # Returning tenants start at the current minimum virtual time
+                state.virtual_time = max(state.virtual_time, self._min_virtual_time())
+            state.waiters.append(waiter)
+            self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release_locked(tenant, provider)
+                elif waiter in state.waiters:
+                    state.waiters.remove(waiter)
+            raise
+
+        if waiter.error is not None:
+            raise waiter.error
+        return SchedulerSlot(self, tenant, provider, time.monotonic() - start)
+
+    def record_spend(self, tenant: str, cost_usd: float) -> None:
+        """Add a completed query's cost to the tenant's rolling spend."""
+        if cost_usd <= 0:
+            return
+        with self._lock:
+            state = self._tenant(tenant)
+            state.spend.append((time.monotonic(), cost_usd))
+            # Fail queued waiters at once if the cap is now reached
+            self._dispatch()
+
+    def snapshot(self) -> dict:
+        """
+        Return queue depth, in-flight slots, wait times and spend per tenant
+        and in-flight slots per provider (JSON-serializable).
+        """
+        with self._lock:
+            now = time.monotonic()
+            tenants = {}
+            for name, state in self._tenants.items():
+                oldest = state.waiters[0].enqueued_at if state.waiters else None
+                tenants[name] = {
+                    "weight": state.weight,
+                    "queue_depth": len(state.waiters),
+                    "in_flight": state.in_flight,
+                    "granted": state.granted,
+                    "rejected": state.rejected,
+                    "avg_wait_ms": round(state.total_wait / state.granted * 1000, 3)
+                    if state.granted
+                    else 0.0,
+                    "max_wait_ms": round(state.max_wait * 1000, 3),
+                    "oldest_wait_ms": round((now - oldest) * 1000, 3) if oldest else 0.0,
+                    "spend_window_usd": round(self._window_spend(state), 6),
+                    "spend_cap_usd": self.config.tenant_spend_cap_usd,
+                }
+            providers = {
+                name: {"in_flight": count, "limit": self.config.provider_limit(name)}
+                for name, count in self._provider_in_flight.items()
+            }
+            return {
+                "tenants": tenants,
+                "providers": providers,
+                "queue_depth": sum(t["queue_depth"] for t in tenants.values()),
+                "in_flight": sum(t["in_flight"] for t in tenants.values()),
+            }
+
+    # ------------------------------------------------------------------------
+    # Internals (called with self._lock held)
+    # ------------------------------------------------------------------------
+
+    def _tenant(self, tenant: str) -> _TenantState:
+        state = self._tenants.get(tenant)
+        if state is None:
+            weight = self.config.tenant_weights.get(tenant, 1.0)
+            state = self._tenants[tenant] = _TenantState(weight=weight)
+        return state
+
+    def _min_virtual_time(self) -> float:
+        active = [s.virtual_time for s in self._tenants.values() if s.active]
+        return min(active, default=0.0)
+
+    def _window_spend(self, state: _TenantState) -> float:
+        horizon = time.monotonic() - self.config.spend_window_seconds
+        while state.spend and state.spend[0][0] < horizon:
+            state.spend.popleft()
+        return sum(cost for _, cost in state.spend)
+
+    def _check_spend_cap(self, tenant: str, state: _TenantState) -> None:
+        cap = self.config.tenant_spend_cap_usd
+        if cap is None:
+            return
+        spent = self._window_spend(state)
+        if spent >= cap:
+            state.rejected += 1
+            raise BudgetExceededError(
+                f"Tenant {tenant} spent ${spent:.4f}, reaching its spend cap of "
+                f"${cap:.2f} per {self.config.spend_window_seconds:g}s",
+                estimated_cost=spent,
+                budget_limit=cap,
+                budget_type="per_user",
+            )
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiters in fair-share order."""
+        while True:
+            best = None
+            for tenant, state in self._tenants.items():
+                if not state.waiters:
+                    continue
+                try:
+                    self._check_spend_cap(tenant, state)
+                except BudgetExceededError as e:
+                    for waiter in state.waiters:
+                        waiter.error = e
+                        self._wake(waiter)
+                    state.waiters.clear()
+                    continue
+                if state.in_flight >= self.config.tenant_max_concurrency:
+                    continue
+                waiter = next(
+                    (w for w in state.waiters if self._provider_has_room(w.provider)), None
+                )
+                if waiter is None:
+                    continue
+                rank = (state.virtual_time, waiter.seq)
+                if best is None or rank < best[0]:
+                    best = (rank, state, waiter)
+
+            if best is None:
+                return
+
+            _, state, waiter = best
+            state.waiters.remove(waiter)
+            state.in_flight += 1
+            state.virtual_time += waiter.cost / state.weight
+            self._provider_in_flight[waiter.provider] = (
+                self._provider_in_flight.get(waiter.provider, 0) + 1
+            )
+            wait = time.monotonic() - waiter.enqueued_at
+            state.granted += 1
+            state.total_wait += wait
+            state.max_wait = max(state.max_wait, wait)
+            waiter.granted = True
+            self._wake(waiter)
+
+    def _provider_has_room(self, provider: str) -> bool:
+        return self._provider_in_flight.get(provider, 0) < self.config.provider_limit(provider)
+
+    def _release(self, tenant: str, provider: str) -> None:
+        with self._lock:
+            self._release_locked(tenant, provider)
+
+    def _release_locked(self, tenant: str, provider: str) -> None:
+        self._tenants[tenant].in_flight -= 1
+        self._provider_in_flight[provider] -= 1
+        self._dispatch()
+
+    @staticmethod
+    def _wake(waiter: _Waiter) -> None:
+        def _set_result():
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+
+        try:
+            waiter.loop.call_soon_threadsafe(_set_result)
+        except RuntimeError:
+            # Loop already closed; its coroutine is gone and cannot run
+            logger.debug("Scheduler waiter's event loop is closed")
+
+
+class ScheduledLLMClient:
+    """
+    LLMClient wrapper that holds a scheduler slot for each upstream call.
+
+    The slot is acquired when generate_answer() is called and released when
+    it returns or raises. Other attributes are delegated to the wrapped
+    client.
+
+    Attributes:
+        base_client: Wrapped client making upstream calls
+        provider: Provider the calls count against
+        tenant: Tenant the calls are scheduled for
+        scheduler: Scheduler to take slots from (default: process-wide,
+            looked up per call)
+    """
+
+    def __init__(
+        self,
+        base_client: LLMClient,
+        provider: str,
+        tenant: str = LOCAL_TENANT,
+        scheduler: "FairShareScheduler | None" = None,
+    ) -> None:
+        self.base_client = base_client
+        self.provider = provider
+        self.tenant = tenant
+        self.scheduler = scheduler
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not set in __init__
+        return getattr(self.base_client, name)
+
+    async def generate_answer(
+        self,
+        prompt: str,
+        on_chunk: ChunkCallback | None = None,
+        max_answer_chars: int | None = None,
+    ) -> LLMResponse:
+        """
+        Wait for a slot, then generate an answer with the wrapped client.
+
+        Args:
+            prompt: User intent prompt
+            on_chunk: Optional streaming callback
+            max_answer_chars: Optional streamed length cap
+
+        Returns:
+            The wrapped client's LLMResponse
+
+        Raises:
+            BudgetExceededError: If the tenant reached its spend cap
+        """
+        stream_kwargs = {}
+        if on_chunk is not None:
+            stream_kwargs = {"on_chunk": on_chunk, "max_answer_chars": max_answer_chars}
+        scheduler = self.scheduler or get_scheduler()
+        with metrics.span("scheduler_wait"):
+            slot = await scheduler.acquire(self.tenant, self.provider)
+        try:
+            return await self.base_client.generate_answer(prompt, **stream_kwargs)
+        finally:
+            slot.release()
+
+
+# ============================================================================
+# MODULE-LEVEL API
+# ============================================================================
+
+class _SchedulerHolder:
+    """Process-wide scheduler, created from the environment on first use."""
+
+    def __init__(self) -> None:
+        self.scheduler: FairShareScheduler | None = None
+        self.lock = threading.Lock()
+
+
+_holder = _SchedulerHolder()
+
+
+def get_scheduler() -> FairShareScheduler:
+    """Return the process-wide scheduler, created from the environment on first use."""
+    with _holder.lock:
+        if _holder.scheduler is None:
+            _holder.scheduler = FairShareScheduler(SchedulerConfig.from_env())
+        return _holder.scheduler
+
+
+def configure_scheduler(config: SchedulerConfig) -> FairShareScheduler:
+    """
+    Replace the process-wide scheduler (e.g. at API startup or in tests).
+
+    Slots held from the previous scheduler are released against it.
+    """
+    with _holder.lock:
+        _holder.scheduler = FairShareScheduler(config)
+        return _holder.scheduler
@@ -0,0 +1,265 @@
+"""
+Single-flight coalescing of identical in-flight LLM requests.
+
+Several users of the API often track the same intent, and operations of
+different runs can render to the same prompt, so identical requests are
+regularly in flight at the same time. Each one used to be paid for and
+rate-limited on its own. With single-flight, the first request for a given
+(provider, model, API key, system prompt, tools, prompt) becomes the leader and
+makes the upstream call; identical requests arriving while it is in flight
+wait for it and share its answer.
+
+- The leader's answer carries the full cost; coalesced answers are copies
+  with cost_usd=0.0, so the cost is attributed (and counted against budgets
+  and spend caps) once
+- A failed upstream call fails the leader and all coalesced requests alike
+- The upstream call is cancelled only once every waiting request is
+- Coalesced requests that asked for streaming receive the complete answer
+  as a single chunk
+- Requests made inside no_coalescing() always call upstream: sampling needs
+  independent answers, and a hedge must not wait for the request it hedges
+
+Clients built through the run's FactoryCache are wrapped automatically; set
+WATCHER_SINGLE_FLIGHT=off to disable coalescing for the process. Coalescing
+complements incremental runs (which reuse earlier answers): it covers
+requests that are in flight at the same moment.
+
+Example:
+    >>> client = CoalescingLLMClient(groq_client, ("groq", "llama-3.1-8b-instant", ...))
+    >>> first, second = await asyncio.gather(
+    ...     client.generate_answer("Best CRM?"), client.generate_answer("Best CRM?")
+    ... )
+    >>> first.answer_text == second.answer_text, second.cost_usd
+    (True, 0.0)
+    >>> get_single_flight().stats.to_dict()["coalesced"]
+    1
+
+Security:
+    The API key is part of the request key as a truncated SHA-256 digest
+    (never the key itself), so only requests made with the same key are
+    coalesced: one tenant's requests never ride on another tenant's key,
+    quota or failures.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import os
+import threading
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from ..utils import metrics
+from .models import ChunkCallback, LLMClient, LLMResponse
+
+logger = logging.getLogger(__name__)
+
+# Values of WATCHER_SINGLE_FLIGHT that disable coalescing
+_DISABLED_VALUES = {"0", "false", "no", "off"}
+
+# Set inside no_coalescing(): requests bypass the single-flight layer
+_bypass: ContextVar[bool] = ContextVar("llm_answer_watcher_no_coalescing", default=False)
+
+
+def single_flight_enabled() -> bool:
+    """True unless WATCHER_SINGLE_FLIGHT disables coalescing."""
+    return os.environ.get("WATCHER_SINGLE_FLIGHT", "on").strip().lower() not in _DISABLED_VALUES
+
+
+@contextmanager
+def no_coalescing() -> Iterator[None]:
+    """Make requests in this context (and tasks created from it) call upstream."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+@dataclass
+class SingleFlightStats:
+    """Process-wide coalescing counters."""
+
+    leaders: int = 0
+    coalesced: int = 0
+    shared_failures: int = 0
+    saved_cost_usd: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Return stats as a JSON-serializable dict with the coalescing rate."""
+        data = asdict(self)
+        total = self.leaders + self.coalesced
+        data["coalesce_rate"] = round(self.coalesced / total, 4) if total else 0.0
+        data["saved_cost_usd"] = round(self.saved_cost_usd, 6)
+        return data
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Registry of in-flight upstream calls, shared by all runs in the process.
+
+    Flights are kept per event loop, so requests are only coalesced with
+    requests of the same loop.
+
+    Attributes:
+        stats: Coalescing counters
+    """
+
+    def __init__(self) -> None:
+        self.stats = SingleFlightStats()
+        self._lock = threading.Lock()
+        self._flights: dict[tuple, _Flight] = {}
+
+    def in_flight(self) -> int:
+        """Number of upstream calls currently shared."""
+        with self._lock:
+            return len(self._flights)
+
+    async def do(self, key: tuple, call: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Run call() once per key among concurrent callers.
+
+        Args:
+            key: Hashable request key
+            call: Coroutine factory making the upstream call (leader only)
+
+        Returns:
+            Tuple of (result, coalesced); coalesced is False for the leader
+
+        Raises:
+            Exception: Whatever the upstream call raised
+        """
+        flight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            coalesced = flight is not None
+            if flight is None:
+                flight = _Flight(asyncio.ensure_future(call()))
+                self._flights[flight_key] = flight
+                flight.task.add_done_callback(lambda _: self._forget(flight_key, flight))
+                self.stats.leaders += 1
+            else:
+                self.stats.coalesced += 1
+            flight.waiters += 1
+
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0 and not flight.task.done()
+                if abandoned:
+                    self._forget_locked(flight_key, flight)
+            if abandoned:
+                flight.task.cancel()
+            raise
+        except Exception:
+            with self._lock:
+                flight.waiters -= 1
+                if coalesced:
+                    self.stats.shared_failures += 1
+            raise
+
+        with self._lock:
+            flight.waiters -= 1
+        return result, coalesced
+
+    def record_saving(self, cost_usd: float) -> None:
+        """Count the cost of an upstream call a coalesced request did not make."""
+        with self._lock:
+            self.stats.saved_cost_usd += cost_usd
+
+    def _forget(self, flight_key: tuple, flight: _Flight) -> None:
+        with self._lock:
+            self._forget_locked(flight_key, flight)
+
+    def _forget_locked(self, flight_key: tuple, flight: _Flight) -> None:
+        # A cancelled flight may already have been replaced by a new one
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight registry."""
+    return _single_flight
+
+
+class CoalescingLLMClient:
+    """
+    LLMClient wrapper that coalesces identical concurrent requests.
+
+    Other attributes (close(), aclose(), configuration) are delegated to the
+    wrapped client.
+
+    Attributes:
+        base_client: Wrapped client making upstream calls
+        client_key: Request settings other than the prompt (provider, model,
+            API key digest, system prompt, tools, ...); never the API key itself
+        single_flight: Registry to coalesce in (default: process-wide)
+    """
+
+    def __init__(
+        self,
+        base_client: LLMClient,
+        client_key: tuple,
+        single_flight: SingleFlight | None = None,
+    ) -> None:
+        self.base_client = base_client
+        self.client_key = client_key
+        self.single_flight = single_flight or get_single_flight()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not set in __init__
+        return getattr(self.base_client, name)
+
+    async def generate_answer(
+        self,
+        prompt: str,
+        on_chunk: ChunkCallback | None = None,
+        max_answer_chars: int | None = None,
+    ) -> LLMResponse:
+        """
+        Generate an answer, sharing the upstream call with identical requests.
+
+        Args:
+            prompt: User intent prompt
+            on_chunk: Optional streaming callback
+            max_answer_chars: Optional streamed length cap (part of the key)
+
+        Returns:
+            LLMResponse; cost_usd is 0.0 if the request was coalesced
+        """
+        stream_kwargs = {}
+        if on_chunk is not None:
+            stream_kwargs = {"on_chunk": on_chunk, "max_answer_chars": max_answer_chars}
+        if _bypass.get():
+            return await self.base_client.generate_answer(prompt, **stream_kwargs)
+
+        response, coalesced = await self.single_flight.do(
+            (*self.client_key, prompt, max_answer_chars),
+            lambda: self.base_client.generate_answer(prompt, **stream_kwargs),
+        )
+        if not coalesced:
+            return response
+
+        self.single_flight.record_saving(response.cost_usd)
+        metrics.inc("coalesced_requests_total")
+        metrics.inc("coalesced_cost_saved_usd", response.cost_usd)
+        logger.debug(
+            f"Coalesced identical request: model={response.provider}/{response.model_name}"
+        )
+        if on_chunk is not None and response.answer_text:
+            on_chunk(response.answer_text)
+        return dataclasses.replace(response, cost_usd=0.0)
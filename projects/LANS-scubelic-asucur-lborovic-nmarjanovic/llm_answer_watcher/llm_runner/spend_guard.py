@@ -0,0 +1,339 @@
+"""
+Live spend guard: enforce budgets on the actual spend of a running run.
+
+validate_budget() only checks the up-front estimate from estimate_run_cost().
+Long answers, extraction calls, follow-up samples, operations and hedged
+requests can cost more than estimated, and nothing stopped a run once it
+had started. The spend guard is shared by all query tasks of run_all() and
+tracks, per provider/model and per intent:
+
+- committed spend: actual costs of finished requests
+- reserved spend: estimated costs of work that has started but not finished
+
+Before a query, a follow-up sample or an intent's operations start, their
+estimated cost is reserved. If committed + reserved + estimate would exceed
+budget.max_per_run_usd (or max_per_intent_usd for the intent), the work is
+refused and recorded as skipped. Estimates are the per-query and
+per-operation costs from estimate_run_cost() (provider pricing, with
+utils.cost as fallback), without its safety buffer.
+
+Work is prioritized in two levels:
+- The primary answer of a query (and its extraction) is never cancelled once
+  started: it is paid for as soon as the request is sent
+- Follow-up samples and operations are low priority; with
+  budget.cancel_low_priority, the ones in flight are cancelled as soon as
+  the committed spend reaches the budget
+
+The guard's summary (spend per model and intent, skipped and cancelled
+work) is written to run_meta.json as "spend_guard".
+
+Example:
+    >>> guard = SpendGuard(max_per_run_usd=0.01, query_estimates={"groq/llama": 0.004})
+    >>> estimate = guard.query_estimate("groq/llama")
+    >>> reservation = guard.try_reserve("best-crm", "groq/llama", estimate)
+    >>> guard.settle(reservation, 0.008)  # longer answer than estimated
+    >>> guard.try_reserve("best-email", "groq/llama", 0.004) is None
+    True
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any
+
+from ..config.schema import RuntimeConfig, RuntimeExtractionSettings
+from ..utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Work stages recorded in the summary
+STAGE_QUERY = "query"
+STAGE_SAMPLING = "sampling"
+STAGE_OPERATIONS = "operations"
+
+# Estimate for models without a per-query estimate (~gpt-4o-mini ballpark,
+# like the fallback of estimate_run_cost)
+DEFAULT_QUERY_ESTIMATE_USD = 0.000323
+
+
+def model_key(provider: str, model_name: str) -> str:
+    """Key of a model in the guard's accounts ("provider/model")."""
+    return f"{provider}/{model_name}"
+
+
+@dataclass
+class Reservation:
+    """
+    Estimated cost held for work in progress.
+
+    Attributes:
+        intent_id: Intent the work belongs to
+        model_key: "provider/model" the work is accounted to
+        amount_usd: Reserved amount
+    """
+
+    intent_id: str
+    model_key: str
+    amount_usd: float
+
+
+class SpendGuard:
+    """
+    Per-run accountant of committed and reserved spend.
+
+    Args:
+        max_per_run_usd: Budget for the whole run (None: no run limit)
+        max_per_intent_usd: Budget per intent (None: no intent limit)
+        query_estimates: Estimated cost of one query per "provider/model"
+        operation_estimate_usd: Estimated cost of one operation (None: use
+            the query estimate of the intent's model)
+        cancel_low_priority: Cancel in-flight low-priority work once the
+            committed spend reaches a budget
+    """
+
+    def __init__(
+        self,
+        max_per_run_usd: float | None = None,
+        max_per_intent_usd: float | None = None,
+        query_estimates: dict[str, float] | None = None,
+        operation_estimate_usd: float | None = None,
+        cancel_low_priority: bool = False,
+    ) -> None:
+        self.max_per_run_usd = max_per_run_usd
+        self.max_per_intent_usd = max_per_intent_usd
+        self.query_estimates = query_estimates or {}
+        self.operation_estimate_usd = operation_estimate_usd
+        self.cancel_low_priority = cancel_low_priority
+        self._lock = threading.Lock()
+        self.committed_usd = 0.0
+        self.reserved_usd = 0.0
+        self._committed_by_model: dict[str, float] = {}
+        self._committed_by_intent: dict[str, float] = {}
+        self._reserved_by_intent: dict[str, float] = {}
+        self._requests_by_model: dict[str, int] = {}
+        self.skipped: list[dict] = []
+        self.cancelled: list[dict] = []
+        self.exhausted = False
+        # Low-priority tasks in flight -> (intent_id, stage)
+        self._low_priority: dict[asyncio.Task, tuple[str, str]] = {}
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig, cost_estimate: dict) -> "SpendGuard | None":
+        """
+        Build the guard for a run, or None if no live budget applies.
+
+        Args:
+            config: Runtime configuration with budget settings
+            cost_estimate: Cost estimate from estimate_run_cost()
+
+        Returns:
+            SpendGuard, or None if budgets are disabled, live enforcement is
+            off or neither max_per_run_usd nor max_per_intent_usd is set
+        """
+        budget = config.run_settings.budget
+        if budget is None or not budget.enabled or not budget.enforce_live:
+            return None
+        if budget.max_per_run_usd is None and budget.max_per_intent_usd is None:
+            return None
+
+        query_estimates = {
+            model_key(m["provider"], m["model_name"]): m["cost_per_query"]
+            for m in cost_estimate["per_model_costs"]
+        }
+        operation_costs = [
+            m["cost_per_operation"] for m in cost_estimate["per_operation_model_costs"]
+        ]
+        return cls(
+            max_per_run_usd=budget.max_per_run_usd,
+            max_per_intent_usd=budget.max_per_intent_usd,
+            query_estimates=query_estimates,
+            operation_estimate_usd=max(operation_costs) if operation_costs else None,
+            cancel_low_priority=budget.cancel_low_priority,
+        )
+
+    def query_estimate(self, key: str) -> float:
+        """Estimated cost of one query to a "provider/model"."""
+        return self.query_estimates.get(key, DEFAULT_QUERY_ESTIMATE_USD)
+
+    def operations_estimate(self, key: str, num_operations: int) -> float:
+        """Estimated cost of num_operations operations of a query to key."""
+        per_operation = self.operation_estimate_usd
+        if per_operation is None:
+            per_operation = self.query_estimate(key)
+        return per_operation * num_operations
+
+    def try_reserve(self, intent_id: str, key: str, amount_usd: float) -> Reservation | None:
+        """
+        Reserve the estimated cost of new work if the budgets allow it.
+
+        Args:
+            intent_id: Intent the work belongs to
+            key: "provider/model" the work is accounted to
+            amount_usd: Estimated cost
+
+        Returns:
+            Reservation, or None if the work would exceed a budget
+        """
+        with self._lock:
+            run_total = self.committed_usd + self.reserved_usd + amount_usd
+            intent_total = (
+                self._committed_by_intent.get(intent_id, 0.0)
+                + self._reserved_by_intent.get(intent_id, 0.0)
+                + amount_usd
+            )
+            if self.exhausted or (
+                self.max_per_run_usd is not None and run_total > self.max_per_run_usd
+            ):
+                return None
+            if self.max_per_intent_usd is not None and intent_total > self.max_per_intent_usd:
+                return None
+            self.reserved_usd += amount_usd
+            self._reserved_by_intent[intent_id] = (
+                self._reserved_by_intent.get(intent_id, 0.0) + amount_usd
+            )
+            return Reservation(intent_id, key, amount_usd)
+
+    def release(self, reservation: Reservation) -> None:
+        """Drop a reservation (the work finished, failed or was cancelled)."""
+        with self._lock:
+            self.reserved_usd = max(0.0, self.reserved_usd - reservation.amount_usd)
+            held = self._reserved_by_intent.get(reservation.intent_id, 0.0)
+            self._reserved_by_intent[reservation.intent_id] = max(
+                0.0, held - reservation.amount_usd
+            )
+
+    def charge(self, intent_id: str, key: str, amount_usd: float, requests: int = 1) -> None:
+        """
+        Commit the actual cost of finished work.
+
+        Costs are always committed, even past the budget: they are already
+        spent. Reaching a budget stops new work and, with
+        cancel_low_priority, cancels low-priority work in flight.
+
+        Args:
+            intent_id: Intent the work belongs to
+            key: "provider/model" that was paid
+            amount_usd: Actual cost
+            requests: Number of requests the cost covers
+        """
+        with self._lock:
+            self.committed_usd += amount_usd
+            self._committed_by_model[key] = self._committed_by_model.get(key, 0.0) + amount_usd
+            self._requests_by_model[key] = self._requests_by_model.get(key, 0) + requests
+            intent_spent = self._committed_by_intent.get(intent_id, 0.0) + amount_usd
+            self._committed_by_intent[intent_id] = intent_spent
+
+            run_reached = (
+                self.max_per_run_usd is not None and self.committed_usd >= self.max_per_run_usd
+            )
+            intent_reached = (
+                self.max_per_intent_usd is not None and intent_spent >= self.max_per_intent_usd
+            )
+            newly_exhausted = run_reached and not self.exhausted
+            if run_reached:
+                self.exhausted = True
+            to_cancel = []
+            if self.cancel_low_priority and (run_reached or intent_reached):
+                to_cancel = [
+                    task
+                    for task, (task_intent, _) in self._low_priority.items()
+                    if run_reached or task_intent == intent_id
+                ]
+
+        if newly_exhausted:
+            logger.warning(
+                f"Run budget of ${self.max_per_run_usd:.2f} reached "
+                f"(spent ${self.committed_usd:.4f}): no new work is started"
+            )
+        for task in to_cancel:
+            task.cancel()
+
+    def charge_extraction(
+        self,
+        intent_id: str,
+        extraction_settings: RuntimeExtractionSettings | None,
+        amount_usd: float,
+    ) -> None:
+        """Commit the cost of an extraction or intent classification call."""
+        if extraction_settings is None or amount_usd <= 0:
+            return
+        model = extraction_settings.extraction_model
+        self.charge(intent_id, model_key(model.provider, model.model_name), amount_usd)
+
+    def settle(self, reservation: Reservation, amount_usd: float, requests: int = 1) -> None:
+        """Release a reservation and commit the actual cost of its work."""
+        self.charge(reservation.intent_id, reservation.model_key, amount_usd, requests)
+        self.release(reservation)
+
+    def record_skipped(self, intent_id: str, key: str, stage: str) -> None:
+        """Record work that was not started because of the budget."""
+        with self._lock:
+            self.skipped.append({"intent_id": intent_id, "model": key, "stage": stage})
+        metrics.inc("budget_refusals_total", stage=stage)
+        logger.warning(f"Budget reached: skipped {stage} for intent={intent_id}, model={key}")
+
+    async def run_low_priority(
+        self, intent_id: str, key: str, stage: str, work: Awaitable[Any]
+    ) -> tuple[Any, bool]:
+        """
+        Run low-priority work that may be cancelled when a budget is reached.
+
+        Args:
+            intent_id: Intent the work belongs to
+            key: "provider/model" of the query the work belongs to
+            stage: STAGE_SAMPLING or STAGE_OPERATIONS
+            work: Awaitable doing the work
+
+        Returns:
+            Tuple of (result, cancelled); result is None if cancelled
+
+        Raises:
+            Exception: Whatever the work raised
+        """
+        task = asyncio.ensure_future(work)
+        with self._lock:
+            self._low_priority[task] = (intent_id, stage)
+        try:
+            return await asyncio.shield(task), False
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                # The caller itself was cancelled: stop the work too
+                task.cancel()
+                raise
+            with self._lock:
+                self.cancelled.append({"intent_id": intent_id, "model": key, "stage": stage})
+            metrics.inc("budget_cancellations_total", stage=stage)
+            logger.warning(
+                f"Budget reached: cancelled {stage} for intent={intent_id}, model={key}"
+            )
+            return None, True
+        finally:
+            with self._lock:
+                self._low_priority.pop(task, None)
+
+    def to_dict(self) -> dict:
+        """Partial-run summary for run_meta.json."""
+        with self._lock:
+            return {
+                "max_per_run_usd": self.max_per_run_usd,
+                "max_per_intent_usd": self.max_per_intent_usd,
+                "committed_usd": round(self.committed_usd, 6),
+                "reserved_usd": round(self.reserved_usd, 6),
+                "exhausted": self.exhausted,
+                "partial": bool(self.skipped or self.cancelled),
+                "per_model": {
+                    key: {
+                        "committed_usd": round(cost, 6),
+                        "requests": self._requests_by_model.get(key, 0),
+                    }
+                    for key, cost in sorted(self._committed_by_model.items())
+                },
+                "per_intent": {
+                    intent_id: round(cost, 6)
+                    for intent_id, cost in sorted(self._committed_by_intent.items())
+                },
+                "skipped": list(self.skipped),
+                "cancelled": list(self.cancelled),
+            }
@@ -0,0 +1,295 @@
+"""
+Streaming support for LLM answers.
+
+With streaming, clients deliver an answer as text deltas while it is being
+generated instead of one response body at the end. This module holds the
+pieces shared by the streaming clients and the runner:
+
+- iter_sse_data(): Parse a server-sent events body (Gemini
+  streamGenerateContent?alt=sse and Groq chat completions with stream=true)
+- StreamBuffer: Client-side collector that forwards deltas to the on_chunk
+  callback, cuts the answer off at max_answer_chars and measures
+  time-to-first-token
+- estimate_tokens(): Token estimate for truncated streams, which end before
+  the provider reports usage
+- LiveAnswer / LiveAnswerRegistry: Process-wide registry of in-flight
+  partial answers with the brands detected so far, served by the API
+  (GET /runs/live) so users see answers grow instead of waiting for the run
+- AnswerStream: Runner-side on_chunk handler tying the three together
+
+Example:
+    >>> registry = get_live_answers()
+    >>> live = registry.start(run_id, "local", "best-crm", "groq", "llama-3.1-8b-instant")
+    >>> stream = AnswerStream(live, StreamingMentionDetector(["HubSpot"], ["Salesforce"]))
+    >>> response = await client.generate_answer(prompt, on_chunk=stream)
+    >>> registry.finish(live)
+"""
+
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+from ..extractor.stream_detector import StreamingMentionDetector
+from ..utils.time import utc_timestamp
+from .models import ChunkCallback
+
+logger = logging.getLogger(__name__)
+
+# Sentinel data payload that ends an OpenAI-compatible stream (Groq)
+SSE_DONE = "[DONE]"
+
+# Average characters per token, used when a truncated stream has no usage data
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (at least 1 for non-empty text)."""
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[str]:
+    """
+    Yield the data payload of each server-sent event in a streamed response.
+
+    Multi-line data fields are joined with newlines, comments and other
+    fields (event, id, retry) are skipped.
+
+    Args:
+        response: Streaming httpx response (from client.stream())
+
+    Yields:
+        Data payload of each event, e.g. a JSON chunk or "[DONE]"
+    """
+    data_lines: list[str] = []
+    async for line in response.aiter_lines():
+        if not line:
+            if data_lines:
+                yield "\n".join(data_lines)
+                data_lines = []
+            continue
+        if line.startswith(":"):
+            continue
+        name, _, value = line.partition(":")
+        if name == "data":
+            data_lines.append(value[1:] if value.startswith(" ") else value)
+    if data_lines:
+        yield "\n".join(data_lines)
+
+
+class StreamBuffer:
+    """
+    Collect streamed text deltas for one LLM call.
+
+    Forwards each delta to the on_chunk callback, stops accepting text once
+    max_answer_chars is reached, and records the time until the first
+    non-empty delta.
+
+    Attributes:
+        truncated: True once the answer was cut off at max_answer_chars
+        time_to_first_token_ms: Milliseconds from creation to the first
+                                delta (None until one arrives)
+
+    Example:
+        >>> buffer = StreamBuffer(on_chunk=print, max_answer_chars=5)
+        >>> buffer.add("Hello world")
+        Hello
+        False
+        >>> buffer.text, buffer.truncated
+        ('Hello', True)
+    """
+
+    def __init__(self, on_chunk: ChunkCallback, max_answer_chars: int | None = None):
+        self._on_chunk = on_chunk
+        self._max_answer_chars = max_answer_chars
+        self._parts: list[str] = []
+        self._length = 0
+        self._started = time.perf_counter()
+        self.truncated = False
+        self.time_to_first_token_ms: float | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def started(self) -> bool:
+        """True once any text was passed to on_chunk."""
+        return self._length > 0
+
+    def add(self, delta: str) -> bool:
+        """
+        Append a delta and pass it to on_chunk.
+
+        Args:
+            delta: Next piece of answer text (may be empty)
+
+        Returns:
+            False once the answer reached max_answer_chars (stop reading)
+        """
+        if self.truncated:
+            return False
+        if not delta:
+            return True
+        if self.time_to_first_token_ms is None:
+            self.time_to_first_token_ms = (time.perf_counter() - self._started) * 1000
+
+        cap = self._max_answer_chars
+        if cap is not None and self._length + len(delta) > cap:
+            delta = delta[: cap - self._length]
+            self.truncated = True
+
+        if delta:
+            self._parts.append(delta)
+            self._length += len(delta)
+            self._on_chunk(delta)
+        return not self.truncated
+
+
+# ============================================================================
+# LIVE PARTIAL ANSWERS
+# ============================================================================
+
+
+@dataclass
+class LiveAnswer:
+    """
+    Partial answer of one in-flight streamed query.
+
+    Attributes:
+        run_id: Run the query belongs to
+        tenant: Scheduler tenant (user id, "local" for CLI runs)
+        intent_id: Intent identifier
+        model_provider: LLM provider
+        model_name: Model identifier
+        started_utc: When the query started streaming (ISO 8601)
+        text: Answer text received so far
+        mentions: Normalized names of brands detected so far, in order
+        time_to_first_token_ms: Time until the first chunk (None until then)
+    """
+
+    run_id: str
+    tenant: str
+    intent_id: str
+    model_provider: str
+    model_name: str
+    started_utc: str
+    text: str = ""
+    mentions: list[str] = field(default_factory=list)
+    time_to_first_token_ms: float | None = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def key(self) -> tuple[str, str, str, str]:
+        return (self.run_id, self.intent_id, self.model_provider, self.model_name)
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "intent_id": self.intent_id,
+            "model_provider": self.model_provider,
+            "model_name": self.model_name,
+            "started_utc": self.started_utc,
+            "answer_text": self.text,
+            "answer_length": len(self.text),
+            "mentions": list(self.mentions),
+            "time_to_first_token_ms": self.time_to_first_token_ms,
+        }
+
+
+class LiveAnswerRegistry:
+    """
+    Thread-safe registry of in-flight streamed answers, shared by all runs.
+
+    The runner registers a LiveAnswer when a streamed query starts, updates
+    it in place as chunks arrive and removes it when the query finishes, so
+    the registry only ever holds answers that are still being generated.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._answers: dict[tuple[str, str, str, str], LiveAnswer] = {}
+
+    def start(
+        self,
+        run_id: str,
+        tenant: str,
+        intent_id: str,
+        model_provider: str,
+        model_name: str,
+    ) -> LiveAnswer:
+        """Register a query that is about to stream and return its LiveAnswer."""
+        live = LiveAnswer(run_id, tenant, intent_id, model_provider, model_name, utc_timestamp())
+        with self._lock:
+            self._answers[live.key] = live
+        return live
+
+    def finish(self, live: LiveAnswer) -> None:
+        """Remove a finished (or failed) query."""
+        with self._lock:
+            self._answers.pop(live.key, None)
+
+    def snapshot(self, tenant: str | None = None) -> list[dict]:
+        """
+        In-flight partial answers, oldest first.
+
+        Args:
+            tenant: Only answers of this tenant (None: all tenants)
+
+        Returns:
+            List of LiveAnswer.to_dict() entries
+        """
+        with self._lock:
+            answers = [
+                live for live in self._answers.values() if tenant is None or live.tenant == tenant
+            ]
+            return [live.to_dict() for live in sorted(answers, key=lambda a: a._started)]
+
+
+_live_answers = LiveAnswerRegistry()
+
+
+def get_live_answers() -> LiveAnswerRegistry:
+    """Return the process-wide registry of in-flight streamed answers."""
+    return _live_answers
+
+
+class AnswerStream:
+    """
+    Runner-side on_chunk handler for one streamed query.
+
+    Grows the LiveAnswer, detects brand mentions on the growing text and
+    notifies an optional listener (e.g. the CLI progress display) with the
+    LiveAnswer after every chunk.
+
+    Args:
+        live: LiveAnswer registered for the query
+        detector: Incremental mention detector for the configured brands
+        listener: Optional callable receiving the LiveAnswer after each chunk
+    """
+
+    def __init__(
+        self,
+        live: LiveAnswer,
+        detector: StreamingMentionDetector,
+        listener: Callable[[LiveAnswer], None] | None = None,
+    ) -> None:
+        self.live = live
+        self.detector = detector
+        self.listener = listener
+
+    def __call__(self, delta: str) -> None:
+        if self.live.time_to_first_token_ms is None:
+            self.live.time_to_first_token_ms = (time.perf_counter() - self.live._started) * 1000
+        found = self.detector.feed(delta)
+        self.live.text = self.detector.text
+        self.live.mentions.extend(mention.normalized_name for mention in found)
+        if self.listener is not None:
+            try:
+                self.listener(self.live)
+            except Exception as e:
+                # A broken display must not fail the query
+                logger.debug(f"Stream listener failed: {e}")
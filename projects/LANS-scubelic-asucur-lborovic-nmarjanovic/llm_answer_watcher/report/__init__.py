@@ -7,15 +7,18 @@ with inline CSS, no external dependencies, and XSS protection via Jinja2 autoesc
 Key exports:
     - generate_report: Generate HTML string from run data
     - write_report: Generate and write HTML report to disk
+    - generate_diff_report: Generate HTML diff report for two runs
     - format_cost_usd: Format cost values for display
 """
 
 from .cost_formatter import format_cost_summary, format_cost_usd
+from .diff import generate_diff_report
 from .generator import generate_report, write_report
 
 __all__ = [
     "format_cost_summary",
     "format_cost_usd",
+    "generate_diff_report",
     "generate_report",
     "write_report",
 ]
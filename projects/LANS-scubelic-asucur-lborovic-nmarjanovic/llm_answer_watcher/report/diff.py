@@ -0,0 +1,88 @@
+"""
+HTML diff report for two runs.
+
+Renders the brand deltas from storage.diff.diff_runs() as a self-contained
+HTML page: a summary of changes (overall and for my brands), the queries
+that could not be compared, and one table per (intent, model) query.
+
+Security:
+- Jinja2 autoescaping enabled, like the run report
+
+Example:
+    >>> with sqlite3.connect(db_path) as conn:
+    ...     html = generate_diff_report(
+    ...         run_a, run_b, diff_runs(conn, run_a, run_b), unpaired_queries(conn, run_a, run_b)
+    ...     )
+"""
+
+import logging
+from collections.abc import Iterable
+from itertools import groupby
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from ..storage.diff import BrandDelta, DiffCounter
+
+logger = logging.getLogger(__name__)
+
+
+def generate_diff_report(
+    run_a: str,
+    run_b: str,
+    deltas: Iterable[BrandDelta],
+    unpaired: list[dict],
+) -> str:
+    """
+    Generate an HTML diff report.
+
+    Args:
+        run_a: Earlier (baseline) run identifier
+        run_b: Later run identifier
+        deltas: Brand deltas ordered by intent, provider and model
+                (as yielded by diff_runs())
+        unpaired: Queries answered in only one run (from unpaired_queries())
+
+    Returns:
+        Complete HTML document
+
+    Raises:
+        ValueError: If the template can't be loaded or rendered
+    """
+    template_dir = Path(__file__).parent / "templates"
+    env = Environment(
+        loader=FileSystemLoader(str(template_dir)),
+        autoescape=select_autoescape(["html", "xml", "j2"]),
+    )
+
+    try:
+        template = env.get_template("diff.html.j2")
+    except Exception as e:
+        logger.error(f"Failed to load diff template: {e}", exc_info=True)
+        raise ValueError(f"Cannot load diff template: {e}") from e
+
+    counter = DiffCounter()
+    queries = [
+        {
+            "intent_id": intent_id,
+            "model_provider": provider,
+            "model_name": model_name,
+            "deltas": list(group),
+        }
+        for (intent_id, provider, model_name), group in groupby(
+            counter.count(deltas),
+            key=lambda d: (d.intent_id, d.model_provider, d.model_name),
+        )
+    ]
+
+    try:
+        return template.render(
+            run_a=run_a,
+            run_b=run_b,
+            summary=counter.summary(),
+            queries=queries,
+            unpaired=unpaired,
+        )
+    except Exception as e:
+        logger.error(f"Failed to render diff template: {e}", exc_info=True)
+        raise ValueError(f"Cannot render diff template: {e}") from e
@@ -31,7 +31,12 @@ from pathlib import Path
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from ..config.schema import RuntimeConfig
-from ..storage.layout import get_parsed_answer_filename, get_raw_answer_filename
+from ..storage.artifact_store import RunArtifacts
+from ..storage.layout import (
+    get_parsed_answer_filename,
+    get_raw_answer_filename,
+    get_samples_filename,
+)
 from ..storage.writer import write_report_html
 from .cost_formatter import format_cost_usd
 
@@ -352,7 +357,7 @@ def _build_template_data(
         Dictionary with template variables (run_id, intents, costs, etc.)
 
     Note:
-        - Reads parsed JSON files for each successful result
+        - Reads parsed artifacts for each successful result (files or packed archive)
         - Handles missing files gracefully (logs warning, continues)
         - Formats all costs with format_cost_usd()
         - Sorts mentions by position for consistent display
@@ -370,6 +375,7 @@ def _build_template_data(
     total_operations_cost = 0.0
     total_llm_cost = total_cost  # Default if run_meta doesn't exist
     config_filename = None
+    carried_forward_count = 0
 
     # Try to load more accurate cost breakdown from run_meta.json
     run_meta_path = run_dir / "run_meta.json"
@@ -380,6 +386,7 @@ def _build_template_data(
                 total_operations_cost = run_meta.get("total_operations_cost_usd", 0.0)
                 total_llm_cost = run_meta.get("total_llm_cost_usd", total_cost)
                 config_filename = run_meta.get("config_filename")
+                carried_forward_count = run_meta.get("carried_forward_count", 0)
         except (json.JSONDecodeError, OSError) as e:
             logger.warning(f"Failed to load run_meta.json for cost breakdown: {e}")
 
@@ -404,29 +411,31 @@ def _build_template_data(
             )
             seen_models.add(model_key)
 
-    # Group results by intent
+    # Group results by intent (artifacts come from loose files or the packed archive)
     intents_data = []
-    for intent in config.intents:
-        intent_results = [r for r in results if r.get("intent_id") == intent.id]
-
-        # Load parsed data for each model result
-        model_results = []
-        for result in intent_results:
-            model_data = _load_model_result(
-                run_dir,
-                result,
-                intent.id,
+    with RunArtifacts(run_dir) as artifacts:
+        for intent in config.intents:
+            intent_results = [r for r in results if r.get("intent_id") == intent.id]
+
+            # Load parsed data for each model result
+            model_results = []
+            for result in intent_results:
+                model_data = _load_model_result(
+                    run_dir,
+                    result,
+                    intent.id,
+                    artifacts=artifacts,
+                )
+                if model_data:
+                    model_results.append(model_data)
+
+            intents_data.append(
+                {
+                    "intent_id": intent.id,
+                    "prompt": intent.prompt,
+                    "results": model_results,
+                }
             )
-            if model_data:
-                model_results.append(model_data)
-
-        intents_data.append(
-            {
-                "intent_id": intent.id,
-                "prompt": intent.prompt,
-                "results": model_results,
-            }
-        )
 
     # Calculate visibility scores
     visibility_scores = _calculate_visibility_scores(intents_data)
@@ -442,6 +451,7 @@ def _build_template_data(
         "total_intents": total_intents,
         "total_models": total_models,
         "success_rate": success_rate,
+        "carried_forward_count": carried_forward_count,
         "models_used": models_used,
         "intents": intents_data,
         "visibility_scores": visibility_scores,
@@ -452,17 +462,19 @@ def _load_model_result(
     run_dir: Path,
     result: dict,
     intent_id: str,
+    artifacts: RunArtifacts | None = None,
 ) -> dict | None:
     """
     Load parsed result data for a single model's answer.
 
-    Reads the parsed JSON file and extracts mentions, rankings, and metadata
+    Reads the parsed JSON artifact and extracts mentions, rankings, and metadata
     for template rendering.
 
     Args:
         run_dir: Path to run output directory
         result: Result dict from runner (with provider, model_name, status, cost)
         intent_id: Intent identifier (for filename generation)
+        artifacts: Open artifact reader for run_dir (created if not provided)
 
     Returns:
         Dictionary with model result data for template, or None if loading fails
@@ -481,6 +493,10 @@ def _load_model_result(
         )
         return None
 
+    if artifacts is None:
+        with RunArtifacts(run_dir) as opened:
+            return _load_model_result(run_dir, result, intent_id, artifacts=opened)
+
     provider = result.get("provider")
     model_name = result.get("model_name")
 
@@ -489,15 +505,14 @@ def _load_model_result(
     parsed_path = run_dir / parsed_filename
 
     # Load parsed JSON
-    if not parsed_path.exists():
+    if not artifacts.exists(parsed_filename):
         logger.warning(
             f"Parsed file not found: {parsed_path}. Skipping in report generation."
         )
         return None
 
     try:
-        with parsed_path.open(encoding="utf-8") as f:
-            parsed_data = json.load(f)
+        parsed_data = artifacts.read_json(parsed_filename)
     except json.JSONDecodeError as e:
         logger.error(
             f"Invalid JSON in {parsed_path}: {e}. Skipping in report generation.",
@@ -555,16 +570,25 @@ def _load_model_result(
     answer_length = 0
     web_search_count = 0
 
-    if raw_path.exists():
+    if artifacts.exists(raw_filename):
         try:
-            with raw_path.open(encoding="utf-8") as f:
-                raw_data = json.load(f)
-                answer_text = raw_data.get("answer_text", "")
-                answer_length = raw_data.get("answer_length", len(answer_text))
-                web_search_count = raw_data.get("web_search_count", 0)
+            raw_data = artifacts.read_json(raw_filename)
+            answer_text = raw_data.get("answer_text", "")
+            answer_length = raw_data.get("answer_length", len(answer_text))
+            web_search_count = raw_data.get("web_search_count", 0)
         except (json.JSONDecodeError, OSError) as e:
             logger.warning(f"Failed to load raw answer text from {raw_path}: {e}")
 
+    # Load sampling intervals (present only for sampled queries)
+    sampling = None
+    samples_filename = get_samples_filename(intent_id, provider, model_name)
+    if artifacts.exists(samples_filename):
+        try:
+            sampling = artifacts.read_json(samples_filename)
+            sampling.pop("samples", None)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Failed to load samples from {samples_filename}: {e}")
+
     # Load operations results for this intent
     # Note: Operations run with operation_models (e.g., o3-mini), not query models
     # We show the same operations under each query model since they analyze all responses
@@ -574,22 +598,20 @@ def _load_model_result(
     # Find all operation result files for this intent (regardless of operation model used)
     # Pattern: intent_{intent_id}_operation_{operation_id}_{provider}_{model}.json
     operation_pattern = f"intent_{intent_id}_operation_*.json"
-    operation_files = run_dir.glob(operation_pattern)
 
-    for op_file in operation_files:
+    for op_file in artifacts.names(operation_pattern):
         try:
-            with op_file.open(encoding="utf-8") as f:
-                op_data = json.load(f)
-                operations.append({
-                    "operation_id": op_data.get("operation_id", ""),
-                    "result_text": op_data.get("result_text", ""),
-                    "cost_usd": op_data.get("cost_usd", 0.0),
-                    "cost_formatted": format_cost_usd(op_data.get("cost_usd", 0.0)),
-                    "tokens_used": op_data.get("tokens_used_input", 0) + op_data.get("tokens_used_output", 0),
-                    "skipped": op_data.get("skipped", False),
-                    "error": op_data.get("error"),
-                })
-                operations_cost_usd += op_data.get("cost_usd", 0.0)
+            op_data = artifacts.read_json(op_file)
+            operations.append({
+                "operation_id": op_data.get("operation_id", ""),
+                "result_text": op_data.get("result_text", ""),
+                "cost_usd": op_data.get("cost_usd", 0.0),
+                "cost_formatted": format_cost_usd(op_data.get("cost_usd", 0.0)),
+                "tokens_used": op_data.get("tokens_used_input", 0) + op_data.get("tokens_used_output", 0),
+                "skipped": op_data.get("skipped", False),
+                "error": op_data.get("error"),
+            })
+            operations_cost_usd += op_data.get("cost_usd", 0.0)
         except (json.JSONDecodeError, OSError) as e:
             logger.warning(f"Failed to load operation result from {op_file}: {e}")
 
@@ -611,4 +633,6 @@ def _load_model_result(
         "operations_cost_usd": operations_cost_usd,
         "operations_cost_formatted": format_cost_usd(operations_cost_usd),
         "has_operations": len(operations) > 0,
+        "carried_from_run_id": parsed_data.get("carried_from_run_id"),
+        "sampling": sampling,
     }
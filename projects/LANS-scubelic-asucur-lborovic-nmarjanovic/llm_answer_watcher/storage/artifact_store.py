@@ -0,0 +1,522 @@
+"""
+Packed per-run artifact store for LLM Answer Watcher.
+
+The default "files" backend writes one pretty-printed JSON file per artifact
+(raw answer, parsed answer, error, operation result). Large runs create tens
+of thousands of small files, which is slow on network filesystems and Docker
+volumes and awkward to sync to object storage.
+
+The "packed" backend writes the same artifacts into a single append-only
+archive per run:
+
+- artifacts.jsonl.zst (or .gz): one compressed frame per record. Each record
+  is a JSON line {"name": "<artifact filename>", "data": {...}}. Frames are
+  concatenated, so `zstdcat`/`zcat` on the archive yields plain JSONL.
+- artifacts.index.json: maps artifact filename -> [offset, length] of its
+  frame for random access without decompressing the whole archive.
+
+Compression and disk writes happen on a background thread fed by a bounded
+queue, so query tasks only pay for JSON serialization. The archive is written
+to a ".partial" file and atomically renamed on finalize; the index is written
+last, so a run directory either has a complete archive or none at all.
+
+Readers use RunArtifacts, which serves artifacts by their usual filename from
+either backend, so the report generator and exporters don't care how a run
+was stored.
+
+zstd requires the optional `zstandard` package; without it the packed backend
+falls back to gzip from the standard library.
+
+Example:
+    >>> writer = open_packed_artifacts("./output/2025-11-02T08-00-00Z")
+    >>> writer.put("intent_a_raw_openai_gpt-4o-mini.json", {"answer_text": "..."})
+    >>> finalize_packed_artifacts("./output/2025-11-02T08-00-00Z")
+    >>> with RunArtifacts("./output/2025-11-02T08-00-00Z") as artifacts:
+    ...     artifacts.read_json("intent_a_raw_openai_gpt-4o-mini.json")
+    {'answer_text': '...'}
+"""
+
+import contextlib
+import fnmatch
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from ..utils import serialization
+from ..utils.metrics import timed
+from .layout import get_artifact_archive_filename, get_artifact_index_filename
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+ARTIFACT_BACKENDS = ("files", "packed")
+ARTIFACT_CODECS = ("zstd", "gzip")
+INDEX_VERSION = 1
+
+# zstd level 3 is the library default: fast with a good ratio for JSON text
+ZSTD_LEVEL = 3
+GZIP_LEVEL = 6
+
+# Bounded queue gives backpressure if disk is slower than the query rate
+DEFAULT_QUEUE_SIZE = 1024
+
+PARTIAL_SUFFIX = ".partial"
+
+_SENTINEL = object()
+
+
+def default_codec() -> str:
+    """
+    Return the best available compression codec.
+
+    Returns:
+        "zstd" if the zstandard package is installed, otherwise "gzip"
+    """
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _require_codec(codec: str) -> None:
+    """Raise if codec is unknown or its library is not installed."""
+    if codec not in ARTIFACT_CODECS:
+        raise ValueError(f"Unknown artifact codec '{codec}'. Use one of: {ARTIFACT_CODECS}")
+    if codec == "zstd" and zstandard is None:
+        raise RuntimeError(
+            "zstd artifact archives require the 'zstandard' package. "
+            "Install with: pip install zstandard"
+        )
+
+
+def _decompress(codec: str, blob: bytes) -> bytes:
+    """Decompress a single record frame."""
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+
+class PackedArtifactWriter:
+    """
+    Append-only compressed artifact archive for one run.
+
+    Records are serialized on the caller's thread (so later mutation of the
+    data can't leak into the archive and non-serializable data fails at the
+    call site), then compressed and appended by a background thread.
+
+    Attributes:
+        run_dir: Run directory the archive belongs to
+        codec: Compression codec ("zstd" or "gzip")
+        archive_path: Final archive path (exists only after finalize)
+        index_path: Index path (exists only after finalize)
+
+    Example:
+        >>> writer = PackedArtifactWriter("./output/run", codec="gzip")
+        >>> writer.start()
+        >>> writer.put("intent_a_parsed_openai_gpt-4o-mini.json", {"appeared_mine": True})
+        >>> writer.finalize()
+        './output/run/artifacts.jsonl.gz'
+    """
+
+    def __init__(
+        self,
+        run_dir: str,
+        codec: str | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        codec = codec or default_codec()
+        _require_codec(codec)
+
+        self.run_dir = run_dir
+        self.codec = codec
+        self.archive_path = os.path.join(run_dir, get_artifact_archive_filename(codec))
+        self.index_path = os.path.join(run_dir, get_artifact_index_filename())
+        self._partial_path = self.archive_path + PARTIAL_SUFFIX
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._file = None
+        self._entries: dict[str, list[int]] = {}
+        self._offset = 0
+        self._error: Exception | None = None
+        self._closed = False
+
+    @property
+    def count(self) -> int:
+        """Number of records written to the archive so far."""
+        return len(self._entries)
+
+    def start(self) -> None:
+        """
+        Open the partial archive and start the background writer thread.
+
+        Raises:
+            OSError: If the partial archive cannot be created
+        """
+        self._file = open(self._partial_path, "wb")  # noqa: SIM115 - closed in finalize/abort
+        self._thread = threading.Thread(
+            target=self._drain, name="artifact-writer", daemon=True
+        )
+        self._thread.start()
+        logger.debug(f"Opened packed artifact archive: {self._partial_path}")
+
+    def put(self, name: str, data: dict | list) -> None:
+        """
+        Queue an artifact for writing.
+
+        Args:
+            name: Artifact filename (from storage.layout), used as the lookup key
+            data: JSON-serializable artifact data
+
+        Raises:
+            RuntimeError: If the writer is closed or the background thread failed
+            TypeError: If data is not JSON-serializable
+        """
+        if self._closed or self._thread is None:
+            raise RuntimeError(f"Packed artifact writer for '{self.run_dir}' is not open")
+        if self._error is not None:
+            raise RuntimeError(
+                f"Packed artifact writer for '{self.run_dir}' failed: {self._error}"
+            ) from self._error
+
+        try:
+            payload = serialization.dumps_bytes({"name": name, "data": data})
+        except TypeError as e:
+            raise TypeError(
+                f"Cannot write artifact '{name}': Data is not JSON-serializable. {e}"
+            ) from e
+
+        self._queue.put((name, payload + b"\n"))
+
+    def _drain(self) -> None:
+        """Background loop: compress queued records and append them to the archive."""
+        if self.codec == "zstd":
+            compress = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+        else:
+            def compress(payload: bytes) -> bytes:
+                return gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+
+        while True:
+            item = self._queue.get()
+            if item is _SENTINEL:
+                return
+            if self._error is not None:
+                # Keep draining so producers never block on a dead writer
+                continue
+
+            name, payload = item
+            try:
+                blob = compress(payload)
+                self._file.write(blob)
+            except Exception as e:  # surfaced via put()/finalize()
+                logger.error(f"Packed artifact writer failed on '{name}': {e}", exc_info=True)
+                self._error = e
+                continue
+
+            # Later writes of the same name win, like overwriting a file
+            self._entries[name] = [self._offset, len(blob)]
+            self._offset += len(blob)
+
+    def _stop(self) -> None:
+        """Signal the background thread to exit and wait for it."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_SENTINEL)
+            self._thread.join()
+
+    def finalize(self) -> str:
+        """
+        Flush all queued records and atomically publish the archive and index.
+
+        Returns:
+            Path to the finalized archive
+
+        Raises:
+            OSError: If the background writer failed or the archive cannot be
+                published. The partial archive is removed in that case.
+        """
+        self._stop()
+
+        if self._error is not None:
+            self._discard()
+            raise OSError(
+                f"Cannot write artifact archive '{self.archive_path}': {self._error}. "
+                f"Check disk space and permissions."
+            ) from self._error
+
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._partial_path, self.archive_path)
+
+            index = {
+                "version": INDEX_VERSION,
+                "codec": self.codec,
+                "archive": os.path.basename(self.archive_path),
+                "count": len(self._entries),
+                "entries": self._entries,
+            }
+            index_tmp = self.index_path + PARTIAL_SUFFIX
+            with open(index_tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(index_tmp, self.index_path)
+        except OSError as e:
+            logger.error(f"Failed to finalize artifact archive: {self.archive_path}", exc_info=True)
+            raise OSError(
+                f"Cannot finalize artifact archive '{self.archive_path}': {e}. "
+                f"Check disk space and permissions."
+            ) from e
+
+        logger.info(
+            f"Finalized artifact archive: {self.archive_path} "
+            f"({len(self._entries)} records, {self._offset} bytes)"
+        )
+        return self.archive_path
+
+    def abort(self) -> None:
+        """Stop the writer and delete the partial archive without publishing it."""
+        self._stop()
+        self._discard()
+        logger.warning(f"Discarded partial artifact archive: {self._partial_path}")
+
+    def _discard(self) -> None:
+        """Close and remove the partial archive file."""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._partial_path)
+
+
+# Active writers keyed by absolute run directory. storage.writer consults this
+# so the runner's write_* calls are routed to the archive without new arguments.
+_active_writers: dict[str, PackedArtifactWriter] = {}
+_active_writers_lock = threading.Lock()
+
+
+def open_packed_artifacts(run_dir: str, codec: str | None = None) -> PackedArtifactWriter:
+    """
+    Start a packed artifact archive for a run directory.
+
+    While open, storage.writer's write_raw_answer/write_parsed_answer/
+    write_error/write_operation_result calls for this run_dir go to the
+    archive instead of individual files.
+
+    Args:
+        run_dir: Run directory (from create_run_directory)
+        codec: "zstd" or "gzip" (default: best available)
+
+    Returns:
+        The started PackedArtifactWriter
+
+    Raises:
+        RuntimeError: If an archive is already open for run_dir, or zstd was
+            requested without the zstandard package
+    """
+    key = os.path.abspath(run_dir)
+    with _active_writers_lock:
+        if key in _active_writers:
+            raise RuntimeError(f"Packed artifact archive already open for '{run_dir}'")
+        writer = PackedArtifactWriter(run_dir, codec=codec)
+        writer.start()
+        _active_writers[key] = writer
+    return writer
+
+
+def get_packed_artifacts(run_dir: str) -> PackedArtifactWriter | None:
+    """
+    Return the open packed writer for run_dir, or None for the files backend.
+
+    Args:
+        run_dir: Run directory path
+
+    Returns:
+        Open PackedArtifactWriter or None
+    """
+    if not _active_writers:
+        return None
+    return _active_writers.get(os.path.abspath(run_dir))
+
+
+@timed()
+def finalize_packed_artifacts(run_dir: str) -> str | None:
+    """
+    Finalize and close the packed archive for run_dir, if one is open.
+
+    Args:
+        run_dir: Run directory path
+
+    Returns:
+        Path to the finalized archive, or None if no archive was open
+
+    Raises:
+        OSError: If the archive cannot be finalized
+    """
+    with _active_writers_lock:
+        writer = _active_writers.pop(os.path.abspath(run_dir), None)
+    if writer is None:
+        return None
+    return writer.finalize()
+
+
+def abort_packed_artifacts(run_dir: str) -> None:
+    """
+    Discard the packed archive for run_dir, if one is open.
+
+    Args:
+        run_dir: Run directory path
+    """
+    with _active_writers_lock:
+        writer = _active_writers.pop(os.path.abspath(run_dir), None)
+    if writer is not None:
+        writer.abort()
+
+
+# ============================================================================
+# READER
+# ============================================================================
+
+
+class RunArtifacts:
+    """
+    Read-only view of a run's JSON artifacts from either backend.
+
+    Artifacts are addressed by their storage.layout filename. If the run
+    directory has a finalized packed archive, entries are served from it;
+    loose files in the directory (e.g. run_meta.json, or every artifact for
+    the files backend) are served from disk.
+
+    Attributes:
+        run_dir: Run directory path
+        packed: True if a finalized packed archive was found
+
+    Example:
+        >>> with RunArtifacts("./output/2025-11-02T08-00-00Z") as artifacts:
+        ...     for name, data in artifacts.iter_json("*_parsed_*.json"):
+        ...         print(name, data["appeared_mine"])
+    """
+
+    def __init__(self, run_dir: str | Path):
+        self.run_dir = Path(run_dir)
+        self._index = self._load_index()
+        self._archive = None
+
+    def _load_index(self) -> dict | None:
+        """Load the archive index, or None if the run is not packed."""
+        index_path = self.run_dir / get_artifact_index_filename()
+        if not index_path.exists():
+            return None
+        try:
+            with index_path.open(encoding="utf-8") as f:
+                index = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Failed to read artifact index {index_path}: {e}")
+            return None
+        if index.get("version") != INDEX_VERSION:
+            logger.error(
+                f"Unsupported artifact index version {index.get('version')} in {index_path}"
+            )
+            return None
+        return index
+
+    @property
+    def packed(self) -> bool:
+        """True if artifacts are served from a packed archive."""
+        return self._index is not None
+
+    def names(self, pattern: str = "*.json") -> list[str]:
+        """
+        List artifact filenames matching a glob pattern.
+
+        Args:
+            pattern: fnmatch-style pattern (e.g., "intent_x_operation_*.json")
+
+        Returns:
+            Sorted artifact filenames from the archive and the run directory
+        """
+        names = {p.name for p in self.run_dir.glob(pattern) if p.is_file()}
+        if self._index is not None:
+            names.update(fnmatch.filter(self._index["entries"], pattern))
+        return sorted(names)
+
+    def exists(self, name: str) -> bool:
+        """Return True if the named artifact exists in either backend."""
+        if self._index is not None and name in self._index["entries"]:
+            return True
+        return (self.run_dir / name).is_file()
+
+    def read_json(self, name: str) -> Any:
+        """
+        Read and parse one artifact.
+
+        Args:
+            name: Artifact filename
+
+        Returns:
+            Parsed JSON data
+
+        Raises:
+            FileNotFoundError: If the artifact does not exist
+            json.JSONDecodeError: If the artifact is not valid JSON
+            OSError: If the archive or file cannot be read
+        """
+        if self._index is not None and name in self._index["entries"]:
+            offset, length = self._index["entries"][name]
+            archive = self._open_archive()
+            archive.seek(offset)
+            record = serialization.loads(_decompress(self._index["codec"], archive.read(length)))
+            return record["data"]
+
+        return serialization.loads((self.run_dir / name).read_bytes())
+
+    def iter_json(self, pattern: str = "*.json") -> Iterator[tuple[str, Any]]:
+        """
+        Iterate (name, data) for every artifact matching pattern.
+
+        Args:
+            pattern: fnmatch-style pattern
+
+        Yields:
+            Tuples of artifact filename and parsed JSON data
+        """
+        for name in self.names(pattern):
+            yield name, self.read_json(name)
+
+    def _open_archive(self):
+        """Open the archive file on first packed read."""
+        if self._archive is None:
+            _require_codec(self._index["codec"])
+            self._archive = (self.run_dir / self._index["archive"]).open("rb")
+        return self._archive
+
+    def close(self) -> None:
+        """Close the archive file handle, if open."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def __enter__(self) -> "RunArtifacts":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
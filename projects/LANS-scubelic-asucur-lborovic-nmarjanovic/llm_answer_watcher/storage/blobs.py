@@ -0,0 +1,267 @@
+"""
+Content-addressed, compressed text storage for the SQLite database.
+
+Large text fields of answers_raw (prompt, answer_text, web search results)
+are stored once in the answer_blobs table, keyed by the SHA-256 of their
+UTF-8 bytes, and referenced from answers_raw by hash. Deterministic models
+often return byte-identical answers across hourly runs, and prompts repeat
+every run, so identical text is stored once no matter how many rows use it.
+
+Blobs are compressed with zstd when the optional `zstandard` package is
+installed, otherwise with zlib from the standard library. The codec is stored
+per blob, so databases written with either remain readable as long as the
+codec library is available. Short texts that don't shrink are stored as-is.
+
+Example:
+    >>> with sqlite3.connect("watcher.db") as conn:
+    ...     digest = put_blob(conn, "Here are the best email warmup tools...")
+    ...     get_blob(conn, digest)
+    'Here are the best email warmup tools...'
+
+Security:
+    - All queries use parameterized statements
+    - Hashes are computed locally; blob content is never logged
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import zlib
+from collections.abc import Iterable
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+BLOB_CODECS = ("zstd", "zlib", "raw")
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+
+# Below this size compression headers usually outweigh the savings
+MIN_COMPRESS_BYTES = 64
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds
+LOOKUP_BATCH_SIZE = 500
+
+# zstd compressor/decompressor objects are reusable but not thread-safe
+_zstd_local = threading.local()
+
+
+def default_blob_codec() -> str:
+    """
+    Return the codec used for new blobs.
+
+    Returns:
+        "zstd" if the zstandard package is installed, otherwise "zlib"
+    """
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def content_hash(text: str) -> str:
+    """
+    Compute the content address of a text.
+
+    Args:
+        text: Text to hash
+
+    Returns:
+        Hex SHA-256 digest of the UTF-8 encoded text
+
+    Example:
+        >>> content_hash("hello")[:12]
+        '2cf24dba5fb0'
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress_text(text: str, codec: str | None = None) -> tuple[str, bytes]:
+    """
+    Compress text for storage.
+
+    Args:
+        text: Text to compress
+        codec: "zstd", "zlib" or "raw" (default: best available)
+
+    Returns:
+        Tuple of (codec actually used, stored bytes). Falls back to "raw"
+        when compression would not make the payload smaller.
+    """
+    payload = text.encode("utf-8")
+    codec = codec or default_blob_codec()
+
+    if codec == "raw" or len(payload) < MIN_COMPRESS_BYTES:
+        return "raw", payload
+
+    if codec == "zstd":
+        compressor = getattr(_zstd_local, "compressor", None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            _zstd_local.compressor = compressor
+        data = compressor.compress(payload)
+    elif codec == "zlib":
+        data = zlib.compress(payload, ZLIB_LEVEL)
+    else:
+        raise ValueError(f"Unknown blob codec '{codec}'. Use one of: {BLOB_CODECS}")
+
+    if len(data) >= len(payload):
+        return "raw", payload
+    return codec, data
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """
+    Decompress a stored blob back to text.
+
+    Args:
+        codec: Codec recorded with the blob
+        data: Stored bytes
+
+    Returns:
+        Original text
+
+    Raises:
+        RuntimeError: If the blob is zstd-compressed and zstandard is not installed
+        ValueError: If the codec is unknown
+    """
+    if codec == "raw":
+        return bytes(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError(
+                "Database contains zstd-compressed answers. "
+                "Install the 'zstandard' package to read them: pip install zstandard"
+            )
+        decompressor = getattr(_zstd_local, "decompressor", None)
+        if decompressor is None:
+            decompressor = zstandard.ZstdDecompressor()
+            _zstd_local.decompressor = decompressor
+        return decompressor.decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown blob codec '{codec}'. Use one of: {BLOB_CODECS}")
+
+
+def put_blob(conn: sqlite3.Connection, text: str | None) -> str | None:
+    """
+    Store text in answer_blobs (if not already present) and return its hash.
+
+    Existing blobs are detected before compressing, so storing a duplicate
+    answer costs one indexed lookup.
+
+    Args:
+        conn: Active SQLite database connection
+        text: Text to store (None is passed through as None)
+
+    Returns:
+        Content hash referencing the blob, or None if text is None
+
+    Note:
+        Always call conn.commit() after to persist changes.
+    """
+    if text is None:
+        return None
+
+    digest = content_hash(text)
+    exists = conn.execute(
+        "SELECT 1 FROM answer_blobs WHERE hash = ?", (digest,)
+    ).fetchone()
+    if exists:
+        return digest
+
+    codec, data = compress_text(text)
+    conn.execute(
+        "INSERT OR IGNORE INTO answer_blobs (hash, codec, size, data) VALUES (?, ?, ?, ?)",
+        (digest, codec, len(text), data),
+    )
+    return digest
+
+
+def get_blob(conn: sqlite3.Connection, digest: str | None) -> str | None:
+    """
+    Load one blob by hash.
+
+    Args:
+        conn: Active SQLite database connection
+        digest: Content hash (None returns None)
+
+    Returns:
+        Decompressed text, or None if digest is None or not found
+    """
+    if digest is None:
+        return None
+    row = conn.execute(
+        "SELECT codec, data FROM answer_blobs WHERE hash = ?", (digest,)
+    ).fetchone()
+    if row is None:
+        logger.warning(f"Answer blob not found: {digest}")
+        return None
+    return decompress_text(row[0], row[1])
+
+
+def get_blobs(conn: sqlite3.Connection, digests: Iterable[str | None]) -> dict[str, str]:
+    """
+    Load many blobs by hash in batched queries.
+
+    Args:
+        conn: Active SQLite database connection
+        digests: Content hashes (None values and duplicates are ignored)
+
+    Returns:
+        Dict mapping hash to decompressed text (missing hashes are omitted)
+    """
+    unique = list({d for d in digests if d is not None})
+    texts: dict[str, str] = {}
+    for start in range(0, len(unique), LOOKUP_BATCH_SIZE):
+        batch = unique[start : start + LOOKUP_BATCH_SIZE]
+        placeholders = ",".join("?" * len(batch))
+        for digest, codec, data in conn.execute(
+            f"SELECT hash, codec, data FROM answer_blobs WHERE hash IN ({placeholders})",
+            batch,
+        ):
+            texts[digest] = decompress_text(codec, data)
+    return texts
+
+
+def delete_orphan_blobs(conn: sqlite3.Connection, limit: int | None = None) -> int:
+    """
+    Delete blobs no longer referenced by any answers_raw or answer_samples row.
+
+    Args:
+        conn: Active SQLite database connection
+        limit: Maximum number of blobs to delete (default: all). Callers that
+               must not hold the write lock for long delete in batches.
+
+    Returns:
+        Number of blobs deleted
+
+    Note:
+        Always call conn.commit() after to persist changes.
+    """
+    cursor = conn.execute(
+        """
+        DELETE FROM answer_blobs
+        WHERE hash IN (
+            SELECT hash FROM answer_blobs
+            WHERE hash NOT IN (
+                SELECT prompt_hash FROM answers_raw
+                UNION SELECT answer_hash FROM answers_raw
+                UNION SELECT web_search_results_hash FROM answers_raw
+                    WHERE web_search_results_hash IS NOT NULL
+                UNION SELECT answer_hash FROM answer_samples
+            )
+            LIMIT ?
+        )
+        """,
+        (-1 if limit is None else limit,),
+    )
+    if cursor.rowcount:
+        logger.info(f"Deleted {cursor.rowcount} orphaned answer blobs")
+    return cursor.rowcount
@@ -0,0 +1,325 @@
+"""
+Tuned SQLite connections with read/write separation.
+
+Storage call sites used to open a bare sqlite3.connect() per call, with
+SQLite's defaults: rollback journal (readers block the writer and vice
+versa), synchronous=FULL, a 2 MB page cache, no mmap and no busy timeout,
+so API readers and a running job's writes failed with "database is
+locked". Every call also paid for opening the file and parsing the schema.
+
+This module keeps one ConnectionPool per database file:
+
+- A single writer connection, shared by all threads and serialized by a
+  lock. SQLite allows one writer at a time anyway; queuing in-process is
+  cheaper than spinning on the busy handler.
+- A small pool of query-only reader connections for API queries, exports
+  and reports. In WAL mode readers see the last committed state and never
+  block the writer.
+
+Every connection gets the same pragmas (CONNECTION_PRAGMAS): WAL journal,
+synchronous=NORMAL (durable at checkpoints, safe against corruption in WAL
+mode), a larger page cache, memory-mapped I/O, a busy timeout for other
+processes (maintenance, a second CLI run) and foreign key enforcement.
+
+Both context managers keep the semantics of `with sqlite3.connect(path) as
+conn`: the block's transaction is committed on success and rolled back on
+an exception. Connections are never closed by callers.
+
+Maintenance is the one writer with its own connection (VACUUM and its
+explicit IMMEDIATE transactions need autocommit mode). It holds the pool's
+writer lock (ConnectionPool.hold_writer()) for each of its transactions, so
+the two queue in-process instead of failing with "database is locked".
+
+Example:
+    >>> with write_connection("./output/watcher.db") as conn:
+    ...     insert_run(conn, run_id, timestamp, total_intents, total_models)
+    >>> with read_connection("./output/watcher.db") as conn:
+    ...     runs = get_all_runs(conn)
+"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+# How long a connection waits for another process's lock (seconds)
+BUSY_TIMEOUT_SECONDS = 30.0
+
+# Applied to every connection, in order
+CONNECTION_PRAGMAS: tuple[tuple[str, str | int], ...] = (
+    ("synchronous", "NORMAL"),
+    ("cache_size", -16384),  # 16 MB (negative: KiB)
+    ("mmap_size", 256 * 1024 * 1024),
+    ("busy_timeout", int(BUSY_TIMEOUT_SECONDS * 1000)),
+    ("foreign_keys", "ON"),
+)
+
+# Idle reader connections kept per database
+DEFAULT_MAX_READERS = 4
+
+# Databases with open pools; the least recently used pool is closed beyond this
+MAX_POOLS = 16
+
+_MEMORY_DB = ":memory:"
+
+
+def apply_pragmas(conn: sqlite3.Connection, query_only: bool = False) -> None:
+    """
+    Apply CONNECTION_PRAGMAS to a connection.
+
+    Args:
+        conn: Open connection
+        query_only: Also reject writes on this connection
+    """
+    for name, value in CONNECTION_PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+    if query_only:
+        conn.execute("PRAGMA query_only = ON")
+
+
+def _open(db_path: str, query_only: bool = False) -> sqlite3.Connection:
+    is_new = db_path == _MEMORY_DB or not os.path.exists(db_path) or not os.path.getsize(db_path)
+    # Pooled connections move between threads (API threadpool, event loop)
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+    if is_new and not query_only:
+        # Only possible before the first write (switching to WAL is one)
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    if not query_only:
+        conn.execute("PRAGMA journal_mode = WAL")
+    apply_pragmas(conn, query_only=query_only)
+    return conn
+
+
+def _file_identity(db_path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Commit on success, roll back on error (like `with sqlite3.connect()`)."""
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+    finally:
+        # Callers may set a row factory; don't leak it to the next user
+        conn.row_factory = None
+
+
+# ============================================================================
+# POOL
+# ============================================================================
+
+
+class ConnectionPool:
+    """
+    Writer connection and reader pool for one database file.
+
+    Args:
+        db_path: Path to the SQLite database (created if missing)
+        max_readers: Idle reader connections to keep open
+    """
+
+    def __init__(self, db_path: str, max_readers: int = DEFAULT_MAX_READERS) -> None:
+        self.db_path = db_path
+        self.max_readers = max_readers
+        # Reentrant: a write block may call a helper that writes too
+        self._writer_lock = threading.RLock()
+        # Nesting depth of write() blocks, only touched by the lock's owner
+        self._writer_depth = 0
+        self._writer = _open(db_path)
+        self.identity = _file_identity(db_path)
+        self._readers_lock = threading.Lock()
+        self._idle_readers: list[sqlite3.Connection] = []
+        self._closed = False
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out the writer connection for one transaction.
+
+        A block nested in another write block of the same thread joins the
+        outer transaction: only the outermost block commits or rolls back.
+
+        Yields:
+            The writer connection; other writers wait until the block exits
+
+        Raises:
+            sqlite3.ProgrammingError: If the pool was closed
+        """
+        with self._writer_lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError(f"Connection pool closed: {self.db_path}")
+            self._writer_depth += 1
+            try:
+                if self._writer_depth > 1:
+                    yield self._writer
+                else:
+                    with _transaction(self._writer) as conn:
+                        yield conn
+            finally:
+                self._writer_depth -= 1
+
+    @contextmanager
+    def hold_writer(self) -> Iterator[None]:
+        """
+        Keep the writer connection from being checked out during a block.
+
+        For a transaction on another connection to the same file (the
+        autocommit connection of storage.maintenance).
+        """
+        with self._writer_lock:
+            yield
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a query-only reader connection.
+
+        Yields:
+            A reader connection (writes raise sqlite3.OperationalError)
+        """
+        with self._readers_lock:
+            conn = self._idle_readers.pop() if self._idle_readers else None
+        if conn is None:
+            conn = _open(self.db_path, query_only=True)
+        try:
+            with _transaction(conn):
+                yield conn
+        finally:
+            with self._readers_lock:
+                keep = not self._closed and len(self._idle_readers) < self.max_readers
+                if keep:
+                    self._idle_readers.append(conn)
+            if not keep:
+                conn.close()
+
+    def close(self) -> None:
+        """Close all connections; readers in use are closed when returned."""
+        with self._writer_lock:
+            self._closed = True
+            self._writer.close()
+        with self._readers_lock:
+            idle, self._idle_readers = self._idle_readers, []
+        for conn in idle:
+            conn.close()
+
+
+_pools: "OrderedDict[str, ConnectionPool]" = OrderedDict()
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str) -> ConnectionPool:
+    """
+    Return the process-wide pool for a database file.
+
+    A pool is replaced when its file was deleted, replaced or renamed (e.g.
+    a test or a user moving watcher.db), so it never serves a stale inode.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        ConnectionPool for the file
+    """
+    key = os.path.abspath(db_path)
+    identity = _file_identity(key)
+    evicted = []
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is not None and pool.identity != identity:
+            evicted.append(_pools.pop(key))
+            pool = None
+        if pool is None:
+            # A pool under another name for the same file: it was renamed.
+            # SQLite shares locks per inode, so close it before reopening.
+            # (Its un-checkpointed writes are lost: SQLite doesn't checkpoint
+            # a moved file. Call close_connection_pools() before moving one.)
+            for other in [k for k, p in _pools.items() if identity and p.identity == identity]:
+                evicted.append(_pools.pop(other))
+            for stale in evicted:
+                stale.close()
+            evicted = []
+            pool = ConnectionPool(key)
+            _pools[key] = pool
+            while len(_pools) > MAX_POOLS:
+                evicted.append(_pools.popitem(last=False)[1])
+        else:
+            _pools.move_to_end(key)
+    for stale in evicted:
+        stale.close()
+    return pool
+
+
+@contextmanager
+def write_connection(db_path: str) -> Iterator[sqlite3.Connection]:
+    """
+    Connection for a write transaction on db_path.
+
+    Replaces `with sqlite3.connect(db_path) as conn` for code that writes.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Yields:
+        Writer connection, committed on success and rolled back on error
+    """
+    if db_path == _MEMORY_DB:
+        conn = _open(db_path)
+        try:
+            with _transaction(conn):
+                yield conn
+        finally:
+            conn.close()
+        return
+    with get_connection_pool(db_path).write() as conn:
+        yield conn
+
+
+@contextmanager
+def read_connection(db_path: str) -> Iterator[sqlite3.Connection]:
+    """
+    Query-only connection for reads on db_path.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Yields:
+        Reader connection from the pool
+    """
+    if db_path == _MEMORY_DB:
+        with write_connection(db_path) as conn:
+            yield conn
+        return
+    with get_connection_pool(db_path).read() as conn:
+        yield conn
+
+
+def close_connection_pools() -> None:
+    """Close every pool (at shutdown, or in tests that delete databases)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+# Closing the last connection checkpoints the WAL into the database file
+atexit.register(close_connection_pools)
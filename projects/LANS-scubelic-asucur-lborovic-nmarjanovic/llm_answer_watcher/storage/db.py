@@ -7,6 +7,8 @@ All timestamps are stored in ISO 8601 format with 'Z' suffix (UTC).
 The database tracks:
 - runs: Each CLI execution with metadata and totals
 - answers_raw: Full LLM responses with usage and cost data
+- answer_blobs: Compressed, content-addressed answer/prompt texts
+- mention_rollups: Daily per-brand aggregates of expired mentions
 - mentions: Exploded brand mentions for analytics
 
 Schema versioning ensures safe upgrades as features evolve.
@@ -27,12 +29,19 @@ import logging
 import sqlite3
 from pathlib import Path
 
+from ..utils import serialization
+from ..utils.metrics import timed
 from ..utils.time import utc_timestamp
+from .blobs import get_blobs, put_blob
+from .connection import write_connection
 
 logger = logging.getLogger(__name__)
 
 # Current schema version - increment when migrations are added
-CURRENT_SCHEMA_VERSION = 10
+CURRENT_SCHEMA_VERSION = 17
+
+# Rows copied per batch when rewriting answers_raw in _migrate_to_v11
+MIGRATION_BATCH_SIZE = 1000
 
 
 def init_db_if_needed(db_path: str) -> None:
@@ -71,8 +80,10 @@ def init_db_if_needed(db_path: str) -> None:
     db_path_obj = Path(db_path)
     db_path_obj.parent.mkdir(parents=True, exist_ok=True)
 
-    # Connect to database (creates file if doesn't exist)
-    with sqlite3.connect(db_path) as conn:
+    # Connect to database (creates file if doesn't exist). New files get
+    # auto_vacuum = INCREMENTAL from storage.connection, so storage.maintenance
+    # can return freed pages to the filesystem in small steps.
+    with write_connection(db_path) as conn:
         # Enable foreign key constraints (disabled by default in SQLite)
         conn.execute("PRAGMA foreign_keys = ON")
 
@@ -204,9 +215,23 @@ def apply_migrations(
                 _migrate_to_v9(conn)
             elif target_version == 10:
                 _migrate_to_v10(conn)
+            elif target_version == 11:
+                _migrate_to_v11(conn)
+            elif target_version == 12:
+                _migrate_to_v12(conn)
+            elif target_version == 13:
+                _migrate_to_v13(conn)
+            elif target_version == 14:
+                _migrate_to_v14(conn)
+            elif target_version == 15:
+                _migrate_to_v15(conn)
+            elif target_version == 16:
+                _migrate_to_v16(conn)
+            elif target_version == 17:
+                _migrate_to_v17(conn)
             # Future migrations go here:
-            # elif target_version == 11:
-            #     _migrate_to_v10(conn)
+            # elif target_version == 18:
+            #     _migrate_to_v18(conn)
             else:
                 raise ValueError(f"No migration defined for version {target_version}")
 
@@ -904,11 +929,353 @@ def _migrate_to_v10(conn: sqlite3.Connection) -> None:
     logger.debug("Created user_settings table (schema v10)")
 
 
+def _migrate_to_v11(conn: sqlite3.Connection) -> None:
+    """
+    Migrate database schema to version 11.
+
+    Moves the large text columns of answers_raw into content-addressed,
+    compressed storage (see storage.blobs):
+    - Creates answer_blobs table keyed by SHA-256 of the text
+    - Rebuilds answers_raw with prompt_hash, answer_hash and
+      web_search_results_hash in place of prompt, answer_text and
+      web_search_results_json (all other columns and indexes unchanged)
+    - Copies existing rows in batches, storing each distinct text once
+
+    Args:
+        conn: Active SQLite database connection in transaction
+
+    Note:
+        SQLite cannot drop columns in place on older versions, so answers_raw
+        is rebuilt and renamed. Space freed by the old table is reused by new
+        pages; run VACUUM afterwards to shrink the file on disk.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS answer_blobs (
+            hash TEXT PRIMARY KEY,
+            codec TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            data BLOB NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+    conn.execute("""
+        CREATE TABLE answers_raw_v11 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL,
+            intent_id TEXT NOT NULL,
+            model_provider TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            timestamp_utc TEXT NOT NULL,
+            prompt_hash TEXT NOT NULL,
+            answer_hash TEXT NOT NULL,
+            answer_length INTEGER NOT NULL,
+            usage_meta_json TEXT,
+            estimated_cost_usd REAL,
+            web_search_count INTEGER DEFAULT 0,
+            web_search_results_hash TEXT,
+            runner_type TEXT DEFAULT 'api',
+            runner_name TEXT,
+            screenshot_path TEXT,
+            html_snapshot_path TEXT,
+            session_id TEXT,
+            FOREIGN KEY (run_id) REFERENCES runs(run_id),
+            UNIQUE(run_id, intent_id, model_provider, model_name)
+        )
+    """)
+
+    source = conn.execute("""
+        SELECT id, run_id, intent_id, model_provider, model_name, timestamp_utc,
+               prompt, answer_text, answer_length, usage_meta_json, estimated_cost_usd,
+               web_search_count, web_search_results_json, runner_type, runner_name,
+               screenshot_path, html_snapshot_path, session_id
+        FROM answers_raw
+        ORDER BY id
+    """)
+    copied = 0
+    while rows := source.fetchmany(MIGRATION_BATCH_SIZE):
+        conn.executemany(
+            """
+            INSERT INTO answers_raw_v11 VALUES
+            (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    *row[:6],
+                    put_blob(conn, row[6]),
+                    put_blob(conn, row[7]),
+                    *row[8:12],
+                    put_blob(conn, row[12]),
+                    *row[13:],
+                )
+                for row in rows
+            ],
+        )
+        copied += len(rows)
+
+    conn.execute("DROP TABLE answers_raw")
+    conn.execute("ALTER TABLE answers_raw_v11 RENAME TO answers_raw")
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_answers_timestamp ON answers_raw(timestamp_utc)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_answers_runner_type ON answers_raw(runner_type)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_answers_runner_name ON answers_raw(runner_name)"
+    )
+
+    blob_count = conn.execute("SELECT COUNT(*) FROM answer_blobs").fetchone()[0]
+    logger.debug(
+        f"Moved answers_raw text into answer_blobs (schema v11): "
+        f"{copied} rows, {blob_count} distinct blobs"
+    )
+
+
+def _migrate_to_v12(conn: sqlite3.Connection) -> None:
+    """
+    Migrate database schema to version 12.
+
+    Adds tables for retention and maintenance (see storage.maintenance):
+    - mention_rollups: Daily per-brand aggregates that replace individual
+      mentions once they expire
+    - maintenance_log: History of maintenance tasks, used to schedule them
+
+    Args:
+        conn: Active SQLite database connection in transaction
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS mention_rollups (
+            day TEXT NOT NULL,
+            intent_id TEXT NOT NULL,
+            model_provider TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            normalized_name TEXT NOT NULL,
+            brand_name TEXT NOT NULL,
+            is_mine INTEGER NOT NULL,
+            mention_count INTEGER NOT NULL,
+            run_count INTEGER NOT NULL,
+            rank_sum INTEGER NOT NULL DEFAULT 0,
+            ranked_count INTEGER NOT NULL DEFAULT 0,
+            best_rank INTEGER,
+            positive_count INTEGER NOT NULL DEFAULT 0,
+            neutral_count INTEGER NOT NULL DEFAULT 0,
+            negative_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, intent_id, model_provider, model_name, normalized_name)
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_mention_rollups_brand ON mention_rollups(normalized_name)"
+    )
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS maintenance_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            finished_at TEXT NOT NULL,
+            rows_affected INTEGER NOT NULL DEFAULT 0,
+            details_json TEXT
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_maintenance_log_task ON maintenance_log(task, finished_at)"
+    )
+
+    logger.debug("Created mention_rollups and maintenance_log tables (schema v12)")
+
+
+def _migrate_to_v13(conn: sqlite3.Connection) -> None:
+    """
+    Migrate database schema to version 13.
+
+    Adds incremental run support to answers_raw (see llm_runner.incremental):
+    - fingerprint: Hash of everything that determines the answer (prompt,
+      model, system prompt, tools, brands), used to find reusable answers
+    - carried_from_run_id: Run that originally produced an answer which was
+      carried forward into a later run (NULL for answers queried live)
+    - Index on (fingerprint, timestamp_utc) for the freshness lookup
+
+    Args:
+        conn: Active SQLite database connection in transaction
+    """
+    conn.execute("ALTER TABLE answers_raw ADD COLUMN fingerprint TEXT")
+    conn.execute("ALTER TABLE answers_raw ADD COLUMN carried_from_run_id TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_answers_fingerprint "
+        "ON answers_raw(fingerprint, timestamp_utc)"
+    )
+
+    logger.debug("Added fingerprint and carried_from_run_id to answers_raw (schema v13)")
+
+
+def _migrate_to_v14(conn: sqlite3.Connection) -> None:
+    """
+    Migrate database schema to version 14.
+
+    Adds tables for sequential sampling (see llm_runner.sampling):
+    - answer_samples: Every sample of a sampled (intent, model) query, with
+      the answer text in answer_blobs. Sample 0 is the run's primary answer.
+    - sample_groups: Per-query appearance rate and mean rank intervals
+
+    Args:
+        conn: Active SQLite database connection in transaction
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS answer_samples (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL,
+            intent_id TEXT NOT NULL,
+            model_provider TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            sample_index INTEGER NOT NULL,
+            timestamp_utc TEXT NOT NULL,
+            answer_hash TEXT NOT NULL,
+            answer_length INTEGER NOT NULL,
+            appeared_mine INTEGER NOT NULL,
+            my_rank INTEGER,
+            estimated_cost_usd REAL,
+            FOREIGN KEY (run_id) REFERENCES runs(run_id),
+            UNIQUE(run_id, intent_id, model_provider, model_name, sample_index)
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_answer_samples_timestamp "
+        "ON answer_samples(timestamp_utc)"
+    )
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sample_groups (
+            run_id TEXT NOT NULL,
+            intent_id TEXT NOT NULL,
+            model_provider TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            timestamp_utc TEXT NOT NULL,
+            sample_count INTEGER NOT NULL,
+            appeared_count INTEGER NOT NULL,
+            appearance_rate REAL NOT NULL,
+            appearance_ci_low REAL NOT NULL,
+            appearance_ci_high REAL NOT NULL,
+            ranked_count INTEGER NOT NULL,
+            mean_rank REAL,
+            rank_ci_low REAL,
+            rank_ci_high REAL,
+            confidence REAL NOT NULL,
+            stop_reason TEXT NOT NULL,
+            total_cost_usd REAL NOT NULL DEFAULT 0.0,
+            PRIMARY KEY (run_id, intent_id, model_provider, model_name),
+            FOREIGN KEY (run_id) REFERENCES runs(run_id)
+        )
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sample_groups_timestamp ON sample_groups(timestamp_utc)"
+    )
+
+    logger.debug("Created answer_samples and sample_groups tables (schema v14)")
+
+
+def _migrate_to_v15(conn: sqlite3.Connection) -> None:
+    """
+    Migrate database schema to version 15.
+
+    Adds response timing to answers_raw (see llm_runner.streaming):
+    - latency_ms: Wall-clock time of the LLM call, including retries
+    - time_to_first_token_ms: Time until the first streamed chunk arrived
+      (NULL for answers that were not streamed)
+    - truncated: 1 if a streamed answer was cut off at max_answer_chars
+
+    Args:
+        conn: Active SQLite database connection in transaction
+    """
+    conn.execute("ALTER TABLE answers_raw ADD COLUMN latency_ms REAL")
+    conn.execute("ALTER TABLE answers_raw ADD COLUMN time_to_first_token_ms REAL")
+    conn.execute("ALTER TABLE answers_raw ADD COLUMN truncated INTEGER DEFAULT 0")
+
+    logger.debug("Added latency and time-to-first-token columns to answers_raw (schema v15)")
+
+
+def _migrate_to_v16(conn: sqlite3.Connection) -> None:
+    """
+    Migrate database schema to version 16.
+
+    Creates extraction_memo, the persistent tier of the extraction memo
+    (see extractor.memo): ExtractionResult payloads keyed by answer text
+    hash and brand/extraction config fingerprint, so identical answers are
+    not parsed (or sent to the extraction model) again. Entries of an old
+    config fingerprint no longer match and are pruned by retention.
+
+    Args:
+        conn: Active SQLite database connection in transaction
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS extraction_memo (
+            answer_hash TEXT NOT NULL,
+            config_fingerprint TEXT NOT NULL,
+            result_json TEXT NOT NULL,
+            extraction_cost_usd REAL DEFAULT 0.0,
+            cached_at TEXT NOT NULL,
+            last_accessed_at TEXT NOT NULL,
+            PRIMARY KEY (answer_hash, config_fingerprint)
+        )
+    """)
+
+    # Index for last access time (retention of unused entries)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_extraction_memo_last_accessed
+        ON extraction_memo(last_accessed_at)
+    """)
+
+    logger.debug("Created extraction_memo table (schema v16)")
+
+
+# Tables with a run_id foreign key to runs (without ON DELETE CASCADE)
+RUN_CHILD_TABLES = (
+    "answer_samples",
+    "sample_groups",
+    "mentions",
+    "operations",
+    "intent_classifications",
+    "run_insights",
+    "answers_raw",
+)
+
+
+def _migrate_to_v17(conn: sqlite3.Connection) -> None:
+    """
+    Migrate database schema to version 17.
+
+    Connections enforce foreign keys (storage.connection), but the run_id
+    foreign keys of RUN_CHILD_TABLES were created without ON DELETE CASCADE,
+    so deleting a run with answers failed with "FOREIGN KEY constraint
+    failed" (clearing a user's history, or deleting a user, which cascades
+    to runs). Rebuilding those tables would rewrite every row; instead a
+    trigger deletes a run's child rows in the same statement, before the
+    run itself. Blobs left unreferenced are collected by maintenance.
+
+    Args:
+        conn: Active SQLite database connection in transaction
+    """
+    deletes = "\n".join(
+        f"            DELETE FROM {table} WHERE run_id = OLD.run_id;"
+        for table in RUN_CHILD_TABLES
+    )
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_runs_delete_children
+        BEFORE DELETE ON runs
+        BEGIN
+{deletes}
+        END
+    """)
+
+    logger.debug("Created trigger deleting run child rows (schema v17)")
+
+
 # ============================================================================
 # Database Operations (CRUD)
 # ============================================================================
 
 
+@timed()
 def insert_run(
     conn: sqlite3.Connection,
     run_id: str,
@@ -985,6 +1352,7 @@ def insert_run(
     )
 
 
+@timed()
 def insert_answer_raw(
     conn: sqlite3.Connection,
     run_id: str,
@@ -1003,12 +1371,19 @@ def insert_answer_raw(
     screenshot_path: str | None = None,
     html_snapshot_path: str | None = None,
     session_id: str | None = None,
+    fingerprint: str | None = None,
+    latency_ms: float | None = None,
+    time_to_first_token_ms: float | None = None,
+    truncated: bool = False,
 ) -> None:
     """
     Insert a raw LLM answer into the answers_raw table.
 
     Stores the complete LLM response with metadata for historical tracking.
-    The answer_length is computed automatically from answer_text.
+    The answer_length is computed automatically from answer_text. The prompt,
+    answer_text and web_search_results_json are stored compressed in
+    answer_blobs and referenced by content hash, so identical texts across
+    runs are stored once. Use get_answers_raw() to read them back.
 
     This function is idempotent - if an answer for the same (run_id, intent_id,
     model_provider, model_name) already exists, the insert is skipped (due to
@@ -1032,6 +1407,12 @@ def insert_answer_raw(
         screenshot_path: Optional path to screenshot file (browser runners only)
         html_snapshot_path: Optional path to HTML snapshot file (browser runners only)
         session_id: Optional browser session ID (browser runners only)
+        fingerprint: Optional query fingerprint for incremental runs
+            (see llm_runner.incremental.query_fingerprint)
+        latency_ms: Optional wall-clock time of the LLM call in milliseconds
+        time_to_first_token_ms: Optional time until the first streamed chunk
+            arrived (None if the answer was not streamed)
+        truncated: True if a streamed answer was cut off at max_answer_chars
 
     Raises:
         sqlite3.Error: If database operation fails
@@ -1098,6 +1479,11 @@ def insert_answer_raw(
 
     answer_length = len(answer_text)
 
+    # Texts are stored once in answer_blobs and referenced by content hash
+    prompt_hash = put_blob(conn, prompt)
+    answer_hash = put_blob(conn, answer_text)
+    web_search_results_hash = put_blob(conn, web_search_results_json)
+
     conn.execute(
         """
         INSERT OR IGNORE INTO answers_raw (
@@ -1106,19 +1492,23 @@ def insert_answer_raw(
             model_provider,
             model_name,
             timestamp_utc,
-            prompt,
-            answer_text,
+            prompt_hash,
+            answer_hash,
             answer_length,
             usage_meta_json,
             estimated_cost_usd,
             web_search_count,
-            web_search_results_json,
+            web_search_results_hash,
             runner_type,
             runner_name,
             screenshot_path,
             html_snapshot_path,
-            session_id
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            session_id,
+            fingerprint,
+            latency_ms,
+            time_to_first_token_ms,
+            truncated
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         (
             run_id,
@@ -1126,18 +1516,22 @@ def insert_answer_raw(
             model_provider,
             model_name,
             timestamp_utc,
-            prompt,
-            answer_text,
+            prompt_hash,
+            answer_hash,
             answer_length,
             usage_meta_json,
             estimated_cost_usd,
             web_search_count,
-            web_search_results_json,
+            web_search_results_hash,
             runner_type,
             runner_name,
             screenshot_path,
             html_snapshot_path,
             session_id,
+            fingerprint,
+            latency_ms,
+            time_to_first_token_ms,
+            int(truncated),
         ),
     )
 
@@ -1154,6 +1548,7 @@ def insert_answer_raw(
         )
 
 
+@timed()
 def insert_mention(
     conn: sqlite3.Connection,
     run_id: str,
@@ -1285,6 +1680,7 @@ def insert_mention(
     )
 
 
+@timed()
 def insert_intent_classification(
     conn: sqlite3.Connection,
     run_id: str,
@@ -1377,6 +1773,7 @@ def insert_intent_classification(
     )
 
 
+@timed()
 def lookup_intent_classification_cache(
     conn: sqlite3.Connection, query_hash: str
 ) -> dict | None:
@@ -1457,6 +1854,7 @@ def lookup_intent_classification_cache(
     }
 
 
+@timed()
 def store_intent_classification_cache(
     conn: sqlite3.Connection,
     query_hash: str,
@@ -1551,6 +1949,103 @@ def store_intent_classification_cache(
     )
 
 
+def lookup_extraction_memo(
+    conn: sqlite3.Connection, answer_hash: str, config_fingerprint: str
+) -> str | None:
+    """
+    Look up a memoized extraction result.
+
+    Read-only, so it works on reader connections; record hits with
+    touch_extraction_memo() so retention only prunes entries that are no
+    longer used.
+
+    Args:
+        conn: Active SQLite database connection
+        answer_hash: SHA256 hash of the answer text
+        config_fingerprint: Fingerprint of brands and extraction settings
+
+    Returns:
+        Serialized result (JSON) on a hit, None on a miss
+
+    Security:
+        Uses parameterized query to prevent SQL injection.
+    """
+    row = conn.execute(
+        """
+        SELECT result_json FROM extraction_memo
+        WHERE answer_hash = ? AND config_fingerprint = ?
+        """,
+        (answer_hash, config_fingerprint),
+    ).fetchone()
+    return row[0] if row is not None else None
+
+
+def touch_extraction_memo(
+    conn: sqlite3.Connection, keys: list[tuple[str, str]], timestamp_utc: str | None = None
+) -> None:
+    """
+    Update last_accessed_at of memo entries that were hit.
+
+    Args:
+        conn: Active SQLite database connection
+        keys: (answer_hash, config_fingerprint) of each entry
+        timestamp_utc: Access time (default: now)
+
+    Note:
+        Always call conn.commit() after update to persist changes.
+    """
+    timestamp = timestamp_utc or utc_timestamp()
+    conn.executemany(
+        """
+        UPDATE extraction_memo SET last_accessed_at = ?
+        WHERE answer_hash = ? AND config_fingerprint = ?
+        """,
+        [(timestamp, answer_hash, fingerprint) for answer_hash, fingerprint in keys],
+    )
+
+
+def store_extraction_memo(
+    conn: sqlite3.Connection,
+    answer_hash: str,
+    config_fingerprint: str,
+    result_json: str,
+    extraction_cost_usd: float = 0.0,
+) -> None:
+    """
+    Store an extraction result in the memo.
+
+    Idempotent: an existing entry for the same key is kept.
+
+    Args:
+        conn: Active SQLite database connection
+        answer_hash: SHA256 hash of the answer text
+        config_fingerprint: Fingerprint of brands and extraction settings
+        result_json: Serialized result
+        extraction_cost_usd: Cost of the extraction the entry saves on a hit
+
+    Security:
+        Uses parameterized query to prevent SQL injection.
+
+    Note:
+        Always call conn.commit() after insert to persist changes.
+    """
+    timestamp = utc_timestamp()
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO extraction_memo (
+            answer_hash,
+            config_fingerprint,
+            result_json,
+            extraction_cost_usd,
+            cached_at,
+            last_accessed_at
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (answer_hash, config_fingerprint, result_json, extraction_cost_usd, timestamp, timestamp),
+    )
+
+
+@timed()
 def insert_operation(
     conn: sqlite3.Connection,
     run_id: str,
@@ -1649,10 +2144,8 @@ def insert_operation(
     if not timestamp_utc or timestamp_utc.isspace():
         raise ValueError("timestamp_utc cannot be empty or whitespace")
 
-    import json
-
     # Convert depends_on list to JSON
-    depends_on_json = json.dumps(depends_on) if depends_on else None
+    depends_on_json = serialization.dumps(depends_on) if depends_on else None
 
     # Convert boolean to integer for SQLite
     skipped_int = 1 if skipped else 0
@@ -1709,6 +2202,7 @@ def insert_operation(
         )
 
 
+@timed()
 def update_run_cost(
     conn: sqlite3.Connection, run_id: str, total_cost_usd: float
 ) -> None:
@@ -1807,6 +2301,358 @@ def get_run_summary(conn: sqlite3.Connection, run_id: str) -> dict | None:
     }
 
 
+def get_answers_raw(
+    conn: sqlite3.Connection,
+    run_id: str,
+    intent_id: str | None = None,
+) -> list[dict]:
+    """
+    Retrieve raw answers for a run with their texts resolved.
+
+    Joins answers_raw rows with their prompt, answer and web search blobs,
+    decompressing each distinct blob once.
+
+    Args:
+        conn: Active SQLite database connection
+        run_id: Run identifier to retrieve
+        intent_id: Optional intent filter
+
+    Returns:
+        List of dicts with all answers_raw columns, where prompt, answer_text
+        and web_search_results_json hold the resolved texts in place of the
+        *_hash columns. Ordered by insertion (id).
+
+    Example:
+        >>> answers = get_answers_raw(conn, "2025-11-02T08-00-00Z")
+        >>> answers[0]["answer_text"]
+        'Here are top email warmup tools: ...'
+
+    Security:
+        Uses parameterized query to prevent SQL injection.
+    """
+    query = """
+        SELECT id, run_id, intent_id, model_provider, model_name, timestamp_utc,
+               prompt_hash, answer_hash, answer_length, usage_meta_json,
+               estimated_cost_usd, web_search_count, web_search_results_hash,
+               runner_type, runner_name, screenshot_path, html_snapshot_path, session_id
+        FROM answers_raw
+        WHERE run_id = ?
+    """
+    params: tuple = (run_id,)
+    if intent_id is not None:
+        query += " AND intent_id = ?"
+        params += (intent_id,)
+    query += " ORDER BY id"
+
+    columns = (
+        "id", "run_id", "intent_id", "model_provider", "model_name", "timestamp_utc",
+        "prompt_hash", "answer_hash", "answer_length", "usage_meta_json",
+        "estimated_cost_usd", "web_search_count", "web_search_results_hash",
+        "runner_type", "runner_name", "screenshot_path", "html_snapshot_path", "session_id",
+    )
+    rows = [dict(zip(columns, tuple(row), strict=True)) for row in conn.execute(query, params)]
+
+    texts = get_blobs(
+        conn,
+        (
+            digest
+            for row in rows
+            for digest in (row["prompt_hash"], row["answer_hash"], row["web_search_results_hash"])
+        ),
+    )
+    for row in rows:
+        row["prompt"] = texts.get(row.pop("prompt_hash"))
+        row["answer_text"] = texts.get(row.pop("answer_hash"))
+        web_hash = row.pop("web_search_results_hash")
+        row["web_search_results_json"] = texts.get(web_hash) if web_hash else None
+
+    return rows
+
+
+def find_fresh_answer(
+    conn: sqlite3.Connection,
+    fingerprint: str,
+    since_utc: str,
+    user_id: int | None = None,
+) -> dict | None:
+    """
+    Find the newest answer with a fingerprint that was generated since a cutoff.
+
+    Answers are matched within the same user's runs (user_id NULL for local
+    CLI runs). Carried-forward copies keep the original generation time, so
+    an answer never looks fresher than when the model actually produced it.
+
+    Args:
+        conn: Active SQLite database connection
+        fingerprint: Query fingerprint to match
+        since_utc: ISO 8601 cutoff; older answers are stale
+        user_id: Owner of the runs to search (None for local runs)
+
+    Returns:
+        Dict with id, run_id, intent_id, model_provider, model_name,
+        timestamp_utc and carried_from_run_id, or None if no fresh answer
+
+    Example:
+        >>> source = find_fresh_answer(conn, fingerprint, "2025-11-02T02:00:00Z")
+        >>> source["run_id"] if source else None
+        '2025-11-02T07-00-00Z'
+
+    Security:
+        Uses parameterized query to prevent SQL injection.
+    """
+    row = conn.execute(
+        """
+        SELECT a.id, a.run_id, a.intent_id, a.model_provider, a.model_name,
+               a.timestamp_utc, a.carried_from_run_id
+        FROM answers_raw a
+        JOIN runs r ON r.run_id = a.run_id
+        WHERE a.fingerprint = ? AND a.timestamp_utc >= ? AND r.user_id IS ?
+        ORDER BY a.timestamp_utc DESC, a.run_id DESC
+        LIMIT 1
+        """,
+        (fingerprint, since_utc, user_id),
+    ).fetchone()
+    if row is None:
+        return None
+
+    columns = (
+        "id", "run_id", "intent_id", "model_provider", "model_name",
+        "timestamp_utc", "carried_from_run_id",
+    )
+    return dict(zip(columns, row, strict=True))
+
+
+def carry_answer_forward(
+    conn: sqlite3.Connection,
+    source: dict,
+    run_id: str,
+    timestamp_utc: str,
+) -> int:
+    """
+    Copy an answer and its mentions from an earlier run into a new run.
+
+    The answers_raw row is copied as-is (same blob hashes, cost and original
+    timestamp) with carried_from_run_id set to the run that first produced
+    it. Mentions are copied with the new run's timestamp so daily rollups
+    count them for the new run. A sample_groups row, if any, is copied too.
+
+    Args:
+        conn: Active SQLite database connection
+        source: Answer row from find_fresh_answer()
+        run_id: Run receiving the carried answer
+        timestamp_utc: Timestamp of the receiving run
+
+    Returns:
+        Number of mentions copied
+
+    Security:
+        Uses parameterized query to prevent SQL injection.
+
+    Note:
+        Always call conn.commit() after to persist changes.
+        Uses INSERT OR IGNORE, so carrying the same answer twice is a no-op.
+    """
+    origin_run_id = source["carried_from_run_id"] or source["run_id"]
+
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO answers_raw (
+            run_id, intent_id, model_provider, model_name, timestamp_utc,
+            prompt_hash, answer_hash, answer_length, usage_meta_json,
+            estimated_cost_usd, web_search_count, web_search_results_hash,
+            runner_type, runner_name, screenshot_path, html_snapshot_path,
+            session_id, fingerprint, carried_from_run_id
+        )
+        SELECT ?, intent_id, model_provider, model_name, timestamp_utc,
+               prompt_hash, answer_hash, answer_length, usage_meta_json,
+               estimated_cost_usd, web_search_count, web_search_results_hash,
+               runner_type, runner_name, screenshot_path, html_snapshot_path,
+               session_id, fingerprint, ?
+        FROM answers_raw
+        WHERE id = ?
+        """,
+        (run_id, origin_run_id, source["id"]),
+    )
+
+    cursor = conn.execute(
+        """
+        INSERT OR IGNORE INTO mentions (
+            run_id, timestamp_utc, intent_id, model_provider, model_name,
+            brand_name, normalized_name, is_mine, first_position, rank_position,
+            match_type, sentiment, mention_context
+        )
+        SELECT ?, ?, intent_id, model_provider, model_name,
+               brand_name, normalized_name, is_mine, first_position, rank_position,
+               match_type, sentiment, mention_context
+        FROM mentions
+        WHERE run_id = ? AND intent_id = ? AND model_provider = ? AND model_name = ?
+        """,
+        (
+            run_id,
+            timestamp_utc,
+            source["run_id"],
+            source["intent_id"],
+            source["model_provider"],
+            source["model_name"],
+        ),
+    )
+
+    # Intervals from sequential sampling travel with the answer
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO sample_groups
+        SELECT ?, intent_id, model_provider, model_name, timestamp_utc, sample_count,
+               appeared_count, appearance_rate, appearance_ci_low, appearance_ci_high,
+               ranked_count, mean_rank, rank_ci_low, rank_ci_high, confidence,
+               stop_reason, total_cost_usd
+        FROM sample_groups
+        WHERE run_id = ? AND intent_id = ? AND model_provider = ? AND model_name = ?
+        """,
+        (
+            run_id,
+            source["run_id"],
+            source["intent_id"],
+            source["model_provider"],
+            source["model_name"],
+        ),
+    )
+
+    logger.debug(
+        f"Carried answer forward: intent={source['intent_id']}, "
+        f"model={source['model_provider']}/{source['model_name']}, "
+        f"from run {origin_run_id} ({cursor.rowcount} mentions)"
+    )
+    return cursor.rowcount
+
+
+def insert_sample_group(
+    conn: sqlite3.Connection,
+    run_id: str,
+    intent_id: str,
+    model_provider: str,
+    model_name: str,
+    timestamp_utc: str,
+    summary: dict,
+    samples: list[dict],
+) -> None:
+    """
+    Insert a sequential sampling group: its samples and its intervals.
+
+    Sample answer texts are stored in answer_blobs by content hash, so the
+    primary answer (sample 0) shares its blob with answers_raw.
+
+    Args:
+        conn: Active SQLite database connection
+        run_id: Run identifier (foreign key to runs.run_id)
+        intent_id: Intent query identifier
+        model_provider: LLM provider
+        model_name: Model identifier
+        timestamp_utc: Timestamp of the primary answer
+        summary: Interval summary from SampleGroup.summary()
+        samples: Sample dicts with index, timestamp_utc, answer_text,
+            appeared_mine, my_rank and cost_usd
+
+    Raises:
+        sqlite3.Error: If database operation fails
+
+    Security:
+        Uses parameterized query to prevent SQL injection.
+
+    Note:
+        Always call conn.commit() after insert to persist changes.
+        Uses INSERT OR IGNORE to make operation idempotent.
+    """
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO answer_samples (
+            run_id, intent_id, model_provider, model_name, sample_index, timestamp_utc,
+            answer_hash, answer_length, appeared_mine, my_rank, estimated_cost_usd
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                run_id,
+                intent_id,
+                model_provider,
+                model_name,
+                sample["index"],
+                sample["timestamp_utc"],
+                put_blob(conn, sample["answer_text"]),
+                len(sample["answer_text"]),
+                1 if sample["appeared_mine"] else 0,
+                sample["my_rank"],
+                sample["cost_usd"],
+            )
+            for sample in samples
+        ],
+    )
+
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO sample_groups (
+            run_id, intent_id, model_provider, model_name, timestamp_utc, sample_count,
+            appeared_count, appearance_rate, appearance_ci_low, appearance_ci_high,
+            ranked_count, mean_rank, rank_ci_low, rank_ci_high, confidence,
+            stop_reason, total_cost_usd
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            run_id,
+            intent_id,
+            model_provider,
+            model_name,
+            timestamp_utc,
+            summary["sample_count"],
+            summary["appeared_count"],
+            summary["appearance_rate"],
+            summary["appearance_ci_low"],
+            summary["appearance_ci_high"],
+            summary["ranked_count"],
+            summary["mean_rank"],
+            summary["rank_ci_low"],
+            summary["rank_ci_high"],
+            summary["confidence"],
+            summary["stop_reason"],
+            summary["total_cost_usd"],
+        ),
+    )
+    logger.debug(
+        f"Inserted sample group: intent={intent_id}, model={model_provider}/{model_name}, "
+        f"samples={summary['sample_count']}, stop={summary['stop_reason']}"
+    )
+
+
+def get_sample_groups(conn: sqlite3.Connection, run_id: str) -> list[dict]:
+    """
+    Retrieve the sampling intervals of a run.
+
+    Args:
+        conn: Active SQLite database connection
+        run_id: Run identifier
+
+    Returns:
+        List of sample_groups rows as dicts, ordered by intent and model
+
+    Example:
+        >>> groups = get_sample_groups(conn, "2025-11-02T08-00-00Z")
+        >>> groups[0]["appearance_ci_low"], groups[0]["appearance_ci_high"]
+        (0.61, 1.0)
+
+    Security:
+        Uses parameterized query to prevent SQL injection.
+    """
+    cursor = conn.execute(
+        """
+        SELECT * FROM sample_groups
+        WHERE run_id = ?
+        ORDER BY intent_id, model_provider, model_name
+        """,
+        (run_id,),
+    )
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row, strict=True)) for row in cursor.fetchall()]
+
+
 def insert_run_insight(
     conn: sqlite3.Connection,
     run_id: str,
@@ -2703,7 +3549,7 @@ def delete_all_runs_for_user(conn: sqlite3.Connection, user_id: int) -> int:
     if not run_ids:
         return 0
 
-    # Delete runs (cascading should handle the rest if PRAGMA foreign_keys = ON)
+    # Child rows are deleted by trg_runs_delete_children (schema v17)
     cursor = conn.execute("DELETE FROM runs WHERE user_id = ?", (user_id,))
     return cursor.rowcount
 
@@ -2753,10 +3599,9 @@ def get_user_settings(conn: sqlite3.Connection, user_id: int) -> dict | None:
     row = cursor.fetchone()
     if row is None:
         return None
-    
-    import json
+
     try:
-        return json.loads(row[0])
-    except json.JSONDecodeError:
+        return serialization.loads(row[0])
+    except ValueError:
         return {}
 
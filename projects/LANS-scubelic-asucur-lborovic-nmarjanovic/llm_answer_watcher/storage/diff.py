@@ -0,0 +1,246 @@
+"""
+Run-to-run diffs of brand visibility.
+
+Compares the mentions of two runs per (intent, model, brand) and reports
+which brands appeared, disappeared, or moved in rank. The comparison is a
+single set-based GROUP BY over both runs' mentions, served by the
+UNIQUE(run_id, intent_id, model_provider, model_name, normalized_name)
+index on mentions, so comparing runs with 100k mentions each stays a
+sub-second query. Results are streamed from the cursor in batches and
+never materialized as a whole.
+
+Only queries answered in both runs are compared. A query that failed (or
+was not configured) in one run would otherwise show every brand as
+appeared or disappeared; those queries are listed by unpaired_queries()
+instead.
+
+Example:
+    >>> with sqlite3.connect("./output/watcher.db") as conn:
+    ...     for delta in diff_runs(conn, "2025-11-01T08-00-00Z", "2025-11-02T08-00-00Z"):
+    ...         print(delta.intent_id, delta.brand_name, delta.change)
+    best-crm HubSpot rank_up
+
+Security:
+    Uses parameterized queries only.
+"""
+
+import sqlite3
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+
+CHANGE_APPEARED = "appeared"
+CHANGE_DISAPPEARED = "disappeared"
+CHANGE_RANK_UP = "rank_up"
+CHANGE_RANK_DOWN = "rank_down"
+CHANGE_UNCHANGED = "unchanged"
+
+CHANGES = (
+    CHANGE_APPEARED,
+    CHANGE_DISAPPEARED,
+    CHANGE_RANK_UP,
+    CHANGE_RANK_DOWN,
+    CHANGE_UNCHANGED,
+)
+
+# (intent, provider, model) answered in a run, from answers_raw or mentions
+# (answers_raw may already be pruned by retention while mentions are kept).
+# Wrapped in a subquery because compound operators chain left to right.
+_RUN_QUERIES_SQL = """
+    SELECT * FROM (
+        SELECT intent_id, model_provider, model_name FROM answers_raw WHERE run_id = :{run}
+        UNION
+        SELECT intent_id, model_provider, model_name FROM mentions WHERE run_id = :{run}
+    )
+"""
+
+_DIFF_SQL = f"""
+    WITH shared AS (
+        {_RUN_QUERIES_SQL.format(run="run_a")}
+        INTERSECT
+        {_RUN_QUERIES_SQL.format(run="run_b")}
+    )
+    SELECT
+        m.intent_id,
+        m.model_provider,
+        m.model_name,
+        m.normalized_name,
+        MAX(m.brand_name),
+        MAX(m.is_mine),
+        MAX(m.run_id = :run_a) AS in_a,
+        MAX(m.run_id = :run_b) AS in_b,
+        MAX(CASE WHEN m.run_id = :run_a THEN m.rank_position END) AS rank_a,
+        MAX(CASE WHEN m.run_id = :run_b THEN m.rank_position END) AS rank_b
+    FROM mentions m
+    JOIN shared s
+        ON s.intent_id = m.intent_id
+        AND s.model_provider = m.model_provider
+        AND s.model_name = m.model_name
+    WHERE m.run_id IN (:run_a, :run_b)
+    GROUP BY m.intent_id, m.model_provider, m.model_name, m.normalized_name
+    HAVING :include_unchanged OR in_a <> in_b OR rank_a IS NOT rank_b
+    ORDER BY m.intent_id, m.model_provider, m.model_name, m.normalized_name
+"""
+
+
+@dataclass
+class BrandDelta:
+    """
+    Change of one brand for one (intent, model) query between two runs.
+
+    Attributes:
+        intent_id: Intent identifier
+        model_provider: Model provider
+        model_name: Model identifier
+        normalized_name: Normalized brand name
+        brand_name: Brand name as mentioned
+        is_mine: True if the brand is one of my brands
+        rank_a: Rank in the first run (None if not ranked or not mentioned)
+        rank_b: Rank in the second run (None if not ranked or not mentioned)
+        change: One of CHANGES
+    """
+
+    intent_id: str
+    model_provider: str
+    model_name: str
+    normalized_name: str
+    brand_name: str
+    is_mine: bool
+    rank_a: int | None
+    rank_b: int | None
+    change: str
+
+    @property
+    def rank_delta(self) -> int | None:
+        """Positions gained (positive) or lost (negative), if ranked in both runs."""
+        if self.rank_a is None or self.rank_b is None:
+            return None
+        return self.rank_a - self.rank_b
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "rank_delta": self.rank_delta}
+
+
+def _classify(in_a: bool, in_b: bool, rank_a: int | None, rank_b: int | None) -> str:
+    """Classify a brand's change; becoming ranked counts as moving up."""
+    if not in_a:
+        return CHANGE_APPEARED
+    if not in_b:
+        return CHANGE_DISAPPEARED
+    if rank_a == rank_b:
+        return CHANGE_UNCHANGED
+    if rank_a is None or (rank_b is not None and rank_b < rank_a):
+        return CHANGE_RANK_UP
+    return CHANGE_RANK_DOWN
+
+
+def diff_runs(
+    conn: sqlite3.Connection,
+    run_a: str,
+    run_b: str,
+    include_unchanged: bool = False,
+    batch_size: int = 1000,
+) -> Iterator[BrandDelta]:
+    """
+    Stream brand visibility changes from run_a to run_b.
+
+    Args:
+        conn: Active SQLite database connection (kept open while iterating)
+        run_a: Earlier (baseline) run identifier
+        run_b: Later run identifier
+        include_unchanged: Also yield brands whose visibility did not change
+        batch_size: Rows fetched from the cursor at a time
+
+    Yields:
+        BrandDelta per changed brand, ordered by intent, provider, model and brand
+
+    Example:
+        >>> deltas = list(diff_runs(conn, run_a, run_b))
+        >>> [d.change for d in deltas if d.is_mine]
+        ['rank_down']
+    """
+    cursor = conn.execute(
+        _DIFF_SQL,
+        {"run_a": run_a, "run_b": run_b, "include_unchanged": int(include_unchanged)},
+    )
+    while rows := cursor.fetchmany(batch_size):
+        for intent_id, provider, model, normalized, brand, is_mine, in_a, in_b, ra, rb in rows:
+            yield BrandDelta(
+                intent_id=intent_id,
+                model_provider=provider,
+                model_name=model,
+                normalized_name=normalized,
+                brand_name=brand,
+                is_mine=bool(is_mine),
+                rank_a=ra,
+                rank_b=rb,
+                change=_classify(bool(in_a), bool(in_b), ra, rb),
+            )
+
+
+def unpaired_queries(conn: sqlite3.Connection, run_a: str, run_b: str) -> list[dict]:
+    """
+    List queries answered in only one of two runs (left out of diff_runs()).
+
+    Args:
+        conn: Active SQLite database connection
+        run_a: Earlier run identifier
+        run_b: Later run identifier
+
+    Returns:
+        List of dicts with intent_id, model_provider, model_name and run_id
+        (the run that has the answer)
+    """
+    rows = []
+    for only_in, other in ((run_a, run_b), (run_b, run_a)):
+        cursor = conn.execute(
+            f"""
+            {_RUN_QUERIES_SQL.format(run="only_in")}
+            EXCEPT
+            {_RUN_QUERIES_SQL.format(run="other")}
+            ORDER BY 1, 2, 3
+            """,
+            {"only_in": only_in, "other": other},
+        )
+        rows.extend(
+            {
+                "intent_id": intent_id,
+                "model_provider": provider,
+                "model_name": model,
+                "run_id": only_in,
+            }
+            for intent_id, provider, model in cursor
+        )
+    return rows
+
+
+class DiffCounter:
+    """
+    Count changes while passing deltas through, so streams can be summarized.
+
+    Example:
+        >>> counter = DiffCounter()
+        >>> for delta in counter.count(diff_runs(conn, run_a, run_b)):
+        ...     write(delta)
+        >>> counter.summary()["rank_up"]
+        12
+    """
+
+    def __init__(self) -> None:
+        self.changes: Counter[str] = Counter()
+        self.my_changes: Counter[str] = Counter()
+
+    def count(self, deltas: Iterable[BrandDelta]) -> Iterator[BrandDelta]:
+        for delta in deltas:
+            self.changes[delta.change] += 1
+            if delta.is_mine:
+                self.my_changes[delta.change] += 1
+            yield delta
+
+    def summary(self) -> dict:
+        """Counts per change, overall and for my brands."""
+        return {
+            **{change: self.changes[change] for change in CHANGES},
+            "total": sum(self.changes.values()),
+            "mine": {change: self.my_changes[change] for change in CHANGES},
+        }
@@ -7,7 +7,10 @@ in ISO 8601 format with 'Z' suffix (UTC).
 
 The database tracks:
 - eval_runs: Each evaluation execution with summary statistics
-- eval_results: Detailed metric results for each test case
+- eval_results: Detailed metric results for each test case, with the case's
+  extraction latency
+- eval_case_cache: Last stored result per test case with its fingerprint, so
+  unchanged cases are not evaluated again
 
 Schema versioning ensures safe upgrades as features evolve.
 
@@ -22,17 +25,22 @@ Security:
     - Connection context managers ensure proper cleanup
 """
 
+import json
 import logging
 import sqlite3
 from pathlib import Path
 from typing import Any
 
 from ..utils.time import utc_timestamp
+from .connection import write_connection
 
 logger = logging.getLogger(__name__)
 
 # Current schema version for eval database - increment when migrations are added
-EVAL_CURRENT_SCHEMA_VERSION = 1
+EVAL_CURRENT_SCHEMA_VERSION = 2
+
+# Bound parameters per lookup query (SQLite's limit is 999 on old builds)
+_LOOKUP_CHUNK_SIZE = 500
 
 
 def init_eval_db_if_needed(db_path: str) -> None:
@@ -69,7 +77,7 @@ def init_eval_db_if_needed(db_path: str) -> None:
     db_path_obj.parent.mkdir(parents=True, exist_ok=True)
 
     # Connect to database (creates file if doesn't exist)
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         # Enable foreign key constraints (disabled by default in SQLite)
         conn.execute("PRAGMA foreign_keys = ON")
 
@@ -183,9 +191,11 @@ def apply_eval_migrations(
 
             if target_version == 1:
                 _migrate_eval_to_v1(conn)
+            elif target_version == 2:
+                _migrate_eval_to_v2(conn)
             # Future migrations go here:
-            # elif target_version == 2:
-            #     _migrate_eval_to_v2(conn)
+            # elif target_version == 3:
+            #     _migrate_eval_to_v3(conn)
             else:
                 raise ValueError(
                     f"No eval migration defined for version {target_version}"
@@ -314,6 +324,47 @@ def _migrate_eval_to_v1(conn: sqlite3.Connection) -> None:
     logger.debug("Created eval schema v1 tables and indexes")
 
 
+def _migrate_eval_to_v2(conn: sqlite3.Connection) -> None:
+    """
+    Migrate eval database schema to version 2.
+
+    Adds per-case extraction latency and the case result cache:
+    - eval_results.extraction_latency_ms: Time spent in extraction for the
+      test case (same value on each of its metric rows, NULL for old runs)
+    - eval_case_cache: Last stored result per test case, keyed by description.
+      case_fingerprint covers the case content, its brands and the extractor
+      code; the runner reuses result_json while the fingerprint matches.
+
+    Args:
+        conn: Active SQLite database connection in transaction
+
+    Raises:
+        sqlite3.Error: If table alteration or creation fails
+
+    Note:
+        This migration is called automatically by apply_eval_migrations().
+        Do NOT call directly - use apply_eval_migrations() instead.
+
+        One row per test case keeps the cache bounded by the fixture set;
+        a changed case replaces its row.
+    """
+    conn.execute("""
+        ALTER TABLE eval_results ADD COLUMN extraction_latency_ms REAL
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS eval_case_cache (
+            test_description TEXT PRIMARY KEY,
+            case_fingerprint TEXT NOT NULL,
+            result_json TEXT NOT NULL,
+            eval_run_id TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+
+    logger.debug("Created eval schema v2 latency column and case cache")
+
+
 # ============================================================================
 # Eval Database Operations (CRUD)
 # ============================================================================
@@ -359,8 +410,6 @@ def insert_eval_run(
         Always call conn.commit() after insert to persist changes.
         summary_json is stored as JSON string for flexible schema evolution.
     """
-    import json
-
     timestamp = utc_timestamp()
     summary_json = json.dumps(summary, separators=(",", ":"))
 
@@ -444,8 +493,6 @@ def insert_eval_result(
         metric_details_json is stored as JSON string for flexible schema.
         overall_passed and metric_passed are stored as INTEGER (0/1).
     """
-    import json
-
     timestamp = utc_timestamp()
     overall_passed_int = 1 if overall_passed else 0
     metric_passed_int = 1 if metric_passed else 0
@@ -516,8 +563,10 @@ def store_eval_results(
         Uses parameterized queries to prevent SQL injection.
 
     Note:
-        This function handles both insert_eval_run and multiple insert_eval_result
-        calls in a single transaction for atomicity.
+        The run summary and all metric rows are written in a single
+        transaction; metric rows and case cache rows are bulk-inserted with
+        executemany(). Results with a case_fingerprint replace their test
+        case's row in eval_case_cache.
     """
     from ..utils.time import run_id_from_timestamp
 
@@ -531,26 +580,74 @@ def store_eval_results(
         # Insert eval run summary
         insert_eval_run(conn, run_id, eval_results["summary"])
 
-        # Insert detailed results for each test case
+        timestamp = utc_timestamp()
+        metric_rows = []
+        cache_rows = []
         for result in eval_results["results"]:
-            test_description = result.test_description
-            overall_passed = result.overall_passed
-
+            overall_passed_int = 1 if result.overall_passed else 0
+            latency_ms = getattr(result, "extraction_latency_ms", None)
             for metric in result.metrics:
-                insert_eval_result(
-                    conn,
-                    eval_run_id=run_id,
-                    test_description=test_description,
-                    overall_passed=overall_passed,
-                    metric_name=metric.name,
-                    metric_value=metric.value,
-                    metric_passed=metric.passed,
-                    metric_details=metric.details,
+                metric_rows.append(
+                    (
+                        run_id,
+                        result.test_description,
+                        overall_passed_int,
+                        metric.name,
+                        metric.value,
+                        1 if metric.passed else 0,
+                        json.dumps(metric.details, separators=(",", ":"))
+                        if metric.details
+                        else None,
+                        latency_ms,
+                        timestamp,
+                    )
+                )
+            fingerprint = getattr(result, "case_fingerprint", None)
+            if fingerprint:
+                cache_rows.append(
+                    (
+                        result.test_description,
+                        fingerprint,
+                        result.model_dump_json(exclude={"cached"}),
+                        run_id,
+                        timestamp,
+                    )
                 )
 
+        # One statement per table instead of one per metric
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO eval_results (
+                eval_run_id,
+                test_description,
+                overall_passed,
+                metric_name,
+                metric_value,
+                metric_passed,
+                metric_details_json,
+                extraction_latency_ms,
+                created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            metric_rows,
+        )
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO eval_case_cache (
+                test_description,
+                case_fingerprint,
+                result_json,
+                eval_run_id,
+                updated_at
+            ) VALUES (?, ?, ?, ?, ?)
+            """,
+            cache_rows,
+        )
+
         logger.info(
             f"Stored eval results for run {run_id}: "
-            f"{eval_results['total_passed']}/{eval_results['total_test_cases']} passed"
+            f"{eval_results['total_passed']}/{eval_results['total_test_cases']} passed "
+            f"({len(metric_rows)} metric rows, {len(cache_rows)} cached cases)"
         )
 
     except Exception as e:
@@ -579,8 +676,6 @@ def get_recent_eval_runs(
         >>> for run in recent:
         ...     print(f"{run['run_id']}: {run['pass_rate']:.1%} passed")
     """
-    import json
-
     cursor = conn.execute(
         """
         SELECT run_id, timestamp_utc, total_test_cases, total_passed, total_failed,
@@ -709,3 +804,39 @@ def get_failing_tests(
         )
 
     return failing
+
+
+def get_cached_eval_results(
+    conn: sqlite3.Connection, test_descriptions: list[str]
+) -> dict[str, tuple[str, str]]:
+    """
+    Get the last stored result for each test case.
+
+    Args:
+        conn: Active SQLite database connection
+        test_descriptions: Descriptions of the test cases to look up
+
+    Returns:
+        Dictionary mapping test description to (case_fingerprint, result_json)
+        for the cases that have a stored result
+
+    Example:
+        >>> cached = get_cached_eval_results(conn, ["HubSpot mention test"])
+        >>> fingerprint, result_json = cached["HubSpot mention test"]
+    """
+    cached = {}
+    for start in range(0, len(test_descriptions), _LOOKUP_CHUNK_SIZE):
+        chunk = test_descriptions[start : start + _LOOKUP_CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor = conn.execute(
+            f"""
+            SELECT test_description, case_fingerprint, result_json
+            FROM eval_case_cache
+            WHERE test_description IN ({placeholders})
+        """,
+            chunk,
+        )
+        for row in cursor.fetchall():
+            cached[row[0]] = (row[1], row[2])
+
+    return cached
@@ -2,11 +2,14 @@
 Data export utilities for LLM Answer Watcher.
 
 Exports data from SQLite database to various formats (CSV, JSON) for external analysis.
-Supports filtering by run_id, date range, and data type.
+Supports filtering by run_id, date range, and data type. Per-run JSON artifacts
+can also be exported from a run directory, whether stored as loose files or in
+a packed archive.
 
 Key features:
 - Export mentions (brand mentions with rankings)
 - Export runs (run summaries with costs)
+- Export run artifacts (raw/parsed/error/operation JSON) to JSON or JSONL
 - CSV format for spreadsheet analysis
 - JSON format for programmatic processing
 - Date range filtering
@@ -28,6 +31,9 @@ import logging
 import sqlite3
 from datetime import UTC, datetime, timedelta
 
+from .artifact_store import RunArtifacts
+from .connection import read_connection
+
 logger = logging.getLogger(__name__)
 
 
@@ -97,7 +103,7 @@ def export_mentions_csv(
     logger.info(f"Exporting mentions to CSV: {output_path}")
 
     try:
-        with sqlite3.connect(db_path) as conn:
+        with read_connection(db_path) as conn:
             conn.row_factory = sqlite3.Row  # Enable column access by name
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -205,7 +211,7 @@ def export_mentions_json(
     logger.info(f"Exporting mentions to JSON: {output_path}")
 
     try:
-        with sqlite3.connect(db_path) as conn:
+        with read_connection(db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -276,7 +282,7 @@ def export_runs_csv(output_path: str, db_path: str, days: int | None = None) ->
     logger.info(f"Exporting runs to CSV: {output_path}")
 
     try:
-        with sqlite3.connect(db_path) as conn:
+        with read_connection(db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -357,7 +363,7 @@ def export_runs_json(output_path: str, db_path: str, days: int | None = None) ->
     logger.info(f"Exporting runs to JSON: {output_path}")
 
     try:
-        with sqlite3.connect(db_path) as conn:
+        with read_connection(db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -382,3 +388,58 @@ def export_runs_json(output_path: str, db_path: str, days: int | None = None) ->
     except OSError as e:
         logger.error(f"File write error: {e}", exc_info=True)
         raise
+
+
+def export_run_artifacts(
+    output_path: str, run_dir: str, pattern: str = "intent_*.json"
+) -> int:
+    """
+    Export a run's JSON artifacts to a single JSON or JSONL file.
+
+    Works for both artifact backends: loose per-artifact files and the packed
+    archive (see storage.artifact_store). Output format is chosen by extension:
+    - .jsonl: one {"name": ..., "data": ...} object per line
+    - .json: object mapping artifact filename to its data
+
+    Args:
+        output_path: Path to output .json or .jsonl file
+        run_dir: Run directory containing the artifacts
+        pattern: Glob pattern for artifact filenames (default: all per-query artifacts)
+
+    Returns:
+        Number of artifacts exported
+
+    Raises:
+        ValueError: If output_path has an unsupported extension
+        OSError: If artifacts cannot be read or the output cannot be written
+
+    Example:
+        >>> count = export_run_artifacts(
+        ...     "./parsed.jsonl", "./output/2025-11-02T08-00-00Z", "*_parsed_*.json"
+        ... )
+    """
+    jsonl = output_path.lower().endswith(".jsonl")
+    if not jsonl and not output_path.lower().endswith(".json"):
+        raise ValueError("Output file must have .json or .jsonl extension")
+
+    logger.info(f"Exporting artifacts from {run_dir} to {output_path}")
+
+    count = 0
+    try:
+        with RunArtifacts(run_dir) as artifacts, open(output_path, "w", encoding="utf-8") as f:
+            if jsonl:
+                for name, data in artifacts.iter_json(pattern):
+                    f.write(json.dumps({"name": name, "data": data}, ensure_ascii=False))
+                    f.write("\n")
+                    count += 1
+            else:
+                exported = dict(artifacts.iter_json(pattern))
+                count = len(exported)
+                json.dump(exported, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+    except OSError as e:
+        logger.error(f"Artifact export error: {e}", exc_info=True)
+        raise
+
+    logger.info(f"Exported {count} artifacts to {output_path}")
+    return count
@@ -13,6 +13,7 @@ Output structure:
             intent_{id}_raw_{provider}_{model}.json
             intent_{id}_parsed_{provider}_{model}.json
             intent_{id}_error_{provider}_{model}.json
+            intent_{id}_samples_{provider}_{model}.json
             intent_{id}_operation_{operation_id}_{provider}_{model}.json
 
 Key features:
@@ -180,6 +181,29 @@ def get_error_filename(intent_id: str, provider: str, model: str) -> str:
     return f"intent_{intent_id}_error_{provider}_{safe_model}.json"
 
 
+def get_samples_filename(intent_id: str, provider: str, model: str) -> str:
+    """
+    Get filename for sample group JSON.
+
+    Written when sequential sampling is enabled: all samples taken for one
+    (intent, model) query with their appearance and rank intervals.
+
+    Args:
+        intent_id: Intent query identifier (e.g., "email-warmup")
+        provider: LLM provider name (e.g., "openai", "anthropic")
+        model: Model name (e.g., "gpt-4o-mini", "claude-3-5-sonnet")
+
+    Returns:
+        Filename string like "intent_{intent_id}_samples_{provider}_{model}.json"
+
+    Example:
+        >>> get_samples_filename("email-warmup", "openai", "gpt-4o-mini")
+        'intent_email-warmup_samples_openai_gpt-4o-mini.json'
+    """
+    safe_model = sanitize_for_filename(model)
+    return f"intent_{intent_id}_samples_{provider}_{safe_model}.json"
+
+
 def get_run_meta_filename() -> str:
     """
     Get filename for run metadata JSON.
@@ -257,3 +281,44 @@ def get_operation_result_filename(
     """
     safe_model = sanitize_for_filename(model)
     return f"intent_{intent_id}_operation_{operation_id}_{provider}_{safe_model}.json"
+
+
+def get_artifact_archive_filename(codec: str) -> str:
+    """
+    Get filename for the packed artifact archive.
+
+    The packed artifact backend stores every per-query JSON artifact (raw,
+    parsed, error, operation) as compressed JSONL records in one archive per
+    run instead of one file per artifact.
+
+    Args:
+        codec: Compression codec ("zstd" or "gzip")
+
+    Returns:
+        Filename string like "artifacts.jsonl.zst" or "artifacts.jsonl.gz"
+
+    Example:
+        >>> get_artifact_archive_filename("zstd")
+        'artifacts.jsonl.zst'
+        >>> get_artifact_archive_filename("gzip")
+        'artifacts.jsonl.gz'
+    """
+    extension = {"zstd": "zst", "gzip": "gz"}[codec]
+    return f"artifacts.jsonl.{extension}"
+
+
+def get_artifact_index_filename() -> str:
+    """
+    Get filename for the packed artifact offset index.
+
+    The index maps artifact filenames to byte ranges in the archive. It is
+    written last, during finalize, so its presence marks a complete archive.
+
+    Returns:
+        Constant filename "artifacts.index.json"
+
+    Example:
+        >>> get_artifact_index_filename()
+        'artifacts.index.json'
+    """
+    return "artifacts.index.json"
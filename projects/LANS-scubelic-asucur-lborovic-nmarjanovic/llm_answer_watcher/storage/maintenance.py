@@ -0,0 +1,671 @@
+"""
+Retention, downsampling and online compaction for the SQLite database.
+
+Data in watcher.db ages through three tiers configured by RetentionConfig
+(run_settings.retention):
+
+1. Raw answers: answers_raw, answer_samples and operations rows (and their
+   answer blobs) are deleted after raw_answers_days, as are extraction memo
+   entries not used for that long.
+2. Mentions: individual mentions are rolled up into daily per-brand
+   aggregates in mention_rollups after mentions_days, then deleted.
+3. Rollups: mention_rollups and sample_groups (per-query visibility
+   intervals from sequential sampling) are deleted after rollups_days.
+
+All deletes run in small batches, each in its own short write transaction,
+so a `run` writing to the same database is never locked out for long.
+Freed pages are returned to the filesystem with incremental vacuum, and
+query planner statistics are kept fresh with PRAGMA optimize / ANALYZE.
+
+Two entry points:
+- run_scheduled_maintenance(): called at the end of every run. Always runs
+  PRAGMA optimize; applies retention when configured and due.
+- compact_database(): backs `llm-answer-watcher db compact`. Switches the
+  database to WAL mode, applies retention, collects orphaned blobs,
+  vacuums and analyzes, reporting progress per batch.
+
+Example:
+    >>> from config.schema import RetentionConfig
+    >>> result = compact_database(
+    ...     "./output/watcher.db",
+    ...     RetentionConfig(raw_answers_days=30, mentions_days=180),
+    ...     progress=lambda stage, batch, total: print(stage, total),
+    ... )
+    >>> result.deleted["answers_raw"]
+    1250
+
+Security:
+    - All queries use parameterized statements
+    - Table names are internal constants, never user input
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Callable
+from contextlib import closing, contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from ..utils.time import parse_timestamp, utc_now, utc_timestamp
+from .blobs import delete_orphan_blobs
+from .connection import ConnectionPool, apply_pragmas, get_connection_pool
+from .db import init_db_if_needed
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+# Rows deleted per write transaction
+DEFAULT_BATCH_SIZE = 1000
+
+# Pages released per incremental_vacuum step (4 MB with 4 KB pages)
+DEFAULT_VACUUM_PAGES = 1000
+
+# How long maintenance waits for a running job's write lock
+BUSY_TIMEOUT_SECONDS = 30.0
+
+# Minimum days between full ANALYZE passes in scheduled maintenance
+ANALYZE_INTERVAL_DAYS = 7
+
+# PRAGMA auto_vacuum value for INCREMENTAL
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Called after every batch with (stage, rows in batch, rows so far in stage)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+@dataclass
+class MaintenanceResult:
+    """
+    Summary of a maintenance pass.
+
+    Attributes:
+        deleted: Rows deleted per table
+        rolled_up_days: Number of days of mentions rolled up into mention_rollups
+        vacuumed_pages: Pages returned to the filesystem
+        vacuum_mode: "incremental", "full" or "none"
+        analyzed: Whether ANALYZE was run
+        size_before_bytes: Database file size before the pass
+        size_after_bytes: Database file size after the pass
+    """
+
+    deleted: dict[str, int] = field(default_factory=dict)
+    rolled_up_days: int = 0
+    vacuumed_pages: int = 0
+    vacuum_mode: str = "none"
+    analyzed: bool = False
+    size_before_bytes: int | None = None
+    size_after_bytes: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the result as a JSON-serializable dict."""
+        return asdict(self)
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+
+class MaintenanceConnection(sqlite3.Connection):
+    """
+    Autocommit connection that shares the connection pool's writer lock.
+
+    Maintenance needs its own connection (VACUUM and explicit IMMEDIATE
+    transactions require autocommit mode), so it can't use
+    write_connection(). Each of its write transactions holds the writer lock
+    of the database's ConnectionPool instead: pooled writers of this process
+    (a run finishing, the API) wait for the batch rather than failing with
+    "database is locked". Other processes wait on the busy timeout.
+    """
+
+    pool: ConnectionPool | None = None
+
+
+def connect_for_maintenance(db_path: str) -> MaintenanceConnection:
+    """
+    Open a connection suitable for online maintenance.
+
+    Switches the database to WAL mode (persistent) so readers and a running
+    job's writes proceed while maintenance holds short write transactions,
+    and waits up to BUSY_TIMEOUT_SECONDS for locks instead of failing. Other
+    pragmas are the ones of storage.connection.
+
+    Args:
+        db_path: Path to SQLite database
+
+    Returns:
+        Open connection in autocommit mode (transactions are explicit)
+    """
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        isolation_level=None,
+        factory=MaintenanceConnection,
+    )
+    conn.pool = get_connection_pool(db_path)
+    with conn.pool.hold_writer():
+        conn.execute("PRAGMA journal_mode = WAL")
+    apply_pragmas(conn)
+    return conn
+
+
+def _hold_writer(conn: sqlite3.Connection):
+    """The pool's writer lock for a maintenance connection (no-op for others)."""
+    pool = getattr(conn, "pool", None)
+    return pool.hold_writer() if pool is not None else nullcontext()
+
+
+@contextmanager
+def _write_transaction(conn: sqlite3.Connection):
+    """Run a block in one short IMMEDIATE transaction."""
+    if conn.in_transaction:
+        conn.commit()
+    with _hold_writer(conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def _day_cutoff(now: datetime, days: int) -> str:
+    """
+    Return the start of the day `days` before now as a DB timestamp.
+
+    Cutoffs are aligned to midnight UTC so whole days expire together and
+    daily rollups are computed from complete days.
+    """
+    day = (now - timedelta(days=days)).date()
+    return f"{day.isoformat()}T00:00:00Z"
+
+
+def _delete_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    where: str,
+    params: tuple,
+    batch_size: int,
+    pause_seconds: float,
+    progress: ProgressCallback | None,
+) -> int:
+    """
+    Delete matching rows in batches of batch_size by rowid.
+
+    Matching rowids are collected with one read first, so each batch is an
+    indexed rowid delete instead of a repeated scan.
+    """
+    rowids = [row[0] for row in conn.execute(f"SELECT rowid FROM {table} WHERE {where}", params)]
+    deleted = 0
+    for start in range(0, len(rowids), batch_size):
+        batch = rowids[start : start + batch_size]
+        placeholders = ",".join("?" * len(batch))
+        with _write_transaction(conn):
+            conn.execute(f"DELETE FROM {table} WHERE rowid IN ({placeholders})", batch)
+        deleted += len(batch)
+        if progress:
+            progress(table, len(batch), deleted)
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return deleted
+
+
+def _log_task(
+    conn: sqlite3.Connection,
+    task: str,
+    started_at: str,
+    rows_affected: int,
+    details: dict | None = None,
+) -> None:
+    """Record a finished maintenance task in maintenance_log."""
+    with _write_transaction(conn):
+        conn.execute(
+            """
+            INSERT INTO maintenance_log (task, started_at, finished_at, rows_affected, details_json)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                task,
+                started_at,
+                utc_timestamp(),
+                rows_affected,
+                json.dumps(details) if details is not None else None,
+            ),
+        )
+
+
+def last_task_time(conn: sqlite3.Connection, task: str) -> datetime | None:
+    """
+    Return when a maintenance task last finished.
+
+    Args:
+        conn: Active SQLite database connection
+        task: Task name (e.g., "retention", "analyze", "compact")
+
+    Returns:
+        UTC datetime of the last run, or None if it never ran
+    """
+    row = conn.execute(
+        "SELECT MAX(finished_at) FROM maintenance_log WHERE task = ?", (task,)
+    ).fetchone()
+    return parse_timestamp(row[0]) if row and row[0] else None
+
+
+# ============================================================================
+# RETENTION
+# ============================================================================
+
+
+def rollup_mentions(
+    conn: sqlite3.Connection,
+    before: str,
+    pause_seconds: float = 0.0,
+    progress: ProgressCallback | None = None,
+) -> tuple[int, int]:
+    """
+    Roll up mentions older than a cutoff into mention_rollups and delete them.
+
+    Each day is aggregated and deleted in one transaction, so a mention is
+    never counted twice or lost if maintenance is interrupted.
+
+    Args:
+        conn: Active SQLite database connection
+        before: Cutoff timestamp (mentions with timestamp_utc < before)
+        pause_seconds: Sleep between days to let other writers in
+        progress: Optional per-batch progress callback
+
+    Returns:
+        Tuple of (days rolled up, mentions deleted)
+    """
+    days = [
+        row[0]
+        for row in conn.execute(
+            """
+            SELECT DISTINCT substr(timestamp_utc, 1, 10)
+            FROM mentions
+            WHERE timestamp_utc < ?
+            ORDER BY 1
+            """,
+            (before,),
+        )
+    ]
+
+    deleted = 0
+    for day in days:
+        day_start = f"{day}T00:00:00Z"
+        next_day = (datetime.fromisoformat(day) + timedelta(days=1)).date().isoformat()
+        day_end = min(f"{next_day}T00:00:00Z", before)
+
+        with _write_transaction(conn):
+            conn.execute(
+                """
+                INSERT INTO mention_rollups (
+                    day, intent_id, model_provider, model_name, normalized_name,
+                    brand_name, is_mine, mention_count, run_count, rank_sum,
+                    ranked_count, best_rank, positive_count, neutral_count, negative_count
+                )
+                SELECT
+                    ?, intent_id, model_provider, model_name, normalized_name,
+                    MAX(brand_name), MAX(is_mine), COUNT(*), COUNT(DISTINCT run_id),
+                    COALESCE(SUM(rank_position), 0), COUNT(rank_position), MIN(rank_position),
+                    SUM(CASE WHEN sentiment = 'positive' THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN sentiment = 'neutral' THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN sentiment = 'negative' THEN 1 ELSE 0 END)
+                FROM mentions
+                WHERE timestamp_utc >= ? AND timestamp_utc < ?
+                GROUP BY intent_id, model_provider, model_name, normalized_name
+                ON CONFLICT (day, intent_id, model_provider, model_name, normalized_name)
+                DO UPDATE SET
+                    mention_count = mention_count + excluded.mention_count,
+                    run_count = run_count + excluded.run_count,
+                    rank_sum = rank_sum + excluded.rank_sum,
+                    ranked_count = ranked_count + excluded.ranked_count,
+                    best_rank = MIN(
+                        COALESCE(best_rank, excluded.best_rank),
+                        COALESCE(excluded.best_rank, best_rank)
+                    ),
+                    positive_count = positive_count + excluded.positive_count,
+                    neutral_count = neutral_count + excluded.neutral_count,
+                    negative_count = negative_count + excluded.negative_count
+                """,
+                (day, day_start, day_end),
+            )
+            cursor = conn.execute(
+                "DELETE FROM mentions WHERE timestamp_utc >= ? AND timestamp_utc < ?",
+                (day_start, day_end),
+            )
+        deleted += cursor.rowcount
+        if progress:
+            progress("mentions", cursor.rowcount, deleted)
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return len(days), deleted
+
+
+def apply_retention(
+    conn: sqlite3.Connection,
+    retention,
+    now: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause_seconds: float = 0.0,
+    progress: ProgressCallback | None = None,
+) -> MaintenanceResult:
+    """
+    Apply retention tiers, deleting and rolling up expired data in batches.
+
+    Args:
+        conn: Active SQLite database connection
+        retention: RetentionConfig with raw_answers_days, mentions_days, rollups_days
+        now: Reference time (default: current UTC time)
+        batch_size: Rows deleted per transaction
+        pause_seconds: Sleep between batches to let other writers in
+        progress: Optional per-batch progress callback
+
+    Returns:
+        MaintenanceResult with deleted row counts and rolled up days
+
+    Example:
+        >>> result = apply_retention(conn, RetentionConfig(raw_answers_days=30))
+        >>> result.deleted
+        {'answers_raw': 120, 'operations': 40, 'answer_blobs': 95}
+    """
+    now = now or utc_now()
+    result = MaintenanceResult()
+
+    if retention.raw_answers_days is not None:
+        cutoff = _day_cutoff(now, retention.raw_answers_days)
+        for table in ("answers_raw", "answer_samples", "operations"):
+            result.deleted[table] = _delete_rows(
+                conn, table, "timestamp_utc < ?", (cutoff,), batch_size, pause_seconds, progress
+            )
+        result.deleted["answer_blobs"] = collect_orphan_blobs(
+            conn, batch_size, pause_seconds, progress
+        )
+        result.deleted["extraction_memo"] = _delete_rows(
+            conn,
+            "extraction_memo",
+            "last_accessed_at < ?",
+            (cutoff,),
+            batch_size,
+            pause_seconds,
+            progress,
+        )
+
+    if retention.mentions_days is not None:
+        cutoff = _day_cutoff(now, retention.mentions_days)
+        result.rolled_up_days, result.deleted["mentions"] = rollup_mentions(
+            conn, cutoff, pause_seconds, progress
+        )
+
+    if retention.rollups_days is not None:
+        cutoff_day = _day_cutoff(now, retention.rollups_days)[:10]
+        result.deleted["mention_rollups"] = _delete_rows(
+            conn, "mention_rollups", "day < ?", (cutoff_day,), batch_size, pause_seconds, progress
+        )
+        result.deleted["sample_groups"] = _delete_rows(
+            conn,
+            "sample_groups",
+            "timestamp_utc < ?",
+            (_day_cutoff(now, retention.rollups_days),),
+            batch_size,
+            pause_seconds,
+            progress,
+        )
+
+    total = sum(result.deleted.values())
+    if total:
+        logger.info(
+            f"Retention removed {total} rows ({result.deleted}), "
+            f"rolled up {result.rolled_up_days} days of mentions"
+        )
+    return result
+
+
+def collect_orphan_blobs(
+    conn: sqlite3.Connection,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause_seconds: float = 0.0,
+    progress: ProgressCallback | None = None,
+) -> int:
+    """
+    Delete answer blobs no longer referenced by answers_raw, in batches.
+
+    Args:
+        conn: Active SQLite database connection
+        batch_size: Blobs deleted per transaction
+        pause_seconds: Sleep between batches
+        progress: Optional per-batch progress callback
+
+    Returns:
+        Number of blobs deleted
+    """
+    deleted = 0
+    while True:
+        with _write_transaction(conn):
+            count = delete_orphan_blobs(conn, limit=batch_size)
+        if not count:
+            return deleted
+        deleted += count
+        if progress:
+            progress("answer_blobs", count, deleted)
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+
+# ============================================================================
+# VACUUM AND STATISTICS
+# ============================================================================
+
+
+def incremental_vacuum(
+    conn: sqlite3.Connection,
+    pages_per_step: int = DEFAULT_VACUUM_PAGES,
+    pause_seconds: float = 0.0,
+    progress: ProgressCallback | None = None,
+) -> int:
+    """
+    Return free pages to the filesystem in small steps.
+
+    Only works on databases with auto_vacuum = INCREMENTAL (all databases
+    created by init_db_if_needed; older ones need one full_vacuum()).
+
+    Args:
+        conn: Active SQLite database connection
+        pages_per_step: Pages released per transaction
+        pause_seconds: Sleep between steps
+        progress: Optional per-step progress callback
+
+    Returns:
+        Number of pages released (0 if incremental vacuum is not enabled)
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+        logger.info(
+            "Incremental vacuum is not enabled for this database; "
+            "run `llm-answer-watcher db compact --full-vacuum` once to enable it"
+        )
+        return 0
+
+    released = 0
+    while (free_pages := conn.execute("PRAGMA freelist_count").fetchone()[0]) > 0:
+        step = min(pages_per_step, free_pages)
+        with _write_transaction(conn):
+            # The pragma releases pages as it is stepped, so drain it
+            conn.execute(f"PRAGMA incremental_vacuum({int(step)})").fetchall()
+        remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if remaining >= free_pages:
+            break
+        released += free_pages - remaining
+        if progress:
+            progress("vacuum", free_pages - remaining, released)
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return released
+
+
+def full_vacuum(conn: sqlite3.Connection) -> None:
+    """
+    Rebuild the database file and enable incremental vacuum.
+
+    VACUUM blocks all writers for its duration, so it is only run on request
+    (`db compact --full-vacuum`). Needed once for databases created before
+    incremental vacuum was enabled.
+
+    Args:
+        conn: Active SQLite database connection (no open transaction)
+    """
+    if conn.in_transaction:
+        conn.commit()
+    with _hold_writer(conn):
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+
+
+def optimize(conn: sqlite3.Connection, analyze: bool = False) -> None:
+    """
+    Refresh query planner statistics.
+
+    Args:
+        conn: Active SQLite database connection
+        analyze: Run a full ANALYZE instead of the cheap PRAGMA optimize,
+                 which only re-analyzes tables whose statistics look stale
+    """
+    if conn.in_transaction:
+        conn.commit()
+    with _hold_writer(conn):
+        conn.execute("ANALYZE" if analyze else "PRAGMA optimize")
+
+
+# ============================================================================
+# ENTRY POINTS
+# ============================================================================
+
+
+def run_scheduled_maintenance(
+    db_path: str,
+    retention=None,
+    now: datetime | None = None,
+) -> MaintenanceResult | None:
+    """
+    Run cheap maintenance after a run, and retention when it is due.
+
+    Always runs PRAGMA optimize. When retention is configured, applies it
+    (plus orphan blob collection and incremental vacuum) at most once per
+    retention.maintenance_interval_hours, and a full ANALYZE at most once
+    per ANALYZE_INTERVAL_DAYS.
+
+    Args:
+        db_path: Path to SQLite database
+        retention: Optional RetentionConfig (run_settings.retention)
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        MaintenanceResult if retention ran, otherwise None
+    """
+    now = now or utc_now()
+
+    with closing(connect_for_maintenance(db_path)) as conn:
+        optimize(conn)
+        if retention is None:
+            return None
+
+        result = None
+        last_retention = last_task_time(conn, "retention")
+        interval = timedelta(hours=retention.maintenance_interval_hours)
+        if last_retention is None or now - last_retention >= interval:
+            started_at = utc_timestamp()
+            result = apply_retention(conn, retention, now=now)
+            result.vacuumed_pages = incremental_vacuum(conn)
+            result.vacuum_mode = "incremental"
+            _log_task(conn, "retention", started_at, sum(result.deleted.values()), result.to_dict())
+
+        last_analyze = last_task_time(conn, "analyze")
+        if last_analyze is None or now - last_analyze >= timedelta(days=ANALYZE_INTERVAL_DAYS):
+            started_at = utc_timestamp()
+            optimize(conn, analyze=True)
+            _log_task(conn, "analyze", started_at, 0)
+            if result is not None:
+                result.analyzed = True
+
+        return result
+
+
+def compact_database(
+    db_path: str,
+    retention=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause_seconds: float = 0.0,
+    full: bool = False,
+    progress: ProgressCallback | None = None,
+    now: datetime | None = None,
+) -> MaintenanceResult:
+    """
+    Apply retention and compact the database while it stays in use.
+
+    Steps: switch to WAL mode, apply retention (if given), collect orphaned
+    answer blobs, vacuum (incremental, or full when requested), ANALYZE and
+    checkpoint the WAL. Every step works in short batches except the
+    optional full VACUUM.
+
+    Args:
+        db_path: Path to SQLite database
+        retention: Optional RetentionConfig; None skips retention
+        batch_size: Rows deleted per transaction
+        pause_seconds: Sleep between batches to let running jobs write
+        full: Run a blocking full VACUUM (also enables incremental vacuum)
+        progress: Optional per-batch progress callback
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        MaintenanceResult describing what was done
+
+    Raises:
+        sqlite3.Error: If a database operation fails
+    """
+    init_db_if_needed(db_path)
+    started_at = utc_timestamp()
+
+    with closing(connect_for_maintenance(db_path)) as conn:
+        # Pages committed by pooled connections may still be in the WAL only
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+        size_before = Path(db_path).stat().st_size
+        if retention is not None:
+            result = apply_retention(conn, retention, now, batch_size, pause_seconds, progress)
+        else:
+            result = MaintenanceResult()
+        result.size_before_bytes = size_before
+
+        orphans = collect_orphan_blobs(conn, batch_size, pause_seconds, progress)
+        if orphans or "answer_blobs" in result.deleted:
+            result.deleted["answer_blobs"] = result.deleted.get("answer_blobs", 0) + orphans
+
+        if full:
+            full_vacuum(conn)
+            result.vacuum_mode = "full"
+        else:
+            result.vacuumed_pages = incremental_vacuum(
+                conn, pause_seconds=pause_seconds, progress=progress
+            )
+            result.vacuum_mode = "incremental"
+
+        optimize(conn, analyze=True)
+        result.analyzed = True
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+
+        result.size_after_bytes = Path(db_path).stat().st_size
+        _log_task(conn, "compact", started_at, sum(result.deleted.values()), result.to_dict())
+        _log_task(conn, "analyze", started_at, 0)
+
+    logger.info(
+        f"Compacted {db_path}: {size_before} -> {result.size_after_bytes} bytes "
+        f"({result.vacuum_mode} vacuum)"
+    )
+    return result
@@ -11,6 +11,8 @@ Key features:
 - Graceful error handling (permissions, disk full)
 - Directory creation with proper permissions
 - Uses naming conventions from storage.layout
+- Per-query artifacts go to a packed archive when one is open for the run
+  (see storage.artifact_store)
 
 Example:
     >>> run_dir = create_run_directory("./output", "2025-11-02T08-00-00Z")
@@ -23,12 +25,14 @@ Security:
     - Proper error handling (no data loss)
 """
 
-import json
 import logging
 import os
 from pathlib import Path
 
+from ..utils import serialization
+from ..utils.metrics import timed
 from ..utils.time import utc_timestamp
+from .artifact_store import get_packed_artifacts
 from .layout import (
     get_error_filename,
     get_operation_result_filename,
@@ -37,6 +41,7 @@ from .layout import (
     get_report_filename,
     get_run_directory,
     get_run_meta_filename,
+    get_samples_filename,
 )
 
 logger = logging.getLogger(__name__)
@@ -93,7 +98,7 @@ def create_run_directory(output_dir: str, run_id: str) -> str:
         ) from e
 
 
-def write_json(filepath: str, data: dict | list) -> None:
+def write_json(filepath: str, data: dict | list, pretty: bool | None = None) -> None:
     """
     Write data to JSON file with UTF-8 encoding.
 
@@ -103,6 +108,8 @@ def write_json(filepath: str, data: dict | list) -> None:
     Args:
         filepath: Full path to JSON file to write
         data: Dictionary or list to serialize
+        pretty: Indent by 2 spaces; None uses WATCHER_JSON_ARTIFACTS (pretty
+            unless set to "compact", see utils.serialization)
 
     Raises:
         OSError: If file cannot be written (permissions, disk full)
@@ -116,13 +123,16 @@ def write_json(filepath: str, data: dict | list) -> None:
         - Uses indent=2 for human-readable output
         - Uses ensure_ascii=False for proper Unicode handling
         - UTF-8 encoding for international characters
-        - Atomic write (data fully written or not at all)
+        - Data is encoded before the file is opened, so unserializable data
+          never leaves a partial file
     """
+    if pretty is None:
+        pretty = serialization.artifacts_pretty()
     try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        payload = serialization.dumps_bytes(data, pretty=pretty)
+        with open(filepath, "wb") as f:
             # Add newline at end of file for POSIX compliance
-            f.write("\n")
+            f.write(payload + b"\n")
         logger.debug(f"Wrote JSON file: {filepath}")
     except TypeError as e:
         logger.error(f"Cannot serialize data to JSON: {e}", exc_info=True)
@@ -137,6 +147,28 @@ def write_json(filepath: str, data: dict | list) -> None:
         ) from e
 
 
+def _write_artifact(run_dir: str, filename: str, data: dict | list) -> None:
+    """
+    Write a per-query artifact to the run's packed archive or as a JSON file.
+
+    Args:
+        run_dir: Run directory path
+        filename: Artifact filename from storage.layout
+        data: JSON-serializable artifact data
+
+    Raises:
+        OSError: If the file cannot be written
+        TypeError: If data is not JSON-serializable
+        RuntimeError: If the packed archive writer has failed
+    """
+    packed = get_packed_artifacts(run_dir)
+    if packed is not None:
+        packed.put(filename, data)
+    else:
+        write_json(os.path.join(run_dir, filename), data)
+
+
+@timed()
 def write_raw_answer(
     run_dir: str, intent_id: str, provider: str, model: str, data: dict
 ) -> None:
@@ -172,13 +204,13 @@ def write_raw_answer(
         Uses get_raw_answer_filename from layout module for consistent naming.
     """
     filename = get_raw_answer_filename(intent_id, provider, model)
-    filepath = os.path.join(run_dir, filename)
-    write_json(filepath, data)
+    _write_artifact(run_dir, filename, data)
     logger.info(
         f"Wrote raw answer: intent={intent_id}, provider={provider}, model={model}"
     )
 
 
+@timed()
 def write_parsed_answer(
     run_dir: str, intent_id: str, provider: str, model: str, data: dict
 ) -> None:
@@ -216,13 +248,13 @@ def write_parsed_answer(
         Uses get_parsed_answer_filename from layout module for consistent naming.
     """
     filename = get_parsed_answer_filename(intent_id, provider, model)
-    filepath = os.path.join(run_dir, filename)
-    write_json(filepath, data)
+    _write_artifact(run_dir, filename, data)
     logger.info(
         f"Wrote parsed answer: intent={intent_id}, provider={provider}, model={model}"
     )
 
 
+@timed()
 def write_error(
     run_dir: str, intent_id: str, provider: str, model: str, error_message: str
 ) -> None:
@@ -255,7 +287,6 @@ def write_error(
         - Error presence indicates partial run failure
     """
     filename = get_error_filename(intent_id, provider, model)
-    filepath = os.path.join(run_dir, filename)
 
     error_data = {
         "timestamp_utc": utc_timestamp(),
@@ -265,13 +296,14 @@ def write_error(
         "error_message": error_message,
     }
 
-    write_json(filepath, error_data)
+    _write_artifact(run_dir, filename, error_data)
     logger.warning(
         f"Wrote error file: intent={intent_id}, provider={provider}, "
         f"model={model}, error={error_message}"
     )
 
 
+@timed()
 def write_operation_result(
     run_dir: str,
     intent_id: str,
@@ -320,14 +352,43 @@ def write_operation_result(
         Uses get_operation_result_filename from layout module for consistent naming.
     """
     filename = get_operation_result_filename(intent_id, operation_id, provider, model)
-    filepath = os.path.join(run_dir, filename)
-    write_json(filepath, data)
+    _write_artifact(run_dir, filename, data)
     logger.info(
         f"Wrote operation result: intent={intent_id}, operation={operation_id}, "
         f"provider={provider}, model={model}"
     )
 
 
+def write_sample_group(
+    run_dir: str, intent_id: str, provider: str, model: str, data: dict
+) -> None:
+    """
+    Write sample group JSON to run directory.
+
+    Holds every sample taken for one (intent, model) query by sequential
+    sampling, with the appearance and rank intervals.
+
+    Args:
+        run_dir: Run directory path (from create_run_directory)
+        intent_id: Intent query identifier
+        provider: LLM provider name
+        model: Model identifier
+        data: Group summary with a "samples" list
+
+    Raises:
+        OSError: If file cannot be written
+
+    Note:
+        Uses get_samples_filename from layout module for consistent naming.
+    """
+    filename = get_samples_filename(intent_id, provider, model)
+    _write_artifact(run_dir, filename, data)
+    logger.info(
+        f"Wrote sample group: intent={intent_id}, provider={provider}, model={model}"
+    )
+
+
+@timed()
 def write_run_meta(run_dir: str, meta: dict) -> None:
     """
     Write run metadata JSON to run directory.
@@ -365,6 +426,7 @@ def write_run_meta(run_dir: str, meta: dict) -> None:
     logger.info(f"Wrote run metadata: {filepath}")
 
 
+@timed()
 def write_report_html(run_dir: str, html: str) -> None:
     """
     Write HTML report to run directory.
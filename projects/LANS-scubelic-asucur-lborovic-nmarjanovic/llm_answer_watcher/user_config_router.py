@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 
 from llm_answer_watcher.auth.dependencies import get_current_user, get_db_path
+from llm_answer_watcher.storage.connection import read_connection, write_connection
 from llm_answer_watcher.storage.db import (
     create_user_brand,
     create_user_intent,
@@ -64,7 +65,7 @@ async def list_brands(
     List all brands configured for the current user.
     """
     init_db_if_needed(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with read_connection(db_path) as conn:
         brands = get_user_brands(conn, current_user["id"])
     return brands
 
@@ -78,7 +79,7 @@ async def add_brand(
     Add a new brand (mine or competitor) for the current user.
     """
     init_db_if_needed(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         try:
             brand_id = create_user_brand(
                 conn, current_user["id"], brand.brand_name, brand.is_mine
@@ -106,7 +107,7 @@ async def remove_brand(
     Delete a brand.
     """
     init_db_if_needed(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         deleted = delete_user_brand(conn, brand_id, current_user["id"])
     
     if not deleted:
@@ -129,7 +130,7 @@ async def list_intents(
     List all intents configured for the current user.
     """
     init_db_if_needed(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with read_connection(db_path) as conn:
         intents = get_user_intents(conn, current_user["id"])
     return intents
 
@@ -143,7 +144,7 @@ async def add_intent(
     Add a new intent for the current user.
     """
     init_db_if_needed(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         try:
             intent_id = create_user_intent(
                 conn, current_user["id"], intent.intent_alias, intent.prompt
@@ -169,7 +170,7 @@ async def remove_intent(
     Delete an intent.
     """
     init_db_if_needed(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         deleted = delete_user_intent(conn, intent_id, current_user["id"])
     
     if not deleted:
@@ -203,7 +204,7 @@ async def get_settings(
 ):
     """Get user settings."""
     init_db_if_needed(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with read_connection(db_path) as conn:
         settings = get_user_settings(conn, current_user["id"])
     return settings or {}
 
@@ -216,7 +217,7 @@ async def update_settings(
     """Update user settings."""
     init_db_if_needed(db_path)
     import json
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         upsert_user_settings(conn, current_user["id"], json.dumps(settings_data.settings))
     return {"message": "Settings updated"}
 
@@ -227,7 +228,7 @@ async def clear_history(
 ):
     """Delete all search history (runs) for the current user."""
     init_db_if_needed(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with write_connection(db_path) as conn:
         count = delete_all_runs_for_user(conn, current_user["id"])
     return {"message": f"Deleted {count} runs"}
 
@@ -240,7 +241,7 @@ async def export_data(
     from datetime import datetime
     
     init_db_if_needed(db_path)
-    with sqlite3.connect(db_path) as conn:
+    with read_connection(db_path) as conn:
         brands = get_user_brands(conn, current_user["id"])
         intents = get_user_intents(conn, current_user["id"])
         keys = get_user_api_keys(conn, current_user["id"])
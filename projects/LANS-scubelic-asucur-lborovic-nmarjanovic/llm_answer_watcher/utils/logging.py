@@ -7,15 +7,29 @@ Provides standardized logging with:
 - Structured context fields
 - Secret redaction (never log API keys in full)
 - Component-based logger creation
+- Non-blocking output: records are queued and formatted/written on a
+  background thread (QueueHandler + QueueListener)
+- Rate limiting of high-frequency per-query logs
 
 All logs use Python's standard logging module with custom formatting.
 Log level defaults to INFO, use setup_logging(verbose=True) for DEBUG.
 
+Inside run_all() logs are emitted from the event loop, so the emitting side
+only merges the message and enqueues the record. Redaction, JSON
+serialization and the stderr write happen on the listener thread.
+
+Per-query logs opt into rate limiting with extra={"sample_key": "<key>"}.
+At most QUERY_LOG_RATE records per second are emitted per key; the number
+of records dropped in between is reported in the next emitted record's
+"suppressed" field. WARNING and above are never dropped, and verbose mode
+disables sampling.
+
 Examples:
     >>> from utils.logging import setup_logging, get_logger
     >>> setup_logging(verbose=True)
     >>> logger = get_logger("config.loader")
     >>> logger.info("Config loaded", extra={"context": {"intents": 5}})
+    >>> logger.info(f"Processing: intent={intent_id}", extra={"sample_key": "query.start"})
 
 Security:
     - NEVER log full API keys
@@ -23,13 +37,25 @@ Security:
     - Only stderr is used (stdout reserved for user output)
 """
 
+import atexit
 import json
 import logging
+import queue
 import re
 import sys
-from typing import Any
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, TextIO
+
+# Records per second emitted per sample_key (token bucket refill rate)
+QUERY_LOG_RATE = 10.0
 
-from llm_answer_watcher.utils.time import utc_timestamp
+# Records a sample_key may emit in a burst before rate limiting applies
+QUERY_LOG_BURST = 20
+
+# Listener started by setup_logging(), stopped on exit or reconfiguration
+_active_listener: QueueListener | None = None
 
 
 class JSONFormatter(logging.Formatter):
@@ -55,9 +81,10 @@ class JSONFormatter(logging.Formatter):
         Returns:
             JSON string representing the log entry
         """
-        # Build base log entry
+        # Build base log entry. The timestamp is the record's creation time,
+        # not the (later) time the listener thread formats it.
         log_entry = {
-            "timestamp": utc_timestamp(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(record.created)),
             "level": record.levelname,
             "component": record.name,
             "message": record.getMessage(),
@@ -71,9 +98,16 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "run_id"):
             log_entry["run_id"] = record.run_id
 
-        # Include exception info if present
+        # Records dropped by QueryLogSampler since the last emitted one
+        if getattr(record, "suppressed", 0):
+            log_entry["suppressed"] = record.suppressed
+
+        # Include exception info if present (queued records carry exc_text,
+        # rendered on the emitting thread while the traceback was alive)
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_entry["exception"] = record.exc_text
 
         return json.dumps(log_entry)
 
@@ -93,22 +127,34 @@ class SecretRedactingFilter(logging.Filter):
     "Bearer abc123xyz789" -> "Bearer ***xyz789"
     """
 
-    # Pattern to match specific API key formats
-    # OpenAI: sk-proj- (48 chars), sk- (20 chars for legacy keys, 51 for new keys)
-    # Anthropic: sk-ant-api03- (starts with sk-ant-api03-, typically 86+ chars total)
-    # Generic bearer tokens with proper word boundary
-    SECRET_PATTERNS = [
-        # OpenAI project keys: sk-proj-XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-        (re.compile(r"\bsk-proj-[a-zA-Z0-9_-]{48}\b"), "sk-proj-...{last4}"),
-        # OpenAI standard keys: sk-XXXXXXXXXXXXXXXXXXXXXXXX (51 chars for new keys) or sk-XXXXXXXXXXXXXXXXXXXX (20 chars for legacy)
-        (re.compile(r"\bsk-[a-zA-Z0-9_-]{20}\b"), "sk-...{last4}"),
-        (re.compile(r"\bsk-[a-zA-Z0-9_-]{51}\b"), "sk-...{last4}"),
-        # Anthropic Claude API keys: sk-ant-REDACTED
-        (re.compile(r"\bsk-ant-api03-[a-zA-Z0-9_-]{64,}\b"), "sk-ant-api03-...{last4}"),
-        # Generic bearer tokens (more conservative - require actual "Bearer " prefix)
-        # Match the whole thing but be more specific about the format
-        (re.compile(r"Bearer\s+[a-zA-Z0-9_-]{20,}"), "Bearer ***{last4}"),
-    ]
+    # API key formats, combined into one pattern so text is scanned once.
+    # Each alternative is a group; the group that matched selects the prefix
+    # kept in front of the last 4 characters.
+    # - Anthropic Claude API keys: sk-ant-api03-XXXX... (64+ chars)
+    # - OpenAI project keys: sk-proj-XXXX... (48 chars)
+    # - OpenAI standard keys: sk-XXXX... (51 chars for new keys, 20 for legacy)
+    # - Generic bearer tokens (conservative - require actual "Bearer " prefix)
+    # More specific formats come first so they win over the generic sk- ones.
+    SECRET_PATTERN = re.compile(
+        r"(\bsk-ant-api03-[a-zA-Z0-9_-]{64,}\b)"
+        r"|(\bsk-proj-[a-zA-Z0-9_-]{48}\b)"
+        r"|(\bsk-[a-zA-Z0-9_-]{51}\b)"
+        r"|(\bsk-[a-zA-Z0-9_-]{20}\b)"
+        r"|(Bearer\s+[a-zA-Z0-9_-]{20,})"
+    )
+
+    # Redacted prefix per SECRET_PATTERN group (1-based group index)
+    REDACTED_PREFIXES = {
+        1: "sk-ant-api03-...",
+        2: "sk-proj-...",
+        3: "sk-...",
+        4: "sk-...",
+        5: "Bearer ***",
+    }
+
+    # Every secret format contains one of these; text without them is
+    # returned without running the regex (the common case)
+    SECRET_MARKERS = ("sk-", "Bearer")
 
     def filter(self, record: logging.LogRecord) -> bool:
         """
@@ -123,16 +169,13 @@ class SecretRedactingFilter(logging.Filter):
         # Redact message
         record.msg = self._redact_secrets(str(record.msg))
 
-        # Redact args if present
+        # Redact args if present. Args without secrets keep their original
+        # type so format specifiers like %d still work.
         if record.args:
             if isinstance(record.args, dict):
-                record.args = {
-                    k: self._redact_secrets(str(v)) for k, v in record.args.items()
-                }
+                record.args = {k: self._redact_arg(v) for k, v in record.args.items()}
             elif isinstance(record.args, tuple):
-                record.args = tuple(
-                    self._redact_secrets(str(arg)) for arg in record.args
-                )
+                record.args = tuple(self._redact_arg(arg) for arg in record.args)
 
         # Redact context if present
         if hasattr(record, "context") and isinstance(record.context, dict):
@@ -140,6 +183,12 @@ class SecretRedactingFilter(logging.Filter):
 
         return True
 
+    def _redact_arg(self, arg: Any) -> Any:
+        """Return arg unchanged, or its redacted string if it contains a secret."""
+        text = str(arg)
+        redacted = self._redact_secrets(text)
+        return arg if redacted == text else redacted
+
     def _redact_secrets(self, text: str) -> str:
         """
         Redact secrets in text, keeping only last 4 characters.
@@ -148,25 +197,15 @@ class SecretRedactingFilter(logging.Filter):
             text: Input string potentially containing secrets
 
         Returns:
-            String with secrets replaced by redacted versions
+            String with secrets replaced by redacted versions (the input
+            object itself if it cannot contain a secret)
         """
-        for pattern, template in self.SECRET_PATTERNS:
+        if not any(marker in text for marker in self.SECRET_MARKERS):
+            return text
+        return self.SECRET_PATTERN.sub(self._redact_match, text)
 
-            def redact_match(match: re.Match) -> str:
-                matched = match.group(0)
-
-                # Special handling for Bearer tokens
-                if matched.startswith("Bearer "):
-                    token_part = matched[7:]  # Skip "Bearer "
-                    last4 = token_part[-4:]
-                    return f"Bearer ***{last4}"
-                # Standard handling for other patterns
-                last4 = matched[-4:]
-                return template.format(last4=last4)
-
-            text = pattern.sub(redact_match, text)
-
-        return text
+    def _redact_match(self, match: re.Match) -> str:
+        return f"{self.REDACTED_PREFIXES[match.lastindex]}{match.group(0)[-4:]}"
 
     def _redact_dict(self, data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -193,6 +232,138 @@ class SecretRedactingFilter(logging.Filter):
         return result
 
 
+class QueryLogSampler(logging.Filter):
+    """
+    Rate-limits records tagged with extra={"sample_key": ...}.
+
+    Each key has a token bucket refilled at `rate` records per second with
+    capacity `burst`. A record arriving at an empty bucket is dropped and
+    counted; the count is attached to the key's next emitted record as
+    `suppressed`. Untagged records and WARNING or above always pass.
+
+    Attributes:
+        rate: Records per second allowed per key
+        burst: Records a key may emit at once before limiting applies
+    """
+
+    def __init__(self, rate: float = QUERY_LOG_RATE, burst: int = QUERY_LOG_BURST):
+        super().__init__()
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got: {rate}")
+        self.rate = rate
+        self.burst = burst
+        # key -> [tokens, last refill time, records dropped since last emit]
+        self._buckets: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Decide whether a record is emitted.
+
+        Args:
+            record: LogRecord to check
+
+        Returns:
+            False if the record's key is over its rate, True otherwise
+        """
+        key = getattr(record, "sample_key", None)
+        if key is None or record.levelno >= logging.WARNING:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1.0
+            record.suppressed, bucket[2] = bucket[2], 0
+        return True
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps records structured for JSONFormatter.
+
+    The stock prepare() formats the record with a plain Formatter, folding
+    the traceback into the message. Here only the message is merged (args
+    may be mutated after the call returns) and the traceback is rendered
+    to exc_text; formatting to JSON is left to the listener thread.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Shallow copy (other handlers still see the original record);
+        # cheaper than copy.copy() on this per-record path
+        prepared = object.__new__(type(record))
+        prepared.__dict__.update(record.__dict__)
+        record = prepared
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        if isinstance(getattr(record, "context", None), dict):
+            record.context = dict(record.context)
+        return record
+
+
+def create_log_handler(
+    stream: TextIO,
+    level: int = logging.INFO,
+    queued: bool = True,
+    sample: bool = True,
+) -> tuple[logging.Handler, QueueListener | None]:
+    """
+    Build the handler chain used by setup_logging().
+
+    Args:
+        stream: Output stream for JSON log lines
+        level: Minimum level written
+        queued: Format and write on a background thread (QueueListener)
+        sample: Rate-limit records tagged with sample_key
+
+    Returns:
+        Tuple of (handler to attach to a logger, started listener or None).
+        Call listener.stop() to flush queued records.
+    """
+    output = logging.StreamHandler(stream)
+    output.setLevel(level)
+    output.setFormatter(JSONFormatter())
+    output.addFilter(SecretRedactingFilter())
+
+    if not queued:
+        if sample:
+            output.addFilter(QueryLogSampler())
+        return output, None
+
+    handler = _RecordQueueHandler(queue.SimpleQueue())
+    handler.setLevel(level)
+    if sample:
+        handler.addFilter(QueryLogSampler())
+    listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    listener.start()
+    return handler, listener
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the background log listener, writing every queued record.
+
+    Registered with atexit by setup_logging(); safe to call more than once.
+    """
+    global _active_listener
+    listener, _active_listener = _active_listener, None
+    if listener is not None:
+        listener.stop()
+
+
 def setup_logging(verbose: bool = False, quiet_logs: bool = False) -> None:
     """
     Configure structured JSON logging for the application.
@@ -201,6 +372,8 @@ def setup_logging(verbose: bool = False, quiet_logs: bool = False) -> None:
     - JSON formatter for structured output
     - Secret redaction filter
     - stderr output (stdout reserved for user-facing content)
+    - Queue-based delivery: formatting and writing run on a background thread
+    - Rate limiting of sample_key-tagged per-query logs (off when verbose)
     - Log level: DEBUG if verbose=True, INFO otherwise
     - Completely suppress logs if quiet_logs=True (unless verbose=True)
 
@@ -225,7 +398,9 @@ def setup_logging(verbose: bool = False, quiet_logs: bool = False) -> None:
     # Get root logger
     root_logger = logging.getLogger()
 
-    # Remove any existing handlers (prevents duplicate logs)
+    # Remove any existing handlers (prevents duplicate logs) after flushing
+    # records still queued for the previous configuration
+    shutdown_logging()
     root_logger.handlers.clear()
 
     # If quiet_logs is True and verbose is False, suppress all logging
@@ -235,21 +410,16 @@ def setup_logging(verbose: bool = False, quiet_logs: bool = False) -> None:
         return
 
     # Set level based on verbose flag
-    root_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
-
-    # Create stderr handler
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG if verbose else logging.INFO)
+    level = logging.DEBUG if verbose else logging.INFO
+    root_logger.setLevel(level)
 
-    # Add JSON formatter
-    formatter = JSONFormatter()
-    handler.setFormatter(formatter)
+    global _active_listener
+    handler, _active_listener = create_log_handler(sys.stderr, level=level, sample=not verbose)
+    root_logger.addHandler(handler)
 
-    # Add secret redacting filter
-    handler.addFilter(SecretRedactingFilter())
 
-    # Add handler to root logger
-    root_logger.addHandler(handler)
+# Flush queued records before the interpreter exits
+atexit.register(shutdown_logging)
 
 
 def get_logger(component: str) -> logging.Logger:
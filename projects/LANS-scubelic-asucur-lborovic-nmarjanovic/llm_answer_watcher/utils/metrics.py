@@ -0,0 +1,429 @@
+"""
+Lightweight in-process metrics for LLM Answer Watcher.
+
+Provides span-style stage timing, counters and gauges without external
+dependencies. Every measurement is recorded in two places:
+
+- The process-wide REGISTRY, exposed in Prometheus text format at the API's
+  /metrics endpoint (long-lived server processes)
+- The registry of the run currently being collected (if any), whose
+  snapshot is written to run_meta.json under "metrics"
+
+Labels:
+    Spans bind their labels (e.g. provider, model) to the current context, so
+    nested spans and timed functions (writer/DB calls) inherit them. Context
+    is per asyncio task, so concurrent queries never mix labels.
+
+Metric names:
+    stage_duration_seconds   Histogram of stage durations (label: stage)
+    time_to_first_token_seconds  Histogram of time until the first streamed chunk
+    llm_retries_total        Counter of retried LLM requests
+    rate_limited_total       Counter of 429 responses from providers
+    hedged_requests_total    Counter of hedged LLM requests (label: outcome)
+    coalesced_requests_total Counter of LLM requests answered by an identical in-flight request
+    coalesced_cost_saved_usd Counter of upstream cost saved by coalescing
+    budget_refusals_total    Counter of work not started because of the budget (label: stage)
+    budget_cancellations_total  Counter of in-flight work cancelled by the budget (label: stage)
+    cache_hits_total         Counter of cache hits (label: cache)
+    cache_misses_total       Counter of cache misses (label: cache)
+    queries_total            Counter of completed queries (label: status)
+    in_flight_queries        Gauge of queries holding a concurrency slot
+    semaphore_queue_depth    Gauge of queries waiting for a concurrency slot
+
+Example:
+    >>> from llm_answer_watcher.utils import metrics
+    >>> registry, token = metrics.start_run_collection()
+    >>> with metrics.span("llm_request", provider="google", model="gemini-2.5-flash"):
+    ...     response = await client.generate_answer(prompt)
+    >>> metrics.stop_run_collection(token)
+    >>> registry.snapshot()["histograms"][0]["p95"]
+    0.412
+"""
+
+import functools
+import inspect
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+# Histogram of stage durations, labelled by stage (+ provider/model when known)
+STAGE_DURATION = "stage_duration_seconds"
+
+# Prefix applied to every metric name in the Prometheus exposition
+PROMETHEUS_PREFIX = "llm_answer_watcher_"
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Most recent samples kept per histogram for percentile estimation.
+# count/sum/max stay exact; percentiles describe the recent window in
+# long-lived processes and are exact for any run below this size.
+MAX_SAMPLES_PER_HISTOGRAM = 10_000
+
+# Quantiles reported for every histogram
+QUANTILES = (0.5, 0.95, 0.99)
+
+# HELP text for known metrics in the Prometheus exposition
+METRIC_HELP = {
+    STAGE_DURATION: "Duration of pipeline stages in seconds",
+    "time_to_first_token_seconds": "Time until the first chunk of a streamed answer",
+    "llm_retries_total": "LLM requests retried after a transient failure",
+    "rate_limited_total": "HTTP 429 responses received from LLM providers",
+    "hedged_requests_total": "Slow LLM requests duplicated to a hedge, by outcome",
+    "coalesced_requests_total": "LLM requests that shared an identical in-flight request",
+    "coalesced_cost_saved_usd": "Upstream LLM cost saved by coalescing identical requests",
+    "budget_refusals_total": "Queries, samples and operations not started because of the budget",
+    "budget_cancellations_total": "In-flight samples and operations cancelled by the budget",
+    "cache_hits_total": "Cache lookups served from cache",
+    "cache_misses_total": "Cache lookups that missed",
+    "queries_total": "Completed intent x model queries",
+    "in_flight_queries": "Queries currently holding a concurrency slot",
+    "semaphore_queue_depth": "Queries waiting for a concurrency slot",
+}
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class _Histogram:
+    """Exact count/sum/max plus a bounded window of recent samples."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    samples: deque = field(
+        default_factory=lambda: deque(maxlen=MAX_SAMPLES_PER_HISTOGRAM)
+    )
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+    def quantile(self, q: float) -> float:
+        """Nearest-rank quantile of the sample window (0.0 when empty)."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(max(math.ceil(q * len(ordered)) - 1, 0), len(ordered) - 1)
+        return ordered[index]
+
+
+@dataclass
+class _Gauge:
+    """Current value plus the high-water mark."""
+
+    value: float = 0.0
+    max: float = 0.0
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of histograms, counters and gauges.
+
+    Keys are (metric name, sorted label pairs). Methods are safe to call from
+    the event loop and from worker threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, LabelKey], _Histogram] = {}
+        self._counters: dict[tuple[str, LabelKey], float] = {}
+        self._gauges: dict[tuple[str, LabelKey], _Gauge] = {}
+
+    def observe(self, name: str, value: float, labels: LabelKey = ()) -> None:
+        """Record one histogram observation."""
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                histogram = self._histograms[(name, labels)] = _Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1.0, labels: LabelKey = ()) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[(name, labels)] = self._counters.get((name, labels), 0.0) + amount
+
+    def gauge_add(self, name: str, delta: float, labels: LabelKey = ()) -> None:
+        """Add delta (may be negative) to a gauge and track its maximum."""
+        with self._lock:
+            gauge = self._gauges.get((name, labels))
+            if gauge is None:
+                gauge = self._gauges[(name, labels)] = _Gauge()
+            gauge.value += delta
+            gauge.max = max(gauge.max, gauge.value)
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Return a JSON-serializable summary of all metrics.
+
+        Returns:
+            Dict with "histograms" (count, sum, p50/p95/p99, max in seconds),
+            "counters" (value) and "gauges" (value, max), each a list of
+            entries sorted by name and labels
+        """
+        with self._lock:
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": h.count,
+                    "sum": round(h.total, 6),
+                    **{f"p{round(q * 100)}": round(h.quantile(q), 6) for q in QUANTILES},
+                    "max": round(h.max, 6),
+                }
+                for (name, labels), h in sorted(self._histograms.items())
+            ]
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            gauges = [
+                {"name": name, "labels": dict(labels), "value": g.value, "max": g.max}
+                for (name, labels), g in sorted(self._gauges.items())
+            ]
+        return {"histograms": histograms, "counters": counters, "gauges": gauges}
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Histograms are exposed as summaries (quantiles + _sum + _count).
+        """
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted({n for n, _ in self._histograms}):
+                _prometheus_header(lines, name, "summary")
+                for (metric_name, labels), h in sorted(self._histograms.items()):
+                    if metric_name != name:
+                        continue
+                    full = PROMETHEUS_PREFIX + name
+                    for q in QUANTILES:
+                        quantile_labels = labels + (("quantile", str(q)),)
+                        lines.append(f"{full}{_format_labels(quantile_labels)} {h.quantile(q)}")
+                    lines.append(f"{full}_sum{_format_labels(labels)} {h.total}")
+                    lines.append(f"{full}_count{_format_labels(labels)} {h.count}")
+
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted({n for n, _ in store}):
+                    _prometheus_header(lines, name, kind)
+                    for (metric_name, labels), entry in sorted(store.items()):
+                        if metric_name != name:
+                            continue
+                        value = entry.value if isinstance(entry, _Gauge) else entry
+                        lines.append(
+                            f"{PROMETHEUS_PREFIX}{name}{_format_labels(labels)} {value}"
+                        )
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _prometheus_header(lines: list[str], name: str, kind: str) -> None:
+    """Append HELP/TYPE lines for a metric family."""
+    full = PROMETHEUS_PREFIX + name
+    lines.append(f"# HELP {full} {METRIC_HELP.get(name, name)}")
+    lines.append(f"# TYPE {full} {kind}")
+
+
+def _format_labels(labels: LabelKey) -> str:
+    """Format label pairs as {k="v",...} with Prometheus escaping."""
+    if not labels:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+# ============================================================================
+# MODULE-LEVEL API
+# ============================================================================
+
+# Process-wide registry (exposed at /metrics)
+REGISTRY = MetricsRegistry()
+
+# Registry of the run currently being collected in this context
+_run_registry: ContextVar[MetricsRegistry | None] = ContextVar(
+    "llm_answer_watcher_run_metrics", default=None
+)
+
+# Labels inherited by measurements in this context (provider, model, ...)
+_context_labels: ContextVar[dict[str, str] | None] = ContextVar(
+    "llm_answer_watcher_metric_labels", default=None
+)
+
+
+def _label_key(labels: dict[str, object]) -> LabelKey:
+    """Merge context labels with explicit labels into a hashable key."""
+    merged = {**(_context_labels.get() or {}), **labels}
+    return tuple(sorted((k, str(v)) for k, v in merged.items() if v is not None))
+
+
+def _registries() -> tuple[MetricsRegistry, ...]:
+    run_registry = _run_registry.get()
+    return (REGISTRY, run_registry) if run_registry is not None else (REGISTRY,)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record a histogram observation with context labels merged in."""
+    key = _label_key(labels)
+    for registry in _registries():
+        registry.observe(name, value, key)
+
+
+def inc(name: str, amount: float = 1.0, **labels) -> None:
+    """Increment a counter with context labels merged in."""
+    key = _label_key(labels)
+    for registry in _registries():
+        registry.inc(name, amount, key)
+
+
+def gauge_add(name: str, delta: float, **labels) -> None:
+    """Adjust a gauge. Gauges ignore context labels (they are process/run wide)."""
+    key = tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+    for registry in _registries():
+        registry.gauge_add(name, delta, key)
+
+
+def bind_labels(**labels) -> Token:
+    """
+    Bind labels to the current context (e.g. provider/model of a query task).
+
+    Returns:
+        Token that can be passed to unbind_labels() to restore the previous labels
+    """
+    return _context_labels.set({**(_context_labels.get() or {}), **labels})
+
+
+def unbind_labels(token: Token) -> None:
+    """Restore labels saved by bind_labels()."""
+    _context_labels.reset(token)
+
+
+@contextmanager
+def span(stage: str, **labels) -> Iterator[None]:
+    """
+    Time a block and record it in the stage_duration_seconds histogram.
+
+    Labels are bound for the duration of the block so nested spans inherit
+    them. The duration is recorded even when the block raises.
+
+    Args:
+        stage: Stage name (e.g., "llm_request", "parse_answer")
+        **labels: Extra labels (e.g., provider="google", model="gemini-2.5-flash")
+    """
+    token = bind_labels(**labels) if labels else None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(STAGE_DURATION, time.perf_counter() - start, stage=stage)
+        if token is not None:
+            unbind_labels(token)
+
+
+def timed(stage: str | None = None) -> Callable:
+    """
+    Decorator recording each call of a sync or async function as a span.
+
+    Args:
+        stage: Stage name (default: the function's __name__)
+
+    Example:
+        >>> @timed()
+        ... def write_raw_answer(run_dir, intent_id, provider, model, data): ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = stage or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@asynccontextmanager
+async def tracked_semaphore(semaphore, stage: str = "query"):
+    """
+    Acquire an asyncio.Semaphore while tracking queue depth and in-flight work.
+
+    Records time spent waiting ("semaphore_wait" stage) and time spent holding
+    the slot (`stage`), and maintains the semaphore_queue_depth and
+    in_flight_queries gauges.
+
+    Args:
+        semaphore: asyncio.Semaphore limiting concurrency
+        stage: Stage name recorded for the time the slot is held
+    """
+    gauge_add("semaphore_queue_depth", 1)
+    wait_start = time.perf_counter()
+    try:
+        await semaphore.acquire()
+    finally:
+        gauge_add("semaphore_queue_depth", -1)
+    observe(STAGE_DURATION, time.perf_counter() - wait_start, stage="semaphore_wait")
+
+    gauge_add("in_flight_queries", 1)
+    held_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        gauge_add("in_flight_queries", -1)
+        semaphore.release()
+        # Labels bound inside the block (provider/model) are still visible here
+        observe(STAGE_DURATION, time.perf_counter() - held_start, stage=stage)
+
+
+def start_run_collection() -> tuple[MetricsRegistry, Token]:
+    """
+    Start collecting metrics for a run in the current context.
+
+    Tasks created afterwards (e.g. by asyncio.gather) inherit the collection.
+
+    Returns:
+        Tuple of (run registry, token for stop_run_collection())
+    """
+    registry = MetricsRegistry()
+    return registry, _run_registry.set(registry)
+
+
+def stop_run_collection(token: Token) -> None:
+    """Stop collecting run metrics started with start_run_collection()."""
+    _run_registry.reset(token)
+
+
+def render_prometheus() -> str:
+    """Render the process-wide registry in Prometheus text format."""
+    return REGISTRY.render_prometheus()
@@ -13,6 +13,9 @@ The pricing system uses a three-tier approach:
 3. Cached pricing (config/pricing_cache.json) - 24-hour cache
 4. Hardcoded fallback (original PRICING dict) - Last resort
 
+Inside no_remote_pricing() (benchmarks, offline runs) the remote source is
+skipped and lookups fall through to the local tiers.
+
 Example:
     >>> from utils.pricing import get_pricing, refresh_pricing
     >>> pricing = get_pricing("openai", "gpt-4o-mini")
@@ -26,13 +29,15 @@ Example:
 
 import json
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-import httpx
-
+from llm_answer_watcher.utils import metrics
 from llm_answer_watcher.utils.time import utc_now
 
 logger = logging.getLogger(__name__)
@@ -48,6 +53,21 @@ OVERRIDES_FILE = PROJECT_ROOT / "config" / "pricing_overrides.json"
 # Cache duration (24 hours)
 CACHE_DURATION = timedelta(hours=24)
 
+# Set inside no_remote_pricing(): the remote source is not contacted
+_remote_disabled: ContextVar[bool] = ContextVar(
+    "llm_answer_watcher_no_remote_pricing", default=False
+)
+
+
+@contextmanager
+def no_remote_pricing() -> Iterator[None]:
+    """Skip the remote pricing source in this context (and tasks created from it)."""
+    token = _remote_disabled.set(True)
+    try:
+        yield
+    finally:
+        _remote_disabled.reset(token)
+
 # Provider name mapping (our names -> llm-prices.com vendor names)
 PROVIDER_MAPPING = {
     "google": "google",
@@ -132,6 +152,7 @@ def get_pricing(provider: str, model: str, use_cache: bool = True) -> ModelPrici
                 # Try to find exact model match
                 for price in prices:
                     if price["vendor"] == vendor and price["id"] == model.lower():
+                        metrics.inc("cache_hits_total", cache="pricing")
                         return ModelPricing(
                             provider=provider,
                             model=model,
@@ -149,6 +170,7 @@ def get_pricing(provider: str, model: str, use_cache: bool = True) -> ModelPrici
                         logger.info(
                             f"Using approximate model match: {model} -> {price['id']}"
                         )
+                        metrics.inc("cache_hits_total", cache="pricing")
                         return ModelPricing(
                             provider=provider,
                             model=model,
@@ -159,6 +181,7 @@ def get_pricing(provider: str, model: str, use_cache: bool = True) -> ModelPrici
                         )
 
     # 3. Fetch from remote (and cache)
+    metrics.inc("cache_misses_total", cache="pricing")
     try:
         logger.info(f"Fetching pricing from remote: {PRICING_URL}")
         remote_data = _fetch_remote_pricing()
@@ -481,7 +504,12 @@ def _is_cache_expired(cached_at: str | None) -> bool:
 
 
 def _fetch_remote_pricing(timeout: float = 10.0) -> dict[str, Any] | None:
-    """Fetch pricing data from remote source."""
+    """Fetch pricing data from remote source (None inside no_remote_pricing())."""
+    if _remote_disabled.get():
+        return None
+    # Imported here so `prices show`/`prices list` don't pay for httpx
+    import httpx
+
     try:
         with httpx.Client(timeout=timeout) as client:
             response = client.get(PRICING_URL)
@@ -0,0 +1,213 @@
+"""
+JSON serialization for artifacts, database columns and API responses.
+
+JSON encoding and decoding sit on the hot path of a run: every answer's
+usage metadata and web search results are encoded for the database, run
+artifacts are written with indent=2, and the results endpoint decodes the
+usage metadata of every answer. With the stdlib json module this showed up
+at double-digit percentages in profiles of large runs.
+
+This module is the single place that encodes and decodes JSON:
+
+- orjson is used when installed (several times faster, native UTF-8 bytes)
+- the stdlib json module is the fallback, and is used for any value orjson
+  rejects (integers beyond 64 bits, NaN literals when decoding)
+- pretty output is indented by 2 spaces, compact output has no whitespace;
+  non-ASCII characters are written as-is in both
+
+Unlike plain orjson, datetimes and dataclasses are not serialized implicitly
+(TypeError, as with the stdlib); pass default= to convert them.
+
+Output is the same with both backends except for NaN and infinite floats:
+orjson encodes them as null (valid JSON, decoded as None), the stdlib as
+the NaN / Infinity literals (not valid JSON, decoded back as floats).
+Checking every float for them would cost most of orjson's speedup, so
+values that can be non-finite should be converted by the caller.
+
+Configuration:
+    WATCHER_JSON_BACKEND=json  Use the stdlib even when orjson is installed
+    WATCHER_JSON_ARTIFACTS=compact  Write run artifacts (run_meta.json,
+        intent_*.json) without indentation; "pretty" (default) keeps them
+        human-readable
+
+Example:
+    >>> dumps({"tokens": 650, "brand": "Škoda"})
+    '{"tokens":650,"brand":"Škoda"}'
+    >>> loads(b'{"tokens": 650}')
+    {'tokens': 650}
+    >>> dumps_bytes([1, 2], pretty=True)
+    b'[\\n  1,\\n  2\\n]'
+"""
+
+import json
+import logging
+import os
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ORJSON = "orjson"
+BACKEND_STDLIB = "json"
+
+# Values of WATCHER_JSON_ARTIFACTS that write compact artifacts
+_COMPACT_VALUES = {"compact", "0", "false", "no", "off"}
+
+# Keep the stdlib's behavior for types orjson would serialize on its own
+_ORJSON_OPTIONS = (
+    (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+    if orjson is not None
+    else 0
+)
+
+
+def _configured_backend() -> str:
+    requested = os.environ.get("WATCHER_JSON_BACKEND", BACKEND_ORJSON).strip().lower()
+    if requested == BACKEND_STDLIB or orjson is None:
+        return BACKEND_STDLIB
+    return BACKEND_ORJSON
+
+
+_backend = _configured_backend()
+
+
+def get_backend() -> str:
+    """Return the active backend ("orjson" or "json")."""
+    return _backend
+
+
+def set_backend(name: str) -> str:
+    """
+    Switch the backend for the process (e.g. to benchmark both).
+
+    Args:
+        name: "orjson" or "json"
+
+    Returns:
+        The previous backend
+
+    Raises:
+        ValueError: If name is unknown, or "orjson" is not installed
+    """
+    global _backend
+    if name not in (BACKEND_ORJSON, BACKEND_STDLIB):
+        raise ValueError(f"Unknown JSON backend: {name!r}")
+    if name == BACKEND_ORJSON and orjson is None:
+        raise ValueError("The orjson backend requires the 'orjson' package")
+    previous, _backend = _backend, name
+    return previous
+
+
+def artifacts_pretty() -> bool:
+    """True unless WATCHER_JSON_ARTIFACTS asks for compact artifacts."""
+    value = os.environ.get("WATCHER_JSON_ARTIFACTS", "pretty").strip().lower()
+    return value not in _COMPACT_VALUES
+
+
+def _stdlib_dumps(obj: Any, pretty: bool, sort_keys: bool, default: Callable | None) -> str:
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=2 if pretty else None,
+        separators=(",", ": ") if pretty else (",", ":"),
+        sort_keys=sort_keys,
+        default=default,
+    )
+
+
+def dumps_bytes(
+    obj: Any,
+    pretty: bool = False,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """
+    Encode a value as UTF-8 JSON bytes.
+
+    Args:
+        obj: Value to encode
+        pretty: Indent by 2 spaces instead of compact output
+        sort_keys: Sort object keys
+        default: Called for values that are not JSON types; returns a
+            serializable value or raises TypeError
+
+    Returns:
+        Encoded JSON
+
+    Raises:
+        TypeError: If obj contains values that cannot be serialized
+        ValueError: If obj contains circular references
+    """
+    if _backend == BACKEND_ORJSON:
+        options = _ORJSON_OPTIONS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=options)
+        except TypeError:
+            # Integers beyond 64 bits, or really unserializable (raises again)
+            pass
+    return _stdlib_dumps(obj, pretty, sort_keys, default).encode("utf-8")
+
+
+def dumps(
+    obj: Any,
+    pretty: bool = False,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> str:
+    """
+    Encode a value as a JSON string (e.g. for a TEXT column).
+
+    Args:
+        obj: Value to encode
+        pretty: Indent by 2 spaces instead of compact output
+        sort_keys: Sort object keys
+        default: Called for values that are not JSON types
+
+    Returns:
+        Encoded JSON
+
+    Raises:
+        TypeError: If obj contains values that cannot be serialized
+        ValueError: If obj contains circular references
+    """
+    if _backend == BACKEND_STDLIB:
+        return _stdlib_dumps(obj, pretty, sort_keys, default)
+    return dumps_bytes(obj, pretty=pretty, sort_keys=sort_keys, default=default).decode("utf-8")
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """
+    Decode JSON text or UTF-8 bytes.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Decoded value
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON (a ValueError)
+        TypeError: If data is not str or bytes-like
+    """
+    if _backend == BACKEND_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity literals, or invalid (raises the stdlib error)
+            pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -0,0 +1,172 @@
+"""
+Tests for the benchmarks package.
+
+Tests cover:
+- Synthetic data generation
+- Individual scenarios against mock providers (with chaos injection)
+- Results JSON round-trip
+- Baseline comparison and regression detection
+"""
+
+import json
+
+import pytest
+
+from llm_answer_watcher.benchmarks.runner import (
+    compare_benchmark_results,
+    load_benchmark_results,
+    run_benchmark_suite,
+    write_benchmark_results,
+)
+from llm_answer_watcher.benchmarks.scenarios import (
+    bench_db_inserts,
+    bench_http_client,
+    bench_run_all,
+    bench_serialization,
+    make_answer,
+    make_brand_names,
+)
+from llm_answer_watcher.benchmarks.schema import (
+    BENCHMARK_SCHEMA_VERSION,
+    BenchmarkResult,
+    Metric,
+)
+
+
+def _report(results: list[BenchmarkResult], peak_rss_mb: float | None = None) -> dict:
+    """Build a minimal results dict like run_benchmark_suite() returns."""
+    from dataclasses import asdict
+
+    return {
+        "schema_version": BENCHMARK_SCHEMA_VERSION,
+        "peak_rss_mb": peak_rss_mb,
+        "results": [{**asdict(r), "key": r.key} for r in results],
+    }
+
+
+class TestSyntheticData:
+    """Test suite for synthetic benchmark inputs."""
+
+    def test_make_brand_names_unique(self):
+        """Test generated brand names are unique and deterministic."""
+        names = make_brand_names(50)
+
+        assert len(set(names)) == 50
+        assert names == make_brand_names(50)
+
+    def test_make_answer_length_and_brands(self):
+        """Test answer reaches requested length and lists every brand."""
+        brands = make_brand_names(5)
+        answer = make_answer(brands, 3000)
+
+        assert len(answer) == 3000
+        for position, brand in enumerate(brands, start=1):
+            assert f"{position}. **{brand}**" in answer
+
+
+class TestScenarios:
+    """Test suite for benchmark scenarios."""
+
+    def test_run_all_with_chaos_reports_errors(self):
+        """Test run_all scenario runs offline and records injected failures."""
+        metrics = bench_run_all(
+            intents=4, models=2, concurrency=4, failure_rate=0.5, repeat=1
+        )
+
+        assert metrics["queries_per_sec"].value > 0
+        assert metrics["queries_per_sec"].higher_is_better is True
+        assert 0.0 < metrics["error_rate"].value < 1.0
+        assert metrics["error_rate"].higher_is_better is None
+
+    def test_db_inserts_batched(self):
+        """Test db_inserts scenario reports an insert rate."""
+        metrics = bench_db_inserts(answers=5, batched=True, repeat=1)
+
+        assert metrics["rows_per_sec"].value > 0
+
+    def test_http_client_against_fake_server(self):
+        """Test http_client scenario drives the real client over local HTTP."""
+        metrics = bench_http_client(provider="groq", requests=5, concurrency=2, repeat=1)
+
+        assert metrics["requests_per_sec"].value > 0
+        assert metrics["p95_ms"].value >= metrics["p50_ms"].value
+        assert metrics["error_rate"].value == 0.0
+
+    def test_serialization_backends(self):
+        """Test serialization scenario measures both JSON backends on the same payload."""
+        stdlib = bench_serialization(answers=5, answer_chars=500, backend="json", repeat=1)
+        fast = bench_serialization(answers=5, answer_chars=500, backend="orjson", repeat=1)
+
+        assert stdlib["finalize_ms"].value > 0
+        assert fast["results_ms"].higher_is_better is False
+        assert fast["results_kb"].value == stdlib["results_kb"].value
+
+    def test_suite_unknown_scenario(self):
+        """Test unknown scenario names are rejected."""
+        with pytest.raises(ValueError, match="Unknown benchmark scenario"):
+            run_benchmark_suite(scenarios=["nope"])
+
+    def test_suite_quick_extraction(self, tmp_path):
+        """Test quick suite output round-trips through JSON."""
+        report = run_benchmark_suite(scenarios=["extraction"], quick=True, repeat=1)
+        path = tmp_path / "bench" / "results.json"
+
+        write_benchmark_results(path, report)
+        loaded = load_benchmark_results(path)
+
+        assert loaded["schema_version"] == BENCHMARK_SCHEMA_VERSION
+        assert {r["scenario"] for r in loaded["results"]} == {"extraction"}
+        assert all("answers_per_sec" in r["metrics"] for r in loaded["results"])
+
+
+class TestCompare:
+    """Test suite for baseline comparison."""
+
+    def test_throughput_drop_flagged(self):
+        """Test a throughput drop beyond threshold is a regression."""
+        base = BenchmarkResult("extraction", {"n": 1}, {"ops": Metric(100.0, "ops/s", True)})
+        cur = BenchmarkResult("extraction", {"n": 1}, {"ops": Metric(80.0, "ops/s", True)})
+
+        comparisons = compare_benchmark_results(_report([base]), _report([cur]), 0.10)
+
+        assert len(comparisons) == 1
+        assert comparisons[0].regressed
+        assert comparisons[0].change_pct == pytest.approx(-20.0)
+
+    def test_latency_within_threshold_not_flagged(self):
+        """Test small latency increases within threshold pass."""
+        base = BenchmarkResult("report", {}, {"ms": Metric(100.0, "ms", False)})
+        cur = BenchmarkResult("report", {}, {"ms": Metric(105.0, "ms", False)})
+
+        comparisons = compare_benchmark_results(_report([base]), _report([cur]), 0.10)
+
+        assert not comparisons[0].regressed
+
+    def test_informational_and_unmatched_metrics_skipped(self):
+        """Test informational metrics and scenarios without baseline are ignored."""
+        base = BenchmarkResult("run_all", {"a": 1}, {"error_rate": Metric(0.1, "ratio", None)})
+        cur = BenchmarkResult("run_all", {"a": 1}, {"error_rate": Metric(0.9, "ratio", None)})
+        new = BenchmarkResult("run_all", {"a": 2}, {"ops": Metric(1.0, "ops/s", True)})
+
+        comparisons = compare_benchmark_results(
+            _report([base]), _report([cur, new]), 0.10
+        )
+
+        assert comparisons == []
+
+    def test_peak_rss_compared(self):
+        """Test process peak RSS growth is flagged."""
+        comparisons = compare_benchmark_results(
+            _report([], peak_rss_mb=100.0), _report([], peak_rss_mb=150.0), 0.10
+        )
+
+        assert comparisons[0].key == "process"
+        assert comparisons[0].regressed
+
+    def test_load_rejects_wrong_schema(self, tmp_path):
+        """Test loading a file with unsupported schema version fails."""
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps({"schema_version": 999, "results": []}))
+
+        with pytest.raises(ValueError, match="schema_version"):
+            load_benchmark_results(path)
@@ -0,0 +1,103 @@
+"""
+Tests for CLI startup cost.
+
+Runs `python -X importtime -m llm_answer_watcher --help` in a subprocess and
+fails if heavy dependencies are imported eagerly or the total import time
+exceeds a budget. Cron wrappers call the CLI many times per hour, so startup
+regressions are treated as bugs.
+
+Tests cover:
+- No heavy dependency (httpx, tenacity, rapidfuzz, jinja2, pydantic, ...) on --help
+- Import time of llm_answer_watcher.cli under IMPORT_TIME_BUDGET_MS
+- Lazy wrappers still resolve to the real implementations
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must only be imported by the commands that need them
+HEAVY_MODULES = (
+    "httpx",
+    "tenacity",
+    "rapidfuzz",
+    "jinja2",
+    "pydantic",
+    "fastapi",
+    "yaml",
+    "sqlite3",
+    "llm_answer_watcher.config.loader",
+    "llm_answer_watcher.llm_runner",
+    "llm_answer_watcher.report",
+    "llm_answer_watcher.auth",
+    "llm_answer_watcher.utils.pricing",
+)
+
+# Budget for importing llm_answer_watcher.cli (including typer and rich).
+# Eagerly importing the whole stack took ~400ms locally; lazy imports ~120ms.
+IMPORT_TIME_BUDGET_MS = 250
+
+
+def _importtime(*args: str) -> dict[str, tuple[int, int]]:
+    """
+    Run the CLI under -X importtime and parse the report.
+
+    Args:
+        *args: CLI arguments (e.g., "--help")
+
+    Returns:
+        Dict mapping module name to (nesting depth, cumulative import time in us)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "llm_answer_watcher", *args],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+
+    # Lines look like: "import time:  self_us | cumulative_us | <2*depth spaces>name"
+    modules: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (depth, int(cumulative_us))
+    return modules
+
+
+class TestCliImportTime:
+    """Test suite for CLI startup import cost."""
+
+    def test_help_does_not_import_heavy_modules(self):
+        """Test --help imports none of the heavy dependencies."""
+        modules = _importtime("--help")
+
+        eager = sorted(
+            name
+            for name in modules
+            if any(name == heavy or name.startswith(f"{heavy}.") for heavy in HEAVY_MODULES)
+        )
+
+        assert "llm_answer_watcher.cli" in modules
+        assert eager == []
+
+    @pytest.mark.slow
+    def test_help_within_import_time_budget(self):
+        """Test cli module import time stays within budget (best of 3 runs)."""
+        timings_ms = [
+            _importtime("--help")["llm_answer_watcher.cli"][1] / 1000 for _ in range(3)
+        ]
+
+        assert min(timings_ms) < IMPORT_TIME_BUDGET_MS, timings_ms
+
+    def test_lazy_wrappers_resolve(self, tmp_path):
+        """Test lazy wrappers call through to the real implementations."""
+        from llm_answer_watcher import cli
+
+        db_path = tmp_path / "watcher.db"
+        cli.init_db_if_needed(str(db_path))
+
+        assert db_path.exists()
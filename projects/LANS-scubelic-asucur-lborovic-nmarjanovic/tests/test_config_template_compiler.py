@@ -0,0 +1,174 @@
+"""
+Tests for config.template_compiler module.
+
+Tests cover:
+- Single-pass rendering of all template variables and operation results
+- Substituted values are not substituted again
+- Compiled conditions (null checks, comparisons, contains)
+- Config-load validation of {operation:id} references; uncompiled conditions
+  kept with a warning
+"""
+
+import pytest
+
+from llm_answer_watcher.config import schema as schema_module
+from llm_answer_watcher.config.schema import Operation, WatcherConfig
+from llm_answer_watcher.config.template_compiler import (
+    CONDITION_COMPARISON,
+    CONDITION_UNSUPPORTED,
+    compile_condition,
+    compile_template,
+)
+from llm_answer_watcher.llm_runner.operation_executor import (
+    OperationContext,
+    evaluate_condition,
+    render_template,
+)
+
+
+def _context(my_rank=3, response="1. Salesforce\n2. Pipedrive\n3. HubSpot") -> OperationContext:
+    return OperationContext(
+        intent_data={"id": "best-crm", "prompt": "Best CRM?", "response": response},
+        extraction_data={
+            "my_brand": "HubSpot",
+            "my_brand_aliases": ["HubSpot", "HubSpot CRM"],
+            "competitors": ["Salesforce", "Pipedrive"],
+            "competitors_mentioned": ["Salesforce", "Pipedrive"],
+            "my_rank": my_rank,
+            "my_mentions": ["HubSpot"],
+            "competitor_mentions": ["Salesforce", "Pipedrive"],
+        },
+        run_metadata={"run_id": "2025-11-02T08-00-00Z", "timestamp": "2025-11-02T08:00:00Z"},
+        model_info={"provider": "groq", "name": "llama-3.1-8b-instant"},
+        operation_results={"gap-analysis": "Missing pricing page"},
+    )
+
+
+class TestCompiledTemplate:
+    """Test suite for template compilation and rendering."""
+
+    def test_renders_all_variables(self):
+        """Test every variable and operation results are substituted."""
+        template = (
+            "{brand:mine}|{brand:mine_all}|{brand:competitors}|{competitors:mentioned}|"
+            "{intent:id}|{intent:prompt}|{rank:mine}|{mentions:mine}|{mentions:competitors}|"
+            "{model:provider}|{model:name}|{run:id}|{run:timestamp}|{operation:gap-analysis}"
+        )
+
+        rendered = render_template(template, _context())
+
+        assert rendered.split("|") == [
+            "HubSpot",
+            "HubSpot, HubSpot CRM",
+            "Salesforce, Pipedrive",
+            "Salesforce, Pipedrive",
+            "best-crm",
+            "Best CRM?",
+            "3",
+            "HubSpot",
+            "Salesforce, Pipedrive",
+            "groq",
+            "llama-3.1-8b-instant",
+            "2025-11-02T08-00-00Z",
+            "2025-11-02T08:00:00Z",
+            "Missing pricing page",
+        ]
+
+    def test_unresolved_placeholders_stay_literal(self):
+        """Test unknown variables and operations that haven't run are kept as-is."""
+        compiled = compile_template("{brand:appeared} {operation:later} {rank:mine}")
+
+        assert compiled.render(_context(my_rank=None)) == (
+            "{brand:appeared} {operation:later} not found"
+        )
+        assert compiled.unknown_variables == ("brand:appeared",)
+        assert compiled.operation_refs == ("later",)
+
+    def test_values_not_rescanned(self):
+        """Test placeholders inside the answer are not substituted."""
+        context = _context(response="Try {brand:mine} and {run:id}")
+
+        rendered = render_template("{intent:response} / {brand:mine}", context)
+
+        assert rendered == "Try {brand:mine} and {run:id} / HubSpot"
+
+    def test_compiled_once(self):
+        """Test the same template string reuses its compiled form."""
+        assert compile_template("Rank {rank:mine}") is compile_template("Rank {rank:mine}")
+
+
+class TestCompiledCondition:
+    """Test suite for condition predicates."""
+
+    @pytest.mark.parametrize(
+        ("condition", "my_rank", "expected"),
+        [
+            ("{rank:mine} == null", None, True),
+            ("{rank:mine} == null", 2, False),
+            ("{rank:mine} > 1", 3, True),
+            ("{rank:mine} > 1", 1, False),
+            ("{rank:mine} >= 3", 3, True),
+            ("{rank:mine} <= 5", None, False),
+            ("{rank:mine} != 3", 3, False),
+            ('{competitors:mentioned} contains "Pipedrive"', 3, True),
+            ("{competitors:mentioned} contains 'Zoho'", 3, False),
+        ],
+    )
+    def test_conditions(self, condition, my_rank, expected):
+        """Test supported condition shapes."""
+        assert evaluate_condition(condition, _context(my_rank=my_rank)) is expected
+
+    def test_condition_kinds(self):
+        """Test conditions compile to their shape, or unsupported."""
+        assert compile_condition("{rank:mine} < 4").kind == CONDITION_COMPARISON
+        unsupported = compile_condition("{rank:mine} is top")
+        assert unsupported.kind == CONDITION_UNSUPPORTED
+        # Evaluated like before compilation: not understood, don't skip
+        assert unsupported(_context()) is True
+
+
+class TestTemplateValidation:
+    """Test suite for config-load validation of templates."""
+
+    def test_unsupported_condition_kept_with_warning(self, monkeypatch):
+        """Test conditions the compiler doesn't support still load, with a warning."""
+        warnings = []
+        monkeypatch.setattr(schema_module.logger, "warning", warnings.append)
+
+        for condition in ("{rank:mine} != null", "{rank:mine} is null"):
+            operation = Operation(
+                id="gaps", prompt="Analyze {intent:response}", condition=condition
+            )
+            assert operation.condition == condition
+
+        assert warnings
+        assert all("not compiled" in warning for warning in warnings)
+
+    def test_unknown_operation_reference_rejected(self):
+        """Test {operation:id} must reference an existing operation."""
+        with pytest.raises(ValueError, match=r"references \{operation:missing\}"):
+            WatcherConfig.model_validate(
+                {
+                    "run_settings": {
+                        "output_dir": "./output",
+                        "sqlite_db_path": "./output/watcher.db",
+                        "models": [
+                            {
+                                "provider": "groq",
+                                "model_name": "llama-3.1-8b-instant",
+                                "env_api_key": "GROQ_API_KEY",
+                            }
+                        ],
+                    },
+                    "brands": {"mine": ["HubSpot"], "competitors": ["Salesforce"]},
+                    "intents": [
+                        {
+                            "id": "best-crm",
+                            "prompt": "What are the best CRM tools?",
+                            "operations": [
+                                {"id": "actions", "prompt": "Act on {operation:missing}"}
+                            ],
+                        }
+                    ],
+                }
+            )
@@ -6,6 +6,7 @@ Tests cover all runner functions with various scenarios:
 - evaluate_single_test_case() - Single test case evaluation
 - run_eval_suite() - Complete evaluation orchestration
 - write_eval_results() - Results database storage
+- Stored result reuse, parallel evaluation and extraction latency thresholds
 """
 
 import tempfile
@@ -14,7 +15,12 @@ from pathlib import Path
 import pytest
 import yaml
 
+from llm_answer_watcher.evals import runner as runner_module
 from llm_answer_watcher.evals.runner import (
+    EXTRACTION_LATENCY_P95_THRESHOLD_MS,
+    LATENCY_P95_METRIC,
+    LATENCY_REGRESSION_METRIC,
+    check_evaluation_thresholds,
     evaluate_single_test_case,
     load_test_cases,
     run_eval_suite,
@@ -623,3 +629,112 @@ class TestWriteEvalResults:
 
             # Should have written all 8 test cases
             # (We could query the database here to verify, but that's tested in eval_db tests)
+
+
+FIXTURES_PATH = "llm_answer_watcher/evals/testcases/fixtures.yaml"
+
+
+def _metric_values(results):
+    return [
+        (r.test_description, r.overall_passed, [(m.name, m.value) for m in r.metrics])
+        for r in results
+    ]
+
+
+class TestCachedEvalSuite:
+    """Test cases for reusing stored results of unchanged test cases."""
+
+    def test_unchanged_cases_reused(self, tmp_path):
+        """Test a second run reuses every stored result."""
+        db_path = str(tmp_path / "eval_results.db")
+        first = run_eval_suite(FIXTURES_PATH, cache_db_path=db_path)
+        write_eval_results("2025-11-02T12-00-00Z", first["results"], db_path)
+
+        second = run_eval_suite(FIXTURES_PATH, cache_db_path=db_path)
+
+        assert first["cached_cases"] == 0
+        assert second["cached_cases"] == 8
+        assert all(r.cached for r in second["results"])
+        assert _metric_values(second["results"]) == _metric_values(first["results"])
+        assert second["summary"]["latency"] == first["summary"]["latency"]
+
+    def test_changed_case_evaluated_again(self, tmp_path):
+        """Test a case with new answer text or brands is not reused."""
+        db_path = str(tmp_path / "eval_results.db")
+        write_eval_results(
+            "2025-11-02T12-00-00Z", run_eval_suite(FIXTURES_PATH)["results"], db_path
+        )
+        data = yaml.safe_load(Path(FIXTURES_PATH).read_text(encoding="utf-8"))
+        data["test_cases"][0]["llm_answer_text"] += "\nAlso consider Lemwarm."
+        data["test_cases"][1]["brands_competitors"].append("Mailwarm")
+        fixtures = tmp_path / "fixtures.yaml"
+        fixtures.write_text(yaml.safe_dump(data), encoding="utf-8")
+
+        results = run_eval_suite(fixtures, cache_db_path=db_path)
+
+        assert results["cached_cases"] == 6
+        assert [r.cached for r in results["results"][:3]] == [False, False, True]
+
+    def test_extractor_change_invalidates(self, tmp_path, monkeypatch):
+        """Test a new extractor code version invalidates all stored results."""
+        db_path = str(tmp_path / "eval_results.db")
+        write_eval_results(
+            "2025-11-02T12-00-00Z", run_eval_suite(FIXTURES_PATH)["results"], db_path
+        )
+        monkeypatch.setattr(runner_module, "extractor_code_version", lambda: "changed")
+
+        assert run_eval_suite(FIXTURES_PATH, cache_db_path=db_path)["cached_cases"] == 0
+
+
+class TestParallelEvalSuite:
+    """Test cases for evaluation in a process pool."""
+
+    def test_pool_matches_sequential(self, monkeypatch):
+        """Test pool results are the same, in fixture order, as in-process results."""
+        sequential = run_eval_suite(FIXTURES_PATH, workers=1)
+        monkeypatch.setattr(runner_module, "PARALLEL_MIN_CASES", 1)
+
+        parallel = run_eval_suite(FIXTURES_PATH, workers=2)
+
+        assert _metric_values(parallel["results"]) == _metric_values(sequential["results"])
+        assert all(r.extraction_latency_ms is not None for r in parallel["results"])
+        assert all(r.case_fingerprint for r in parallel["results"])
+
+
+class TestLatencyThresholds:
+    """Test cases for extraction performance thresholds."""
+
+    def _results(self, latency_ms):
+        results = run_eval_suite(FIXTURES_PATH)["results"]
+        for result in results:
+            result.extraction_latency_ms = latency_ms
+        return results
+
+    def test_slow_extraction_fails(self):
+        """Test a p95 above the absolute threshold is a critical violation."""
+        check = check_evaluation_thresholds(
+            self._results(EXTRACTION_LATENCY_P95_THRESHOLD_MS + 50)
+        )
+
+        assert not check["passes_thresholds"]
+        assert check["summary"]["overall_status"] == "FAIL"
+        violation = check["threshold_violations"][-1]
+        assert violation["metric"] == LATENCY_P95_METRIC
+        assert violation["severity"] == "critical"
+        assert violation["gap_percent"] == pytest.approx(20.0)
+
+    def test_regression_against_baseline(self):
+        """Test a p95 regression against the last stored run fails the suite."""
+        results = self._results(20.0)
+
+        regressed = check_evaluation_thresholds(results, baseline_latency_p95_ms=5.0)
+        within_slack = check_evaluation_thresholds(results, baseline_latency_p95_ms=10.0)
+
+        violations = [v["metric"] for v in regressed["threshold_violations"]]
+        latency_violations = [m for m in violations if m.startswith("extraction_latency")]
+        assert latency_violations == [LATENCY_REGRESSION_METRIC]
+        assert not regressed["passes_thresholds"]
+        assert regressed["metric_summary"][LATENCY_P95_METRIC]["passes"]
+        slack_summary = within_slack["metric_summary"][LATENCY_REGRESSION_METRIC]
+        assert slack_summary["passes"]
+        assert slack_summary["threshold"] == 25.0
@@ -0,0 +1,214 @@
+"""
+Tests for extractor.memo module.
+
+Tests cover:
+- Memoized parse_answer() results (per-call fields, zero cost on hits)
+- Invalidation when brands or extraction settings change
+- Function-calling extraction: one paid call per answer, persistent tier
+- Failed extractions that fell back to regex are not memoized
+- LRU eviction and retention of unused persistent entries
+- Access times of hits written in batches, not on lookup
+"""
+
+import asyncio
+import sqlite3
+from datetime import UTC, datetime
+
+import pytest
+
+from llm_answer_watcher.config.schema import (
+    Brands,
+    RetentionConfig,
+    RuntimeExtractionModel,
+    RuntimeExtractionSettings,
+)
+from llm_answer_watcher.extractor import function_extractor
+from llm_answer_watcher.extractor import memo as memo_module
+from llm_answer_watcher.extractor.function_extractor import FunctionExtractionResult
+from llm_answer_watcher.extractor.memo import ExtractionMemo
+from llm_answer_watcher.extractor.parser import parse_answer
+from llm_answer_watcher.storage.db import init_db_if_needed
+from llm_answer_watcher.storage.maintenance import apply_retention
+
+ANSWER = "Top CRMs:\n1. Salesforce\n2. HubSpot\n3. Pipedrive"
+BRANDS = Brands(mine=["HubSpot"], competitors=["Salesforce", "Pipedrive"])
+
+
+@pytest.fixture
+def memo(monkeypatch):
+    memo = ExtractionMemo()
+    monkeypatch.setattr(memo_module, "_extraction_memo", memo)
+    return memo
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "watcher.db")
+    init_db_if_needed(path)
+    return path
+
+
+def _settings(method="function_calling") -> RuntimeExtractionSettings:
+    return RuntimeExtractionSettings(
+        extraction_model=RuntimeExtractionModel(
+            provider="google", model_name="gemini-2.5-flash", api_key="AIza-test"
+        ),
+        method=method,
+        fallback_to_regex=True,
+        min_confidence=0.7,
+        enable_sentiment_analysis=False,
+        enable_intent_classification=False,
+    )
+
+
+def _parse(answer=ANSWER, brands=BRANDS, model_name="gemini-2.5-flash", **kwargs):
+    return asyncio.run(
+        parse_answer(
+            answer_text=answer,
+            brands=brands,
+            intent_id="best-crm",
+            provider="google",
+            model_name=model_name,
+            timestamp_utc="2025-11-02T08:00:00Z",
+            **kwargs,
+        )
+    )
+
+
+class TestPatternMemo:
+    """Test suite for memoized regex/pattern extraction."""
+
+    def test_repeated_answer_hits(self, memo):
+        """Test a repeated answer is rebuilt from the memo with its own call fields."""
+        first = _parse()
+        second = _parse(model_name="llama-3.1-8b-instant")
+
+        assert memo.stats.to_dict()["memory_hits"] == 1
+        assert second.model_name == "llama-3.1-8b-instant"
+        assert second.my_mentions == first.my_mentions
+        assert second.ranked_list == first.ranked_list
+        assert second.rank_extraction_method == "pattern"
+
+    def test_config_change_invalidates(self, memo):
+        """Test other brands or answers miss the memo."""
+        _parse()
+        changed = _parse(brands=Brands(mine=["HubSpot"], competitors=["Salesforce"]))
+        _parse(answer=ANSWER + "\n4. Zoho")
+
+        assert memo.stats.misses == 3
+        assert [m.normalized_name for m in changed.competitor_mentions] == ["Salesforce"]
+
+    def test_lru_eviction(self, monkeypatch):
+        """Test the in-memory tier keeps only max_entries results."""
+        memo = ExtractionMemo(max_entries=2)
+        monkeypatch.setattr(memo_module, "_extraction_memo", memo)
+        for answer in ("1. HubSpot", "1. Salesforce", "1. Pipedrive", "1. HubSpot"):
+            _parse(answer=answer)
+
+        assert memo.stats.misses == 4
+        assert len(memo._entries) == 2
+
+
+class TestFunctionCallingMemo:
+    """Test suite for memoized function-calling extraction."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        calls = []
+
+        async def _extract(answer_text, brands, extraction_settings, intent_id):
+            calls.append(answer_text)
+            return FunctionExtractionResult(
+                brands_mentioned=[
+                    {"name": "Salesforce", "rank": 1, "confidence": "high"},
+                    {"name": "HubSpot", "rank": 2, "confidence": "medium"},
+                ],
+                extraction_notes=None,
+                confidence_scores={"Salesforce": "high", "HubSpot": "medium"},
+                method="function_calling",
+                fallback_used=False,
+                extraction_cost_usd=0.0004,
+            )
+
+        monkeypatch.setattr(function_extractor, "extract_with_function_calling", _extract)
+        return calls
+
+    def test_one_paid_call_per_answer(self, memo, calls, db_path):
+        """Test hits skip the extraction model, also from the persistent tier."""
+        first = _parse(extraction_settings=_settings(), db_path=db_path)
+        second = _parse(extraction_settings=_settings(), db_path=db_path)
+        memo.clear()
+        third = _parse(extraction_settings=_settings(), db_path=db_path)
+
+        assert len(calls) == 1
+        assert first.extraction_cost_usd == 0.0004
+        assert second.extraction_cost_usd == third.extraction_cost_usd == 0.0
+        assert third.ranked_list == first.ranked_list
+        assert third.rank_extraction_method == "function_calling"
+        assert memo.stats.db_hits == 1
+        assert memo.stats.saved_cost_usd == pytest.approx(0.0004)
+
+    def test_method_change_invalidates(self, memo, calls):
+        """Test switching the extraction method misses the memo."""
+        _parse(extraction_settings=_settings())
+        hybrid = _parse(extraction_settings=_settings(method="hybrid"))
+
+        assert len(calls) == 2
+        assert hybrid.extraction_cost_usd == 0.0004
+
+    def test_fallback_not_memoized(self, memo, monkeypatch):
+        """Test a regex fallback after a failed call is retried next time."""
+
+        async def _fail(**kwargs):
+            raise RuntimeError("extraction model unavailable")
+
+        monkeypatch.setattr(function_extractor, "extract_with_function_calling", _fail)
+
+        first = _parse(extraction_settings=_settings())
+        _parse(extraction_settings=_settings())
+
+        assert first.rank_extraction_method == "pattern"
+        assert memo.stats.misses == 2
+        assert memo.stats.stores == 0
+
+
+class TestMemoRetention:
+    """Test suite for pruning the persistent tier."""
+
+    def test_hit_access_times_deferred(self, memo, db_path):
+        """Test hits don't write on lookup; their access times go out on flush."""
+        _parse(db_path=db_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE extraction_memo SET last_accessed_at = '2025-01-01T00:00:00Z'")
+        memo.clear()
+
+        _parse(db_path=db_path)
+        with sqlite3.connect(db_path) as conn:
+            query = "SELECT last_accessed_at FROM extraction_memo"
+            before_flush = conn.execute(query).fetchone()[0]
+            memo.flush(db_path)
+            after_flush = conn.execute(query).fetchone()[0]
+
+        assert memo.stats.db_hits == 1
+        assert before_flush == "2025-01-01T00:00:00Z"
+        assert after_flush > before_flush
+
+    def test_unused_entries_pruned(self, memo, db_path):
+        """Test entries unused for raw_answers_days are deleted."""
+        _parse(db_path=db_path)
+        _parse(answer="1. HubSpot", db_path=db_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "UPDATE extraction_memo SET last_accessed_at = '2025-01-01T00:00:00Z' "
+                "WHERE rowid = 1"
+            )
+            conn.commit()
+            result = apply_retention(
+                conn,
+                RetentionConfig(raw_answers_days=30),
+                now=datetime(2025, 11, 2, tzinfo=UTC),
+            )
+            remaining = conn.execute("SELECT COUNT(*) FROM extraction_memo").fetchone()[0]
+
+        assert result.deleted["extraction_memo"] == 1
+        assert remaining == 1
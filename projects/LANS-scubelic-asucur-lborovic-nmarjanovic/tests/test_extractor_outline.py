@@ -0,0 +1,85 @@
+"""
+Tests for llm_answer_watcher.extractor.outline module.
+
+Tests cover:
+- Classification of numbered items, bullets and headers
+- Item text, list numbers and line positions
+- Lines that look structural but don't match the rules
+- Rank extraction from one outline matching the per-strategy helpers
+"""
+
+from llm_answer_watcher.extractor.outline import parse_outline
+from llm_answer_watcher.extractor.rank_extractor import (
+    _extract_bullet_list,
+    _extract_headers,
+    _extract_numbered_list,
+    extract_ranked_list_pattern,
+)
+
+ANSWER = (
+    "## Best tools\n"
+    "Some intro text mentioning HubSpot.\n"
+    "1. Warmly - great for signals\n"
+    "  2) HubSpot\n"
+    "- Instantly\n"
+    "• Apollo\n"
+    "* Lemlist\n"
+    "### Honorable mention\n"
+)
+
+
+class TestParseOutline:
+    """Test suite for parse_outline()."""
+
+    def test_items_by_kind(self):
+        """Test each structural line lands in its kind's list, in order."""
+        outline = parse_outline(ANSWER)
+
+        assert [(i.number, i.text) for i in outline.numbered] == [
+            (1, "Warmly - great for signals"),
+            (2, "HubSpot"),
+        ]
+        assert [i.text for i in outline.bullets] == ["Instantly", "Apollo", "Lemlist"]
+        assert [i.text for i in outline.headers] == ["Best tools", "Honorable mention"]
+        assert {i.kind for i in outline.bullets} == {"bullet"}
+
+    def test_positions_are_line_offsets(self):
+        """Test item positions point at the start of their line."""
+        outline = parse_outline(ANSWER)
+
+        assert outline.headers[0].position == 0
+        assert outline.numbered[1].position == ANSWER.index("  2) HubSpot")
+        assert outline.bullets[0].position == ANSWER.index("- Instantly")
+
+    def test_non_matching_lines_ignored(self):
+        """Test marker-like lines that break the rules are not items."""
+        text = "# Title\n#### Deep\n1.NoSpace\n-dash\n2024 was a year\n**Bold**\n"
+        outline = parse_outline(text)
+
+        assert outline.numbered == []
+        assert outline.bullets == []
+        assert outline.headers == []
+
+    def test_empty_text(self):
+        """Test an empty answer yields an empty outline."""
+        outline = parse_outline("")
+
+        assert (outline.numbered, outline.bullets, outline.headers) == ([], [], [])
+
+
+class TestOutlineRanking:
+    """Test rank extraction driven by a single outline."""
+
+    def test_strategies_agree_with_helpers(self):
+        """Test each strategy gives the same result through the outline."""
+        brands = ["Warmly", "HubSpot", "Instantly", "Apollo", "Lemlist"]
+        bullets_only = "Options:\n- Instantly\n• Apollo\n* Lemlist\n"
+
+        assert extract_ranked_list_pattern(ANSWER, brands) == _extract_numbered_list(ANSWER, brands)
+        assert extract_ranked_list_pattern(bullets_only, brands) == _extract_bullet_list(
+            bullets_only, brands
+        )
+        headers_only = "## Warmly\n### HubSpot\n"
+        assert extract_ranked_list_pattern(headers_only, brands) == _extract_headers(
+            headers_only, brands
+        )
@@ -0,0 +1,247 @@
+"""
+Tests for llm_runner.browser.session_pool and pooled Steel runners.
+
+Tests cover:
+- Session reuse across intents and the pool size bound under concurrency
+- Conversation reset between prompts
+- Recycling after max uses, failed health checks and failed prompts
+- Lease timeouts and releasing every session on close
+- Unpooled mode (session_reuse=False) releasing each session
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llm_answer_watcher.llm_runner.browser.fake_steel import FakeSteel, FakeSteelConfig
+from llm_answer_watcher.llm_runner.browser.session_pool import (
+    SteelSessionPool,
+    close_session_pools,
+)
+from llm_answer_watcher.llm_runner.browser.steel_base import SteelConfig
+from llm_answer_watcher.llm_runner.browser.steel_chatgpt import SteelChatGPTRunner
+
+
+class FakeSiteRunner(SteelChatGPTRunner):
+    """ChatGPT runner whose page interactions go through FakeSteel only."""
+
+    def __init__(self, config, steel_client, prompt_delay=0.0, fail_prompts=()):
+        super().__init__(config, steel_client=steel_client)
+        self.prompt_delay = prompt_delay
+        self.fail_prompts = set(fail_prompts)
+        self.warmed: list[str] = []
+        self.resets: list[str] = []
+
+    def _warm_session(self, session):
+        self.warmed.append(session["id"])
+
+    def _reset_session(self, session):
+        self.resets.append(session["id"])
+
+    def _navigate_and_submit(self, session, prompt):
+        if prompt in self.fail_prompts:
+            raise RuntimeError("Page crashed")
+        time.sleep(self.prompt_delay)
+
+    def _extract_answer(self, session):
+        return self._scrape_page_content(session["id"])
+
+    def _extract_web_sources(self, session):
+        return None
+
+
+def _runner(client, tmp_path, **overrides) -> FakeSiteRunner:
+    runner_kwargs = {
+        key: overrides.pop(key) for key in ("prompt_delay", "fail_prompts") if key in overrides
+    }
+    config = SteelConfig(
+        steel_api_key="test-key",
+        target_url="https://chat.openai.com",
+        take_screenshots=False,
+        save_html_snapshot=False,
+        output_dir=str(tmp_path),
+        **overrides,
+    )
+    return FakeSiteRunner(config, client, **runner_kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _close_pools():
+    yield
+    close_session_pools()
+
+
+class TestPooledRunner:
+    """Test suite for Steel runners leasing sessions from the pool."""
+
+    def test_sequential_intents_share_one_session(self, tmp_path):
+        """Test a warm session serves many prompts."""
+        client = FakeSteel()
+        runner = _runner(client, tmp_path)
+
+        results = [runner.run_intent(f"Prompt {n}") for n in range(10)]
+
+        assert all(r.success for r in results)
+        assert results[0].answer_text.startswith("Top CRM tools")
+        assert {r.session_id for r in results} == {results[0].session_id}
+        assert client.stats.sessions_created == 1
+        assert runner.warmed == [results[0].session_id]
+        assert len(runner.resets) == 10
+
+    def test_concurrent_intents_bounded_by_pool_size(self, tmp_path):
+        """Test concurrent intents never hold more sessions than pool_size."""
+        client = FakeSteel()
+
+        def run(n):
+            # Runner registry creates a runner per query; the pool is shared
+            return _runner(client, tmp_path, pool_size=2, prompt_delay=0.02).run_intent(
+                f"Prompt {n}"
+            )
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(run, range(12)))
+
+        assert all(r.success for r in results)
+        assert client.stats.sessions_created == 2
+        assert client.stats.peak_live_sessions == 2
+
+    def test_sessions_recycled_after_max_uses(self, tmp_path):
+        """Test sessions are replaced after session_max_uses prompts."""
+        client = FakeSteel()
+        runner = _runner(client, tmp_path, session_max_uses=2)
+
+        for n in range(5):
+            runner.run_intent(f"Prompt {n}")
+
+        assert client.stats.sessions_created == 3
+        assert client.stats.sessions_released == 2
+
+    def test_dead_session_replaced_after_health_check(self, tmp_path):
+        """Test a session killed by Steel is detected and replaced."""
+        client = FakeSteel()
+        runner = _runner(client, tmp_path, health_check_interval=0)
+
+        first = runner.run_intent("Prompt 1")
+        client.kill(first.session_id)
+        second = runner.run_intent("Prompt 2")
+
+        assert second.success
+        assert second.session_id != first.session_id
+        assert client.stats.sessions_created == 2
+
+    def test_failed_prompt_discards_session(self, tmp_path):
+        """Test a session whose prompt raised is released, not reused."""
+        client = FakeSteel()
+        runner = _runner(client, tmp_path, fail_prompts={"bad"})
+
+        failed = runner.run_intent("bad")
+        ok = runner.run_intent("good")
+
+        assert not failed.success
+        assert "Page crashed" in failed.error_message
+        assert ok.success
+        assert client.stats.sessions_created == 2
+        assert client.stats.sessions_released == 1
+
+    def test_session_reuse_disabled(self, tmp_path):
+        """Test every prompt gets its own session, released afterwards."""
+        client = FakeSteel()
+        runner = _runner(client, tmp_path, session_reuse=False)
+
+        for n in range(3):
+            runner.run_intent(f"Prompt {n}")
+
+        assert client.stats.sessions_created == 3
+        assert client.live_session_count() == 0
+        assert runner.resets == []
+
+    def test_close_session_pools_releases_idle_sessions(self, tmp_path):
+        """Test closing pools releases every warm session."""
+        client = FakeSteel()
+        runner = _runner(client, tmp_path)
+        runner.run_intent("Prompt")
+
+        stats = close_session_pools()
+
+        assert client.live_session_count() == 0
+        assert [s["created"] for s in stats.values()] == [1]
+
+
+class TestSteelSessionPool:
+    """Test suite for SteelSessionPool used directly."""
+
+    def _pool(self, client, **kwargs) -> SteelSessionPool:
+        return SteelSessionPool(
+            create=lambda: {"id": client.sessions.create().id},
+            release=client.sessions.release,
+            **kwargs,
+        )
+
+    def test_lease_times_out_when_exhausted(self):
+        """Test leases wait at most the timeout for a free session."""
+        pool = self._pool(FakeSteel(), size=1)
+
+        with pool.lease():
+            with pytest.raises(TimeoutError, match="pool size 1"):
+                with pool.lease(timeout=0.01):
+                    pass
+
+        assert pool.stats.lease_waits == 1
+
+    def test_waiting_lease_gets_returned_session(self):
+        """Test a waiting lease is served as soon as a session comes back."""
+        client = FakeSteel()
+        pool = self._pool(client, size=1)
+        seen = []
+
+        def hold():
+            with pool.lease() as session:
+                time.sleep(0.05)
+                seen.append(session["id"])
+
+        worker = threading.Thread(target=hold)
+        worker.start()
+        time.sleep(0.01)
+        with pool.lease(timeout=5) as session:
+            seen.append(session["id"])
+        worker.join()
+
+        assert len(set(seen)) == 1
+        assert client.stats.sessions_created == 1
+
+    def test_prewarm_and_max_age(self):
+        """Test prewarmed sessions are recycled once older than max_age."""
+        client = FakeSteel()
+        pool = self._pool(client, size=2, max_age_seconds=0.05)
+
+        assert pool.prewarm() == 2
+        time.sleep(0.06)
+        with pool.lease():
+            pass
+
+        assert pool.stats.recycled_max_age == 2
+        assert client.stats.sessions_created == 3
+
+    def test_closed_pool_rejects_leases(self):
+        """Test leasing from a closed pool fails and close releases sessions."""
+        client = FakeSteel()
+        pool = self._pool(client)
+        pool.prewarm(1)
+
+        pool.close()
+
+        assert client.live_session_count() == 0
+        with pytest.raises(RuntimeError, match="closed"):
+            pool.acquire()
+
+    def test_invalid_size(self):
+        """Test pool size must be positive."""
+        with pytest.raises(ValueError, match="at least 1"):
+            SteelSessionPool(create=dict, release=lambda _session_id: None, size=0)
+
+    def test_fake_steel_rejects_invalid_failure_rate(self):
+        """Test FakeSteelConfig validates fail_create_rate."""
+        with pytest.raises(ValueError, match="fail_create_rate"):
+            FakeSteelConfig(fail_create_rate=2)
@@ -0,0 +1,180 @@
+"""
+Tests for llm_runner.compiled_config module.
+
+Tests cover:
+- Brand patterns, operation order, pricing and client arguments precomputed
+- Cache hits, LRU eviction and expiry keyed by config source and secrets
+- Failed builds not cached
+- estimate_run_cost() using the compiled pricing table
+- run_all() passing the compiled brand patterns to mention detection
+"""
+
+import asyncio
+
+import pytest
+
+from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config, mock_llm_stack
+from llm_answer_watcher.config.schema import RuntimeModel, RuntimeOperation
+from llm_answer_watcher.extractor import parser as parser_module
+from llm_answer_watcher.extractor.mention_detector import compile_brand_patterns
+from llm_answer_watcher.llm_runner.compiled_config import (
+    CompiledConfigCache,
+    compile_runtime_config,
+    config_content_hash,
+)
+from llm_answer_watcher.llm_runner.runner import estimate_run_cost, run_all
+from llm_answer_watcher.storage.db import init_db_if_needed
+from llm_answer_watcher.utils.pricing import ModelPricing
+
+
+def _config(tmp_path, **overrides):
+    config = build_benchmark_config(
+        str(tmp_path / "output"), str(tmp_path / "watcher.db"), intents=2, models=2, concurrency=2
+    )
+    return config.model_copy(update=overrides)
+
+
+class TestCompileRuntimeConfig:
+    """Test suite for compile_runtime_config()."""
+
+    def test_precomputed_structures(self, tmp_path):
+        """Test brand patterns, operation plans and client specs of a config."""
+        config = _config(
+            tmp_path,
+            global_operations=[
+                RuntimeOperation(id="actions", prompt="Act", depends_on=["gaps"]),
+                RuntimeOperation(id="gaps", prompt="Find gaps"),
+            ],
+        )
+
+        compiled = compile_runtime_config(config)
+
+        assert compiled.brand_patterns is compile_brand_patterns(
+            tuple(config.brands.mine), tuple(config.brands.competitors)
+        )
+        assert [op.id for op in compiled.operations_for("bench-intent-000")] == [
+            "gaps",
+            "actions",
+        ]
+        assert compiled.operations_for("unknown") == []
+        assert set(compiled.pricing) == {"mock/mock-model-0", "mock/mock-model-1"}
+        spec = compiled.client_spec(config.models[0])
+        assert spec["model_name"] == "mock-model-0"
+        assert spec["api_key"] == "benchmark-key"
+
+    def test_ambiguous_model_uses_own_settings(self, tmp_path):
+        """Test a model configured twice with different settings keeps its own spec."""
+        config = _config(tmp_path)
+        other = RuntimeModel(
+            provider="mock", model_name="mock-model-0", api_key="k", system_prompt="Other"
+        )
+        config = config.model_copy(update={"models": [*config.models, other]})
+
+        compiled = compile_runtime_config(config)
+
+        assert "mock/mock-model-0" not in compiled.client_specs
+        assert compiled.client_spec(other)["system_prompt"] == "Other"
+
+    def test_estimate_uses_pricing_table(self, tmp_path):
+        """Test the cost estimate reads compiled pricing instead of the pricing files."""
+        config = _config(tmp_path)
+        table = {
+            "mock/mock-model-0": ModelPricing("mock", "mock-model-0", input=1.0, output=2.0),
+            "mock/mock-model-1": None,
+        }
+
+        estimate = estimate_run_cost(config, pricing_table=table)
+
+        costs = {m["model_name"]: m["cost_per_query"] for m in estimate["per_model_costs"]}
+        assert costs["mock-model-0"] == round(150 * 1e-6 + 500 * 2e-6, 6)
+        # No pricing: fallback rates
+        assert costs["mock-model-1"] == round(150 * 0.00000015 + 500 * 0.0000006, 6)
+
+
+    def test_run_uses_compiled_brand_patterns(self, tmp_path, monkeypatch):
+        """Test run_all() hands the compiled patterns to detect_mentions()."""
+        config = _config(tmp_path)
+        init_db_if_needed(config.run_settings.sqlite_db_path)
+        compiled = compile_runtime_config(config)
+        seen = []
+        detect_mentions = parser_module.detect_mentions
+
+        def _detect(*args, brand_patterns=None, **kwargs):
+            seen.append(brand_patterns)
+            return detect_mentions(*args, brand_patterns=brand_patterns, **kwargs)
+
+        monkeypatch.setattr(parser_module, "detect_mentions", _detect)
+        with mock_llm_stack("Top tools: Brand0"):
+            result = asyncio.run(run_all(config, compiled=compiled))
+
+        assert result["success_count"] == 4
+        assert len(seen) >= 1
+        assert all(patterns is compiled.brand_patterns for patterns in seen)
+
+
+class TestCompiledConfigCache:
+    """Test suite for CompiledConfigCache."""
+
+    def test_hit_and_miss(self, tmp_path):
+        """Test the same source and secrets reuse the compiled config."""
+        cache = CompiledConfigCache()
+        builds = []
+
+        def build():
+            builds.append(1)
+            return _config(tmp_path)
+
+        first = cache.get_or_compile("yaml: 1", build, secrets={"openai": "sk-1"})
+        second = cache.get_or_compile("yaml: 1", build, secrets={"openai": "sk-1"})
+        other_key = cache.get_or_compile("yaml: 1", build, secrets={"openai": "sk-2"})
+
+        assert second is first
+        assert other_key is not first
+        assert len(builds) == 2
+        assert cache.stats.to_dict()["hit_rate"] == pytest.approx(1 / 3, abs=1e-4)
+
+    def test_secrets_not_in_key(self):
+        """Test the cache key is a digest that doesn't contain the secret."""
+        key = config_content_hash("yaml: 1", {"openai": "sk-secret"})
+
+        assert "sk-secret" not in key
+        assert key != config_content_hash("yaml: 1")
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently used config is evicted beyond max_entries."""
+        cache = CompiledConfigCache(max_entries=2)
+        config = _config(tmp_path)
+
+        first = cache.get_or_compile("a", lambda: config)
+        cache.get_or_compile("b", lambda: config)
+        cache.get_or_compile("a", lambda: config)
+        cache.get_or_compile("c", lambda: config)
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        assert cache.get_or_compile("a", lambda: config) is first
+        assert cache.get_or_compile("b", lambda: config) is not first
+        assert cache.stats.misses == 4
+
+    def test_expired_entries_recompiled(self, tmp_path):
+        """Test entries older than ttl_seconds are compiled again."""
+        cache = CompiledConfigCache(ttl_seconds=-1)
+        config = _config(tmp_path)
+
+        first = cache.get_or_compile("a", lambda: config)
+
+        assert cache.get_or_compile("a", lambda: config) is not first
+        assert cache.stats.expirations == 1
+
+    def test_failed_build_not_cached(self, tmp_path):
+        """Test a build error propagates and the next call builds again."""
+        cache = CompiledConfigCache()
+
+        def fail():
+            raise ValueError("invalid config")
+
+        with pytest.raises(ValueError, match="invalid config"):
+            cache.get_or_compile("a", fail)
+
+        assert len(cache) == 0
+        assert cache.get_or_compile("a", lambda: _config(tmp_path)).config is not None
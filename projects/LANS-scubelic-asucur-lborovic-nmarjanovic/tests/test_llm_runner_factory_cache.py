@@ -0,0 +1,159 @@
+"""
+Tests for llm_runner.factory_cache module.
+
+Tests cover:
+- One shared client/runner per distinct configuration, with hit/miss stats
+- API keys hashed out of cache keys
+- get_client() using the active run's cache and falling back outside runs
+- Deterministic close in reverse creation order
+- run_all() building one client per model and reporting cache stats
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config, mock_llm_stack
+from llm_answer_watcher.llm_runner import factory_cache
+from llm_answer_watcher.llm_runner.factory_cache import (
+    FactoryCache,
+    get_client,
+    start_factory_cache,
+    stop_factory_cache,
+)
+from llm_answer_watcher.llm_runner.runner import run_all
+from llm_answer_watcher.storage.db import init_db_if_needed
+
+CLIENT_KWARGS = {
+    "provider": "google",
+    "model_name": "gemini-2.5-flash",
+    "api_key": "AIza-secret-key",
+    "system_prompt": "You are a helpful assistant.",
+}
+
+
+class _Closable:
+    """Records close calls in a shared log."""
+
+    def __init__(self, name, log, fail=False, **_kwargs):
+        self.name = name
+        self.log = log
+        self.fail = fail
+
+    async def aclose(self):
+        if self.fail:
+            raise RuntimeError("boom")
+        self.log.append(self.name)
+
+
+class TestFactoryCache:
+    """Test suite for FactoryCache."""
+
+    def test_same_config_returns_shared_client(self):
+        """Test clients are built once per distinct configuration."""
+        cache = FactoryCache()
+        builds = []
+
+        def builder(**kwargs):
+            builds.append(kwargs)
+            return object()
+
+        first = cache.client(builder, **CLIENT_KWARGS)
+        second = cache.client(builder, **CLIENT_KWARGS)
+        with_tools = cache.client(builder, **CLIENT_KWARGS, tools=[{"google_search": {}}])
+
+        assert first is second
+        assert with_tools is not first
+        assert len(builds) == 2
+        stats = cache.stats.to_dict()
+        assert stats["client_hits"] == 1
+        assert stats["client_misses"] == 2
+        assert stats["client_hit_rate"] == pytest.approx(1 / 3, abs=1e-4)
+
+    def test_api_key_not_in_cache_keys(self):
+        """Test API keys are hashed before becoming part of a key."""
+        cache = FactoryCache()
+        cache.client(lambda **_kwargs: object(), **CLIENT_KWARGS)
+
+        assert "AIza-secret-key" not in repr(list(cache._instances))
+
+    def test_runner_created_once_per_config(self):
+        """Test runners from the registry are shared per plugin config."""
+        cache = FactoryCache()
+        config = {**CLIENT_KWARGS, "api_key": "AIza-x"}
+
+        first = cache.runner("api", config)
+        second = cache.runner("api", dict(config))
+        other = cache.runner("api", {**config, "model_name": "gemini-2.5-pro"})
+
+        assert first is second
+        assert other is not first
+        assert cache.stats.runner_misses == 2
+        assert cache.stats.runner_hits == 1
+
+    def test_aclose_reverse_order_and_errors_counted(self):
+        """Test instances close newest first and close errors don't propagate."""
+        cache = FactoryCache()
+        log = []
+        for name, fail in (("a", False), ("b", True), ("c", False)):
+            cache.client(
+                lambda n=name, f=fail, **_kw: _Closable(n, log, fail=f),
+                **{**CLIENT_KWARGS, "model_name": name},
+            )
+
+        asyncio.run(cache.aclose())
+        asyncio.run(cache.aclose())  # idempotent
+
+        assert log == ["c", "a"]
+        assert cache.stats.closed == 2
+        assert cache.stats.close_errors == 1
+        with pytest.raises(RuntimeError, match="closed"):
+            cache.client(lambda **_kw: object(), **CLIENT_KWARGS)
+
+
+class TestGetClient:
+    """Test suite for the context-scoped get_client()."""
+
+    def test_uses_active_cache(self):
+        """Test get_client shares clients only while a cache is active."""
+        outside = get_client(lambda **_kw: object(), **CLIENT_KWARGS)
+
+        cache, token = start_factory_cache()
+        try:
+            first = get_client(lambda **_kw: object(), **CLIENT_KWARGS)
+            second = get_client(lambda **_kw: object(), **CLIENT_KWARGS)
+        finally:
+            stop_factory_cache(token)
+
+        assert first is second
+        assert outside is not first
+        assert cache.stats.client_hits == 1
+        assert factory_cache._active_cache.get() is None
+
+
+class TestRunAllFactoryCache:
+    """Test suite for factory cache use in run_all()."""
+
+    def test_one_client_per_model(self, tmp_path):
+        """Test run_all builds each model's client once and reports stats."""
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=5,
+            models=2,
+            concurrency=4,
+            brand_count=3,
+        )
+        init_db_if_needed(config.run_settings.sqlite_db_path)
+
+        with mock_llm_stack("Top tools: Brand0, Brand1"):
+            result = asyncio.run(run_all(config))
+
+        stats = result["factory_cache"]
+        assert result["success_count"] == 10
+        assert stats["client_misses"] == 2
+        assert stats["client_hits"] == 8
+        run_meta = json.loads((Path(result["output_dir"]) / "run_meta.json").read_text())
+        assert run_meta["factory_cache"]["client_misses"] == 2
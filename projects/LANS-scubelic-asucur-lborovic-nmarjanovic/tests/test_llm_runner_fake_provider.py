@@ -0,0 +1,176 @@
+"""
+Tests for llm_runner.fake_provider module.
+
+Tests cover:
+- FakeProviderConfig validation and latency sampling
+- Real GeminiClient/GroqClient round-trips via base_url override
+- Function-call responses normalized to the _function_call format
+- Rate-limit headers, auth rejection and error injection
+"""
+
+import httpx
+import pytest
+
+from llm_answer_watcher.extractor.function_extractor import (
+    parse_function_call_response,
+)
+from llm_answer_watcher.extractor.function_schemas import (
+    EXTRACT_BRAND_MENTIONS_FUNCTION,
+)
+from llm_answer_watcher.llm_runner.fake_provider import (
+    FakeProvider,
+    FakeProviderConfig,
+    FakeProviderServer,
+)
+from llm_answer_watcher.llm_runner.gemini_client import GeminiClient
+from llm_answer_watcher.llm_runner.groq_client import GroqClient
+
+SYSTEM_PROMPT = "You are a helpful assistant."
+
+
+class TestFakeProviderConfig:
+    """Test suite for FakeProviderConfig and latency sampling."""
+
+    def test_rejects_unknown_distribution(self):
+        """Test unknown latency distributions are rejected."""
+        with pytest.raises(ValueError, match="latency_distribution"):
+            FakeProviderConfig(latency_distribution="pareto")
+
+    def test_rejects_invalid_error_rate(self):
+        """Test error_rate outside 0-1 is rejected."""
+        with pytest.raises(ValueError, match="error_rate"):
+            FakeProviderConfig(error_rate=1.5)
+
+    @pytest.mark.parametrize("distribution", ["fixed", "uniform", "normal", "lognormal"])
+    def test_latency_samples_non_negative(self, distribution):
+        """Test every distribution yields non-negative, centered latencies."""
+        provider = FakeProvider(
+            FakeProviderConfig(
+                latency_ms=50,
+                latency_jitter_ms=20,
+                latency_distribution=distribution,
+                seed=7,
+            )
+        )
+
+        samples = sorted(provider.sample_latency_seconds() for _ in range(500))
+
+        assert samples[0] >= 0
+        assert 0.035 < samples[len(samples) // 2] < 0.065
+
+
+class TestFakeProviderClients:
+    """Test suite for real provider clients against the fake server."""
+
+    @pytest.mark.asyncio
+    async def test_gemini_round_trip(self):
+        """Test GeminiClient parses text answers and configured token counts."""
+        config = FakeProviderConfig(
+            answer_text="1. **Warmly** is great.", prompt_tokens=100, completion_tokens=50
+        )
+        with FakeProviderServer(config) as server:
+            client = GeminiClient(
+                "gemini-2.5-flash", "fake-key", SYSTEM_PROMPT,
+                base_url=server.gemini_base_url,
+            )
+            response = await client.generate_answer("What are the best tools?")
+
+        assert response.answer_text == "1. **Warmly** is great."
+        assert response.prompt_tokens == 100
+        assert response.completion_tokens == 50
+        assert response.tokens_used == 150
+        assert server.stats.by_status == {200: 1}
+
+    @pytest.mark.asyncio
+    async def test_groq_round_trip(self):
+        """Test GroqClient parses chat-completions answers."""
+        with FakeProviderServer(FakeProviderConfig(answer_text="Groq answer")) as server:
+            client = GroqClient(
+                "llama-3.1-8b-instant", "fake-key", SYSTEM_PROMPT,
+                base_url=server.groq_base_url,
+            )
+            response = await client.generate_answer("What are the best tools?")
+
+        assert response.answer_text == "Groq answer"
+        assert response.provider == "groq"
+        assert response.tokens_used > 0
+
+    @pytest.mark.asyncio
+    async def test_gemini_function_call_for_declared_tool(self):
+        """Test Gemini functionCall parts are normalized for the extractor."""
+        arguments = {"mentions": [{"brand_name": "Warmly", "rank": 1}]}
+        config = FakeProviderConfig(function_call_arguments=arguments)
+        with FakeProviderServer(config) as server:
+            client = GeminiClient(
+                "gemini-2.5-flash", "fake-key", SYSTEM_PROMPT,
+                tools=[EXTRACT_BRAND_MENTIONS_FUNCTION],
+                base_url=server.gemini_base_url,
+            )
+            response = await client.generate_answer("Extract brands")
+
+        assert parse_function_call_response(response) == arguments
+        assert server.stats.function_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_groq_tool_calls_normalized(self):
+        """Test Groq tool_calls with JSON string arguments are normalized."""
+        config = FakeProviderConfig(
+            function_call_mode="always", function_call_arguments={"intent": "commercial"}
+        )
+        with FakeProviderServer(config) as server:
+            client = GroqClient(
+                "llama-3.1-8b-instant", "fake-key", SYSTEM_PROMPT,
+                base_url=server.groq_base_url,
+            )
+            response = await client.generate_answer("Classify this")
+
+        assert parse_function_call_response(response) == {"intent": "commercial"}
+
+    @pytest.mark.asyncio
+    async def test_injected_non_retryable_error(self):
+        """Test injected 401 errors surface as RuntimeError without retries."""
+        config = FakeProviderConfig(error_rate=1.0, error_status_codes=(401,))
+        with FakeProviderServer(config) as server:
+            client = GroqClient(
+                "llama-3.1-8b-instant", "fake-key", SYSTEM_PROMPT,
+                base_url=server.groq_base_url,
+            )
+            with pytest.raises(RuntimeError, match="status=401"):
+                await client.generate_answer("What are the best tools?")
+
+        assert server.stats.requests == 1
+        assert server.stats.injected_errors == 1
+
+
+class TestFakeProviderHttp:
+    """Test suite for raw HTTP behavior of the fake server."""
+
+    def test_rate_limit_headers_and_429(self):
+        """Test rate-limit headers are sent and excess requests get 429."""
+        config = FakeProviderConfig(rate_limit_requests=1, rate_limit_window_seconds=30)
+        with FakeProviderServer(config) as server:
+            url = f"{server.groq_base_url}/chat/completions"
+            headers = {"Authorization": "Bearer fake-key"}
+            body = {"model": "llama-3.1-8b-instant", "messages": []}
+
+            first = httpx.post(url, json=body, headers=headers)
+            second = httpx.post(url, json=body, headers=headers)
+            stats = httpx.get(f"{server.url}/_fake/stats").json()
+
+        assert first.status_code == 200
+        assert first.headers["x-ratelimit-limit-requests"] == "1"
+        assert first.headers["x-ratelimit-remaining-requests"] == "0"
+        assert second.status_code == 429
+        assert 1 <= int(second.headers["Retry-After"]) <= 30
+        assert stats["rate_limited"] == 1
+
+    def test_missing_api_key_rejected(self):
+        """Test Gemini endpoint requires the key query parameter."""
+        with FakeProviderServer() as server:
+            response = httpx.post(
+                f"{server.gemini_base_url}/models/gemini-2.5-flash:generateContent",
+                json={"contents": []},
+            )
+
+        assert response.status_code == 401
+        assert response.json()["error"]["status"] == "UNAUTHENTICATED"
@@ -0,0 +1,291 @@
+"""
+Tests for llm_runner.hedging module.
+
+Tests cover:
+- Latency percentiles and seeding from answers_raw
+- Hedge budget (hedge rate and extra spend caps)
+- HedgedLLMClient races: hedge wins, primary wins, both fail, streaming
+- run_all() with hedging to a fallback model
+"""
+
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config
+from llm_answer_watcher.config.schema import HedgingConfig
+from llm_answer_watcher.llm_runner.hedging import (
+    OUTCOME_BOTH_FAILED,
+    OUTCOME_HEDGE_WON,
+    OUTCOME_PRIMARY_WON,
+    HedgeBudget,
+    HedgedLLMClient,
+    LatencyTracker,
+)
+from llm_answer_watcher.llm_runner.mock_client import MockLLMClient
+from llm_answer_watcher.llm_runner.runner import estimate_run_cost, run_all
+from llm_answer_watcher.storage.db import init_db_if_needed, insert_answer_raw, insert_run
+
+MODEL = ("mock", "mock-model")
+
+
+class FailingClient:
+    """LLM client whose requests fail after a delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    async def generate_answer(self, prompt: str):
+        await asyncio.sleep(self.delay)
+        raise RuntimeError("provider unavailable")
+
+
+def _tracker(*seconds: float) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for value in seconds:
+        tracker.record(*MODEL, value)
+    return tracker
+
+
+def _hedged(primary, hedge, budget, tracker):
+    return HedgedLLMClient(primary, hedge, budget, *MODEL, tracker=tracker)
+
+
+def _config(**overrides) -> HedgingConfig:
+    settings = {"min_samples": 3, "min_delay_seconds": 0.0, "percentile": 0.9}
+    settings.update(overrides)
+    return HedgingConfig(**settings)
+
+
+class TestLatencyTracker:
+    """Test suite for LatencyTracker."""
+
+    def test_quantile_needs_min_samples(self):
+        """Test no delay is known before min_samples latencies."""
+        tracker = _tracker(1.0, 2.0)
+
+        assert tracker.quantile(*MODEL, 0.95, min_samples=3) is None
+        tracker.record(*MODEL, 10.0)
+        assert tracker.quantile(*MODEL, 0.95, min_samples=3) == 10.0
+        assert tracker.quantile(*MODEL, 0.5, min_samples=3) == 2.0
+
+    def test_seed_from_db(self, tmp_path):
+        """Test history comes from answers_raw.latency_ms, once per database."""
+        db_path = str(tmp_path / "watcher.db")
+        init_db_if_needed(db_path)
+        with sqlite3.connect(db_path) as conn:
+            insert_run(conn, "run-1", "2025-11-01T08:00:00Z", 1, 1)
+            for i, latency_ms in enumerate((800, 1200, None)):
+                insert_answer_raw(
+                    conn,
+                    run_id="run-1",
+                    intent_id=f"intent-{i}",
+                    model_provider=MODEL[0],
+                    model_name=MODEL[1],
+                    timestamp_utc=f"2025-11-01T08:00:0{i}Z",
+                    prompt="Best CRM?",
+                    answer_text="HubSpot",
+                    usage_meta_json="{}",
+                    estimated_cost_usd=0.0,
+                    latency_ms=latency_ms,
+                )
+            conn.commit()
+        tracker = _tracker(3.0)
+
+        tracker.seed_from_db(db_path, *MODEL)
+        tracker.seed_from_db(db_path, *MODEL)
+        tracker.seed_from_db(str(tmp_path / "missing" / "watcher.db"), "groq", "llama")
+
+        assert tracker.quantile(*MODEL, 1.0, min_samples=3) == 3.0
+        assert tracker.quantile(*MODEL, 0.3, min_samples=3) == 0.8
+        assert tracker.quantile("groq", "llama", 0.5, min_samples=1) is None
+
+
+class TestHedgeBudget:
+    """Test suite for HedgeBudget."""
+
+    def test_hedge_fraction(self):
+        """Test at most max_hedge_fraction of requests are hedged (at least one)."""
+        budget = HedgeBudget(_config(max_hedge_fraction=0.2))
+        budget.count_request()
+
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+        for _ in range(9):
+            budget.count_request()
+        assert budget.try_acquire()
+        assert budget.to_dict()["rejected"] == 1
+
+    def test_extra_cost_cap(self):
+        """Test hedging stops once the extra spend reaches the cap."""
+        budget = HedgeBudget(_config(max_hedge_fraction=1.0, max_extra_cost_usd=0.01))
+        for _ in range(3):
+            budget.count_request()
+
+        assert budget.try_acquire()
+        budget.record_outcome(hedge_won=True, extra_cost_usd=0.01)
+        assert not budget.try_acquire()
+
+
+class TestHedgedLLMClient:
+    """Test suite for HedgedLLMClient."""
+
+    def test_fast_hedge_wins(self):
+        """Test a stuck primary is beaten by the hedge and cancelled."""
+        slow = MockLLMClient(default_response="slow", latency_ms=5000)
+        fast = MockLLMClient(default_response="fast", cost_per_response=0.002)
+        budget = HedgeBudget(_config())
+        client = _hedged(slow, fast, budget, _tracker(0.01, 0.02, 0.05))
+
+        async def _run():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            response = await client.generate_answer("Best CRM?")
+            return response, loop.time() - started
+
+        response, elapsed = asyncio.run(_run())
+
+        assert response.answer_text == "fast"
+        assert elapsed < 1.0
+        assert response.cost_usd == pytest.approx(0.004)
+        assert client.outcome == OUTCOME_HEDGE_WON
+        assert budget.to_dict() == {
+            "requests": 1,
+            "hedges": 1,
+            "hedge_wins": 1,
+            "rejected": 0,
+            "extra_cost_usd": 0.002,
+        }
+
+    def test_no_hedge_before_delay(self):
+        """Test requests faster than the percentile are never hedged."""
+        fast = MockLLMClient(default_response="primary")
+        budget = HedgeBudget(_config())
+        client = _hedged(fast, FailingClient(), budget, _tracker(1.0, 1.0, 1.0))
+
+        response = asyncio.run(client.generate_answer("Best CRM?"))
+
+        assert response.answer_text == "primary"
+        assert client.outcome is None
+        assert budget.hedges == 0
+
+    def test_primary_wins_when_hedge_fails(self):
+        """Test a failing hedge leaves the primary's answer."""
+        primary = MockLLMClient(default_response="primary", latency_ms=100)
+        tracker = _tracker(0.01, 0.01, 0.01)
+        client = _hedged(primary, FailingClient(), HedgeBudget(_config()), tracker)
+
+        response = asyncio.run(client.generate_answer("Best CRM?"))
+
+        assert response.answer_text == "primary"
+        assert client.outcome == OUTCOME_PRIMARY_WON
+
+    def test_both_fail(self):
+        """Test the primary's error is raised when both requests fail."""
+        client = _hedged(
+            FailingClient(delay=0.1), FailingClient(), HedgeBudget(_config()), _tracker(0, 0, 0)
+        )
+
+        with pytest.raises(RuntimeError, match="provider unavailable"):
+            asyncio.run(client.generate_answer("Best CRM?"))
+        assert client.outcome == OUTCOME_BOTH_FAILED
+
+    def test_streaming_request_not_hedged(self):
+        """Test a request that already streams text is left alone."""
+        primary = MockLLMClient(
+            default_response="HubSpot " * 20, streaming_chunk_size=8, streaming_delay_ms=10
+        )
+        budget = HedgeBudget(_config(min_delay_seconds=0.005))
+        client = _hedged(primary, FailingClient(), budget, _tracker(0, 0, 0))
+        chunks = []
+
+        response = asyncio.run(client.generate_answer("Best CRM?", on_chunk=chunks.append))
+
+        assert "".join(chunks) == response.answer_text
+        assert budget.hedges == 0
+
+
+class TestHedgedRun:
+    """Test suite for run_all() with hedging."""
+
+    def test_fallback_answers_slow_model(self, tmp_path, monkeypatch):
+        """Test a slow model is hedged to its fallback and the run records it."""
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=1,
+            models=2,
+            concurrency=2,
+            brand_count=3,
+        )
+        slow, fallback = config.models
+        config.run_settings.hedging = _config(
+            min_samples=1,
+            max_hedge_fraction=1.0,
+            fallback_models={
+                f"{slow.provider}/{slow.model_name}": f"{fallback.provider}/{fallback.model_name}"
+            },
+        )
+        init_db_if_needed(config.run_settings.sqlite_db_path)
+        # Past latency of the slow model: 10ms
+        tracker = LatencyTracker()
+        tracker.record(slow.provider, slow.model_name, 0.01)
+        for module in ("runner", "hedging"):
+            monkeypatch.setattr(
+                f"llm_answer_watcher.llm_runner.{module}.get_latency_tracker", lambda: tracker
+            )
+
+        def _build_client(provider, model_name, *args, **kwargs):
+            latency_ms = 5000 if model_name == slow.model_name else 0
+            return MockLLMClient(
+                default_response="1. Toolmark000",
+                provider=provider,
+                model_name=model_name,
+                latency_ms=latency_ms,
+                cost_per_response=0.001,
+            )
+
+        monkeypatch.setattr("llm_answer_watcher.llm_runner.runner.build_client", _build_client)
+        monkeypatch.setattr(
+            "llm_answer_watcher.utils.pricing._fetch_remote_pricing", lambda *_args: None
+        )
+
+        result = asyncio.run(run_all(config))
+
+        assert result["success_count"] == 2
+        run_dir = Path(result["output_dir"])
+        meta = json.loads((run_dir / "run_meta.json").read_text())
+        assert meta["hedging"]["hedges"] == meta["hedging"]["hedge_wins"] == 1
+        raw = json.loads(
+            (run_dir / f"intent_bench-intent-000_raw_mock_{slow.model_name}.json").read_text()
+        )
+        assert raw["answered_by"] == f"{fallback.provider}/{fallback.model_name}"
+        assert raw["estimated_cost_usd"] == pytest.approx(0.002)
+
+    def test_estimate_budgets_hedges(self, tmp_path):
+        """Test cost estimates grow by max_hedge_fraction."""
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=2,
+            models=1,
+            concurrency=1,
+            brand_count=3,
+        )
+        config.models[0].provider = "groq"
+        config.models[0].model_name = "llama-3.1-8b-instant"
+        base = estimate_run_cost(config)["total_estimated_cost"]
+
+        config.run_settings.hedging = HedgingConfig(max_hedge_fraction=0.5)
+
+        assert estimate_run_cost(config)["total_estimated_cost"] == pytest.approx(base * 1.5)
+
+    def test_config_validated(self):
+        """Test malformed fallback entries and fractions are rejected."""
+        with pytest.raises(ValueError, match="provider/model"):
+            HedgingConfig(fallback_models={"groq": "google/gemini-2.5-flash"})
+        with pytest.raises(ValueError, match="max_hedge_fraction"):
+            HedgingConfig(max_hedge_fraction=0)
@@ -0,0 +1,184 @@
+"""
+Tests for llm_runner.incremental module.
+
+Tests cover:
+- Query fingerprints: stable across runs and API keys, sensitive to inputs
+- Staleness windows and per-intent overrides
+- run_all() carrying fresh answers forward (DB rows, mentions, artifacts)
+- Falling back to live queries when source artifacts are missing
+- Answers are only reused within the same user's runs
+"""
+
+import asyncio
+import json
+import shutil
+import sqlite3
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config, mock_llm_stack
+from llm_answer_watcher.config.schema import IncrementalConfig
+from llm_answer_watcher.llm_runner import runner as runner_module
+from llm_answer_watcher.llm_runner.incremental import plan_incremental_run, query_fingerprint
+from llm_answer_watcher.llm_runner.runner import run_all
+from llm_answer_watcher.storage.db import create_user, init_db_if_needed
+from llm_answer_watcher.utils.time import utc_now
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = build_benchmark_config(
+        output_dir=str(tmp_path / "output"),
+        db_path=str(tmp_path / "watcher.db"),
+        intents=2,
+        models=2,
+        concurrency=4,
+        brand_count=3,
+    )
+    config.run_settings.incremental = IncrementalConfig(max_age_minutes=60)
+    init_db_if_needed(config.run_settings.sqlite_db_path)
+    return config
+
+
+@pytest.fixture
+def run_ids(monkeypatch):
+    """Give consecutive runs distinct run_ids within the same second."""
+    ids = iter(f"2025-11-02T08-00-0{i}Z" for i in range(10))
+    monkeypatch.setattr(runner_module, "run_id_from_timestamp", lambda: next(ids))
+
+
+def _run(config, user_id=None):
+    with mock_llm_stack("Top tools:\n1. Toolmark001\n2. Toolmark000"):
+        return asyncio.run(run_all(config, user_id=user_id))
+
+
+class TestQueryFingerprint:
+    """Test suite for query_fingerprint()."""
+
+    def test_stable_and_ignores_api_key(self, config):
+        """Test same inputs give the same fingerprint, whatever the key."""
+        intent, model = config.intents[0], config.models[0]
+        before = query_fingerprint(config, intent, model_config=model)
+
+        model.api_key = "rotated-key"
+
+        assert query_fingerprint(config, intent, model_config=model) == before
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda c: setattr(c.models[0], "system_prompt", "Answer tersely."),
+            lambda c: setattr(c.models[0], "tools", [{"type": "web_search"}]),
+            lambda c: setattr(c.intents[0], "prompt", "Which CRM is best?"),
+            lambda c: c.brands.competitors.append("NewRival"),
+        ],
+    )
+    def test_changes_with_inputs(self, config, change):
+        """Test prompt, system prompt, tools and brands all change the fingerprint."""
+        before = query_fingerprint(config, config.intents[0], model_config=config.models[0])
+
+        change(config)
+
+        assert query_fingerprint(config, config.intents[0], model_config=config.models[0]) != before
+
+    def test_max_age_validated(self):
+        """Test staleness windows must be at least one minute."""
+        with pytest.raises(ValueError, match="at least 1"):
+            IncrementalConfig(max_age_minutes=0)
+
+
+class TestIncrementalRun:
+    """Test suite for run_all() in incremental mode."""
+
+    def test_second_run_carries_everything(self, config, run_ids):
+        """Test a run right after another re-queries nothing and copies results."""
+        first = _run(config)
+        second = _run(config)
+
+        assert first["carried_forward_count"] == 0
+        assert second["success_count"] == 4
+        assert second["carried_forward_count"] == 4
+        assert second["total_cost_usd"] == 0.0
+        assert {c["source_run_id"] for c in second["carried_forward"]} == {first["run_id"]}
+
+        with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+            carried = conn.execute(
+                "SELECT carried_from_run_id, timestamp_utc FROM answers_raw WHERE run_id = ?",
+                (second["run_id"],),
+            ).fetchall()
+            original_times = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT timestamp_utc FROM answers_raw WHERE run_id = ?", (first["run_id"],)
+                )
+            }
+            mention_times = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT timestamp_utc FROM mentions WHERE run_id = ?", (second["run_id"],)
+                )
+            }
+
+        assert len(carried) == 4
+        assert {row[0] for row in carried} == {first["run_id"]}
+        # Answers keep their original time, mentions count for the new run
+        assert {row[1] for row in carried} <= original_times
+        assert mention_times == {second["timestamp_utc"]}
+
+        parsed_name = "intent_bench-intent-000_parsed_mock_mock-model-0.json"
+        parsed = json.loads((Path(second["output_dir"]) / parsed_name).read_text())
+        assert parsed["carried_from_run_id"] == first["run_id"]
+
+    def test_chained_runs_point_at_origin(self, config, run_ids):
+        """Test an answer carried twice still names the run that produced it."""
+        first = _run(config)
+        _run(config)
+        third = _run(config)
+
+        assert third["carried_forward_count"] == 4
+        assert {c["source_run_id"] for c in third["carried_forward"]} == {first["run_id"]}
+
+    def test_missing_artifacts_query_live(self, config, run_ids):
+        """Test answers whose source files are gone are queried again."""
+        first = _run(config)
+        shutil.rmtree(first["output_dir"])
+
+        second = _run(config)
+
+        assert second["carried_forward_count"] == 0
+        assert second["success_count"] == 4
+        assert second["total_cost_usd"] > 0
+
+    def test_disabled_queries_everything(self, config, run_ids):
+        """Test runs without incremental mode never carry answers."""
+        _run(config)
+        config.run_settings.incremental = None
+
+        assert _run(config)["carried_forward_count"] == 0
+
+    def test_answers_not_shared_between_users(self, config, run_ids):
+        """Test one user's answers are not reused for another user's run."""
+        with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+            first = create_user(conn, "first", "first@example.com", "hash")
+            second = create_user(conn, "second", "second@example.com", "hash")
+        _run(config, user_id=first)
+
+        assert _run(config, user_id=second)["carried_forward_count"] == 0
+        assert _run(config, user_id=first)["carried_forward_count"] == 4
+
+
+class TestStaleness:
+    """Test suite for staleness windows in plan_incremental_run()."""
+
+    def test_window_and_intent_override(self, config, run_ids):
+        """Test answers expire after max_age_minutes, per intent if overridden."""
+        _run(config)
+        config.intents[1].max_age_minutes = 600
+        later = utc_now() + timedelta(minutes=90)
+
+        plan = plan_incremental_run(config, now=later)
+
+        assert len(plan.fingerprints) == 4
+        assert {key[0] for key in plan.sources} == {"bench-intent-001"}
@@ -167,6 +167,31 @@ Line 3"""
         assert "\n" in response.answer_text
 
 
+class TestMockLLMClientLatency:
+    """Test suite for simulated request latency."""
+
+    def test_negative_latency_rejected(self):
+        """Test negative latency values are rejected."""
+        with pytest.raises(ValueError, match="latency_ms"):
+            MockLLMClient(latency_ms=-1)
+
+        with pytest.raises(ValueError, match="latency_jitter_ms"):
+            MockLLMClient(latency_jitter_ms=-1)
+
+    @pytest.mark.asyncio
+    async def test_latency_delays_response(self):
+        """Test configured latency delays the response."""
+        import time
+
+        client = MockLLMClient(latency_ms=30)
+
+        start = time.perf_counter()
+        await client.generate_answer("test")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert elapsed_ms >= 25
+
+
 class TestMockLLMClientProtocolCompliance:
     """Test that MockLLMClient conforms to LLMClient protocol."""
 
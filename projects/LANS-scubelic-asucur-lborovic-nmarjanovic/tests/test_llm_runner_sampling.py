@@ -0,0 +1,182 @@
+"""
+Tests for llm_runner.sampling module.
+
+Tests cover:
+- Wilson and Student's t intervals
+- Stop rules: stable, max_samples, failed follow-up samples
+- run_all() sampling until stable (DB rows, artifacts, cost, report data)
+- Worst-case cost estimates with sampling enabled
+- SamplingConfig validation
+"""
+
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config, mock_llm_stack
+from llm_answer_watcher.config.schema import SamplingConfig
+from llm_answer_watcher.llm_runner.runner import estimate_run_cost, run_all
+from llm_answer_watcher.llm_runner.sampling import (
+    STOP_ERROR,
+    STOP_MAX_SAMPLES,
+    STOP_STABLE,
+    Sample,
+    SampleGroup,
+    mean_interval,
+    sample_until_stable,
+    t_quantile,
+    wilson_interval,
+)
+from llm_answer_watcher.report.generator import _load_model_result
+from llm_answer_watcher.storage.db import get_sample_groups, init_db_if_needed
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = build_benchmark_config(
+        output_dir=str(tmp_path / "output"),
+        db_path=str(tmp_path / "watcher.db"),
+        intents=2,
+        models=1,
+        concurrency=2,
+        brand_count=3,
+    )
+    config.run_settings.sampling = SamplingConfig()
+    init_db_if_needed(config.run_settings.sqlite_db_path)
+    return config
+
+
+def _group(appeared, ranks):
+    group = SampleGroup("intent-1", "openai", "gpt-4o-mini")
+    for index, (mine, rank) in enumerate(zip(appeared, ranks, strict=True)):
+        group.add(Sample(index, "2025-11-02T08:00:00Z", "answer", mine, rank, 0.001))
+    return group
+
+
+class TestIntervals:
+    """Test suite for interval helpers."""
+
+    def test_wilson_interval(self):
+        """Test Wilson bounds match reference values and stay within [0, 1]."""
+        low, high = wilson_interval(successes=5, n=10, confidence=0.95)
+        assert (round(low, 3), round(high, 3)) == (0.237, 0.763)
+
+        low, high = wilson_interval(successes=6, n=6, confidence=0.95)
+        assert high == 1.0
+        assert round(high - low, 2) == 0.39
+
+    def test_t_quantile(self):
+        """Test t quantiles are close to table values."""
+        assert t_quantile(0.95, 5) == pytest.approx(2.571, rel=0.01)
+        assert t_quantile(0.95, 30) == pytest.approx(2.042, rel=0.005)
+
+    def test_t_quantile_small_df_exact(self):
+        """Test df 1 and 2 use exact quantiles (the expansion is too narrow there)."""
+        assert t_quantile(0.95, 1) == pytest.approx(12.706, abs=1e-3)
+        assert t_quantile(0.95, 2) == pytest.approx(4.303, abs=1e-3)
+        assert t_quantile(0.99, 1) == pytest.approx(63.657, abs=1e-3)
+        assert t_quantile(0.99, 2) == pytest.approx(9.925, abs=1e-3)
+
+    def test_mean_interval(self):
+        """Test mean intervals need two values and center on the mean."""
+        assert mean_interval([3], 0.95) is None
+
+        mean, low, high = mean_interval([1, 2, 3], 0.95)
+        assert mean == 2.0
+        assert low < 1.0
+        assert high > 3.0
+
+
+class TestStopRules:
+    """Test suite for SampleGroup.stop_reason()."""
+
+    def test_min_samples_then_stable(self):
+        """Test consistent answers stop once the appearance interval is narrow."""
+        sampling = SamplingConfig(min_samples=3, max_samples=10)
+
+        assert _group([True] * 2, [1] * 2).stop_reason(sampling) is None
+        assert _group([True] * 5, [1] * 5).stop_reason(sampling) is None
+        assert _group([True] * 6, [1] * 6).stop_reason(sampling) == STOP_STABLE
+
+    def test_unstable_rank_runs_to_cap(self):
+        """Test a scattered rank keeps sampling until max_samples."""
+        sampling = SamplingConfig(min_samples=3, max_samples=8)
+        ranks = [1, 6, 2, 7, 1, 8, 2, 9]
+
+        assert _group([True] * 7, ranks[:7]).stop_reason(sampling) is None
+        assert _group([True] * 8, ranks).stop_reason(sampling) == STOP_MAX_SAMPLES
+
+    def test_failed_sample_stops(self, config):
+        """Test a failing follow-up sample stops sampling without raising."""
+
+        class FailingClient:
+            async def generate_answer(self, prompt):
+                raise RuntimeError("rate limited")
+
+        group = _group([True], [1])
+
+        asyncio.run(
+            sample_until_stable(
+                FailingClient(), config.intents[0], config, group, config.run_settings.sampling
+            )
+        )
+
+        assert group.failed
+        assert len(group.samples) == 1
+        assert group.summary(config.run_settings.sampling)["stop_reason"] == STOP_ERROR
+
+    def test_config_validated(self):
+        """Test sample counts and widths are validated."""
+        with pytest.raises(ValueError, match="min_samples"):
+            SamplingConfig(min_samples=5, max_samples=3)
+        with pytest.raises(ValueError):
+            SamplingConfig(confidence=1.0)
+
+
+class TestSampledRun:
+    """Test suite for run_all() with sampling enabled."""
+
+    def test_samples_until_stable(self, config):
+        """Test identical answers stop at six samples and are stored as groups."""
+        with mock_llm_stack("Top tools:\n1. Toolmark001\n2. Toolmark000"):
+            result = asyncio.run(run_all(config))
+
+        assert result["success_count"] == 2
+        # Six answers per query at the mock's $0.0001 each
+        assert result["total_cost_usd"] == pytest.approx(2 * 6 * 0.0001)
+
+        with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+            groups = get_sample_groups(conn, result["run_id"])
+            sample_rows = conn.execute(
+                "SELECT COUNT(*) FROM answer_samples WHERE run_id = ?", (result["run_id"],)
+            ).fetchone()[0]
+
+        assert sample_rows == 12
+        assert len(groups) == 2
+        assert groups[0]["sample_count"] == 6
+        assert groups[0]["stop_reason"] == STOP_STABLE
+        assert groups[0]["appearance_rate"] == 1.0
+        assert groups[0]["mean_rank"] == 2.0
+
+        run_dir = Path(result["output_dir"])
+        artifact = run_dir / "intent_bench-intent-000_samples_mock_mock-model-0.json"
+        assert len(json.loads(artifact.read_text())["samples"]) == 6
+
+        model_result = _load_model_result(
+            run_dir,
+            {"status": "success", "provider": "mock", "model_name": "mock-model-0"},
+            "bench-intent-000",
+        )
+        assert model_result["sampling"]["sample_count"] == 6
+        assert "samples" not in model_result["sampling"]
+
+    def test_estimate_budgets_max_samples(self, config):
+        """Test cost estimates assume every query needs max_samples answers."""
+        sampled = estimate_run_cost(config)["total_estimated_cost"]
+        config.run_settings.sampling = None
+        single = estimate_run_cost(config)["total_estimated_cost"]
+
+        assert sampled == pytest.approx(single * 10, rel=0.01)
@@ -0,0 +1,319 @@
+"""
+Tests for llm_runner.scheduler module.
+
+Tests cover:
+- Fair interleaving of tenants and weighted shares
+- Per-tenant concurrency caps and per-provider ceilings
+- Spend caps rejecting new and queued queries
+- Cancelled waiters and slot release
+- ScheduledLLMClient holding a slot only during each call
+- run_all() taking slots per provider call and recording spend
+- The admin scheduler endpoint
+"""
+
+import asyncio
+
+import pytest
+
+from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config, mock_llm_stack
+from llm_answer_watcher.config.schema import RuntimeOperation
+from llm_answer_watcher.exceptions import BudgetExceededError
+from llm_answer_watcher.llm_runner import scheduler as scheduler_module
+from llm_answer_watcher.llm_runner.mock_client import MockLLMClient
+from llm_answer_watcher.llm_runner.runner import run_all
+from llm_answer_watcher.llm_runner.scheduler import (
+    FairShareScheduler,
+    ScheduledLLMClient,
+    SchedulerConfig,
+    configure_scheduler,
+)
+from llm_answer_watcher.storage.db import init_db_if_needed
+
+
+async def _grant_order(scheduler, requests, provider="openai"):
+    """
+    Hold one slot, queue (tenant, label) requests behind it, then release
+    slots one by one and return labels in grant order.
+    """
+    blocker = await scheduler.acquire("blocker", provider)
+    order = []
+
+    async def _request(tenant, label):
+        slot = await scheduler.acquire(tenant, provider)
+        order.append(label)
+        await asyncio.sleep(0)
+        slot.release()
+
+    tasks = []
+    for tenant, label in requests:
+        tasks.append(asyncio.create_task(_request(tenant, label)))
+        await asyncio.sleep(0)
+    blocker.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+class TestFairShare:
+    """Test suite for fair-share ordering."""
+
+    def test_small_tenant_not_starved(self):
+        """Test a tenant arriving behind a large backlog is served promptly."""
+        scheduler = FairShareScheduler(SchedulerConfig(default_provider_limit=1))
+        requests = [("big", f"big{i}") for i in range(6)]
+        requests += [("small", "small0"), ("small", "small1")]
+
+        order = asyncio.run(_grant_order(scheduler, requests))
+
+        assert order.index("small0") <= 2
+        assert order.index("small1") <= 4
+
+    def test_weights_split_slots(self):
+        """Test a tenant with weight 2 gets twice the grants of weight 1."""
+        config = SchedulerConfig(default_provider_limit=1, tenant_weights={"heavy": 2.0})
+        scheduler = FairShareScheduler(config)
+        requests = [("heavy", "h")] * 8 + [("light", "l")] * 8
+
+        order = asyncio.run(_grant_order(scheduler, requests))
+
+        assert order[:9].count("h") == 6
+
+    def test_invalid_config(self):
+        """Test limits and weights are validated."""
+        with pytest.raises(ValueError, match="at least 1"):
+            SchedulerConfig(tenant_max_concurrency=0)
+        with pytest.raises(ValueError, match="positive"):
+            SchedulerConfig(tenant_weights={"a": 0})
+
+    def test_from_env(self, monkeypatch):
+        """Test WATCHER_* variables configure the scheduler."""
+        monkeypatch.setenv("WATCHER_PROVIDER_MAX_CONCURRENCY", "openai=4, google=16")
+        monkeypatch.setenv("WATCHER_TENANT_WEIGHTS", "7=2")
+        monkeypatch.setenv("WATCHER_TENANT_SPEND_CAP_USD", "1.5")
+
+        config = SchedulerConfig.from_env()
+
+        assert config.provider_limit("openai") == 4
+        assert config.provider_limit("groq") == 64
+        assert config.tenant_weights == {"7": 2.0}
+        assert config.tenant_spend_cap_usd == 1.5
+
+        monkeypatch.setenv("WATCHER_TENANT_WEIGHTS", "broken")
+        with pytest.raises(ValueError, match="key=value"):
+            SchedulerConfig.from_env()
+
+
+class TestLimits:
+    """Test suite for concurrency and spend limits."""
+
+    def test_tenant_and_provider_caps(self):
+        """Test in-flight slots never exceed tenant or provider limits."""
+        config = SchedulerConfig(tenant_max_concurrency=2, provider_limits={"groq": 3})
+        scheduler = FairShareScheduler(config)
+        peaks = {"a": 0, "b": 0, "groq": 0}
+
+        async def _query(tenant):
+            slot = await scheduler.acquire(tenant, "groq")
+            snapshot = scheduler.snapshot()
+            peaks[tenant] = max(peaks[tenant], snapshot["tenants"][tenant]["in_flight"])
+            peaks["groq"] = max(peaks["groq"], snapshot["providers"]["groq"]["in_flight"])
+            await asyncio.sleep(0.001)
+            slot.release()
+
+        async def _main():
+            await asyncio.gather(*(_query(t) for t in ["a"] * 10 + ["b"] * 10))
+
+        asyncio.run(_main())
+
+        assert peaks == {"a": 2, "b": 2, "groq": 3}
+        assert scheduler.snapshot()["in_flight"] == 0
+
+    def test_spend_cap(self):
+        """Test new and queued queries fail once a tenant reaches its cap."""
+        scheduler = FairShareScheduler(
+            SchedulerConfig(tenant_max_concurrency=1, tenant_spend_cap_usd=1.0)
+        )
+
+        async def _main():
+            slot = await scheduler.acquire("u1", "openai")
+            queued = asyncio.create_task(scheduler.acquire("u1", "openai"))
+            await asyncio.sleep(0)
+            scheduler.record_spend("u1", 1.25)
+            with pytest.raises(BudgetExceededError) as exc_info:
+                await queued
+            slot.release()
+            with pytest.raises(BudgetExceededError):
+                await scheduler.acquire("u1", "openai")
+            # Other tenants are unaffected
+            (await scheduler.acquire("u2", "openai")).release()
+            return exc_info.value
+
+        error = asyncio.run(_main())
+
+        assert error.budget_type == "per_user"
+        assert error.budget_limit == 1.0
+        assert scheduler.snapshot()["tenants"]["u1"]["rejected"] == 2
+
+    def test_cancelled_waiter_frees_queue(self):
+        """Test cancelling a queued acquire leaves no slot or queue entry behind."""
+        scheduler = FairShareScheduler(SchedulerConfig(tenant_max_concurrency=1))
+
+        async def _main():
+            slot = await scheduler.acquire("u1", "openai")
+            waiter = asyncio.create_task(scheduler.acquire("u1", "openai"))
+            await asyncio.sleep(0)
+            assert scheduler.snapshot()["tenants"]["u1"]["queue_depth"] == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            slot.release()
+            slot.release()  # idempotent
+
+        asyncio.run(_main())
+
+        tenant = scheduler.snapshot()["tenants"]["u1"]
+        assert (tenant["queue_depth"], tenant["in_flight"], tenant["granted"]) == (0, 0, 1)
+
+
+class TestScheduledClient:
+    """Test suite for ScheduledLLMClient."""
+
+    def test_slot_held_only_during_call(self):
+        """Test each call takes a slot and returns it when the call does."""
+        scheduler = FairShareScheduler()
+        seen = []
+
+        class _ObservingClient(MockLLMClient):
+            async def generate_answer(self, prompt, **kwargs):
+                seen.append(scheduler.snapshot()["tenants"]["42"]["in_flight"])
+                return await super().generate_answer(prompt, **kwargs)
+
+        client = ScheduledLLMClient(_ObservingClient(), "mock", "42", scheduler)
+
+        async def _run():
+            await client.generate_answer("Best CRM?")
+            await client.generate_answer("Best CRM?")
+
+        asyncio.run(_run())
+
+        tenant = scheduler.snapshot()["tenants"]["42"]
+        assert seen == [1, 1]
+        assert (tenant["granted"], tenant["in_flight"]) == (2, 0)
+        assert client.model_name == "mock-model"
+
+    def test_slot_released_on_error(self):
+        """Test a failed call returns its slot."""
+        scheduler = FairShareScheduler()
+
+        class _FailingClient(MockLLMClient):
+            async def generate_answer(self, prompt, **kwargs):
+                raise RuntimeError("provider unavailable")
+
+        client = ScheduledLLMClient(_FailingClient(), "mock", "42", scheduler)
+
+        with pytest.raises(RuntimeError, match="provider unavailable"):
+            asyncio.run(client.generate_answer("Best CRM?"))
+
+        assert scheduler.snapshot()["in_flight"] == 0
+
+
+class TestRunAllScheduling:
+    """Test suite for scheduler use in run_all()."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_scheduler(self, monkeypatch):
+        monkeypatch.setattr(scheduler_module._holder, "scheduler", None)
+
+    def test_run_takes_slots_and_records_spend(self, tmp_path):
+        """Test every query is granted a slot under the user's tenant."""
+        scheduler = configure_scheduler(SchedulerConfig(tenant_max_concurrency=2))
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=3,
+            models=2,
+            concurrency=6,
+            brand_count=3,
+        )
+        init_db_if_needed(config.run_settings.sqlite_db_path)
+
+        with mock_llm_stack("Top tools: Brand0, Brand1"):
+            result = asyncio.run(run_all(config, user_id=42))
+
+        tenant = scheduler.snapshot()["tenants"]["42"]
+        assert result["success_count"] == 6
+        assert tenant["granted"] == 6
+        assert tenant["in_flight"] == 0
+        assert tenant["spend_window_usd"] == pytest.approx(result["total_cost_usd"], abs=1e-6)
+
+    def test_operations_take_their_own_slots(self, tmp_path, monkeypatch):
+        """Test operation calls are scheduled too, each with its own slot."""
+        # Both intents' operations render the same prompt; don't coalesce them
+        monkeypatch.setenv("WATCHER_SINGLE_FLIGHT", "off")
+        scheduler = configure_scheduler(SchedulerConfig())
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=2,
+            models=1,
+            concurrency=2,
+            brand_count=3,
+        )
+        config = config.model_copy(
+            update={"global_operations": [RuntimeOperation(id="gaps", prompt="Find gaps")]}
+        )
+        init_db_if_needed(config.run_settings.sqlite_db_path)
+
+        with mock_llm_stack("Top tools: Brand0"):
+            result = asyncio.run(run_all(config))
+
+        tenant = scheduler.snapshot()["tenants"]["local"]
+        assert result["success_count"] == 2
+        assert tenant["granted"] == 4
+        assert tenant["in_flight"] == 0
+
+    def test_spend_cap_fails_queries(self, tmp_path):
+        """Test a tenant over its cap gets per-query errors, not a crashed run."""
+        scheduler = configure_scheduler(SchedulerConfig(tenant_spend_cap_usd=0.01))
+        scheduler.record_spend("local", 0.02)
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=2,
+            models=1,
+            concurrency=2,
+            brand_count=3,
+        )
+        init_db_if_needed(config.run_settings.sqlite_db_path)
+
+        with mock_llm_stack("Top tools: Brand0"):
+            result = asyncio.run(run_all(config))
+
+        assert result["error_count"] == 2
+        assert "spend cap" in result["errors"][0]["error_message"]
+
+
+class TestAdminEndpoint:
+    """Test suite for GET /admin/scheduler."""
+
+    def test_admin_only(self, monkeypatch):
+        """Test admins see the snapshot and other users get 403."""
+        from fastapi.testclient import TestClient
+
+        from llm_answer_watcher.api import app
+        from llm_answer_watcher.auth.dependencies import get_admin_usernames, get_current_user
+
+        monkeypatch.setattr(scheduler_module._holder, "scheduler", None)
+        user = {"id": 1, "username": "alice"}
+        app.dependency_overrides[get_current_user] = lambda: user
+        app.dependency_overrides[get_admin_usernames] = lambda: {"alice"}
+        try:
+            client = TestClient(app)
+            allowed = client.get("/admin/scheduler")
+            user["username"] = "bob"
+            denied = client.get("/admin/scheduler")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert allowed.status_code == 200
+        assert set(allowed.json()) == {"tenants", "providers", "queue_depth", "in_flight"}
+        assert denied.status_code == 403
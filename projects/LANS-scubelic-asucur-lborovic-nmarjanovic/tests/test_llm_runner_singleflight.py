@@ -0,0 +1,255 @@
+"""
+Tests for llm_runner.singleflight module.
+
+Tests cover:
+- Sharing one upstream call between identical concurrent requests
+- Cost attributed once, shared failures and cancellation
+- Bypassing coalescing (no_coalescing, WATCHER_SINGLE_FLIGHT=off)
+- Concurrent run_all() calls sharing upstream calls
+- The admin single-flight endpoint
+"""
+
+import asyncio
+
+import pytest
+
+from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config, mock_llm_stack
+from llm_answer_watcher.llm_runner import singleflight as singleflight_module
+from llm_answer_watcher.llm_runner.factory_cache import FactoryCache
+from llm_answer_watcher.llm_runner.mock_client import MockLLMClient
+from llm_answer_watcher.llm_runner.runner import run_all
+from llm_answer_watcher.llm_runner.scheduler import ScheduledLLMClient
+from llm_answer_watcher.llm_runner.singleflight import (
+    CoalescingLLMClient,
+    SingleFlight,
+    no_coalescing,
+)
+from llm_answer_watcher.storage.db import init_db_if_needed
+
+CLIENT_KEY = ("mock", "mock-model", "You are a test assistant.", "null", "auto", None)
+
+
+class CountingClient(MockLLMClient):
+    """MockLLMClient that counts upstream calls."""
+
+    calls: int = 0
+
+    async def generate_answer(self, prompt: str, **kwargs):
+        self.calls += 1
+        return await super().generate_answer(prompt, **kwargs)
+
+
+class FailingClient:
+    """LLM client whose requests fail after a delay."""
+
+    async def generate_answer(self, prompt: str):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("provider unavailable")
+
+
+def _client(base=None, single_flight=None):
+    base = base or CountingClient(latency_ms=50, cost_per_response=0.002)
+    return CoalescingLLMClient(base, CLIENT_KEY, single_flight or SingleFlight())
+
+
+class TestCoalescing:
+    """Test suite for CoalescingLLMClient and SingleFlight."""
+
+    def test_identical_requests_share_one_call(self):
+        """Test concurrent identical requests make one call and pay once."""
+        client = _client()
+
+        async def _run():
+            return await asyncio.gather(
+                *(client.generate_answer("Best CRM?") for _ in range(3)),
+                client.generate_answer("Best email tool?"),
+            )
+
+        first, second, third, other = asyncio.run(_run())
+
+        assert client.base_client.calls == 2
+        assert first.answer_text == second.answer_text == third.answer_text
+        assert [r.cost_usd for r in (first, second, third, other)] == [0.002, 0.0, 0.0, 0.002]
+        assert client.single_flight.stats.to_dict() == {
+            "leaders": 2,
+            "coalesced": 2,
+            "shared_failures": 0,
+            "saved_cost_usd": 0.004,
+            "coalesce_rate": 0.5,
+        }
+        assert client.single_flight.in_flight() == 0
+
+    def test_sequential_requests_not_coalesced(self):
+        """Test a request after the call finished makes its own call."""
+        client = _client()
+
+        async def _run():
+            await client.generate_answer("Best CRM?")
+            return await client.generate_answer("Best CRM?")
+
+        response = asyncio.run(_run())
+
+        assert client.base_client.calls == 2
+        assert response.cost_usd == 0.002
+
+    def test_failure_shared(self):
+        """Test every waiting request gets the upstream error."""
+        client = _client(FailingClient())
+
+        async def _run():
+            return await asyncio.gather(
+                client.generate_answer("Best CRM?"),
+                client.generate_answer("Best CRM?"),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(_run())
+
+        assert [str(r) for r in results] == ["provider unavailable"] * 2
+        assert client.single_flight.stats.shared_failures == 1
+
+    def test_cancelled_leader_keeps_call_for_others(self):
+        """Test the call survives a cancelled waiter and stops when all are gone."""
+        client = _client(CountingClient(latency_ms=100))
+
+        async def _run():
+            leader = asyncio.ensure_future(client.generate_answer("Best CRM?"))
+            follower = asyncio.ensure_future(client.generate_answer("Best CRM?"))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            response = await follower
+
+            alone = asyncio.ensure_future(client.generate_answer("Best email tool?"))
+            await asyncio.sleep(0.01)
+            alone.cancel()
+            await asyncio.gather(alone, return_exceptions=True)
+            return leader, response
+
+        leader, response = asyncio.run(_run())
+
+        assert leader.cancelled()
+        assert response.answer_text
+        assert client.single_flight.in_flight() == 0
+
+    def test_streaming_follower_gets_whole_answer(self):
+        """Test a coalesced streaming request receives the answer as one chunk."""
+        client = _client(CountingClient(latency_ms=50, default_response="HubSpot first"))
+        chunks = []
+
+        async def _run():
+            await asyncio.gather(
+                client.generate_answer("Best CRM?"),
+                client.generate_answer("Best CRM?", on_chunk=chunks.append),
+            )
+
+        asyncio.run(_run())
+
+        assert chunks == ["HubSpot first"]
+
+    def test_no_coalescing(self):
+        """Test requests inside no_coalescing() always call upstream."""
+        client = _client()
+
+        async def _run():
+            with no_coalescing():
+                return await asyncio.gather(
+                    client.generate_answer("Best CRM?"), client.generate_answer("Best CRM?")
+                )
+
+        responses = asyncio.run(_run())
+
+        assert client.base_client.calls == 2
+        assert [r.cost_usd for r in responses] == [0.002, 0.002]
+
+    def test_factory_cache_wraps_unless_disabled(self, monkeypatch):
+        """Test cached clients are wrapped, keyed by a digest of the API key."""
+        kwargs = {
+            "provider": "mock",
+            "model_name": "mock-model",
+            "api_key": "secret-key",
+            "system_prompt": "You are a test assistant.",
+        }
+        client = FactoryCache().client(lambda **_kw: MockLLMClient(), **kwargs)
+
+        assert isinstance(client, CoalescingLLMClient)
+        assert "secret-key" not in repr(client.client_key)
+        assert client.model_name == "mock-model"
+        other_tenant = FactoryCache().client(
+            lambda **_kw: MockLLMClient(), **{**kwargs, "api_key": "other-key"}
+        )
+        assert other_tenant.client_key != client.client_key
+
+        monkeypatch.setenv("WATCHER_SINGLE_FLIGHT", "off")
+        unwrapped = FactoryCache().client(lambda **_kw: MockLLMClient(), **kwargs)
+        assert isinstance(unwrapped, ScheduledLLMClient)
+        assert isinstance(unwrapped.base_client, MockLLMClient)
+
+
+class TestConcurrentRuns:
+    """Test suite for coalescing across concurrent run_all() calls."""
+
+    def test_runs_share_upstream_calls(self, tmp_path, monkeypatch):
+        """Test two users' identical runs make each upstream call once."""
+        monkeypatch.setattr(singleflight_module, "_single_flight", SingleFlight())
+        configs = []
+        for user in ("alice", "bob"):
+            config = build_benchmark_config(
+                output_dir=str(tmp_path / user / "output"),
+                db_path=str(tmp_path / user / "watcher.db"),
+                intents=2,
+                models=1,
+                concurrency=2,
+                brand_count=3,
+            )
+            init_db_if_needed(config.run_settings.sqlite_db_path)
+            configs.append(config)
+        calls = []
+        original = MockLLMClient.generate_answer
+
+        async def _counting(self, prompt, **kwargs):
+            calls.append(prompt)
+            return await original(self, prompt, **kwargs)
+
+        monkeypatch.setattr(MockLLMClient, "generate_answer", _counting)
+
+        async def _run():
+            return await asyncio.gather(
+                run_all(configs[0], user_id=1), run_all(configs[1], user_id=2)
+            )
+
+        with mock_llm_stack("1. Toolmark000", latency_ms=100):
+            first, second = asyncio.run(_run())
+
+        assert first["success_count"] == second["success_count"] == 2
+        assert len(calls) == 2
+        total_cost = first["total_cost_usd"] + second["total_cost_usd"]
+        assert total_cost == pytest.approx(0.0002)
+        assert singleflight_module.get_single_flight().stats.coalesced == 2
+
+
+class TestAdminEndpoint:
+    """Test suite for GET /admin/single-flight."""
+
+    def test_admin_only(self, monkeypatch):
+        """Test admins see coalescing stats and other users get 403."""
+        from fastapi.testclient import TestClient
+
+        from llm_answer_watcher.api import app
+        from llm_answer_watcher.auth.dependencies import get_admin_usernames, get_current_user
+
+        monkeypatch.setattr(singleflight_module, "_single_flight", SingleFlight())
+        user = {"id": 1, "username": "alice"}
+        app.dependency_overrides[get_current_user] = lambda: user
+        app.dependency_overrides[get_admin_usernames] = lambda: {"alice"}
+        try:
+            client = TestClient(app)
+            allowed = client.get("/admin/single-flight")
+            user["username"] = "bob"
+            denied = client.get("/admin/single-flight")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert allowed.status_code == 200
+        assert allowed.json()["in_flight"] == 0
+        assert allowed.json()["coalesce_rate"] == 0.0
+        assert denied.status_code == 403
@@ -0,0 +1,271 @@
+"""
+Tests for llm_runner.spend_guard module.
+
+Tests cover:
+- Reservations against run and intent budgets, committed spend per model
+- Cancelling in-flight low-priority work once a budget is reached
+- Follow-up samples refused by the budget
+- run_all() skipping queries once the actual spend reaches the budget
+- Operations finished before a budget cancellation still charged and stored
+"""
+
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config, mock_llm_stack
+from llm_answer_watcher.config.schema import BudgetConfig, RuntimeOperation, SamplingConfig
+from llm_answer_watcher.llm_runner import operation_executor
+from llm_answer_watcher.llm_runner.mock_client import MockLLMClient
+from llm_answer_watcher.llm_runner.operation_executor import OperationResult
+from llm_answer_watcher.llm_runner.runner import run_all
+from llm_answer_watcher.llm_runner.sampling import (
+    STOP_BUDGET,
+    Sample,
+    SampleGroup,
+    sample_until_stable,
+)
+from llm_answer_watcher.llm_runner.spend_guard import STAGE_OPERATIONS, SpendGuard
+from llm_answer_watcher.storage.db import init_db_if_needed
+
+MODEL = "groq/llama-3.1-8b-instant"
+
+
+def _guard(**overrides) -> SpendGuard:
+    settings = {"max_per_run_usd": 0.01, "query_estimates": {MODEL: 0.004}}
+    settings.update(overrides)
+    return SpendGuard(**settings)
+
+
+class TestSpendGuard:
+    """Test suite for SpendGuard accounting."""
+
+    def test_reservations_bound_new_work(self):
+        """Test in-flight estimates count against the budget until settled."""
+        guard = _guard()
+
+        first = guard.try_reserve("best-crm", MODEL, 0.004)
+        second = guard.try_reserve("best-crm", MODEL, 0.004)
+
+        assert guard.try_reserve("best-crm", MODEL, 0.004) is None
+        guard.settle(first, 0.001)
+        assert guard.try_reserve("best-email", MODEL, 0.004) is not None
+        guard.release(second)
+        summary = guard.to_dict()
+        assert summary["committed_usd"] == 0.001
+        assert summary["reserved_usd"] == 0.004
+        assert summary["per_model"] == {MODEL: {"committed_usd": 0.001, "requests": 1}}
+
+    def test_overspend_exhausts_budget(self):
+        """Test actual spend past the budget is committed and stops all new work."""
+        guard = _guard()
+
+        guard.settle(guard.try_reserve("best-crm", MODEL, 0.004), 0.012)
+
+        assert guard.exhausted
+        assert guard.try_reserve("best-email", MODEL, 0.0) is None
+        assert guard.to_dict()["per_intent"] == {"best-crm": 0.012}
+
+    def test_intent_budget(self):
+        """Test an intent over its budget does not block other intents."""
+        guard = _guard(max_per_run_usd=None, max_per_intent_usd=0.005)
+
+        guard.charge("best-crm", MODEL, 0.003)
+
+        assert guard.try_reserve("best-crm", MODEL, 0.004) is None
+        assert guard.try_reserve("best-email", MODEL, 0.004) is not None
+        assert not guard.exhausted
+
+    def test_cancel_low_priority(self):
+        """Test low-priority work in flight is cancelled when the budget is reached."""
+        guard = _guard(cancel_low_priority=True)
+
+        async def _operations():
+            await asyncio.sleep(5)
+            return {"summary": "done"}
+
+        async def _run():
+            work = asyncio.ensure_future(
+                guard.run_low_priority("best-crm", MODEL, STAGE_OPERATIONS, _operations())
+            )
+            await asyncio.sleep(0.01)
+            guard.charge("best-email", MODEL, 0.01)
+            return await work
+
+        result, cancelled = asyncio.run(_run())
+
+        assert result is None
+        assert cancelled
+        assert guard.to_dict()["cancelled"] == [
+            {"intent_id": "best-crm", "model": MODEL, "stage": STAGE_OPERATIONS}
+        ]
+
+    def test_low_priority_kept_without_cancel(self):
+        """Test low-priority work finishes when cancel_low_priority is off."""
+        guard = _guard()
+
+        async def _operations():
+            guard.charge("best-crm", MODEL, 0.02)
+            return "done"
+
+        result, cancelled = asyncio.run(
+            guard.run_low_priority("best-crm", MODEL, STAGE_OPERATIONS, _operations())
+        )
+
+        assert (result, cancelled) == ("done", False)
+
+
+class TestBudgetedSampling:
+    """Test suite for follow-up samples under a budget."""
+
+    def test_budget_stops_sampling(self, tmp_path):
+        """Test sampling stops with STOP_BUDGET once samples no longer fit."""
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=1,
+            models=1,
+            concurrency=1,
+            brand_count=3,
+        )
+        intent = config.intents[0]
+        sampling = SamplingConfig(min_samples=5, max_samples=5)
+        client = MockLLMClient(default_response="1. Toolmark000", cost_per_response=0.004)
+        guard = _guard(query_estimates={"mock/mock-model-0": 0.004})
+        group = SampleGroup(intent.id, "mock", "mock-model-0")
+        group.add(Sample(0, "2025-11-02T08:00:00Z", "1. Toolmark000", True, 1, 0.004))
+        guard.charge(intent.id, "mock/mock-model-0", 0.004)
+
+        asyncio.run(sample_until_stable(client, intent, config, group, sampling, guard))
+
+        assert len(group.samples) == 2
+        assert group.stop_reason(sampling) == STOP_BUDGET
+        assert guard.to_dict()["committed_usd"] == 0.008
+
+
+class TestBudgetedRun:
+    """Test suite for run_all() with a live budget."""
+
+    def test_queries_skipped_past_budget(self, tmp_path, monkeypatch):
+        """Test answers costlier than estimated stop the run at the budget."""
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=4,
+            models=1,
+            concurrency=1,
+            brand_count=3,
+        )
+        # Passes the up-front check (4 x $0.000323 + 20%), not the actual spend
+        config.run_settings.budget = BudgetConfig(max_per_run_usd=0.002)
+        init_db_if_needed(config.run_settings.sqlite_db_path)
+
+        def _build_client(provider, model_name, *args, **kwargs):
+            return MockLLMClient(
+                default_response="1. Toolmark000",
+                provider=provider,
+                model_name=model_name,
+                cost_per_response=0.001,
+            )
+
+        monkeypatch.setattr("llm_answer_watcher.llm_runner.runner.build_client", _build_client)
+        monkeypatch.setattr(
+            "llm_answer_watcher.utils.pricing._fetch_remote_pricing", lambda *_args: None
+        )
+
+        result = asyncio.run(run_all(config))
+
+        assert result["success_count"] == 2
+        assert result["error_count"] == 0
+        assert result["skipped_count"] == 2
+        assert result["total_cost_usd"] == pytest.approx(0.002)
+        meta = json.loads((Path(result["output_dir"]) / "run_meta.json").read_text())
+        guard = meta["spend_guard"]
+        assert guard["exhausted"] and guard["partial"]
+        assert guard["committed_usd"] == pytest.approx(0.002)
+        assert guard["reserved_usd"] == 0.0
+        assert guard["per_model"]["mock/mock-model-0"]["requests"] == 2
+        assert [s["stage"] for s in guard["skipped"]] == ["query", "query"]
+
+    def test_live_enforcement_opt_out(self, tmp_path):
+        """Test no guard is built without limits or with enforce_live off."""
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=1,
+            models=1,
+            concurrency=1,
+            brand_count=3,
+        )
+        estimate = {"per_model_costs": [], "per_operation_model_costs": []}
+
+        config.run_settings.budget = BudgetConfig(warn_threshold_usd=1.0)
+        assert SpendGuard.from_config(config, estimate) is None
+        config.run_settings.budget = BudgetConfig(max_per_run_usd=1.0, enforce_live=False)
+        assert SpendGuard.from_config(config, estimate) is None
+        config.run_settings.budget = BudgetConfig(max_per_run_usd=1.0)
+        assert SpendGuard.from_config(config, estimate).max_per_run_usd == 1.0
+
+    def test_cancelled_operations_keep_finished_results(self, tmp_path, monkeypatch):
+        """Test operations finished before a budget cancellation are charged and stored."""
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=1,
+            models=1,
+            concurrency=1,
+            brand_count=3,
+        )
+        config.run_settings.budget = BudgetConfig(max_per_run_usd=0.5, cancel_low_priority=True)
+        config = config.model_copy(
+            update={
+                "global_operations": [
+                    RuntimeOperation(id="gaps", prompt="Find gaps"),
+                    RuntimeOperation(id="actions", prompt="Act", depends_on=["gaps"]),
+                ]
+            }
+        )
+        init_db_if_needed(config.run_settings.sqlite_db_path)
+
+        guards = []
+        from_config = SpendGuard.from_config
+
+        def _from_config(config, cost_estimate):
+            guard = from_config(config, cost_estimate)
+            guards.append(guard)
+            return guard
+
+        async def _execute_operation(operation, context, runtime_config):
+            if operation.id == "gaps":
+                return OperationResult(
+                    operation_id="gaps",
+                    result_text="Gaps",
+                    tokens_used_input=10,
+                    tokens_used_output=20,
+                    cost_usd=0.001,
+                    timestamp_utc="2025-11-02T08:00:00Z",
+                    model_provider="mock",
+                    model_name="mock-model-0",
+                    rendered_prompt="Find gaps",
+                )
+            # Another task spends the rest of the budget while this one is in flight
+            guards[0].charge("other-intent", "mock/mock-model-1", 1.0)
+            await asyncio.sleep(5)
+            raise AssertionError("operation was not cancelled")
+
+        monkeypatch.setattr(SpendGuard, "from_config", staticmethod(_from_config))
+        monkeypatch.setattr(operation_executor, "execute_operation", _execute_operation)
+        with mock_llm_stack("1. Toolmark000"):
+            result = asyncio.run(run_all(config))
+
+        guard = guards[0].to_dict()
+        assert guard["cancelled"][0]["stage"] == STAGE_OPERATIONS
+        # Query, the finished operation and the other task's spend
+        assert guard["committed_usd"] == pytest.approx(result["total_cost_usd"] + 1.0)
+        assert guard["per_model"]["mock/mock-model-0"]["requests"] == 2
+        with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+            rows = conn.execute("SELECT operation_id, cost_usd FROM operations").fetchall()
+        assert rows == [("gaps", 0.001)]
@@ -0,0 +1,310 @@
+"""
+Tests for llm_runner.streaming and extractor.stream_detector modules.
+
+Tests cover:
+- Incremental mention detection across chunk boundaries
+- StreamBuffer length cap and time-to-first-token
+- Groq and Gemini SSE streaming (deltas, usage, truncation, errors)
+- run_all() with streaming: live partial answers, latency/TTFT columns
+- The GET /runs/live endpoint
+"""
+
+import asyncio
+import json
+import re
+import sqlite3
+
+import pytest
+
+from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config, mock_llm_stack
+from llm_answer_watcher.config.schema import StreamingConfig
+from llm_answer_watcher.extractor.mention_detector import detect_mentions
+from llm_answer_watcher.extractor.stream_detector import StreamingMentionDetector
+from llm_answer_watcher.llm_runner.gemini_client import GEMINI_API_BASE_URL, GeminiClient
+from llm_answer_watcher.llm_runner.groq_client import GROQ_API_BASE_URL, GroqClient
+from llm_answer_watcher.llm_runner.mock_client import MockLLMClient
+from llm_answer_watcher.llm_runner.models import supports_streaming
+from llm_answer_watcher.llm_runner.runner import run_all
+from llm_answer_watcher.llm_runner.streaming import StreamBuffer, get_live_answers
+from llm_answer_watcher.storage.db import init_db_if_needed
+
+SYSTEM_PROMPT = "You are a test assistant."
+
+
+def _sse(*events) -> bytes:
+    """Encode events as a server-sent events body."""
+    return "".join(
+        f"data: {event if isinstance(event, str) else json.dumps(event)}\n\n" for event in events
+    ).encode()
+
+
+def _groq_delta(text):
+    return {"choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+
+
+def _gemini_event(text, finish_reason=None, usage=None):
+    event = {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+    if finish_reason:
+        event["candidates"][0]["finishReason"] = finish_reason
+    if usage:
+        event["usageMetadata"] = usage
+    return event
+
+
+class TestStreamingMentionDetector:
+    """Test suite for StreamingMentionDetector."""
+
+    def test_matches_split_across_chunks(self):
+        """Test brands split over chunks are found once, when complete."""
+        detector = StreamingMentionDetector(["HubSpot"], ["Salesforce", "Hub"])
+
+        assert detector.feed("Try Sales") == []
+        assert [m.normalized_name for m in detector.feed("force or Hub")] == ["Salesforce"]
+        assert [m.normalized_name for m in detector.feed("Spot, then Hub")] == ["HubSpot"]
+        # "Hub" at the very end is only accepted once the stream is complete
+        assert [m.normalized_name for m in detector.finish()] == ["Hub"]
+        assert detector.feed("Spot again") == []
+
+    def test_agrees_with_detect_mentions(self):
+        """Test any chunking finds the same brands and positions as a full scan."""
+        text = "1. HubSpot\n2. Salesforce (salesforce.com)\n3. Pipedrive, or HubSpot again."
+        mine, competitors = ["HubSpot"], ["Salesforce", "Pipedrive", "Zoho"]
+        expected = {
+            (m.normalized_name, m.match_position) for m in detect_mentions(text, mine, competitors)
+        }
+
+        for size in (1, 3, 7, len(text)):
+            detector = StreamingMentionDetector(mine, competitors)
+            for i in range(0, len(text), size):
+                detector.feed(text[i : i + size])
+            detector.finish()
+            assert {(m.normalized_name, m.match_position) for m in detector.mentions} == expected
+
+
+class TestStreamBuffer:
+    """Test suite for StreamBuffer."""
+
+    def test_cap_and_first_token(self):
+        """Test deltas are forwarded up to the cap and TTFT is set once."""
+        chunks = []
+        buffer = StreamBuffer(chunks.append, max_answer_chars=8)
+
+        assert buffer.add("") is True
+        assert buffer.time_to_first_token_ms is None
+        assert buffer.add("Hello") is True
+        assert buffer.add(" world") is False
+        assert buffer.add("!") is False
+
+        assert chunks == ["Hello", " wo"]
+        assert buffer.text == "Hello wo"
+        assert buffer.truncated
+        assert buffer.time_to_first_token_ms >= 0
+
+
+class TestGroqStreaming:
+    """Test suite for GroqClient streaming."""
+
+    def test_streams_deltas_with_usage(self, httpx_mock):
+        """Test deltas reach on_chunk and usage comes from the final event."""
+        httpx_mock.add_response(
+            method="POST",
+            url=f"{GROQ_API_BASE_URL}/chat/completions",
+            content=_sse(
+                _groq_delta("Top CRMs: "),
+                _groq_delta("HubSpot and Salesforce."),
+                {
+                    "choices": [],
+                    "usage": {"prompt_tokens": 20, "completion_tokens": 8, "total_tokens": 28},
+                },
+                "[DONE]",
+            ),
+            headers={"content-type": "text/event-stream"},
+        )
+        client = GroqClient("llama-3.1-8b-instant", "gsk-test", SYSTEM_PROMPT)
+        chunks = []
+
+        response = asyncio.run(client.generate_answer("Best CRM?", on_chunk=chunks.append))
+
+        assert chunks == ["Top CRMs: ", "HubSpot and Salesforce."]
+        assert response.answer_text == "Top CRMs: HubSpot and Salesforce."
+        assert response.tokens_used == 28
+        assert response.time_to_first_token_ms is not None
+        assert not response.truncated
+        request = json.loads(httpx_mock.get_request().content)
+        assert request["stream"] is True
+        assert request["stream_options"] == {"include_usage": True}
+
+    def test_cap_closes_stream_and_estimates_usage(self, httpx_mock):
+        """Test the length cap cuts the answer and estimates missing usage."""
+        httpx_mock.add_response(
+            method="POST",
+            url=f"{GROQ_API_BASE_URL}/chat/completions",
+            content=_sse(*[_groq_delta("x" * 60) for _ in range(5)], "[DONE]"),
+        )
+        client = GroqClient("llama-3.1-8b-instant", "gsk-test", SYSTEM_PROMPT)
+
+        response = asyncio.run(
+            client.generate_answer("Best CRM?", on_chunk=lambda _: None, max_answer_chars=100)
+        )
+
+        assert len(response.answer_text) == 100
+        assert response.truncated
+        assert response.completion_tokens == 25
+        assert response.prompt_tokens > 0
+
+    def test_non_retryable_error(self, httpx_mock):
+        """Test a 401 on a streamed request fails fast with the API message."""
+        httpx_mock.add_response(
+            method="POST",
+            url=f"{GROQ_API_BASE_URL}/chat/completions",
+            status_code=401,
+            json={"error": {"message": "Invalid API key"}},
+        )
+        client = GroqClient("llama-3.1-8b-instant", "gsk-test", SYSTEM_PROMPT)
+
+        with pytest.raises(RuntimeError, match="Invalid API key"):
+            asyncio.run(client.generate_answer("Best CRM?", on_chunk=lambda _: None))
+
+
+class TestGeminiStreaming:
+    """Test suite for GeminiClient streaming."""
+
+    def test_streams_deltas(self, httpx_mock):
+        """Test streamGenerateContent deltas are joined and validated."""
+        httpx_mock.add_response(
+            method="POST",
+            url=re.compile(
+                re.escape(f"{GEMINI_API_BASE_URL}/models/gemini-2.5-flash:streamGenerateContent")
+                + r"\?.*alt=sse.*"
+            ),
+            content=_sse(
+                _gemini_event("HubSpot leads, "),
+                _gemini_event(
+                    "then Salesforce.",
+                    finish_reason="STOP",
+                    usage={"promptTokenCount": 12, "candidatesTokenCount": 6},
+                ),
+            ),
+        )
+        client = GeminiClient("gemini-2.5-flash", "AIza-test", SYSTEM_PROMPT)
+        chunks = []
+
+        response = asyncio.run(client.generate_answer("Best CRM?", on_chunk=chunks.append))
+
+        assert chunks == ["HubSpot leads, ", "then Salesforce."]
+        assert response.answer_text == "HubSpot leads, then Salesforce."
+        assert (response.prompt_tokens, response.completion_tokens) == (12, 6)
+        assert response.tokens_used == 18
+
+    def test_blocked_stream_raises(self, httpx_mock):
+        """Test a safety stop on the last event fails like a complete response."""
+        httpx_mock.add_response(
+            method="POST",
+            url=re.compile(r".*:streamGenerateContent.*"),
+            content=_sse(_gemini_event("Partial", finish_reason="SAFETY")),
+        )
+        client = GeminiClient("gemini-2.5-flash", "AIza-test", SYSTEM_PROMPT)
+
+        with pytest.raises(RuntimeError, match="safety filters"):
+            asyncio.run(client.generate_answer("Best CRM?", on_chunk=lambda _: None))
+
+
+class TestStreamedRun:
+    """Test suite for run_all() with streaming enabled."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        config = build_benchmark_config(
+            output_dir=str(tmp_path / "output"),
+            db_path=str(tmp_path / "watcher.db"),
+            intents=2,
+            models=1,
+            concurrency=2,
+            brand_count=3,
+        )
+        config.run_settings.streaming = StreamingConfig()
+        init_db_if_needed(config.run_settings.sqlite_db_path)
+        return config
+
+    def test_live_answers_and_timings(self, config):
+        """Test partial answers are published while streaming and timings stored."""
+        seen = []
+
+        class Tracker:
+            async def start_query(self, intent_id, provider, model):
+                pass
+
+            async def complete_query(self, query_key, success=True):
+                pass
+
+            def stream_query(self, live):
+                seen.append((len(live.text), list(live.mentions), get_live_answers().snapshot()))
+
+        answer = "Top tools:\n1. Toolmark001\n2. Toolmark000\n3. Toolmark002"
+        with mock_llm_stack(answer, streaming_chunk_size=8):
+            assert supports_streaming(MockLLMClient())
+            result = asyncio.run(run_all(config, progress_callback=Tracker()))
+
+        assert result["success_count"] == 2
+        # Every chunk was published, and brands show up before the answer is complete
+        assert len(seen) == 2 * 7
+        assert any(mentions and length < len(answer) for length, mentions, _ in seen)
+        assert seen[-1][1] == ["Toolmark001", "Toolmark000"]
+        assert all(snapshot for _, _, snapshot in seen)
+        assert get_live_answers().snapshot() == []
+
+        with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+            rows = conn.execute(
+                "SELECT latency_ms, time_to_first_token_ms, truncated FROM answers_raw"
+            ).fetchall()
+        assert len(rows) == 2
+        for latency_ms, ttft_ms, truncated in rows:
+            assert latency_ms >= ttft_ms >= 0
+            assert truncated == 0
+
+    def test_length_cap(self, config):
+        """Test answers are cut off at max_answer_chars and marked truncated."""
+        config.run_settings.streaming = StreamingConfig(max_answer_chars=100)
+
+        with mock_llm_stack("1. Toolmark000 " + "x" * 500, streaming_chunk_size=50):
+            result = asyncio.run(run_all(config))
+
+        assert result["success_count"] == 2
+        with sqlite3.connect(config.run_settings.sqlite_db_path) as conn:
+            rows = conn.execute("SELECT answer_length, truncated FROM answers_raw").fetchall()
+        assert rows == [(100, 1), (100, 1)]
+
+    def test_config_validated(self):
+        """Test tiny length caps are rejected."""
+        with pytest.raises(ValueError, match="max_answer_chars"):
+            StreamingConfig(max_answer_chars=10)
+
+
+class TestLiveEndpoint:
+    """Test suite for GET /runs/live."""
+
+    def test_only_own_answers(self):
+        """Test users only see their own in-flight answers."""
+        from fastapi.testclient import TestClient
+
+        from llm_answer_watcher.api import app as api_app
+        from llm_answer_watcher.auth.dependencies import get_current_user
+
+        registry = get_live_answers()
+        mine = registry.start("run-1", "1", "best-crm", "groq", "llama-3.1-8b-instant")
+        other = registry.start("run-2", "2", "best-crm", "groq", "llama-3.1-8b-instant")
+        mine.text = "Top CRMs: HubSpot"
+        mine.mentions.append("HubSpot")
+        api_app.dependency_overrides[get_current_user] = lambda: {"id": 1, "username": "alice"}
+        try:
+            response = TestClient(api_app).get("/runs/live")
+        finally:
+            api_app.dependency_overrides.clear()
+            registry.finish(mine)
+            registry.finish(other)
+
+        assert response.status_code == 200
+        [answer] = response.json()
+        assert answer["run_id"] == "run-1"
+        assert answer["answer_text"] == "Top CRMs: HubSpot"
+        assert answer["mentions"] == ["HubSpot"]
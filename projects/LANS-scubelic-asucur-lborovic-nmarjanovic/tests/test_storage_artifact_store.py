@@ -0,0 +1,186 @@
+"""
+Tests for storage.artifact_store module.
+
+Tests cover:
+- Packed archive round-trip with random access via the offset index
+- Atomic finalize (no archive/index until finalize, .partial removed on abort)
+- Routing of storage.writer write_* calls to an open archive
+- RunArtifacts serving both backends, report generation and artifact export
+"""
+
+import gzip
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from llm_answer_watcher.storage.artifact_store import (
+    PackedArtifactWriter,
+    RunArtifacts,
+    abort_packed_artifacts,
+    finalize_packed_artifacts,
+    get_packed_artifacts,
+    open_packed_artifacts,
+)
+from llm_answer_watcher.storage.exporter import export_run_artifacts
+from llm_answer_watcher.storage.writer import (
+    write_error,
+    write_parsed_answer,
+    write_raw_answer,
+)
+
+
+class TestPackedArtifactWriter:
+    """Test suite for PackedArtifactWriter."""
+
+    def test_round_trip_random_access(self, tmp_path):
+        """Test records are readable by name after finalize, last write wins."""
+        writer = PackedArtifactWriter(str(tmp_path), codec="gzip")
+        writer.start()
+        for i in range(50):
+            writer.put(f"intent_{i}_raw_openai_gpt.json", {"answer_text": f"answer {i}"})
+        writer.put("intent_7_raw_openai_gpt.json", {"answer_text": "rewritten"})
+        archive = writer.finalize()
+
+        assert archive.endswith("artifacts.jsonl.gz")
+        assert writer.count == 50
+        with RunArtifacts(tmp_path) as artifacts:
+            assert artifacts.packed
+            assert artifacts.read_json("intent_42_raw_openai_gpt.json") == {"answer_text": "answer 42"}
+            assert artifacts.read_json("intent_7_raw_openai_gpt.json") == {"answer_text": "rewritten"}
+
+    def test_archive_is_concatenated_jsonl(self, tmp_path):
+        """Test the archive decompresses as a whole to plain JSONL."""
+        writer = PackedArtifactWriter(str(tmp_path), codec="gzip")
+        writer.start()
+        writer.put("a.json", {"x": 1})
+        writer.put("b.json", {"x": 2})
+        archive = writer.finalize()
+
+        with gzip.open(archive, "rt", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+        assert records == [{"name": "a.json", "data": {"x": 1}}, {"name": "b.json", "data": {"x": 2}}]
+
+    def test_nothing_published_until_finalize(self, tmp_path):
+        """Test only the .partial file exists while the archive is open."""
+        writer = PackedArtifactWriter(str(tmp_path), codec="gzip")
+        writer.start()
+        writer.put("a.json", {"x": 1})
+
+        assert sorted(os.listdir(tmp_path)) == ["artifacts.jsonl.gz.partial"]
+
+        writer.abort()
+
+        assert os.listdir(tmp_path) == []
+
+    def test_non_serializable_fails_at_call_site(self, tmp_path):
+        """Test TypeError is raised by put(), not swallowed by the thread."""
+        writer = PackedArtifactWriter(str(tmp_path), codec="gzip")
+        writer.start()
+
+        with pytest.raises(TypeError, match="not JSON-serializable"):
+            writer.put("a.json", {"x": object()})
+
+        writer.abort()
+
+    def test_unknown_codec_rejected(self, tmp_path):
+        """Test unknown codecs are rejected."""
+        with pytest.raises(ValueError, match="Unknown artifact codec"):
+            PackedArtifactWriter(str(tmp_path), codec="lz4")
+
+
+class TestWriterRouting:
+    """Test suite for storage.writer routing and RunArtifacts."""
+
+    def test_write_functions_route_to_open_archive(self, tmp_path):
+        """Test write_* calls go to the archive while it is open."""
+        run_dir = str(tmp_path)
+        open_packed_artifacts(run_dir, codec="gzip")
+        try:
+            write_raw_answer(run_dir, "intent-a", "openai", "gpt-4o-mini", {"answer_text": "hi"})
+            write_parsed_answer(run_dir, "intent-a", "openai", "gpt-4o-mini", {"my_mentions": [1]})
+            write_error(run_dir, "intent-b", "openai", "gpt-4o-mini", "boom")
+        finally:
+            finalize_packed_artifacts(run_dir)
+
+        assert get_packed_artifacts(run_dir) is None
+        assert not list(tmp_path.glob("intent_*.json"))
+        with RunArtifacts(tmp_path) as artifacts:
+            assert artifacts.names("intent_*.json") == [
+                "intent_intent-a_parsed_openai_gpt-4o-mini.json",
+                "intent_intent-a_raw_openai_gpt-4o-mini.json",
+                "intent_intent-b_error_openai_gpt-4o-mini.json",
+            ]
+            error_data = artifacts.read_json("intent_intent-b_error_openai_gpt-4o-mini.json")
+            assert error_data["error_message"] == "boom"
+
+    def test_abort_discards_archive(self, tmp_path):
+        """Test abort leaves no archive or index behind."""
+        run_dir = str(tmp_path)
+        open_packed_artifacts(run_dir, codec="gzip")
+        write_raw_answer(run_dir, "intent-a", "openai", "gpt-4o-mini", {"answer_text": "hi"})
+        abort_packed_artifacts(run_dir)
+
+        assert os.listdir(tmp_path) == []
+
+    def test_run_artifacts_reads_loose_files(self, tmp_path):
+        """Test RunArtifacts serves the files backend unchanged."""
+        write_raw_answer(str(tmp_path), "intent-a", "openai", "gpt-4o-mini", {"answer_text": "hi"})
+
+        with RunArtifacts(tmp_path) as artifacts:
+            assert not artifacts.packed
+            assert artifacts.exists("intent_intent-a_raw_openai_gpt-4o-mini.json")
+            assert not artifacts.exists("missing.json")
+            with pytest.raises(FileNotFoundError):
+                artifacts.read_json("missing.json")
+
+    @pytest.mark.parametrize("backend", ["files", "packed"])
+    def test_run_all_report_and_export(self, tmp_path, backend):
+        """Test a full run produces the same report and export for both backends."""
+        from llm_answer_watcher.benchmarks.scenarios import (
+            _run_all_once,
+            build_benchmark_config,
+            make_answer,
+            make_brand_names,
+            mock_llm_stack,
+        )
+        from llm_answer_watcher.report.generator import _build_template_data
+
+        config = build_benchmark_config(
+            str(tmp_path / "output"),
+            str(tmp_path / "watcher.db"),
+            intents=3,
+            models=2,
+            concurrency=2,
+            artifact_backend=backend,
+        )
+        with mock_llm_stack(make_answer(make_brand_names(10), 500)):
+            summary = _run_all_once(config)
+        run_dir = summary["output_dir"]
+
+        meta = json.loads((Path(run_dir) / "run_meta.json").read_text())
+        assert meta["artifact_backend"] == backend
+        assert (Path(run_dir) / "artifacts.index.json").exists() == (backend == "packed")
+
+        results = [
+            {
+                "intent_id": intent.id,
+                "provider": model.provider,
+                "model_name": model.model_name,
+                "status": "success",
+                "cost_usd": 0.0,
+            }
+            for intent in config.intents
+            for model in config.models
+        ]
+        data = _build_template_data(Path(run_dir), summary["run_id"], config, results)
+        loaded = [r for intent in data["intents"] for r in intent["results"]]
+        assert len(loaded) == 6
+        assert all(r["appeared_mine"] and r["answer_text"] for r in loaded)
+
+        output = tmp_path / "parsed.jsonl"
+        count = export_run_artifacts(str(output), run_dir, "*_parsed_*.json")
+        assert count == 6
+        assert all(json.loads(line)["data"]["appeared_mine"] for line in output.read_text().splitlines())
@@ -0,0 +1,188 @@
+"""
+Tests for storage.blobs module and the schema v11 answer blob storage.
+
+Tests cover:
+- Compression round-trip and the raw fallback for short texts
+- Deduplication of identical answers and prompts across runs
+- get_answers_raw() read-through including web search results
+- Migration of a v10 database with inline texts to v11
+- Garbage collection of orphaned blobs
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from llm_answer_watcher.storage import blobs
+from llm_answer_watcher.storage.db import (
+    CURRENT_SCHEMA_VERSION,
+    apply_migrations,
+    get_answers_raw,
+    get_schema_version,
+    init_db_if_needed,
+    insert_answer_raw,
+    insert_run,
+)
+
+ANSWER = "Here are the best email warmup tools: Warmly, Lemwarm, Instantly. " * 40
+
+
+def _insert(conn, run_id: str, intent_id: str, answer_text: str = ANSWER, **kwargs) -> None:
+    """Insert a run (if needed) and one answer."""
+    insert_run(conn, run_id, "2025-11-02T08:00:00Z", 1, 1)
+    insert_answer_raw(
+        conn,
+        run_id=run_id,
+        intent_id=intent_id,
+        model_provider="openai",
+        model_name="gpt-4o-mini",
+        timestamp_utc="2025-11-02T08:00:05Z",
+        prompt="What are the best email warmup tools?",
+        answer_text=answer_text,
+        **kwargs,
+    )
+
+
+class TestCompression:
+    """Test suite for compress_text/decompress_text."""
+
+    @pytest.mark.parametrize("codec", ["zlib", "raw"])
+    def test_round_trip(self, codec):
+        """Test texts survive compression with every stdlib codec."""
+        text = "Unicode: 你好 🚀 café " * 100
+
+        used, data = blobs.compress_text(text, codec)
+
+        assert used == codec
+        assert blobs.decompress_text(used, data) == text
+        if codec == "zlib":
+            assert len(data) < len(text.encode("utf-8")) / 10
+
+    def test_short_text_stored_raw(self):
+        """Test short texts skip compression."""
+        assert blobs.compress_text("hi", "zlib") == ("raw", b"hi")
+
+    def test_unknown_codec_rejected(self):
+        """Test unknown codecs are rejected."""
+        with pytest.raises(ValueError, match="Unknown blob codec"):
+            blobs.decompress_text("lz4", b"")
+
+
+class TestAnswerBlobs:
+    """Test suite for content-addressed answer storage."""
+
+    def test_identical_answers_stored_once(self, tmp_path):
+        """Test the same answer across runs is one blob."""
+        db_path = tmp_path / "watcher.db"
+        init_db_if_needed(str(db_path))
+
+        with sqlite3.connect(db_path) as conn:
+            for hour in range(5):
+                _insert(conn, f"2025-11-02T0{hour}-00-00Z", "email-warmup")
+            conn.commit()
+
+            blob_count = conn.execute("SELECT COUNT(*) FROM answer_blobs").fetchone()[0]
+            stored_bytes = conn.execute("SELECT SUM(LENGTH(data)) FROM answer_blobs").fetchone()[0]
+            hashes = {
+                row[0] for row in conn.execute("SELECT answer_hash FROM answers_raw")
+            }
+
+        # One prompt blob + one answer blob for five rows
+        assert blob_count == 2
+        assert hashes == {blobs.content_hash(ANSWER)}
+        assert stored_bytes < len(ANSWER) / 5
+
+    def test_get_answers_raw_resolves_texts(self, tmp_path):
+        """Test texts are read through transparently."""
+        db_path = tmp_path / "watcher.db"
+        init_db_if_needed(str(db_path))
+        results = json.dumps([{"url": "https://example.com", "title": "Example"}])
+
+        with sqlite3.connect(db_path) as conn:
+            _insert(conn, "run-1", "a", web_search_count=1, web_search_results_json=results)
+            _insert(conn, "run-1", "b", answer_text="Short answer")
+            conn.commit()
+
+            rows = get_answers_raw(conn, "run-1")
+            only_b = get_answers_raw(conn, "run-1", intent_id="b")
+
+        assert [row["intent_id"] for row in rows] == ["a", "b"]
+        assert rows[0]["answer_text"] == ANSWER
+        assert rows[0]["prompt"] == "What are the best email warmup tools?"
+        assert rows[0]["web_search_results_json"] == results
+        assert rows[1]["web_search_results_json"] is None
+        assert [row["answer_text"] for row in only_b] == ["Short answer"]
+
+    def test_delete_orphan_blobs(self, tmp_path):
+        """Test blobs are collected once no row references them."""
+        db_path = tmp_path / "watcher.db"
+        init_db_if_needed(str(db_path))
+
+        with sqlite3.connect(db_path) as conn:
+            _insert(conn, "run-1", "a")
+            _insert(conn, "run-2", "a", answer_text="Different answer")
+            conn.commit()
+
+            conn.execute("DELETE FROM answers_raw WHERE run_id = 'run-2'")
+            deleted = blobs.delete_orphan_blobs(conn)
+            conn.commit()
+
+            assert deleted == 1
+            assert blobs.get_blob(conn, blobs.content_hash(ANSWER)) == ANSWER
+            assert get_answers_raw(conn, "run-1")[0]["answer_text"] == ANSWER
+
+
+class TestMigrationToV11:
+    """Test suite for migrating inline answer texts to answer_blobs."""
+
+    def test_migrates_existing_rows(self, tmp_path):
+        """Test a v10 database keeps every row and text after migration."""
+        db_path = tmp_path / "watcher.db"
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE schema_version (
+                    version INTEGER PRIMARY KEY,
+                    applied_at TEXT NOT NULL
+                )
+            """)
+            apply_migrations(conn, 0, 10)
+            insert_run(conn, "run-1", "2025-11-02T08:00:00Z", 3, 1)
+            for intent_id in ("a", "b", "c"):
+                conn.execute(
+                    """
+                    INSERT INTO answers_raw (
+                        run_id, intent_id, model_provider, model_name, timestamp_utc,
+                        prompt, answer_text, answer_length, web_search_count,
+                        web_search_results_json, runner_type, runner_name
+                    ) VALUES (?, ?, 'openai', 'gpt-4o-mini', '2025-11-02T08:00:05Z',
+                              'Prompt', ?, ?, 0, ?, 'browser', 'steel-chatgpt')
+                    """,
+                    (
+                        "run-1",
+                        intent_id,
+                        ANSWER,
+                        len(ANSWER),
+                        "[]" if intent_id == "a" else None,
+                    ),
+                )
+            conn.commit()
+
+        init_db_if_needed(str(db_path))
+
+        with sqlite3.connect(db_path) as conn:
+            assert get_schema_version(conn) == CURRENT_SCHEMA_VERSION
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(answers_raw)")}
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(answers_raw)")}
+            rows = get_answers_raw(conn, "run-1")
+            blob_count = conn.execute("SELECT COUNT(*) FROM answer_blobs").fetchone()[0]
+
+        assert "answer_text" not in columns
+        assert {"prompt_hash", "answer_hash", "web_search_results_hash"} <= columns
+        assert {"idx_answers_timestamp", "idx_answers_runner_type", "idx_answers_runner_name"} <= indexes
+        assert [row["answer_text"] for row in rows] == [ANSWER] * 3
+        assert rows[0]["web_search_results_json"] == "[]"
+        assert rows[0]["runner_name"] == "steel-chatgpt"
+        # Prompt, answer and "[]" stored once each
+        assert blob_count == 3
@@ -0,0 +1,151 @@
+"""
+Tests for storage.connection module.
+
+Tests cover:
+- Pragmas applied to writer and reader connections
+- Transaction semantics of write_connection() (nested blocks included) and
+  query-only readers
+- Pools replaced when the database file is deleted
+- Concurrent writers and readers without "database is locked" errors
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from llm_answer_watcher.storage import connection as connection_module
+from llm_answer_watcher.storage.connection import (
+    close_connection_pools,
+    get_connection_pool,
+    read_connection,
+    write_connection,
+)
+from llm_answer_watcher.storage.db import get_all_runs, init_db_if_needed, insert_run
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "watcher.db")
+    init_db_if_needed(path)
+    yield path
+    close_connection_pools()
+
+
+def _insert_run(conn, run_id):
+    insert_run(conn, run_id, "2025-11-02T08:00:00Z", total_intents=1, total_models=1)
+
+
+class TestConnections:
+    """Test suite for pooled connections."""
+
+    def test_pragmas(self, db_path):
+        """Test writer and readers get the tuned pragmas."""
+        with write_connection(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16384
+        with read_connection(db_path) as conn:
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    def test_write_commits_or_rolls_back(self, db_path):
+        """Test a block is committed on success and rolled back on error."""
+        with write_connection(db_path) as conn:
+            _insert_run(conn, "2025-11-02T08-00-00Z")
+        with pytest.raises(RuntimeError), write_connection(db_path) as conn:
+            _insert_run(conn, "2025-11-02T09-00-00Z")
+            raise RuntimeError("insert failed")
+
+        with read_connection(db_path) as conn:
+            assert [run["run_id"] for run in get_all_runs(conn)] == ["2025-11-02T08-00-00Z"]
+
+    def test_nested_write_joins_outer_transaction(self, db_path):
+        """Test an inner block doesn't commit the outer transaction early."""
+        with pytest.raises(RuntimeError), write_connection(db_path) as outer:
+            _insert_run(outer, "2025-11-02T08-00-00Z")
+            with write_connection(db_path) as inner:
+                assert inner is outer
+                _insert_run(inner, "2025-11-02T09-00-00Z")
+            assert outer.in_transaction
+            raise RuntimeError("insert failed")
+
+        with read_connection(db_path) as conn:
+            assert get_all_runs(conn) == []
+
+    def test_readers_are_query_only(self, db_path):
+        """Test readers reject writes and don't leak row factories."""
+        with read_connection(db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                _insert_run(conn, "2025-11-02T08-00-00Z")
+        with read_connection(db_path) as conn:
+            assert conn.row_factory is None
+
+    def test_pool_replaced_after_delete(self, db_path, tmp_path):
+        """Test a deleted and recreated database gets a fresh pool."""
+        pool = get_connection_pool(db_path)
+        for suffix in ("", "-wal", "-shm"):
+            (tmp_path / f"watcher.db{suffix}").unlink(missing_ok=True)
+        init_db_if_needed(db_path)
+
+        assert get_connection_pool(db_path) is not pool
+        with write_connection(db_path) as conn:
+            _insert_run(conn, "2025-11-02T08-00-00Z")
+
+    def test_lru_pools_closed(self, tmp_path, monkeypatch):
+        """Test only MAX_POOLS databases keep open connections."""
+        monkeypatch.setattr(connection_module, "MAX_POOLS", 2)
+        pools = [get_connection_pool(str(tmp_path / f"db{i}.db")) for i in range(3)]
+
+        with pytest.raises(sqlite3.ProgrammingError), pools[0].write():
+            pass
+        with pools[2].write() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+        close_connection_pools()
+
+
+class TestConcurrency:
+    """Stress test for concurrent writers and readers."""
+
+    def test_concurrent_writers_and_readers(self, db_path):
+        """Test threads writing and reading at once never hit a locked database."""
+        writers, readers, runs_per_writer = 8, 8, 25
+        errors = []
+        seen_counts = []
+        start = threading.Barrier(writers + readers)
+
+        def _write(worker):
+            start.wait()
+            try:
+                for i in range(runs_per_writer):
+                    with write_connection(db_path) as conn:
+                        _insert_run(conn, f"2025-11-02T08-{worker:02d}-{i:02d}Z")
+            except Exception as e:
+                errors.append(e)
+
+        def _read():
+            start.wait()
+            try:
+                for _ in range(runs_per_writer):
+                    with read_connection(db_path) as conn:
+                        count = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+                    seen_counts.append(count)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=_write, args=(w,)) for w in range(writers)]
+        threads += [threading.Thread(target=_read) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with read_connection(db_path) as conn:
+            total = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        assert total == writers * runs_per_writer
+        assert max(seen_counts) <= total
+        assert len(get_connection_pool(db_path)._idle_readers) <= 4
@@ -25,6 +25,9 @@ from freezegun import freeze_time
 from llm_answer_watcher.storage.db import (
     CURRENT_SCHEMA_VERSION,
     apply_migrations,
+    create_user,
+    delete_all_runs_for_user,
+    get_answers_raw,
     get_run_summary,
     get_schema_version,
     init_db_if_needed,
@@ -33,6 +36,7 @@ from llm_answer_watcher.storage.db import (
     insert_run,
     update_run_cost,
 )
+from llm_answer_watcher.storage.connection import close_connection_pools, write_connection
 from llm_answer_watcher.utils.time import utc_timestamp
 
 # ============================================================================
@@ -474,18 +478,19 @@ def test_insert_answer_raw_stores_response(tmp_path):
         )
         conn.commit()
 
-        cursor = conn.execute("SELECT * FROM answers_raw WHERE run_id = ?", (run_id,))
-        row = cursor.fetchone()
+        rows = get_answers_raw(conn, run_id)
 
-    assert row is not None
-    assert row[1] == run_id
-    assert row[2] == "email-warmup"
-    assert row[3] == "openai"
-    assert row[4] == "gpt-4o-mini"
-    assert row[7] == answer_text
-    assert row[8] == len(answer_text)  # answer_length computed correctly
-    assert row[9] == json.dumps(usage_meta)
-    assert row[10] == 0.0012
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["run_id"] == run_id
+    assert row["intent_id"] == "email-warmup"
+    assert row["model_provider"] == "openai"
+    assert row["model_name"] == "gpt-4o-mini"
+    assert row["prompt"] == "What are the best email warmup tools?"
+    assert row["answer_text"] == answer_text
+    assert row["answer_length"] == len(answer_text)  # answer_length computed correctly
+    assert row["usage_meta_json"] == json.dumps(usage_meta)
+    assert row["estimated_cost_usd"] == 0.0012
 
 
 def test_insert_answer_raw_computes_answer_length(tmp_path):
@@ -591,10 +596,7 @@ def test_insert_answer_raw_is_idempotent(tmp_path):
         conn.commit()
 
         # Should still have first answer
-        cursor = conn.execute(
-            "SELECT answer_text FROM answers_raw WHERE run_id = ?", (run_id,)
-        )
-        answer_text = cursor.fetchone()[0]
+        answer_text = get_answers_raw(conn, run_id)[0]["answer_text"]
 
     assert answer_text == "First answer"
 
@@ -622,10 +624,7 @@ def test_insert_answer_raw_with_unicode(tmp_path):
         )
         conn.commit()
 
-        cursor = conn.execute(
-            "SELECT answer_text FROM answers_raw WHERE run_id = ?", (run_id,)
-        )
-        stored_text = cursor.fetchone()[0]
+        stored_text = get_answers_raw(conn, run_id)[0]["answer_text"]
 
     assert stored_text == answer_text
 
@@ -1291,6 +1290,57 @@ def test_foreign_key_allows_valid_references(tmp_path):
     assert mention_count == 1
 
 
+def test_delete_runs_with_children_under_foreign_keys(tmp_path):
+    """Test runs with answers and mentions can be deleted with foreign keys enforced."""
+    db_path = str(tmp_path / "test.db")
+    init_db_if_needed(db_path)
+    timestamp = utc_timestamp()
+
+    try:
+        with write_connection(db_path) as conn:
+            user_id = create_user(conn, "alice", "alice@example.com", "hash")
+            other_id = create_user(conn, "bob", "bob@example.com", "hash")
+            for run_id, owner in [("run-1", user_id), ("run-2", user_id), ("run-3", other_id)]:
+                insert_run(conn, run_id, timestamp, 1, 1, user_id=owner)
+                insert_answer_raw(
+                    conn,
+                    run_id=run_id,
+                    intent_id="test",
+                    model_provider="openai",
+                    model_name="gpt-4o-mini",
+                    timestamp_utc=timestamp,
+                    prompt="Test",
+                    answer_text="Answer",
+                )
+                insert_mention(
+                    conn,
+                    run_id=run_id,
+                    timestamp_utc=timestamp,
+                    intent_id="test",
+                    model_provider="openai",
+                    model_name="gpt-4o-mini",
+                    brand_name="Warmly",
+                    normalized_name="warmly",
+                    is_mine=True,
+                )
+
+        with write_connection(db_path) as conn:
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert delete_all_runs_for_user(conn, user_id) == 2
+
+        with write_connection(db_path) as conn:
+            for table in ("runs", "answers_raw", "mentions"):
+                run_ids = [row[0] for row in conn.execute(f"SELECT run_id FROM {table}")]
+                assert run_ids == ["run-3"]
+
+            # Deleting a user cascades to its runs, and the runs to their rows
+            conn.execute("DELETE FROM users WHERE id = ?", (other_id,))
+            for table in ("runs", "answers_raw", "mentions"):
+                assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+    finally:
+        close_connection_pools()
+
+
 # ============================================================================
 # Integration Tests - Complete Workflow
 # ============================================================================
@@ -1524,15 +1574,11 @@ def test_empty_strings_handled_correctly(tmp_path):
         )
         conn.commit()
 
-        cursor = conn.execute(
-            "SELECT prompt, answer_text, answer_length FROM answers_raw WHERE run_id = ?",
-            (run_id,),
-        )
-        row = cursor.fetchone()
+        row = get_answers_raw(conn, run_id)[0]
 
-    assert row[0] == ""
-    assert row[1] == ""
-    assert row[2] == 0
+    assert row["prompt"] == ""
+    assert row["answer_text"] == ""
+    assert row["answer_length"] == 0
 
 
 def test_very_long_text_stored_correctly(tmp_path):
@@ -1558,14 +1604,10 @@ def test_very_long_text_stored_correctly(tmp_path):
         )
         conn.commit()
 
-        cursor = conn.execute(
-            "SELECT answer_text, answer_length FROM answers_raw WHERE run_id = ?",
-            (run_id,),
-        )
-        row = cursor.fetchone()
+        row = get_answers_raw(conn, run_id)[0]
 
-    assert row[0] == long_text
-    assert row[1] == 50000
+    assert row["answer_text"] == long_text
+    assert row["answer_length"] == 50000
 
 
 def test_sql_injection_prevention_in_queries(tmp_path):
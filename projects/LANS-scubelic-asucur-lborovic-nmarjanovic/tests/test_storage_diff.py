@@ -0,0 +1,228 @@
+"""
+Tests for storage.diff module.
+
+Tests cover:
+- Classifying brands as appeared, disappeared, rank up/down or unchanged
+- Leaving out queries answered in only one run (unpaired_queries)
+- Streaming in batches
+- The HTML diff report
+- The `diff` CLI command and the API endpoint
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+
+import pytest
+from typer.testing import CliRunner
+
+from llm_answer_watcher.cli import app
+from llm_answer_watcher.report.diff import generate_diff_report
+from llm_answer_watcher.storage.connection import close_connection_pools
+from llm_answer_watcher.storage.db import init_db_if_needed, insert_mention, insert_run
+from llm_answer_watcher.storage.diff import (
+    CHANGE_APPEARED,
+    CHANGE_DISAPPEARED,
+    CHANGE_RANK_DOWN,
+    CHANGE_RANK_UP,
+    CHANGE_UNCHANGED,
+    DiffCounter,
+    diff_runs,
+    unpaired_queries,
+)
+
+RUN_A = "2025-11-01T08-00-00Z"
+RUN_B = "2025-11-02T08-00-00Z"
+
+# run_id -> {(intent_id, model_name): [(brand, rank), ...]}
+MENTIONS = {
+    RUN_A: {
+        ("crm", "gpt-4o-mini"): [
+            ("HubSpot", 2),
+            ("Salesforce", 1),
+            ("Pipedrive", 3),
+            ("Zoho", None),
+        ],
+        ("crm", "gpt-4o"): [("HubSpot", 1)],
+        ("email", "gpt-4o-mini"): [("Mailchimp", 1)],
+    },
+    RUN_B: {
+        ("crm", "gpt-4o-mini"): [
+            ("HubSpot", 1),
+            ("Salesforce", 2),
+            ("Zoho", None),
+            ("Close", 4),
+        ],
+        ("crm", "gpt-4o"): [("HubSpot", 1)],
+        ("seo", "gpt-4o-mini"): [("Ahrefs", 1)],
+    },
+}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "watcher.db"
+    init_db_if_needed(str(path))
+    with closing(sqlite3.connect(path)) as conn:
+        for run_id, queries in MENTIONS.items():
+            ts = run_id.replace("-00-00Z", ":00:00Z")
+            insert_run(conn, run_id, ts, 3, 2, user_id=1)
+            for (intent_id, model_name), brands in queries.items():
+                for brand, rank in brands:
+                    insert_mention(
+                        conn,
+                        run_id=run_id,
+                        timestamp_utc=ts,
+                        intent_id=intent_id,
+                        model_provider="openai",
+                        model_name=model_name,
+                        brand_name=brand,
+                        normalized_name=brand.lower(),
+                        is_mine=brand == "HubSpot",
+                        rank_position=rank,
+                    )
+        conn.commit()
+    return path
+
+
+class TestDiffRuns:
+    """Test suite for diff_runs()."""
+
+    def test_classifies_changes(self, db_path):
+        """Test every kind of change is detected and unchanged brands are skipped."""
+        with sqlite3.connect(db_path) as conn:
+            deltas = {d.normalized_name: d for d in diff_runs(conn, RUN_A, RUN_B)}
+
+        assert {name: d.change for name, d in deltas.items()} == {
+            "hubspot": CHANGE_RANK_UP,
+            "salesforce": CHANGE_RANK_DOWN,
+            "pipedrive": CHANGE_DISAPPEARED,
+            "close": CHANGE_APPEARED,
+        }
+        assert deltas["hubspot"].is_mine
+        assert deltas["hubspot"].rank_delta == 1
+        assert deltas["close"].rank_delta is None
+
+    def test_include_unchanged_and_batches(self, db_path):
+        """Test unchanged brands are included on request, across small batches."""
+        with sqlite3.connect(db_path) as conn:
+            deltas = list(diff_runs(conn, RUN_A, RUN_B, include_unchanged=True, batch_size=2))
+
+        unchanged = {
+            (d.model_name, d.normalized_name) for d in deltas if d.change == CHANGE_UNCHANGED
+        }
+        assert unchanged == {("gpt-4o", "hubspot"), ("gpt-4o-mini", "zoho")}
+        assert len(deltas) == 6
+
+    def test_unpaired_queries_left_out(self, db_path):
+        """Test queries answered in one run only are listed, not diffed."""
+        with sqlite3.connect(db_path) as conn:
+            deltas = list(diff_runs(conn, RUN_A, RUN_B))
+            unpaired = unpaired_queries(conn, RUN_A, RUN_B)
+
+        assert {d.intent_id for d in deltas} == {"crm"}
+        assert [(q["intent_id"], q["run_id"]) for q in unpaired] == [
+            ("email", RUN_A),
+            ("seo", RUN_B),
+        ]
+
+    def test_counter_summary(self, db_path):
+        """Test DiffCounter counts changes while passing deltas through."""
+        counter = DiffCounter()
+        with sqlite3.connect(db_path) as conn:
+            passed = list(counter.count(diff_runs(conn, RUN_A, RUN_B)))
+
+        summary = counter.summary()
+        assert len(passed) == summary["total"] == 4
+        assert summary["mine"][CHANGE_RANK_UP] == 1
+        assert summary[CHANGE_UNCHANGED] == 0
+
+
+class TestDiffReport:
+    """Test suite for generate_diff_report()."""
+
+    def test_renders_changes_and_escapes(self, db_path):
+        """Test the report lists changes and unpaired queries with escaping."""
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "UPDATE mentions SET brand_name = '<b>Close</b>' WHERE normalized_name = 'close'"
+            )
+            html = generate_diff_report(
+                RUN_A,
+                RUN_B,
+                diff_runs(conn, RUN_A, RUN_B),
+                unpaired_queries(conn, RUN_A, RUN_B),
+            )
+
+        assert "crm · openai/gpt-4o-mini" in html
+        assert "Not compared" in html
+        assert "&lt;b&gt;Close&lt;/b&gt;" in html
+        assert "<b>Close</b>" not in html
+
+
+class TestDiffCommand:
+    """Test suite for `llm-answer-watcher diff`."""
+
+    def test_json_output_and_jsonl_stream(self, db_path, tmp_path):
+        """Test JSON summary on stdout and every delta in the output file."""
+        output = tmp_path / "diff.jsonl"
+        html = tmp_path / "diff.html"
+
+        result = CliRunner().invoke(
+            app,
+            [
+                "diff", RUN_A, RUN_B, "--db", str(db_path), "--output", str(output),
+                "--html", str(html), "--limit", "1", "--format", "json",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        data = json.loads(result.output)["diff"]
+        assert data["summary"]["total"] == 4
+        assert len(data["deltas"]) == 1
+        assert data["truncated"] is True
+        lines = output.read_text().splitlines()
+        assert len(lines) == 4
+        assert json.loads(lines[0])["normalized_name"] == "close"
+        assert "Run Diff" in html.read_text()
+
+    def test_unknown_run(self, db_path):
+        """Test unknown run IDs are reported as errors."""
+        result = CliRunner().invoke(app, ["diff", RUN_A, "missing", "--db", str(db_path)])
+
+        assert result.exit_code == 1
+        assert "Run not found" in result.output
+
+
+class TestDiffEndpoint:
+    """Test suite for GET /runs/{run_a}/diff/{run_b}."""
+
+    def test_streams_owned_runs_only(self, db_path, monkeypatch):
+        """Test the owner gets NDJSON deltas and other users get 404."""
+        from fastapi.testclient import TestClient
+
+        from llm_answer_watcher.api import app as api_app
+        from llm_answer_watcher.auth.dependencies import get_current_user
+
+        (db_path.parent / "output").mkdir()
+        # Checkpoint the WAL before moving the file
+        close_connection_pools()
+        db_path.rename(db_path.parent / "output" / "watcher.db")
+        monkeypatch.chdir(db_path.parent)
+        user = {"id": 1, "username": "alice"}
+        api_app.dependency_overrides[get_current_user] = lambda: user
+        try:
+            client = TestClient(api_app)
+            owned = client.get(f"/runs/{RUN_A}/diff/{RUN_B}")
+            html = client.get(f"/runs/{RUN_A}/diff/{RUN_B}", params={"format": "html"})
+            user["id"] = 2
+            denied = client.get(f"/runs/{RUN_A}/diff/{RUN_B}")
+        finally:
+            api_app.dependency_overrides.clear()
+
+        assert owned.status_code == 200
+        assert owned.headers["content-type"].startswith("application/x-ndjson")
+        assert len(owned.text.splitlines()) == 4
+        assert html.status_code == 200
+        assert "Run Diff" in html.text
+        assert denied.status_code == 404
@@ -18,6 +18,7 @@ import pytest
 
 from llm_answer_watcher.storage.eval_db import (
     EVAL_CURRENT_SCHEMA_VERSION,
+    get_cached_eval_results,
     get_eval_schema_version,
     get_failing_tests,
     get_metric_trend,
@@ -759,6 +760,50 @@ class TestEvalDatabaseIntegration:
         # Should have 2 (precision+recall) + 1 (precision) + 2 (precision+recall) = 5 results
         assert result_count == 5
 
+    def test_store_eval_results_latency_and_cache(self, tmp_path):
+        """Test stored rows carry latency and fingerprinted cases are cached."""
+        from llm_answer_watcher.evals.schema import EvalMetricScore, EvalResult
+
+        db_path = tmp_path / "test_eval.db"
+        init_eval_db_if_needed(str(db_path))
+        metrics = [
+            EvalMetricScore(name="precision", value=1.0, passed=True),
+            EvalMetricScore(name="recall", value=0.5, passed=False),
+        ]
+        eval_results = {
+            "summary": {"pass_rate": 0.5, "total_test_cases": 2, "total_passed": 1},
+            "results": [
+                EvalResult(
+                    test_description="Cached",
+                    metrics=metrics,
+                    overall_passed=True,
+                    extraction_latency_ms=1.5,
+                    case_fingerprint="abc123",
+                ),
+                EvalResult(test_description="Errored", metrics=[], overall_passed=False),
+            ],
+            "total_test_cases": 2,
+            "total_passed": 1,
+        }
+
+        with sqlite3.connect(str(db_path)) as conn:
+            run_id = store_eval_results(conn, eval_results, "2025-11-02T08-00-00Z")
+            conn.commit()
+
+        with sqlite3.connect(str(db_path)) as conn:
+            latencies = conn.execute(
+                "SELECT metric_name, extraction_latency_ms FROM eval_results "
+                "WHERE eval_run_id = ? ORDER BY metric_name",
+                (run_id,),
+            ).fetchall()
+            cached = get_cached_eval_results(conn, ["Cached", "Errored"])
+
+        assert latencies == [("precision", 1.5), ("recall", 1.5)]
+        assert list(cached) == ["Cached"]
+        fingerprint, result_json = cached["Cached"]
+        assert fingerprint == "abc123"
+        assert EvalResult.model_validate_json(result_json) == eval_results["results"][0]
+
     def test_foreign_key_constraints(self, tmp_path):
         """Test that foreign key constraints are enforced."""
         db_path = tmp_path / "test_eval.db"
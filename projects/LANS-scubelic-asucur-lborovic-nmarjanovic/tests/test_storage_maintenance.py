@@ -0,0 +1,315 @@
+"""
+Tests for storage.maintenance module.
+
+Tests cover:
+- Retention tiers: raw answers deleted, mentions rolled up, rollups expired
+- Rollup aggregation and idempotence across repeated passes
+- Batched deletes with per-batch progress reporting
+- Incremental vacuum and compact_database (WAL mode, file shrinks)
+- Scheduling of maintenance after runs
+- Maintenance transactions queued behind the pooled writer
+- RetentionConfig validation and the `db compact` CLI command
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+from typer.testing import CliRunner
+
+from llm_answer_watcher.cli import app
+from llm_answer_watcher.config.schema import RetentionConfig
+from llm_answer_watcher.storage import maintenance
+from llm_answer_watcher.storage.connection import get_connection_pool
+from llm_answer_watcher.storage.db import (
+    get_answers_raw,
+    init_db_if_needed,
+    insert_answer_raw,
+    insert_mention,
+    insert_run,
+)
+
+NOW = datetime(2025, 6, 30, 12, 0, 0, tzinfo=UTC)
+
+
+def _populate(db_path, days_ago: list[int], runs_per_day: int = 2) -> None:
+    """Insert runs with one unique answer and two mentions each."""
+    init_db_if_needed(str(db_path))
+    with sqlite3.connect(db_path) as conn:
+        for age in days_ago:
+            for n in range(runs_per_day):
+                ts = (NOW - timedelta(days=age, hours=n)).strftime("%Y-%m-%dT%H:%M:%SZ")
+                run_id = f"run-{age}-{n}"
+                insert_run(conn, run_id, ts, 1, 1)
+                insert_answer_raw(
+                    conn,
+                    run_id=run_id,
+                    intent_id="crm",
+                    model_provider="openai",
+                    model_name="gpt-4o-mini",
+                    timestamp_utc=ts,
+                    prompt="Best CRM?",
+                    answer_text=f"Answer {run_id}: HubSpot, Salesforce. " + "x" * 2000 + run_id,
+                )
+                for rank, (brand, mine, sentiment) in enumerate(
+                    [("HubSpot", True, "positive"), ("Salesforce", False, "neutral")], start=1
+                ):
+                    insert_mention(
+                        conn,
+                        run_id=run_id,
+                        timestamp_utc=ts,
+                        intent_id="crm",
+                        model_provider="openai",
+                        model_name="gpt-4o-mini",
+                        brand_name=brand,
+                        normalized_name=brand.lower(),
+                        is_mine=mine,
+                        rank_position=rank + n,
+                        sentiment=sentiment,
+                    )
+        conn.commit()
+
+
+def _count(db_path, table: str) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestRetention:
+    """Test suite for apply_retention()."""
+
+    def test_raw_answers_expire_but_mentions_stay(self, tmp_path):
+        """Test raw tier deletes old answers and their blobs only."""
+        db_path = tmp_path / "watcher.db"
+        _populate(db_path, days_ago=[1, 40])
+
+        with sqlite3.connect(db_path) as conn:
+            result = maintenance.apply_retention(
+                conn, RetentionConfig(raw_answers_days=30), now=NOW
+            )
+            remaining = get_answers_raw(conn, "run-1-0")
+
+        assert result.deleted["answers_raw"] == 2
+        assert result.deleted["answer_blobs"] == 2
+        assert _count(db_path, "answers_raw") == 2
+        assert _count(db_path, "mentions") == 8
+        assert remaining[0]["answer_text"].startswith("Answer run-1-0")
+
+    def test_mentions_rolled_up_by_day(self, tmp_path):
+        """Test expired mentions become daily per-brand rollups."""
+        db_path = tmp_path / "watcher.db"
+        _populate(db_path, days_ago=[1, 200])
+
+        with sqlite3.connect(db_path) as conn:
+            result = maintenance.apply_retention(
+                conn, RetentionConfig(raw_answers_days=30, mentions_days=90), now=NOW
+            )
+            conn.row_factory = sqlite3.Row
+            rollups = {
+                row["normalized_name"]: dict(row)
+                for row in conn.execute("SELECT * FROM mention_rollups")
+            }
+
+        assert result.rolled_up_days == 1
+        assert result.deleted["mentions"] == 4
+        assert _count(db_path, "mentions") == 4
+        assert rollups["hubspot"]["mention_count"] == 2
+        assert rollups["hubspot"]["run_count"] == 2
+        assert rollups["hubspot"]["is_mine"] == 1
+        assert rollups["hubspot"]["best_rank"] == 1
+        assert rollups["hubspot"]["rank_sum"] == 3  # ranks 1 and 2
+        assert rollups["hubspot"]["positive_count"] == 2
+        assert rollups["salesforce"]["neutral_count"] == 2
+
+    def test_repeated_passes_do_not_double_count(self, tmp_path):
+        """Test a second pass finds nothing left to roll up."""
+        db_path = tmp_path / "watcher.db"
+        _populate(db_path, days_ago=[200])
+        retention = RetentionConfig(raw_answers_days=30, mentions_days=90)
+
+        with sqlite3.connect(db_path) as conn:
+            maintenance.apply_retention(conn, retention, now=NOW)
+            second = maintenance.apply_retention(conn, retention, now=NOW)
+            total = conn.execute("SELECT SUM(mention_count) FROM mention_rollups").fetchone()[0]
+
+        assert second.rolled_up_days == 0
+        assert total == 4
+
+    def test_rollups_expire(self, tmp_path):
+        """Test the last tier deletes old rollups."""
+        db_path = tmp_path / "watcher.db"
+        _populate(db_path, days_ago=[100, 400])
+        retention = RetentionConfig(raw_answers_days=30, mentions_days=90, rollups_days=365)
+
+        with sqlite3.connect(db_path) as conn:
+            result = maintenance.apply_retention(conn, retention, now=NOW)
+            days = [row[0] for row in conn.execute("SELECT DISTINCT day FROM mention_rollups")]
+
+        assert result.deleted["mention_rollups"] == 2
+        assert days == [(NOW - timedelta(days=100)).date().isoformat()]
+
+    def test_deletes_reported_per_batch(self, tmp_path):
+        """Test batch_size bounds each transaction and progress sees every batch."""
+        db_path = tmp_path / "watcher.db"
+        _populate(db_path, days_ago=[40], runs_per_day=5)
+        batches = []
+
+        with sqlite3.connect(db_path) as conn:
+            maintenance.apply_retention(
+                conn,
+                RetentionConfig(raw_answers_days=30),
+                now=NOW,
+                batch_size=2,
+                progress=lambda stage, batch, total: batches.append((stage, batch, total)),
+            )
+
+        assert [b for b in batches if b[0] == "answers_raw"] == [
+            ("answers_raw", 2, 2),
+            ("answers_raw", 2, 4),
+            ("answers_raw", 1, 5),
+        ]
+
+
+class TestCompaction:
+    """Test suite for vacuum, compact_database() and scheduling."""
+
+    def test_new_databases_use_incremental_vacuum(self, tmp_path):
+        """Test init_db_if_needed enables incremental auto_vacuum."""
+        db_path = tmp_path / "watcher.db"
+        init_db_if_needed(str(db_path))
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    def test_compact_shrinks_file_in_wal_mode(self, tmp_path):
+        """Test compact deletes expired data and returns pages to the filesystem."""
+        db_path = tmp_path / "watcher.db"
+        _populate(db_path, days_ago=[1, 40, 41, 42, 43], runs_per_day=20)
+
+        result = maintenance.compact_database(
+            str(db_path), RetentionConfig(raw_answers_days=30), batch_size=25, now=NOW
+        )
+
+        with sqlite3.connect(db_path) as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            tasks = [row[0] for row in conn.execute("SELECT task FROM maintenance_log")]
+
+        assert journal_mode == "wal"
+        assert result.deleted["answers_raw"] == 80
+        assert result.vacuumed_pages > 0
+        assert result.size_after_bytes < result.size_before_bytes
+        assert result.analyzed
+        assert "compact" in tasks
+
+    def test_full_vacuum_enables_incremental_mode(self, tmp_path):
+        """Test --full-vacuum converts databases created without auto_vacuum."""
+        db_path = tmp_path / "watcher.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE legacy (x INTEGER)")
+        init_db_if_needed(str(db_path))
+
+        result = maintenance.compact_database(str(db_path), full=True)
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert result.vacuum_mode == "full"
+
+    def test_scheduled_maintenance_respects_interval(self, tmp_path):
+        """Test retention runs after a run at most once per interval."""
+        db_path = tmp_path / "watcher.db"
+        _populate(db_path, days_ago=[40])
+        retention = RetentionConfig(raw_answers_days=30, maintenance_interval_hours=24)
+
+        first = maintenance.run_scheduled_maintenance(str(db_path), retention, now=NOW)
+        second = maintenance.run_scheduled_maintenance(
+            str(db_path), retention, now=NOW + timedelta(hours=1)
+        )
+
+        assert first.deleted["answers_raw"] == 2
+        assert first.analyzed
+        assert second is None
+        assert maintenance.run_scheduled_maintenance(str(db_path), None) is None
+
+    def test_maintenance_waits_for_pooled_writer(self, tmp_path):
+        """Test a maintenance transaction starts only after the pool's write block."""
+        db_path = str(tmp_path / "watcher.db")
+        init_db_if_needed(db_path)
+        order = []
+        writing = threading.Event()
+
+        def _pooled_write():
+            with get_connection_pool(db_path).write():
+                writing.set()
+                time.sleep(0.2)
+                order.append("pool")
+
+        writer = threading.Thread(target=_pooled_write)
+        writer.start()
+        writing.wait()
+        with closing(maintenance.connect_for_maintenance(db_path)) as conn:
+            maintenance.optimize(conn)
+            order.append("maintenance")
+        writer.join()
+
+        assert order == ["pool", "maintenance"]
+
+
+class TestRetentionConfig:
+    """Test suite for RetentionConfig validation."""
+
+    def test_tiers_must_grow(self):
+        """Test later tiers can't be shorter than earlier ones."""
+        with pytest.raises(ValidationError, match="mentions_days"):
+            RetentionConfig(raw_answers_days=90, mentions_days=30)
+
+    def test_mentions_tier_requires_raw_tier(self):
+        """Test mentions can't expire while raw answers are kept forever."""
+        with pytest.raises(ValidationError, match="raw_answers_days must be set"):
+            RetentionConfig(mentions_days=30)
+
+    def test_days_positive(self):
+        """Test zero-day retention is rejected."""
+        with pytest.raises(ValidationError, match="at least 1 day"):
+            RetentionConfig(raw_answers_days=0)
+
+
+class TestDbCompactCommand:
+    """Test suite for `llm-answer-watcher db compact`."""
+
+    def test_json_output(self, tmp_path):
+        """Test compact reports its result as JSON."""
+        db_path = tmp_path / "watcher.db"
+        # NOW is in the past, so these answers are older than 30 days today
+        _populate(db_path, days_ago=[1])
+
+        result = CliRunner().invoke(
+            app, ["db", "compact", "--db", str(db_path), "--raw-days", "30", "--format", "json"]
+        )
+
+        assert result.exit_code == 0, result.output
+        data = json.loads(result.output)
+        assert data["compact"]["deleted"]["answers_raw"] == 2
+        assert data["compact"]["vacuum_mode"] == "incremental"
+
+    def test_retention_from_config(self, tmp_path):
+        """Test retention and database path are read from the config file."""
+        db_path = tmp_path / "watcher.db"
+        _populate(db_path, days_ago=[1])
+        config_path = tmp_path / "watcher.config.yaml"
+        config_path.write_text(
+            "run_settings:\n"
+            f"  sqlite_db_path: {db_path}\n"
+            "  retention:\n"
+            "    raw_answers_days: 60\n"
+            "    mentions_days: 30\n"
+        )
+
+        result = CliRunner().invoke(app, ["db", "compact", "--config", str(config_path)])
+
+        assert result.exit_code == 1
+        assert "Invalid retention settings" in result.output
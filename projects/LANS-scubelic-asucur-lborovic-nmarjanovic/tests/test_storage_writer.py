@@ -165,6 +165,18 @@ class TestWriteJson:
         assert "中文" in content
         assert "العربية" in content
 
+    def test_compact_output(self, tmp_path, monkeypatch):
+        """Test compact artifacts via argument or WATCHER_JSON_ARTIFACTS."""
+        data = {"key": "value", "nested": {"n": 1}}
+
+        write_json(str(tmp_path / "a.json"), data, pretty=False)
+        monkeypatch.setenv("WATCHER_JSON_ARTIFACTS", "compact")
+        write_json(str(tmp_path / "b.json"), data)
+
+        expected = '{"key":"value","nested":{"n":1}}\n'
+        assert (tmp_path / "a.json").read_text(encoding="utf-8") == expected
+        assert (tmp_path / "b.json").read_text(encoding="utf-8") == expected
+
     def test_adds_trailing_newline(self, tmp_path):
         """Test that file ends with newline (POSIX compliance)."""
         filepath = str(tmp_path / "test.json")
@@ -0,0 +1,198 @@
+"""
+Tests for utils.logging module.
+
+Tests cover:
+- Secret redaction for every supported key format, in messages, args and context
+- Args without secrets keeping their type
+- QueryLogSampler rate limiting and suppressed counts
+- Queued handler output: JSON lines, exceptions, flush on listener stop
+- setup_logging() levels, quiet mode and listener replacement
+"""
+
+import io
+import json
+import logging
+
+import pytest
+
+from llm_answer_watcher.utils import logging as log_utils
+from llm_answer_watcher.utils.logging import (
+    QueryLogSampler,
+    SecretRedactingFilter,
+    create_log_handler,
+    setup_logging,
+)
+
+
+def _record(msg, args=None, level=logging.INFO, **attrs) -> logging.LogRecord:
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    for key, value in attrs.items():
+        setattr(record, key, value)
+    return record
+
+
+@pytest.fixture
+def logger():
+    test_logger = logging.getLogger("test_utils_logging")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    yield test_logger
+    test_logger.handlers.clear()
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    log_utils.shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class TestSecretRedactingFilter:
+    """Test suite for SecretRedactingFilter."""
+
+    @pytest.mark.parametrize(
+        ("secret", "expected"),
+        [
+            ("sk-" + "a" * 16 + "WXYZ", "sk-...WXYZ"),
+            ("sk-" + "b" * 47 + "WXYZ", "sk-...WXYZ"),
+            ("sk-proj-" + "c" * 44 + "WXYZ", "sk-proj-...WXYZ"),
+            ("sk-ant-api03-" + "d" * 70 + "WXYZ", "sk-ant-api03-...WXYZ"),
+            ("Bearer " + "e" * 30 + "WXYZ", "Bearer ***WXYZ"),
+        ],
+    )
+    def test_redacts_key_formats(self, secret, expected):
+        """Test each key format keeps only its prefix and last 4 chars."""
+        record = _record(f"Using key {secret} now")
+
+        SecretRedactingFilter().filter(record)
+
+        assert record.msg == f"Using key {expected} now"
+
+    def test_text_without_secrets_unchanged(self):
+        """Test plain text and near-miss keys pass through untouched."""
+        redactor = SecretRedactingFilter()
+
+        assert redactor._redact_secrets("Processing intent=best-crm") == "Processing intent=best-crm"
+        assert redactor._redact_secrets("sk-short") == "sk-short"
+
+    def test_args_and_context(self):
+        """Test secrets in args/context are redacted and other args keep their type."""
+        key = "sk-" + "a" * 16 + "WXYZ"
+        record = _record(
+            "key=%s retries=%d",
+            (key, 3),
+            context={"auth": {"header": "Bearer " + "t" * 24}, "keys": [key]},
+        )
+
+        SecretRedactingFilter().filter(record)
+
+        assert record.args == ("sk-...WXYZ", 3)
+        assert record.getMessage() == "key=sk-...WXYZ retries=3"
+        assert record.context == {
+            "auth": {"header": "Bearer ***tttt"},
+            "keys": ["sk-...WXYZ"],
+        }
+
+
+class TestQueryLogSampler:
+    """Test suite for QueryLogSampler."""
+
+    def test_untagged_and_warnings_always_pass(self):
+        """Test only sample_key-tagged records below WARNING are limited."""
+        sampler = QueryLogSampler(rate=0.001, burst=0)
+
+        assert sampler.filter(_record("plain"))
+        assert sampler.filter(_record("warn", level=logging.WARNING, sample_key="q"))
+        assert not sampler.filter(_record("info", sample_key="q"))
+
+    def test_burst_then_suppressed_count(self, monkeypatch):
+        """Test a key emits its burst, drops the rest and reports drops."""
+        now = [100.0]
+        monkeypatch.setattr(log_utils.time, "monotonic", lambda: now[0])
+        sampler = QueryLogSampler(rate=1.0, burst=2)
+
+        passed = [sampler.filter(_record(str(i), sample_key="q")) for i in range(5)]
+        assert passed == [True, True, False, False, False]
+        assert sampler.filter(_record("other", sample_key="other"))
+
+        now[0] += 1.0
+        record = _record("after refill", sample_key="q")
+        assert sampler.filter(record)
+        assert record.suppressed == 3
+
+    def test_invalid_rate(self):
+        """Test rate must be positive."""
+        with pytest.raises(ValueError, match="rate must be positive"):
+            QueryLogSampler(rate=0)
+
+
+class TestQueuedHandler:
+    """Test suite for the queue-based handler chain."""
+
+    def test_records_written_by_listener(self, logger):
+        """Test queued records are redacted JSON lines once the listener stops."""
+        stream = io.StringIO()
+        handler, listener = create_log_handler(stream)
+        logger.addHandler(handler)
+
+        logger.info("key %s", "sk-" + "a" * 16 + "WXYZ", extra={"context": {"n": 1}, "run_id": "r1"})
+        try:
+            raise ValueError("bad config")
+        except ValueError:
+            logger.exception("Failed")
+        listener.stop()
+
+        first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+        assert first["message"] == "key sk-...WXYZ"
+        assert first["context"] == {"n": 1}
+        assert first["run_id"] == "r1"
+        assert first["timestamp"].endswith("Z")
+        assert second["level"] == "ERROR"
+        assert "ValueError: bad config" in second["exception"]
+
+    def test_sampled_records_report_suppressed(self, logger, monkeypatch):
+        """Test drops are reported in the next emitted record's JSON."""
+        now = [100.0]
+        monkeypatch.setattr(log_utils.time, "monotonic", lambda: now[0])
+        stream = io.StringIO()
+        handler, listener = create_log_handler(stream, queued=False)
+        sampler = next(f for f in handler.filters if isinstance(f, QueryLogSampler))
+        sampler.burst, sampler.rate = 1, 1.0
+        logger.addHandler(handler)
+
+        for i in range(4):
+            logger.info(f"Processing {i}", extra={"sample_key": "query.start"})
+        now[0] += 1.0
+        logger.info("Processing 4", extra={"sample_key": "query.start"})
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert listener is None
+        assert [line["message"] for line in lines] == ["Processing 0", "Processing 4"]
+        assert lines[1]["suppressed"] == 3
+
+
+class TestSetupLogging:
+    """Test suite for setup_logging()."""
+
+    def test_levels_and_listener(self, restore_root_logger):
+        """Test verbose/quiet levels and that reconfiguring stops the old listener."""
+        setup_logging()
+        root = logging.getLogger()
+        first_listener = log_utils._active_listener
+        assert root.level == logging.INFO
+        assert len(root.handlers) == 1
+        assert first_listener is not None
+
+        setup_logging(verbose=True, quiet_logs=True)
+        assert root.level == logging.DEBUG
+        assert first_listener._thread is None
+        # Sampling is disabled in verbose mode
+        assert not any(isinstance(f, QueryLogSampler) for f in root.handlers[0].filters)
+
+        setup_logging(quiet_logs=True)
+        assert root.level == logging.CRITICAL + 1
+        assert root.handlers == []
+        assert log_utils._active_listener is None
@@ -0,0 +1,210 @@
+"""
+Tests for utils.metrics module.
+
+Tests cover:
+- Histogram percentiles, counters and gauges in MetricsRegistry
+- Span/timed label inheritance and per-run collection
+- Semaphore queue depth and in-flight gauges
+- Prometheus text rendering and the API /metrics endpoint
+- run_meta.json metrics from run_all()
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from llm_answer_watcher.utils import metrics
+
+
+def _histogram(snapshot: dict, stage: str) -> dict:
+    """Return the single histogram entry recorded for a stage."""
+    entries = [h for h in snapshot["histograms"] if h["labels"].get("stage") == stage]
+    assert len(entries) == 1, entries
+    return entries[0]
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry."""
+
+    def test_histogram_percentiles(self):
+        """Test p50/p95/p99 use nearest-rank over recorded samples."""
+        registry = metrics.MetricsRegistry()
+        for value in range(1, 101):
+            registry.observe("stage_duration_seconds", float(value), (("stage", "x"),))
+
+        entry = registry.snapshot()["histograms"][0]
+
+        assert entry["count"] == 100
+        assert entry["p50"] == 50.0
+        assert entry["p95"] == 95.0
+        assert entry["p99"] == 99.0
+        assert entry["max"] == 100.0
+
+    def test_gauge_tracks_max(self):
+        """Test gauges keep their high-water mark."""
+        registry = metrics.MetricsRegistry()
+        registry.gauge_add("in_flight_queries", 3)
+        registry.gauge_add("in_flight_queries", -3)
+
+        gauge = registry.snapshot()["gauges"][0]
+
+        assert gauge["value"] == 0
+        assert gauge["max"] == 3
+
+    def test_prometheus_rendering(self):
+        """Test summaries and counters render in exposition format with escaping."""
+        registry = metrics.MetricsRegistry()
+        registry.observe("stage_duration_seconds", 0.5, (("stage", 'a"b'),))
+        registry.inc("llm_retries_total", 2, (("provider", "google"),))
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE llm_answer_watcher_stage_duration_seconds summary" in text
+        assert 'stage="a\\"b",quantile="0.95"} 0.5' in text
+        assert 'llm_answer_watcher_stage_duration_seconds_count{stage="a\\"b"} 1' in text
+        assert "# TYPE llm_answer_watcher_llm_retries_total counter" in text
+        assert 'llm_answer_watcher_llm_retries_total{provider="google"} 2.0' in text
+
+
+class TestSpans:
+    """Test suite for span(), timed() and run collection."""
+
+    def test_nested_spans_inherit_labels(self):
+        """Test timed functions inside a span inherit its labels."""
+
+        @metrics.timed()
+        def write_something():
+            return 42
+
+        registry, token = metrics.start_run_collection()
+        try:
+            with metrics.span("llm_request", provider="groq", model="llama"):
+                assert write_something() == 42
+        finally:
+            metrics.stop_run_collection(token)
+
+        entry = _histogram(registry.snapshot(), "write_something")
+        assert entry["labels"] == {"model": "llama", "provider": "groq", "stage": "write_something"}
+
+    def test_span_records_on_exception(self):
+        """Test spans are recorded even when the block raises."""
+        registry, token = metrics.start_run_collection()
+        try:
+            with pytest.raises(ValueError), metrics.span("failing"):
+                raise ValueError("boom")
+        finally:
+            metrics.stop_run_collection(token)
+
+        assert _histogram(registry.snapshot(), "failing")["count"] == 1
+
+    def test_run_collection_is_scoped(self):
+        """Test measurements after stop_run_collection() are not collected."""
+        registry, token = metrics.start_run_collection()
+        metrics.inc("queries_total", status="success")
+        metrics.stop_run_collection(token)
+        metrics.inc("queries_total", status="success")
+
+        assert registry.snapshot()["counters"][0]["value"] == 1.0
+
+    def test_tracked_semaphore_gauges(self):
+        """Test queue depth and in-flight gauges under contention."""
+
+        async def main():
+            semaphore = asyncio.Semaphore(2)
+
+            async def work():
+                async with metrics.tracked_semaphore(semaphore):
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(*(work() for _ in range(5)))
+
+        registry, token = metrics.start_run_collection()
+        try:
+            asyncio.run(main())
+        finally:
+            metrics.stop_run_collection(token)
+
+        snapshot = registry.snapshot()
+        gauges = {g["name"]: g for g in snapshot["gauges"]}
+        assert gauges["in_flight_queries"]["max"] == 2
+        assert gauges["in_flight_queries"]["value"] == 0
+        # Two tasks acquire immediately; the other three queue
+        assert gauges["semaphore_queue_depth"]["max"] == 3
+        assert _histogram(snapshot, "query")["count"] == 5
+        assert _histogram(snapshot, "semaphore_wait")["count"] == 5
+
+
+class TestIntegration:
+    """Test suite for run_meta.json and /metrics integration."""
+
+    def test_run_meta_contains_stage_metrics(self):
+        """Test run_all() writes per-provider/model stage timings to run_meta.json."""
+        import tempfile
+
+        from llm_answer_watcher.benchmarks.scenarios import (
+            _run_all_once,
+            build_benchmark_config,
+            make_answer,
+            make_brand_names,
+            mock_llm_stack,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            config = build_benchmark_config(
+                f"{tmp}/output", f"{tmp}/watcher.db", intents=2, models=1, concurrency=2
+            )
+            with mock_llm_stack(make_answer(make_brand_names(10), 500)):
+                summary = _run_all_once(config)
+            meta = json.loads((Path(summary["output_dir"]) / "run_meta.json").read_text())
+
+        stages = {
+            h["labels"]["stage"]
+            for h in meta["metrics"]["histograms"]
+            if h["labels"].get("model") == "mock-model-0"
+        }
+        assert {"llm_request", "parse_answer", "write_raw_answer", "insert_answer_raw", "query"} <= stages
+        counters = {
+            (c["name"], c["labels"].get("status")): c["value"]
+            for c in meta["metrics"]["counters"]
+        }
+        assert counters[("queries_total", "success")] == 2
+
+    def test_collection_stopped_when_run_fails(self, tmp_path, monkeypatch):
+        """Test a failing run_all() doesn't leave its collection on the caller's context."""
+        from llm_answer_watcher.benchmarks.scenarios import build_benchmark_config
+        from llm_answer_watcher.llm_runner import runner as runner_module
+
+        config = build_benchmark_config(
+            str(tmp_path / "output"),
+            str(tmp_path / "watcher.db"),
+            intents=1,
+            models=1,
+            concurrency=1,
+        )
+
+        def _fail(*_args, **_kwargs):
+            raise RuntimeError("factory cache unavailable")
+
+        monkeypatch.setattr(runner_module, "start_factory_cache", _fail)
+
+        async def _run():
+            with pytest.raises(RuntimeError, match="factory cache unavailable"):
+                await runner_module.run_all(config)
+            return metrics._run_registry.get()
+
+        assert asyncio.run(_run()) is None
+
+    def test_api_metrics_endpoint(self):
+        """Test /metrics serves Prometheus text."""
+        from fastapi.testclient import TestClient
+
+        from llm_answer_watcher.api import app
+
+        metrics.inc("llm_retries_total", provider="test-endpoint")
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'llm_answer_watcher_llm_retries_total{provider="test-endpoint"}' in response.text
@@ -0,0 +1,108 @@
+"""
+Tests for utils.serialization module.
+
+Tests cover:
+- Round-trips and output format with both backends (pretty, compact, sorted)
+- Stdlib semantics kept for values orjson rejects or would accept silently
+- Non-finite floats, the one difference between the backends
+- Backend selection
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import pytest
+
+from llm_answer_watcher.utils import serialization
+
+BACKENDS = [
+    serialization.BACKEND_STDLIB,
+    pytest.param(
+        serialization.BACKEND_ORJSON,
+        marks=pytest.mark.skipif(serialization.orjson is None, reason="orjson not installed"),
+    ),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = serialization.set_backend(request.param)
+    yield request.param
+    serialization.set_backend(previous)
+
+
+@dataclass
+class _Usage:
+    tokens: int
+
+
+class TestSerialization:
+    """Test suite for dumps/dumps_bytes/loads with each backend."""
+
+    def test_round_trip(self, backend):
+        """Test values survive encoding and decoding unchanged."""
+        data = {"text": "Hello 世界 🌍", "usage": {"tokens": 650}, "items": [1.5, None, True]}
+
+        assert serialization.loads(serialization.dumps(data)) == data
+        assert serialization.loads(serialization.dumps_bytes(data)) == data
+
+    def test_output_format(self, backend):
+        """Test compact, pretty and sorted output match across backends."""
+        data = {"b": "中文", "a": [1, {"c": None}]}
+
+        assert serialization.dumps(data) == '{"b":"中文","a":[1,{"c":null}]}'
+        assert serialization.dumps(data, pretty=True) == json.dumps(
+            data, indent=2, ensure_ascii=False
+        )
+        assert serialization.dumps(data, sort_keys=True).startswith('{"a":')
+        assert serialization.dumps({1: "x"}) == '{"1":"x"}'
+
+    def test_stdlib_semantics(self, backend):
+        """Test big integers and NaN literals work, datetimes need default=."""
+        assert serialization.dumps(2**70) == str(2**70)
+        assert serialization.loads("[NaN]")[0] != serialization.loads("[NaN]")[0]
+
+        with pytest.raises(TypeError):
+            serialization.dumps({"at": datetime(2025, 11, 2, tzinfo=UTC)})
+        with pytest.raises(TypeError):
+            serialization.dumps(_Usage(650))
+        assert serialization.dumps(_Usage(650), default=lambda u: u.tokens) == "650"
+
+    def test_non_finite_floats(self, backend):
+        """Test NaN and infinities: null with orjson, literals with the stdlib."""
+        data = {"cost": float("nan"), "limit": float("inf")}
+
+        encoded = serialization.dumps(data)
+
+        if backend == serialization.BACKEND_ORJSON:
+            assert encoded == '{"cost":null,"limit":null}'
+            assert serialization.loads(encoded) == {"cost": None, "limit": None}
+        else:
+            assert encoded == '{"cost":NaN,"limit":Infinity}'
+            decoded = serialization.loads(encoded)
+            assert math.isnan(decoded["cost"])
+            assert decoded["limit"] == math.inf
+
+    def test_invalid_input(self, backend):
+        """Test decode errors are the stdlib's."""
+        with pytest.raises(json.JSONDecodeError):
+            serialization.loads("{not json")
+        with pytest.raises(TypeError):
+            serialization.loads(None)
+
+
+class TestBackendSelection:
+    """Test suite for backend configuration."""
+
+    def test_unknown_backend_rejected(self):
+        """Test set_backend() only accepts known backends."""
+        with pytest.raises(ValueError, match="Unknown JSON backend"):
+            serialization.set_backend("simplejson")
+
+    def test_artifacts_pretty(self, monkeypatch):
+        """Test WATCHER_JSON_ARTIFACTS switches artifacts to compact output."""
+        assert serialization.artifacts_pretty() is True
+        monkeypatch.setenv("WATCHER_JSON_ARTIFACTS", "compact")
+        assert serialization.artifacts_pretty() is False